@@ -32,7 +32,10 @@ from frigate.api.auth import (
     require_role,
 )
 from frigate.api.config_util import swap_runtime_config
-from frigate.api.defs.query.app_query_parameters import AppTimelineHourlyQueryParameters
+from frigate.api.defs.query.app_query_parameters import (
+    AppTimelineHourlyQueryParameters,
+    StatsSeriesQueryParameters,
+)
 from frigate.api.defs.request.app_body import (
     AppConfigSetBody,
     GenAIProbeBody,
@@ -159,6 +162,28 @@ def stats_history(request: Request, keys: str = None):
     return JSONResponse(content=request.app.stats_emitter.get_stats_history(keys))
 
 
+@router.get(
+    "/stats/series",
+    dependencies=[Depends(require_role(["admin"]))],
+    summary="Get stats over a time range",
+    description=(
+        "Returns downsampled values of the stats matching the comma separated "
+        "metrics, ex: cameras.*.camera_fps. Defaults to the last hour, the "
+        "resolution is 15 seconds for the last day, 1 minute for the last 7 "
+        "days and 15 minutes for the last 28 days. Only the fps, cpu, gpu and "
+        "inference speed stats are kept."
+    ),
+)
+def stats_series(request: Request, params: StatsSeriesQueryParameters = Depends()):
+    before = params.before or datetime.now().timestamp()
+    after = params.after or before - 3600
+    metrics = [metric.strip() for metric in params.metrics.split(",") if metric]
+
+    return JSONResponse(
+        content=request.app.stats_emitter.get_stats_series(metrics, after, before)
+    )
+
+
 @router.get("/metrics", dependencies=[Depends(allow_any_authenticated())])
 def metrics(request: Request):
     """Expose Prometheus metrics endpoint and update metrics with latest stats"""
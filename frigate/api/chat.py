@@ -242,8 +242,8 @@ async def _execute_search_objects_semantic(
     Runs both visual and description vec searches against `semantic_query`,
     intersects the candidates with the structured filters (camera, label,
     sub_label, zones, time window) the LLM supplied, and ranks the survivors
-    by fused similarity. Mirrors the candidate-then-filter pattern used by
-    find_similar_objects since sqlite-vec's IN filter is unreliable.
+    by fused similarity. The camera, label, zone and time filters also narrow
+    the vec searches, the rest are only applied to their candidates.
     """
     from peewee import fn
 
@@ -285,8 +285,16 @@ async def _execute_search_objects_semantic(
 
     visual_distances: dict[str, float] = {}
     description_distances: dict[str, float] = {}
+    search_filters = {
+        "cameras": cameras,
+        "labels": [label] if label else None,
+        "zones": zones,
+        "after": after,
+        "before": before,
+    }
+
     try:
-        rows = context.search_thumbnail(semantic_query)
+        rows = context.search_thumbnail(semantic_query, **search_filters)
         visual_distances = {row[0]: row[1] for row in rows}
     except Exception:
         logger.exception(
@@ -294,7 +302,7 @@ async def _execute_search_objects_semantic(
         )
 
     try:
-        rows = context.search_description(semantic_query)
+        rows = context.search_description(semantic_query, **search_filters)
         description_distances = {row[0]: row[1] for row in rows}
     except Exception:
         logger.exception(
@@ -418,17 +426,22 @@ async def _execute_find_similar_objects(
     limit = int(arguments.get("limit", 10))
     limit = max(1, min(limit, 50))
 
-    # 4. Run similarity searches. We deliberately do NOT pass event_ids into
-    # the vec queries — the IN filter on sqlite-vec is broken in the installed
-    # version (see frigate/embeddings/__init__.py). Mirror the pattern used by
-    # frigate/api/event.py events_search: fetch top-k globally, then intersect
-    # with the structured filters via Peewee.
+    # 4. Run similarity searches. The vec searches are narrowed by camera,
+    # label, zone and time, like frigate/api/event.py events_search the
+    # candidates are then intersected with all structured filters via Peewee.
+    search_filters = {
+        "cameras": cameras,
+        "labels": labels,
+        "zones": zones or None,
+        "after": after,
+        "before": before,
+    }
     visual_distances: dict[str, float] = {}
     description_distances: dict[str, float] = {}
 
     try:
         if similarity_mode in ("visual", "fused"):
-            rows = context.search_thumbnail(anchor)
+            rows = context.search_thumbnail(anchor, **search_filters)
             visual_distances = {row[0]: row[1] for row in rows}
 
         if similarity_mode in ("semantic", "fused"):
@@ -437,7 +450,7 @@ async def _execute_find_similar_objects(
                 or anchor.sub_label
                 or anchor.label
             )
-            rows = context.search_description(query_text)
+            rows = context.search_description(query_text, **search_filters)
             description_distances = {row[0]: row[1] for row in rows}
     except Exception:
         logger.exception("Similarity search failed")
@@ -657,18 +670,9 @@ async def _get_live_frame_image_url(
         frame_processor = request.app.detected_frames_processor
         if camera not in frame_processor.camera_states:
             return None
-        frame = frame_processor.get_current_frame(camera, {})
+        frame = frame_processor.get_current_frame(camera, {}, max_height=480)
         if frame is None:
             return None
-        height, width = frame.shape[:2]
-        target_height = 480
-        if height > target_height:
-            scale = target_height / height
-            frame = cv2.resize(
-                frame,
-                (int(width * scale), target_height),
-                interpolation=cv2.INTER_AREA,
-            )
         _, img_encoded = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
         b64 = base64.b64encode(img_encoded.tobytes()).decode("utf-8")
         return f"data:image/jpeg;base64,{b64}"
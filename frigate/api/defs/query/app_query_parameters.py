@@ -8,3 +8,9 @@ class AppTimelineHourlyQueryParameters(BaseModel):
     before: float | None = None
     limit: int | None = 200
     timezone: str | None = "utc"
+
+
+class StatsSeriesQueryParameters(BaseModel):
+    metrics: str
+    after: float | None = None
+    before: float | None = None
@@ -57,7 +57,7 @@ from frigate.api.defs.tags import Tags
 from frigate.comms.event_metadata_updater import EventMetadataTypeEnum
 from frigate.config.classification import ObjectClassificationType
 from frigate.const import CLIPS_DIR, TRIGGER_DIR
-from frigate.embeddings import EmbeddingsContext
+from frigate.embeddings import SEARCH_LIMIT, EmbeddingsContext
 from frigate.models import Event, ReviewSegment, Timeline, Trigger
 from frigate.track.object_processing import TrackedObject
 from frigate.util.file import get_event_thumbnail_bytes, load_event_snapshot_image
@@ -592,9 +592,11 @@ def events_search(
         filtered = requested.intersection(allowed_cameras)
         if not filtered:
             return JSONResponse(content=[])
-        event_filters.append(Event.camera << list(filtered))
+        search_cameras = list(filtered)
     else:
-        event_filters.append(Event.camera << allowed_cameras)
+        search_cameras = list(allowed_cameras)
+
+    event_filters.append(Event.camera << search_cameras)
 
     if labels != "all":
         event_filters.append(Event.label << labels.split(","))
@@ -735,6 +737,19 @@ def events_search(
             event_filters.append(start_hour_fun > time_after)
             event_filters.append(start_hour_fun < time_before)
 
+    # only search the tracked objects that can match the filters, the filters
+    # are still applied to the results
+    search_limit = max(limit or 0, SEARCH_LIMIT)
+    search_filters = {
+        "cameras": search_cameras,
+        "labels": labels.split(",") if labels != "all" else None,
+        "zones": zones.split(",")
+        if zones != "all" and "None" not in zones.split(",")
+        else None,
+        "after": after or None,
+        "before": before or None,
+    }
+
     # Perform semantic search
     search_results = {}
     if search_type == "similarity":
@@ -758,7 +773,9 @@ def events_search(
                 status_code=404,
             )
 
-        thumb_result = context.search_thumbnail(search_event)
+        thumb_result = context.search_thumbnail(
+            search_event, search_limit, **search_filters
+        )
         thumb_ids = {result[0]: result[1] for result in thumb_result}
         search_results = {
             event_id: {"distance": distance, "source": "thumbnail"}
@@ -771,7 +788,9 @@ def events_search(
         save_stats = "thumbnail" in search_types and "description" in search_types
 
         if "thumbnail" in search_types:
-            thumb_result = context.search_thumbnail(query)
+            thumb_result = context.search_thumbnail(
+                query, search_limit, **search_filters
+            )
 
             thumb_distances = context.thumb_stats.normalize(
                 [result[1] for result in thumb_result], save_stats
@@ -788,7 +807,9 @@ def events_search(
             )
 
         if "description" in search_types:
-            desc_result = context.search_description(query)
+            desc_result = context.search_description(
+                query, search_limit, **search_filters
+            )
 
             desc_distances = context.desc_stats.normalize(
                 [result[1] for result in desc_result], save_stats
@@ -29,6 +29,7 @@ from frigate.api import (
     review,
 )
 from frigate.api.auth import get_jwt_secret, limiter, require_admin_by_default
+from frigate.api.frame_cache import EncodedFrameCache
 from frigate.comms.dispatcher import Dispatcher
 from frigate.comms.event_metadata_updater import (
     EventMetadataPublisher,
@@ -155,6 +156,7 @@ def create_fastapi_app(
     app.detected_frames_processor = detected_frames_processor
     app.storage_maintainer = storage_maintainer
     app.camera_error_image = None
+    app.encoded_frame_cache = EncodedFrameCache()
     app.onvif = onvif
     app.stats_emitter = stats_emitter
     app.event_metadata_updater = event_metadata_updater
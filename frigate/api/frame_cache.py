@@ -0,0 +1,120 @@
+"""Shares converted and encoded live frames between API requests."""
+
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Any
+
+import cv2
+import numpy as np
+
+from frigate.track.object_processing import TrackedObjectProcessor
+
+
+class EncodedFrameCache:
+    """Per camera cache of the latest drawn and encoded frames.
+
+    Dashboards polling latest.jpg and MJPEG viewers of the same camera
+    mostly ask for the same frame with the same options, so the drawn BGR
+    frame is kept per (frame_time, draw options) and the encoded image per
+    (frame_time, draw options, size, format, quality) in small LRUs. Work
+    for a camera is serialized so concurrent requests for a new frame
+    convert and encode it once.
+    """
+
+    def __init__(self, max_drawn: int = 2, max_encoded: int = 8) -> None:
+        self.max_drawn = max_drawn
+        self.max_encoded = max_encoded
+        self.drawn: defaultdict[str, OrderedDict[tuple, np.ndarray]] = defaultdict(
+            OrderedDict
+        )
+        self.encoded: defaultdict[str, OrderedDict[tuple, bytes]] = defaultdict(
+            OrderedDict
+        )
+        self.camera_locks: defaultdict[str, threading.Lock] = defaultdict(
+            threading.Lock
+        )
+        self.lock = threading.Lock()
+
+    def _camera_lock(self, camera: str) -> threading.Lock:
+        with self.lock:
+            return self.camera_locks[camera]
+
+    @staticmethod
+    def _draw_key(frame_time: float, draw_options: dict[str, Any]) -> tuple:
+        # options are only checked for truthiness when drawing
+        return (frame_time, tuple(sorted(k for k, v in draw_options.items() if v)))
+
+    @staticmethod
+    def _remember(cache: OrderedDict, key: tuple, value: Any, size: int) -> None:
+        cache[key] = value
+
+        while len(cache) > size:
+            cache.popitem(last=False)
+
+    def get_frame(
+        self,
+        frame_processor: TrackedObjectProcessor,
+        camera: str,
+        frame_time: float,
+        draw_options: dict[str, Any],
+    ) -> np.ndarray | None:
+        """Returns the drawn BGR frame for the camera's current frame time.
+
+        The returned frame is shared and must not be modified.
+        """
+        key = self._draw_key(frame_time, draw_options)
+
+        with self._camera_lock(camera):
+            drawn = self.drawn[camera]
+            frame = drawn.get(key)
+
+            if frame is not None:
+                drawn.move_to_end(key)
+                return frame
+
+            frame = frame_processor.get_current_frame(camera, draw_options)
+
+            if frame is not None:
+                self._remember(drawn, key, frame, self.max_drawn)
+
+            return frame
+
+    def encode(
+        self,
+        camera: str,
+        frame_time: float,
+        draw_options: dict[str, Any],
+        frame: np.ndarray,
+        width: int,
+        height: int,
+        extension: str,
+        quality_params: list[int],
+        interpolation: int = cv2.INTER_AREA,
+    ) -> bytes:
+        """Resizes and encodes a frame from get_frame, reusing earlier results."""
+        key = (
+            *self._draw_key(frame_time, draw_options),
+            width,
+            height,
+            extension,
+            tuple(quality_params),
+            interpolation,
+        )
+
+        with self._camera_lock(camera):
+            encoded = self.encoded[camera]
+            img = encoded.get(key)
+
+            if img is not None:
+                encoded.move_to_end(key)
+                return img
+
+            if frame.shape[0] != height or frame.shape[1] != width:
+                frame = cv2.resize(
+                    frame, dsize=(width, height), interpolation=interpolation
+                )
+
+            _, buffer = cv2.imencode(f".{extension}", frame, quality_params)
+            img = buffer.tobytes()
+            self._remember(encoded, key, img, self.max_encoded)
+            return img
@@ -6,7 +6,6 @@ import logging
 import math
 import os
 import subprocess as sp
-import time
 from datetime import UTC, datetime, timedelta
 from pathlib import Path as FilePath
 from typing import Any
@@ -33,6 +32,7 @@ from frigate.api.defs.query.media_query_parameters import (
     MediaMjpegFeedQueryParams,
 )
 from frigate.api.defs.tags import Tags
+from frigate.api.frame_cache import EncodedFrameCache
 from frigate.camera.state import CameraState
 from frigate.config import FrigateConfig
 from frigate.config.camera.snapshots import SnapshotsConfig
@@ -51,8 +51,10 @@ from frigate.util.file import (
     get_event_thumbnail_bytes,
     load_event_snapshot_image,
 )
-from frigate.util.image import get_image_from_recording, get_image_quality_params
-from frigate.util.media import get_keyframe_before
+from frigate.util.image import get_ffmpeg_snapshot_cmd, get_image_quality_params
+from frigate.util.media import find_keyframe_before, get_keyframe_before
+from frigate.util.region_history import clear_region_history
+from frigate.util.subprocess_pool import media_downloads, media_subprocesses
 
 logger = logging.getLogger(__name__)
 
@@ -91,6 +93,7 @@ async def mjpeg_feed(
         # return a multipart response
         return StreamingResponse(
             imagestream(
+                request.app.encoded_frame_cache,
                 request.app.detected_frames_processor,
                 camera_name,
                 params.fps,
@@ -106,7 +109,39 @@ async def mjpeg_feed(
         )
 
 
-def imagestream(
+def get_stream_frame(
+    frame_cache: EncodedFrameCache,
+    detected_frames_processor: TrackedObjectProcessor,
+    camera_name: str,
+    height: int,
+    draw_options: dict[str, Any],
+) -> bytes:
+    frame_time = detected_frames_processor.get_current_frame_time(camera_name)
+    frame = frame_cache.get_frame(
+        detected_frames_processor, camera_name, frame_time, draw_options
+    )
+
+    if frame is None:
+        frame = np.zeros((height, int(height * 16 / 9), 3), np.uint8)
+        _, jpg = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), 70])
+        return jpg.tobytes()
+
+    width = int(height * frame.shape[1] / frame.shape[0])
+    return frame_cache.encode(
+        camera_name,
+        frame_time,
+        draw_options,
+        frame,
+        width,
+        height,
+        "jpg",
+        [int(cv2.IMWRITE_JPEG_QUALITY), 70],
+        cv2.INTER_LINEAR,
+    )
+
+
+async def imagestream(
+    frame_cache: EncodedFrameCache,
     detected_frames_processor: TrackedObjectProcessor,
     camera_name: str,
     fps: int,
@@ -115,19 +150,42 @@ def imagestream(
 ):
     while True:
         # max out at specified FPS
-        time.sleep(1 / fps)
-        frame = detected_frames_processor.get_current_frame(camera_name, draw_options)
-        if frame is None:
-            frame = np.zeros((height, int(height * 16 / 9), 3), np.uint8)
+        await asyncio.sleep(1 / fps)
+        jpg = await asyncio.to_thread(
+            get_stream_frame,
+            frame_cache,
+            detected_frames_processor,
+            camera_name,
+            height,
+            draw_options,
+        )
+        yield (b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + jpg + b"\r\n\r\n")
 
-        width = int(height * frame.shape[1] / frame.shape[0])
-        frame = cv2.resize(frame, dsize=(width, height), interpolation=cv2.INTER_LINEAR)
 
-        ret, jpg = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), 70])
-        yield (
-            b"--frame\r\n"
-            b"Content-Type: image/jpeg\r\n\r\n" + bytearray(jpg.tobytes()) + b"\r\n\r\n"
-        )
+async def _get_image_from_recording(
+    request: Request,
+    config: FrigateConfig,
+    file_path: str,
+    relative_frame_time: float,
+    codec: str,
+    height: int | None = None,
+) -> bytes | None:
+    """Retrieve a frame from a recording without blocking the event loop."""
+    process = await media_subprocesses.run(
+        get_ffmpeg_snapshot_cmd(
+            config.ffmpeg,
+            file_path,
+            codec,
+            seek_time=relative_frame_time,
+            height=height,
+        ),
+        request=request,
+    )
+
+    if process.returncode == 0 and process.stdout:
+        return process.stdout
+
+    return None
 
 
 def _resolve_snapshot_settings(
@@ -189,18 +247,21 @@ async def latest_frame(
 
     camera_config = request.app.frigate_config.cameras.get(camera_name)
     if camera_config is not None:
-        frame = frame_processor.get_current_frame(camera_name, draw_options)
+        frame_cache: EncodedFrameCache = request.app.encoded_frame_cache
+        frame_time = frame_processor.get_current_frame_time(camera_name)
         retry_interval = float(camera_config.ffmpeg.retry_interval or 10)
+        frame = None
 
-        is_offline = False
-        if frame is None or datetime.now().timestamp() > (
-            frame_processor.get_current_frame_time(camera_name) + retry_interval
-        ):
-            last_frame_time = frame_processor.get_current_frame_time(camera_name)
-            preview_path = get_most_recent_preview_frame(
-                camera_name, before=last_frame_time
+        if datetime.now().timestamp() <= frame_time + retry_interval:
+            frame = frame_cache.get_frame(
+                frame_processor, camera_name, frame_time, draw_options
             )
 
+        is_live = frame is not None
+        is_offline = False
+        if frame is None:
+            preview_path = get_most_recent_preview_frame(camera_name, before=frame_time)
+
             if preview_path:
                 logger.debug(f"Using most recent preview frame for {camera_name}")
                 frame = cv2.imread(preview_path, cv2.IMREAD_UNCHANGED)
@@ -241,9 +302,23 @@ async def latest_frame(
                 status_code=400,
             )
 
-        frame = cv2.resize(frame, dsize=(width, height), interpolation=cv2.INTER_AREA)
-
-        _, img = cv2.imencode(f".{extension.value}", frame, quality_params)
+        if is_live:
+            img = frame_cache.encode(
+                camera_name,
+                frame_time,
+                draw_options,
+                frame,
+                width,
+                height,
+                extension.value,
+                quality_params,
+            )
+        else:
+            frame = cv2.resize(
+                frame, dsize=(width, height), interpolation=cv2.INTER_AREA
+            )
+            _, encoded = cv2.imencode(f".{extension.value}", frame, quality_params)
+            img = encoded.tobytes()
 
         headers = {
             "Cache-Control": "no-store" if not params.store else "private, max-age=60",
@@ -253,7 +328,7 @@ async def latest_frame(
             headers["X-Frigate-Offline"] = "true"
 
         return Response(
-            content=img.tobytes(),
+            content=img,
             media_type=extension.get_mime_type(),
             headers=headers,
         )
@@ -350,8 +425,8 @@ async def get_snapshot_from_recording(
         mime_type = "png" if format == "png" else "jpeg"
         config: FrigateConfig = request.app.frigate_config
 
-        image_data = get_image_from_recording(
-            config.ffmpeg, recording.path, time_in_segment, codec, height
+        image_data = await _get_image_from_recording(
+            request, config, recording.path, time_in_segment, codec, height
         )
 
         if not image_data:
@@ -405,8 +480,8 @@ async def submit_recording_snapshot_to_plus(
         config: FrigateConfig = request.app.frigate_config
         recording: Recordings = recording_query.get()
         time_in_segment = frame_time - recording.start_time
-        image_data = get_image_from_recording(
-            config.ffmpeg, recording.path, time_in_segment, "png"
+        image_data = await _get_image_from_recording(
+            request, config, recording.path, time_in_segment, "png"
         )
 
         if not image_data:
@@ -451,25 +526,14 @@ async def recording_clip(
     start_ts: float,
     end_ts: float,
 ):
-    def run_download(ffmpeg_cmd: list[str], file_path: str):
-        with sp.Popen(
-            ffmpeg_cmd,
-            stderr=sp.PIPE,
-            stdout=sp.PIPE,
-            text=False,
-        ) as ffmpeg:
-            while True:
-                data = ffmpeg.stdout.read(8192)
-                if data is not None and len(data) > 0:
-                    yield data
-                else:
-                    if ffmpeg.returncode and ffmpeg.returncode != 0:
-                        logger.error(
-                            f"Failed to generate clip, ffmpeg logs: {ffmpeg.stderr.read()}"
-                        )
-                    else:
-                        FilePath(file_path).unlink(missing_ok=True)
-                    break
+    async def run_download(ffmpeg_cmd: list[str], file_path: str):
+        try:
+            async for data in media_downloads.stream(ffmpeg_cmd):
+                yield data
+        except sp.CalledProcessError as e:
+            logger.error(f"Failed to generate clip, ffmpeg logs: {e.stderr}")
+        else:
+            FilePath(file_path).unlink(missing_ok=True)
 
     recordings = (
         Recordings.select(
@@ -572,6 +636,7 @@ async def vod_ts(
             Recordings.duration,
             Recordings.end_time,
             Recordings.start_time,
+            Recordings.keyframes,
         )
         .where(
             Recordings.start_time.between(start_ts, end_ts)
@@ -621,7 +686,16 @@ async def vod_ts(
         # segment. Snap clipFrom back to the preceding keyframe so the
         # segment always starts with a decodable frame.
         if "clipFrom" in clip:
-            keyframe_ms = get_keyframe_before(recording.path, clip["clipFrom"])
+            if recording.keyframes:
+                keyframe_ms = find_keyframe_before(
+                    recording.keyframes, clip["clipFrom"]
+                )
+            else:
+                # segments recorded before the keyframe index existed
+                keyframe_ms = await get_keyframe_before(
+                    recording.path, clip["clipFrom"]
+                )
+
             if keyframe_ms is not None:
                 gained = clip["clipFrom"] - keyframe_ms
                 clip["clipFrom"] = keyframe_ms
@@ -998,6 +1072,8 @@ def grid_snapshot(
         else:
             draw_color = (0, 255, 0)  # green
 
+        # the current frame is shared with other consumers
+        frame = frame.copy()
         grid_size = len(grid)
         grid_coef = 1.0 / grid_size
         width = detect.width
@@ -1006,7 +1082,7 @@ def grid_snapshot(
             for y in range(grid_size):
                 cell = grid[x][y]
 
-                if len(cell["sizes"]) == 0:
+                if not cell.get("count"):
                     continue
 
                 std_dev = round(cell["std_dev"] * width, 2)
@@ -1023,7 +1099,7 @@ def grid_snapshot(
                 )
                 cv2.putText(
                     frame,
-                    f"#: {len(cell['sizes'])}",
+                    f"#: {cell['count']}",
                     (
                         int(x * grid_coef * width + 10),
                         int((y * grid_coef + 0.02) * height),
@@ -1084,6 +1160,7 @@ def clear_region_grid(request: Request, camera_name: str):
         )
 
     Regions.delete().where(Regions.camera == camera_name).execute()
+    clear_region_history(camera_name)
     return JSONResponse(
         content={"success": True, "message": "Region grid cleared"},
     )
@@ -1348,11 +1425,7 @@ async def preview_gif(
             "-",
         ]
 
-        process = await asyncio.to_thread(
-            sp.run,
-            ffmpeg_cmd,
-            capture_output=True,
-        )
+        process = await media_subprocesses.run(ffmpeg_cmd, request=request)
 
         if process.returncode != 0:
             logger.error(process.stderr)
@@ -1428,11 +1501,10 @@ async def preview_gif(
             "-",
         ]
 
-        process = await asyncio.to_thread(
-            sp.run,
+        process = await media_subprocesses.run(
             ffmpeg_cmd,
             input=str.encode("\n".join(selected_previews)),
-            capture_output=True,
+            request=request,
         )
 
         if process.returncode != 0:
@@ -1538,11 +1610,7 @@ async def preview_mp4(
             path,
         ]
 
-        process = await asyncio.to_thread(
-            sp.run,
-            ffmpeg_cmd,
-            capture_output=True,
-        )
+        process = await media_subprocesses.run(ffmpeg_cmd, request=request)
 
         if process.returncode != 0:
             logger.error(process.stderr)
@@ -1615,11 +1683,10 @@ async def preview_mp4(
             path,
         ]
 
-        process = await asyncio.to_thread(
-            sp.run,
+        process = await media_subprocesses.run(
             ffmpeg_cmd,
             input=str.encode("\n".join(selected_previews)),
-            capture_output=True,
+            request=request,
         )
 
         if process.returncode != 0:
@@ -17,7 +17,7 @@ from playhouse.sqlite_ext import SqliteExtDatabase
 
 from frigate.api.auth import hash_password
 from frigate.api.fastapi_app import create_fastapi_app
-from frigate.camera import CameraMetrics, PTZMetrics
+from frigate.camera import AudioMetrics, CameraMetrics, PTZMetrics
 from frigate.camera.maintainer import CameraMaintainer
 from frigate.comms.base_communicator import Communicator
 from frigate.comms.dispatcher import Dispatcher
@@ -37,6 +37,7 @@ from frigate.const import (
     CONFIG_DIR,
     EXPORT_DIR,
     FACE_DIR,
+    MAX_DETECTION_BATCH_SIZE,
     MODEL_CACHE_DIR,
     RECORD_DIR,
     THUMB_DIR,
@@ -102,6 +103,7 @@ class FrigateApp:
         self.detection_shms: list[mp.shared_memory.SharedMemory] = []
         self.log_queue: Queue = mp.Queue()
         self.camera_metrics: DictProxy = self.metrics_manager.dict()
+        self.audio_metrics = AudioMetrics(self.metrics_manager)
         self.embeddings_metrics: DataProcessorMetrics | None = (
             DataProcessorMetrics(
                 self.metrics_manager, list(config.classification.custom.keys())
@@ -376,14 +378,16 @@ class FrigateApp:
                 shm_in = UntrackedSharedMemory(
                     name=name,
                     create=True,
-                    size=largest_frame,
+                    size=largest_frame * MAX_DETECTION_BATCH_SIZE,
                 )
             except FileExistsError:
                 shm_in = UntrackedSharedMemory(name=name)
 
             try:
                 shm_out = UntrackedSharedMemory(
-                    name=f"out-{name}", create=True, size=20 * 6 * 4
+                    name=f"out-{name}",
+                    create=True,
+                    size=20 * 6 * 4 * MAX_DETECTION_BATCH_SIZE,
                 )
             except FileExistsError:
                 shm_out = UntrackedSharedMemory(name=f"out-{name}")
@@ -441,7 +445,7 @@ class FrigateApp:
 
     def start_audio_processor(self) -> None:
         self.audio_process = AudioProcessor(
-            self.config, self.camera_metrics, self.stop_event
+            self.config, self.camera_metrics, self.audio_metrics, self.stop_event
         )
         self.audio_process.start()
         self.processes["audio_detector"] = self.audio_process.pid or 0
@@ -479,6 +483,9 @@ class FrigateApp:
                 self.config,
                 self.camera_metrics,
                 self.embeddings_metrics,
+                self.audio_metrics,
+                self.inter_process_communicator.metrics,
+                self.detected_frames_processor.pipeline_metrics,
                 self.detectors,
                 self.processes,
             ),
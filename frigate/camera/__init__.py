@@ -42,6 +42,17 @@ class CameraMetrics:
         self.stalls_last_hour = manager.Value("i", 0)
 
 
+class AudioMetrics:
+    inference_speed: ValueProxy[float]
+    interpreters: ValueProxy[int]
+    queue_depth: ValueProxy[int]
+
+    def __init__(self, manager: SyncManager):
+        self.inference_speed = manager.Value("d", 0)
+        self.interpreters = manager.Value("i", 0)
+        self.queue_depth = manager.Value("i", 0)
+
+
 class PTZMetrics:
     autotracker_enabled: Synchronized
 
@@ -5,10 +5,15 @@ import json
 import logging
 import random
 import string
+import threading
 from collections import Counter
 from collections.abc import Callable
 from typing import Any
 
+from frigate.comms.audio_telemetry import (
+    AudioTelemetrySubscriber,
+    AudioTelemetryTypeEnum,
+)
 from frigate.comms.event_metadata_updater import (
     EventMetadataPublisher,
     EventMetadataTypeEnum,
@@ -21,6 +26,9 @@ from frigate.config.camera.updater import (
 
 logger = logging.getLogger(__name__)
 
+# audio telemetry from all cameras is handled in batches at this interval
+AUDIO_TELEMETRY_INTERVAL = 0.5
+
 
 class CameraActivityManager:
     def __init__(
@@ -216,6 +224,7 @@ class AudioActivityManager:
         self.publish = publish
         self.current_audio_detections: dict[str, dict[str, dict[str, Any]]] = {}
         self.event_metadata_publisher = EventMetadataPublisher()
+        self.lock = threading.Lock()
 
         for camera_config in config.cameras.values():
             if not camera_config.audio.enabled_in_config:
@@ -223,6 +232,46 @@ class AudioActivityManager:
 
             self.__init_camera(camera_config)
 
+        self.telemetry_subscriber = AudioTelemetrySubscriber()
+        self.stop_event = threading.Event()
+        self.telemetry_thread = threading.Thread(
+            target=self.run, name="audio_telemetry", daemon=True
+        )
+        self.telemetry_thread.start()
+
+    def run(self) -> None:
+        while not self.stop_event.wait(AUDIO_TELEMETRY_INTERVAL):
+            self.handle_telemetry(self.telemetry_subscriber.check_for_updates())
+
+    def handle_telemetry(self, updates: list[tuple[str, Any]]) -> None:
+        """Publish the latest levels and merged activity of a batch of updates."""
+        levels: dict[str, tuple[float, float]] = {}
+        activity: dict[str, dict[str, float]] = {}
+
+        for update_type, payload in updates:
+            if update_type == AudioTelemetryTypeEnum.levels:
+                camera, rms, dBFS, detections = payload
+                levels[camera] = (rms, dBFS)
+                heard = activity.setdefault(camera, {})
+
+                for label, score in detections:
+                    heard[label] = max(score, heard.get(label, 0))
+            elif update_type == AudioTelemetryTypeEnum.expire:
+                activity.pop(payload, None)
+                self.expire_all(payload)
+
+        for camera, (rms, dBFS) in levels.items():
+            self.publish(f"{camera}/audio/dBFS", dBFS)
+            self.publish(f"{camera}/audio/rms", rms)
+
+        if activity:
+            self.update_activity(
+                {
+                    camera: {"detections": list(heard.items())}
+                    for camera, heard in activity.items()
+                }
+            )
+
     def __init_camera(self, camera_config: CameraConfig) -> None:
         if camera_config.name is None:
             return
@@ -230,6 +279,10 @@ class AudioActivityManager:
         self.current_audio_detections[camera_config.name] = {}
 
     def update_activity(self, new_activity: dict[str, dict[str, Any]]) -> None:
+        with self.lock:
+            self._update_activity(new_activity)
+
+    def _update_activity(self, new_activity: dict[str, dict[str, Any]]) -> None:
         now = datetime.datetime.now().timestamp()
 
         for camera in new_activity.keys():
@@ -313,6 +366,10 @@ class AudioActivityManager:
         return any_changed
 
     def expire_all(self, camera: str) -> None:
+        with self.lock:
+            self._expire_all(camera)
+
+    def _expire_all(self, camera: str) -> None:
         now = datetime.datetime.now().timestamp()
         current = self.current_audio_detections.get(camera, {})
 
@@ -324,3 +381,8 @@ class AudioActivityManager:
                 EventMetadataTypeEnum.manual_event_end.value,
             )
             del current[label]
+
+    def stop(self) -> None:
+        self.stop_event.set()
+        self.telemetry_thread.join()
+        self.telemetry_subscriber.stop()
@@ -14,7 +14,7 @@ from frigate.config.camera.updater import (
     CameraConfigUpdateEnum,
     CameraConfigUpdateSubscriber,
 )
-from frigate.const import REPLAY_CAMERA_PREFIX
+from frigate.const import MAX_DETECTION_BATCH_SIZE, REPLAY_CAMERA_PREFIX
 from frigate.models import Regions
 from frigate.util.builtin import empty_and_close_queue
 from frigate.util.image import SharedMemoryFrameManager, UntrackedSharedMemory
@@ -135,11 +135,15 @@ class CameraMaintainer(threading.Thread):
                         for det in self.config.detectors.values()
                     ]
                 )
-                UntrackedSharedMemory(name=f"out-{name}", create=True, size=20 * 6 * 4)
+                UntrackedSharedMemory(
+                    name=f"out-{name}",
+                    create=True,
+                    size=20 * 6 * 4 * MAX_DETECTION_BATCH_SIZE,
+                )
                 UntrackedSharedMemory(
                     name=name,
                     create=True,
-                    size=largest_frame,
+                    size=largest_frame * MAX_DETECTION_BATCH_SIZE,
                 )
             except FileExistsError:
                 pass
@@ -170,11 +174,10 @@ class CameraMaintainer(threading.Thread):
 
         camera_stop_event = self.__ensure_camera_stop_event(name)
 
-        # pre-create shms
+        # pre-create the frame ring
         count = 10 if runtime else self.shm_count
-        for i in range(count):
-            frame_size = config.frame_shape_yuv[0] * config.frame_shape_yuv[1]
-            self.frame_manager.create(f"{config.name}_frame{i}", frame_size)
+        frame_size = config.frame_shape_yuv[0] * config.frame_shape_yuv[1]
+        self.frame_manager.create_frame_ring(name, count, frame_size)
 
         capture_process = CameraCapture(
             config,
@@ -207,23 +210,20 @@ class CameraMaintainer(threading.Thread):
                 capture_process.join()
 
     def __unlink_camera_frame_slots(self, camera: str) -> None:
-        """Drop the camera's per-frame YUV SHM segments from this
-        process's frame_manager and unlink them at the OS level.
+        """Drop the camera's YUV frame ring from this process's
+        frame_manager and unlink it at the OS level.
 
         Safe to call after the camera's capture/processor subprocesses
         have been joined — they no longer hold mappings, so unlink frees
-        the segments immediately. Other long-lived processes that opened
-        these slots will continue using their existing mappings until
-        they call frame_manager.get with a shape that no longer fits
-        (the get path drops and reopens stale refs).
+        the segment immediately. Other long-lived processes that mapped
+        the ring keep their mapping until they are handed a frame from a
+        newer ring or a frame size that no longer fits (the get path
+        drops and reopens stale rings).
         """
-        prefix = f"{camera}_frame"
-        names = [n for n in list(self.frame_manager.shm_store) if n.startswith(prefix)]
-        for name in names:
-            try:
-                self.frame_manager.delete(name)
-            except Exception as exc:
-                logger.debug("Could not unlink SHM %s: %s", name, exc)
+        try:
+            self.frame_manager.delete_frame_ring(camera)
+        except Exception as exc:
+            logger.debug("Could not unlink frame ring for %s: %s", camera, exc)
 
     def __stop_camera_process(self, camera: str) -> None:
         camera_process = self.camera_processes.get(camera)
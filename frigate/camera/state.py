@@ -49,6 +49,10 @@ class CameraState:
         self._last_frame_shape: tuple[int, int] = self.camera_config.frame_shape_yuv
         self.current_frame_lock = threading.Lock()
         self.current_frame_time = 0.0
+        # the current frame converted to bgr, keyed by max height
+        self._bgr_frames: dict[int | None, np.ndarray] = {}
+        self._bgr_frame_time = 0.0
+        self._bgr_frame_lock = threading.Lock()
         self.motion_boxes: list[tuple[int, int, int, int]] = []
         self.regions: list[tuple[int, int, int, int]] = []
         self.previous_frame_id: str | None = None
@@ -78,15 +82,73 @@ class CameraState:
             # A plate is a smaller fraction of a vehicle box; use ~20x multiplier
             self.lpr_min_obj_area = self.camera_config.lpr.min_area * 20
 
-    def get_current_frame(self, draw_options: dict[str, Any] = {}) -> np.ndarray:
+    def _get_bgr_frame(
+        self,
+        yuv_frame: np.ndarray,
+        frame_time: float,
+        max_height: int | None = None,
+    ) -> np.ndarray:
+        """Converts a frame to bgr, scaled down to max_height if it is taller.
+
+        The latest frame is converted, and resized for each max height, at
+        most once no matter how many consumers ask for it. The returned
+        frame is shared and read only.
+        """
+        with self._bgr_frame_lock:
+            if frame_time > self._bgr_frame_time:
+                self._bgr_frames = {}
+                self._bgr_frame_time = frame_time
+
+            # a frame that was already replaced by a newer one isn't cached
+            frames = self._bgr_frames if frame_time == self._bgr_frame_time else {}
+            frame = frames.get(None)
+
+            if frame is None:
+                frame = cv2.cvtColor(yuv_frame, cv2.COLOR_YUV2BGR_I420)
+                frame.flags.writeable = False
+                frames[None] = frame
+
+            if max_height is None or max_height >= frame.shape[0]:
+                return frame
+
+            resized = frames.get(max_height)
+
+            if resized is None:
+                width = int(frame.shape[1] * max_height / frame.shape[0])
+                resized = cv2.resize(
+                    frame, dsize=(width, max_height), interpolation=cv2.INTER_AREA
+                )
+                resized.flags.writeable = False
+                frames[max_height] = resized
+
+            return resized
+
+    def get_current_frame(
+        self, draw_options: dict[str, Any] = {}, max_height: int | None = None
+    ) -> np.ndarray:
+        """Returns the current frame in bgr with the requested overlays drawn.
+
+        Without overlays the shared frame from the bgr cache is returned, it
+        is read only and must be copied by callers that want to modify it.
+        """
+        draw = any(draw_options.values())
+
+        # the current frame is replaced, never modified, on each update
         with self.current_frame_lock:
-            frame_copy = np.copy(self._current_frame)
+            yuv_frame = self._current_frame
             frame_time = self.current_frame_time
-            tracked_objects = {k: v.to_dict() for k, v in self.tracked_objects.items()}
-            motion_boxes = self.motion_boxes.copy()
-            regions = self.regions.copy()
 
-        frame_copy = cv2.cvtColor(frame_copy, cv2.COLOR_YUV2BGR_I420)  # type: ignore[assignment]
+            if draw:
+                tracked_objects = {
+                    k: v.to_dict() for k, v in self.tracked_objects.items()
+                }
+                motion_boxes = self.motion_boxes.copy()
+                regions = self.regions.copy()
+
+        if not draw:
+            return self._get_bgr_frame(yuv_frame, frame_time, max_height)
+
+        frame_copy = self._get_bgr_frame(yuv_frame, frame_time).copy()
         # draw on the frame
         if draw_options.get("mask"):
             mask_overlay = np.where(self.camera_config.motion.rasterized_mask == [0])  # type: ignore[attr-defined]
@@ -297,6 +359,12 @@ class CameraState:
                         2,
                     )
 
+        if max_height is not None and max_height < frame_copy.shape[0]:
+            width = int(frame_copy.shape[1] * max_height / frame_copy.shape[0])
+            frame_copy = cv2.resize(
+                frame_copy, dsize=(width, max_height), interpolation=cv2.INTER_AREA
+            )
+
         return frame_copy
 
     def finished(self, obj_id: str) -> None:
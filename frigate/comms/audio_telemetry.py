@@ -0,0 +1,60 @@
+"""Facilitates sending audio levels and activity without waiting for a reply."""
+
+from enum import Enum
+from typing import Any
+
+from .zmq_proxy import MsgpackSerializer, Publisher, Subscriber
+
+
+class AudioTelemetryTypeEnum(str, Enum):
+    all = ""
+    levels = "levels"
+    expire = "expire"
+
+
+class AudioTelemetryPublisher(Publisher):
+    """Simplifies sending audio levels and activity."""
+
+    topic_base = "audio_telemetry/"
+    serializer = MsgpackSerializer
+
+    def __init__(self) -> None:
+        super().__init__()
+
+    def publish(self, payload: Any, sub_topic: str = "") -> None:
+        super().publish(payload, sub_topic)
+
+
+class AudioTelemetrySubscriber(Subscriber[tuple[str, Any] | tuple[None, None]]):
+    """Simplifies receiving audio levels and activity."""
+
+    topic_base = "audio_telemetry/"
+    serializer = MsgpackSerializer
+
+    def __init__(self) -> None:
+        super().__init__(AudioTelemetryTypeEnum.all.value)
+
+    def check_for_updates(self) -> list[tuple[str, Any]]:
+        """Returns all messages that have been received since the last check."""
+        updates: list[tuple[str, Any]] = []
+
+        while True:
+            update = self.check_for_update()
+
+            if update is None:
+                return updates
+
+            update_type, payload = update
+
+            if update_type is None:
+                return updates
+
+            updates.append((update_type, payload))
+
+    def _return_object(
+        self, topic: str, payload: Any
+    ) -> tuple[str, Any] | tuple[None, None]:
+        if payload is None:
+            return (None, None)
+
+        return (topic[len(self.topic_base) :], payload)
@@ -3,7 +3,7 @@
 from enum import Enum
 from typing import Any
 
-from .zmq_proxy import Publisher, Subscriber
+from .zmq_proxy import MsgpackSerializer, Publisher, Subscriber
 
 
 class DetectionTypeEnum(str, Enum):
@@ -18,6 +18,7 @@ class DetectionPublisher(Publisher):
     """Simplifies receiving video and audio detections."""
 
     topic_base = "detection/"
+    serializer = MsgpackSerializer
 
     def __init__(self, topic: str) -> None:
         super().__init__(topic)
@@ -27,6 +28,7 @@ class DetectionSubscriber(Subscriber):
     """Simplifies receiving video and audio detections."""
 
     topic_base = "detection/"
+    serializer = MsgpackSerializer
 
     def __init__(self, topic: str) -> None:
         super().__init__(topic)
@@ -400,6 +400,7 @@ class Dispatcher:
 
     def stop(self) -> None:
         self.camera_activity.stop()
+        self.audio_activity.stop()
 
         for comm in self.comms:
             comm.stop()
@@ -28,6 +28,8 @@ class EmbeddingsRequestEnum(Enum):
     embed_thumbnail = "embed_thumbnail"
     generate_search = "generate_search"
     reindex = "reindex"
+    search_description = "search_description"
+    search_thumbnail = "search_thumbnail"
     # LPR
     reprocess_plate = "reprocess_plate"
     # Review Descriptions
@@ -40,9 +42,9 @@ class EmbeddingsResponder:
         self.socket = self.context.socket(zmq.REP)
         self.socket.bind(SOCKET_REP_REQ)
 
-    def check_for_request(self, process: Callable) -> None:
+    def check_for_request(self, process: Callable, timeout: float = 0.01) -> None:
         while True:  # load all messages that are queued
-            has_message, _, _ = zmq.select([self.socket], [], [], 0.01)
+            has_message, _, _ = zmq.select([self.socket], [], [], timeout)
 
             if not has_message:
                 break
@@ -1,27 +1,141 @@
 """Facilitates communication between processes."""
 
+import json
 import logging
 import multiprocessing as mp
 import threading
+import time
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
 from multiprocessing.synchronize import Event as MpEvent
 from typing import Any
 
 import zmq
 
 from frigate.comms.base_communicator import Communicator
+from frigate.const import (
+    CLEAR_ONGOING_REVIEW_SEGMENTS,
+    INSERT_MANY_RECORDINGS,
+    INSERT_PREVIEW,
+    REQUEST_REGION_GRID,
+    UPDATE_EVENT_DESCRIPTION,
+    UPDATE_REVIEW_DESCRIPTION,
+    UPSERT_REVIEW_SEGMENT,
+)
 
 logger = logging.getLogger(__name__)
 
 SOCKET_REP_REQ = "ipc:///tmp/cache/comms"
+SOCKET_REPLIES = "inproc://comms_replies"
+
+# seconds a requestor waits for a reply by default
+REQUEST_TIMEOUT = 30
+
+
+class RequestClassEnum(str, Enum):
+    control = "control"
+    database = "database"
+
+
+# requests that do database work, they are handled on their own workers so
+# they can't hold up the quick control requests
+DATABASE_TOPICS = {
+    CLEAR_ONGOING_REVIEW_SEGMENTS,
+    INSERT_MANY_RECORDINGS,
+    INSERT_PREVIEW,
+    REQUEST_REGION_GRID,
+    UPDATE_EVENT_DESCRIPTION,
+    UPDATE_REVIEW_DESCRIPTION,
+    UPSERT_REVIEW_SEGMENT,
+}
+
+# control requests are handled in the order they arrive by a single worker
+REQUEST_WORKERS = {
+    RequestClassEnum.control: 1,
+    RequestClassEnum.database: 4,
+}
+
+
+def get_request_class(topic: str) -> RequestClassEnum:
+    if topic in DATABASE_TOPICS:
+        return RequestClassEnum.database
+
+    return RequestClassEnum.control
+
+
+class RequestMetrics:
+    """Counts requests and the time they spend queued and handled per topic."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.queued: dict[str, int] = {c.value: 0 for c in RequestClassEnum}
+        self.topics: dict[str, dict[str, float]] = {}
+
+    def request_queued(self, request_class: RequestClassEnum) -> None:
+        with self.lock:
+            self.queued[request_class.value] += 1
+
+    def request_handled(
+        self,
+        topic: str,
+        request_class: RequestClassEnum,
+        wait: float,
+        duration: float,
+    ) -> None:
+        # camera topics are counted together, ex: front/audio/rms -> */audio/rms
+        if "/" in topic:
+            topic = f"*/{topic.split('/', 1)[1]}"
+
+        with self.lock:
+            self.queued[request_class.value] -= 1
+            metrics = self.topics.setdefault(
+                topic, {"requests": 0, "wait": 0.0, "duration": 0.0}
+            )
+            metrics["requests"] += 1
+            metrics["wait"] += wait
+            metrics["duration"] += duration
+
+    def stats(self) -> dict[str, Any]:
+        with self.lock:
+            return {
+                "queued": dict(self.queued),
+                "topics": {
+                    topic: {
+                        "requests": int(metrics["requests"]),
+                        "wait": round(metrics["wait"] / metrics["requests"] * 1000, 2),
+                        "duration": round(
+                            metrics["duration"] / metrics["requests"] * 1000, 2
+                        ),
+                    }
+                    for topic, metrics in self.topics.items()
+                },
+            }
 
 
 class InterProcessCommunicator(Communicator):
+    """Receives requests from other processes and handles them on worker pools.
+
+    Requests are read from a ROUTER socket, handled on the workers for their
+    request class and the replies are sent back from the reader thread since
+    zmq sockets can't be shared between threads.
+    """
+
     def __init__(self) -> None:
         self.context = zmq.Context()
-        self.socket = self.context.socket(zmq.REP)
+        self.socket = self.context.socket(zmq.ROUTER)
         self.socket.bind(SOCKET_REP_REQ)
+        self.replies = self.context.socket(zmq.PULL)
+        self.replies.bind(SOCKET_REPLIES)
         self.stop_event: MpEvent = mp.Event()
+        self.metrics = RequestMetrics()
+        self.workers = {
+            request_class: ThreadPoolExecutor(
+                max_workers=count, thread_name_prefix=f"ipc_{request_class.value}"
+            )
+            for request_class, count in REQUEST_WORKERS.items()
+        }
+        self.worker_sockets = threading.local()
 
     def publish(self, topic: str, payload: Any, retain: bool = False) -> None:
         """There is no communication back to the processes."""
@@ -33,45 +147,119 @@ class InterProcessCommunicator(Communicator):
         self.reader_thread.start()
 
     def read(self) -> None:
+        poller = zmq.Poller()
+        poller.register(self.socket, zmq.POLLIN)
+        poller.register(self.replies, zmq.POLLIN)
+
         while not self.stop_event.is_set():
-            while True:  # load all messages that are queued
-                has_message, _, _ = zmq.select([self.socket], [], [], 1)
-
-                if not has_message:
-                    break
-
-                try:
-                    raw = self.socket.recv_json(flags=zmq.NOBLOCK)
-
-                    if isinstance(raw, list):
-                        (topic, value) = raw
-                        response = self._dispatcher(topic, value)
-                    else:
-                        logging.warning(
-                            f"Received unexpected data type in ZMQ recv_json: {type(raw)}"
-                        )
-                        response = None
-
-                    if response is not None:
-                        self.socket.send_json(response)
-                    else:
-                        self.socket.send_json([])
-                except zmq.ZMQError:
-                    break
+            events = dict(poller.poll(1000))
+
+            if self.replies in events:
+                self._send_replies()
+
+            if self.socket in events:
+                self._receive_requests()
+
+    def _send_replies(self) -> None:
+        while True:  # send all replies that are ready
+            try:
+                self.socket.send_multipart(self.replies.recv_multipart(zmq.NOBLOCK))
+            except zmq.ZMQError:
+                break
+
+    def _receive_requests(self) -> None:
+        while True:  # load all messages that are queued
+            try:
+                frames = self.socket.recv_multipart(zmq.NOBLOCK)
+            except zmq.ZMQError:
+                break
+
+            # the envelope identifies the requestor and ends with an empty frame
+            if b"" not in frames:
+                continue
+
+            delimiter = frames.index(b"")
+            envelope = frames[: delimiter + 1]
+
+            try:
+                raw = json.loads(frames[delimiter + 1])
+            except (IndexError, ValueError):
+                raw = None
+
+            if not isinstance(raw, list) or len(raw) != 2:
+                logging.warning(
+                    f"Received unexpected data type in ZMQ recv_json: {type(raw)}"
+                )
+                self.socket.send_multipart(envelope + [b"[]"])
+                continue
+
+            topic, value = raw
+            request_class = get_request_class(topic)
+            self.metrics.request_queued(request_class)
+            self.workers[request_class].submit(
+                self._handle_request,
+                envelope,
+                topic,
+                value,
+                request_class,
+                time.monotonic(),
+            )
+
+    def _handle_request(
+        self,
+        envelope: list[bytes],
+        topic: str,
+        value: Any,
+        request_class: RequestClassEnum,
+        received: float,
+    ) -> None:
+        start = time.monotonic()
+
+        try:
+            response = self._dispatcher(topic, value)
+        except Exception:
+            logger.exception(f"Error handling request for {topic}")
+            response = None
+
+        self.metrics.request_handled(
+            topic, request_class, start - received, time.monotonic() - start
+        )
+
+        # each worker thread sends its replies to the reader on its own socket
+        socket = getattr(self.worker_sockets, "socket", None)
+
+        if socket is None:
+            socket = self.context.socket(zmq.PUSH)
+            socket.connect(SOCKET_REPLIES)
+            self.worker_sockets.socket = socket
+
+        socket.send_multipart(
+            envelope + [json.dumps(response if response is not None else []).encode()]
+        )
 
     def stop(self) -> None:
         self.stop_event.set()
         self.reader_thread.join()
-        self.socket.close(linger=0)
+
+        for workers in self.workers.values():
+            workers.shutdown(wait=True, cancel_futures=True)
+
         self.context.destroy(linger=0)
 
 
 class InterProcessRequestor:
     """Simplifies sending data to InterProcessCommunicator and getting a reply."""
 
-    def __init__(self) -> None:
+    def __init__(self, timeout: float | None = REQUEST_TIMEOUT) -> None:
         self.context = zmq.Context()
         self.socket = self.context.socket(zmq.REQ)
+        # allow sending a new request after a timeout, dropping the late reply
+        self.socket.setsockopt(zmq.REQ_RELAXED, 1)
+        self.socket.setsockopt(zmq.REQ_CORRELATE, 1)
+
+        if timeout is not None:
+            self.socket.setsockopt(zmq.RCVTIMEO, int(timeout * 1000))
+
         self.socket.connect(SOCKET_REP_REQ)
 
     def send_data(self, topic: str, data: Any) -> Any:
@@ -79,6 +267,9 @@ class InterProcessRequestor:
         try:
             self.socket.send_json((topic, data))
             return self.socket.recv_json()
+        except zmq.Again:
+            logger.warning(f"Timed out waiting for a reply to {topic}")
+            return ""
         except zmq.ZMQError:
             return ""
 
@@ -0,0 +1,66 @@
+"""Waits on many zmq sockets at once."""
+
+import time
+from collections.abc import Callable
+from typing import Any
+
+import zmq
+
+
+class TopicPoller:
+    """Dispatches messages from many sockets with a single zmq.Poller.
+
+    Only the handlers of sockets that have messages queued are called. A
+    handler is called repeatedly while its socket has more messages, up to
+    max_batch times per poll so a busy topic can't starve the others.
+    """
+
+    def __init__(self, max_batch: int = 32) -> None:
+        self.max_batch = max_batch
+        self.poller = zmq.Poller()
+        self.topics: list[tuple[str, zmq.Socket, Callable[[], Any]]] = []
+        # smoothed time spent handling each topic per poll, in seconds
+        self.speeds: dict[str, float] = {}
+
+    def register(
+        self, name: str, socket: zmq.Socket, handler: Callable[[], Any]
+    ) -> None:
+        """Call handler to receive a message whenever socket is readable."""
+        self.poller.register(socket, zmq.POLLIN)
+        self.topics.append((name, socket, handler))
+
+    def poll(self, timeout: float) -> int:
+        """Wait up to timeout seconds for messages and handle them.
+
+        Topics are handled in the order they were registered. Returns the
+        number of topics that were handled.
+        """
+        ready = dict(self.poller.poll(int(timeout * 1000)))
+
+        if not ready:
+            return 0
+
+        handled = 0
+
+        for name, socket, handler in self.topics:
+            if socket not in ready:
+                continue
+
+            start = time.monotonic()
+
+            for _ in range(self.max_batch):
+                handler()
+
+                if not int(socket.get(zmq.EVENTS)) & zmq.POLLIN:
+                    break
+
+            self._update_speed(name, time.monotonic() - start)
+            handled += 1
+
+        return handled
+
+    def _update_speed(self, name: str, duration: float) -> None:
+        previous = self.speeds.get(name)
+        self.speeds[name] = (
+            duration if previous is None else (previous * 9 + duration) / 10
+        )
@@ -4,6 +4,8 @@ import errno
 import json
 import logging
 import threading
+import time
+from collections import deque
 from collections.abc import Callable
 from typing import Any
 from wsgiref.simple_server import make_server
@@ -18,6 +20,10 @@ from ws4py.websocket import WebSocket as WebSocket_
 
 from frigate.comms.base_communicator import Communicator
 from frigate.config import FrigateConfig
+from frigate.config.camera.updater import (
+    CameraConfigUpdateEnum,
+    CameraConfigUpdateSubscriber,
+)
 from frigate.const import (
     CLEAR_ONGOING_REVIEW_SEGMENTS,
     EXPIRE_AUDIO_ACTIVITY,
@@ -74,6 +80,18 @@ _WS_VIEWER_TOPICS = frozenset(
 # Camera-scoped command topics a camera-authorized (non-admin) user may send.
 _WS_CAMERA_COMMAND_TOPICS = frozenset({"ptz"})
 
+# Messages kept queued for a stalled client, the oldest are dropped.
+_WS_MAX_PENDING_MESSAGES = 256
+
+# Seconds a send can block before the client is considered stalled.
+_WS_STALLED_SEND_TIMEOUT = 1.0
+
+# Bytes queued for any client before the oldest messages are dropped.
+_WS_MAX_PENDING_BYTES = 32 * 1024 * 1024
+
+# Classified outbound topics to remember before starting over.
+_WS_MAX_CACHED_TOPICS = 4096
+
 
 def _check_ws_authorization(
     topic: str,
@@ -445,6 +463,118 @@ def _materialize_for_ws(
     return None
 
 
+def _ws_scope_key(ws: Any, config: FrigateConfig) -> tuple[Any, ...]:
+    """Return a key shared by connections that receive identical broadcasts.
+
+    Materialization only depends on whether a role header is present and
+    the cameras the roles grant access to, so connections with different
+    role headers that resolve to the same access share a key.
+    """
+    if _ws_role_header(ws) is None:
+        return (False, False, frozenset())
+
+    return (
+        True,
+        _ws_is_unrestricted(ws, config),
+        frozenset(_ws_allowed_cameras(ws, config)),
+    )
+
+
+class _ClientSender:
+    """Delivers broadcasts to a single websocket client on its own thread.
+
+    A client that keeps up can have a burst of messages queued, once a send
+    has been blocked for a while the client is stalled and only the newest
+    pending messages are kept so it can't hold up the dispatcher or other
+    clients.
+    """
+
+    def __init__(
+        self,
+        ws: Any,
+        max_pending: int = _WS_MAX_PENDING_MESSAGES,
+        stall_timeout: float = _WS_STALLED_SEND_TIMEOUT,
+        max_pending_bytes: int = _WS_MAX_PENDING_BYTES,
+    ) -> None:
+        self.ws = ws
+        self.max_pending = max_pending
+        self.stall_timeout = stall_timeout
+        self.max_pending_bytes = max_pending_bytes
+        self.pending: deque[str] = deque()
+        self.pending_bytes = 0
+        self.dropped = 0
+        self.send_started: float | None = None
+        self.stopped = False
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(
+            target=self._run, name="websocket_sender", daemon=True
+        )
+        self.thread.start()
+
+    def _stalled(self) -> bool:
+        return (
+            self.send_started is not None
+            and time.monotonic() - self.send_started > self.stall_timeout
+        )
+
+    def put(self, message: str) -> None:
+        with self.condition:
+            self.pending.append(message)
+            self.pending_bytes += len(message)
+            max_pending = self.max_pending if self._stalled() else None
+
+            while len(self.pending) > 1 and (
+                (max_pending is not None and len(self.pending) > max_pending)
+                or self.pending_bytes > self.max_pending_bytes
+            ):
+                if self.dropped == 0:
+                    logger.debug(
+                        "Websocket client is falling behind, dropping messages"
+                    )
+
+                self.pending_bytes -= len(self.pending.popleft())
+                self.dropped += 1
+
+            self.condition.notify_all()
+
+    def stop(self) -> None:
+        with self.condition:
+            self.stopped = True
+            self.pending.clear()
+            self.pending_bytes = 0
+            self.condition.notify_all()
+
+    def wait_until_idle(self, timeout: float | None = None) -> bool:
+        with self.condition:
+            return self.condition.wait_for(
+                lambda: (
+                    self.stopped or (not self.pending and self.send_started is None)
+                ),
+                timeout,
+            )
+
+    def _run(self) -> None:
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.stopped or self.pending)
+
+                if self.stopped:
+                    return
+
+                message = self.pending.popleft()
+                self.pending_bytes -= len(message)
+                self.send_started = time.monotonic()
+
+            try:
+                self.ws.send(message)
+            except (ConnectionResetError, BrokenPipeError, ValueError):
+                pass
+            finally:
+                with self.condition:
+                    self.send_started = None
+                    self.condition.notify_all()
+
+
 class WebSocket(WebSocket_):  # type: ignore[misc]
     def unhandled_error(self, error: Any) -> None:
         """
@@ -461,8 +591,33 @@ class WebSocketClient(Communicator):
     """Frigate wrapper for ws client."""
 
     def __init__(self, config: FrigateConfig) -> None:
-        self.config = config
         self.websocket_server: WSGIServer | None = None
+        self.senders: dict[int, _ClientSender] = {}
+        self.lock = threading.Lock()
+        # classifications depend on the camera, zone and role layout, they are
+        # cleared when the config is replaced or cameras and zones change
+        self.topic_scopes: dict[str, tuple[str, Any]] = {}
+        self.role_scope_keys: dict[str | None, tuple[Any, ...]] = {}
+        self.config_subscriber: CameraConfigUpdateSubscriber | None = None
+        self.config = config
+
+    @property
+    def config(self) -> FrigateConfig:
+        return self._config
+
+    @config.setter
+    def config(self, config: FrigateConfig) -> None:
+        with self.lock:
+            self._config = config
+            self._clear_scopes()
+
+            if self.config_subscriber is not None:
+                self.config_subscriber.config = config
+                self.config_subscriber.camera_configs = config.cameras
+
+    def _clear_scopes(self) -> None:
+        self.topic_scopes.clear()
+        self.role_scope_keys.clear()
 
     def subscribe(self, receiver: Callable) -> None:
         self._dispatcher = receiver
@@ -470,6 +625,15 @@ class WebSocketClient(Communicator):
 
     def start(self) -> None:
         """Start the websocket client."""
+        self.config_subscriber = CameraConfigUpdateSubscriber(
+            self.config,
+            self.config.cameras,
+            [
+                CameraConfigUpdateEnum.add,
+                CameraConfigUpdateEnum.remove,
+                CameraConfigUpdateEnum.zones,
+            ],
+        )
 
         class _WebSocketHandler(WebSocket):
             receiver = self._dispatcher
@@ -548,44 +712,103 @@ class WebSocketClient(Communicator):
             logger.debug(f"payload for {topic} wasn't text. Skipping...")
             return
 
-        all_cameras = set(self.config.cameras.keys())
-        all_zones = _collect_zone_names(self.config)
-        scope = _classify_outbound(topic, all_cameras, all_zones)
-
-        if scope[0] == "drop":
-            return
+        with self.lock:
+            scope = self._get_scope(topic)
 
-        # Pre-parse payload once for topics that need to read its contents.
-        parsed_payload: Any = None
-        if scope[0] in (
-            "payload_camera",
-            "reshape_by_camera_key",
-            "reshape_job_state",
-            "reshape_stats",
-        ):
-            parsed_payload = _parse_json_payload(payload)
-            if parsed_payload is None:
-                # malformed payload — fail closed
+            if scope[0] == "drop":
                 return
 
-        manager = self.websocket_server.manager
-        with manager.lock:
-            websockets = list(manager.websockets.values())
+            # Pre-parse payload once for topics that need to read its contents.
+            parsed_payload: Any = None
+            if scope[0] in (
+                "payload_camera",
+                "reshape_by_camera_key",
+                "reshape_job_state",
+                "reshape_stats",
+            ):
+                parsed_payload = _parse_json_payload(payload)
+                if parsed_payload is None:
+                    # malformed payload — fail closed
+                    return
+
+            manager = self.websocket_server.manager
+            with manager.lock:
+                websockets = list(manager.websockets.values())
+
+            # materialize once per distinct permission scope
+            messages: dict[tuple[Any, ...], str | None] = {}
+
+            for ws in self._update_senders(websockets):
+                key = self._get_scope_key(ws)
+
+                if key not in messages:
+                    messages[key] = _materialize_for_ws(
+                        ws, topic, ws_message, scope, parsed_payload, self.config
+                    )
+
+                message = messages[key]
+
+                if message is not None:
+                    self.senders[id(ws)].put(message)
+
+    def _get_scope(self, topic: str) -> tuple[str, Any]:
+        if (
+            self.config_subscriber is not None
+            and self.config_subscriber.check_for_updates()
+        ) or len(self.topic_scopes) > _WS_MAX_CACHED_TOPICS:
+            self._clear_scopes()
 
-        for ws in websockets:
-            if getattr(ws, "terminated", False):
-                continue
-            message = _materialize_for_ws(
-                ws, topic, ws_message, scope, parsed_payload, self.config
+        scope = self.topic_scopes.get(topic)
+
+        if scope is None:
+            scope = _classify_outbound(
+                topic, set(self.config.cameras.keys()), _collect_zone_names(self.config)
             )
-            if message is None:
-                continue
-            try:
-                ws.send(message)
-            except (ConnectionResetError, BrokenPipeError, ValueError):
-                pass
+            self.topic_scopes[topic] = scope
+
+        return scope
+
+    def _get_scope_key(self, ws: Any) -> tuple[Any, ...]:
+        header = _ws_role_header(ws)
+        key = self.role_scope_keys.get(header)
+
+        if key is None:
+            key = _ws_scope_key(ws, self.config)
+            self.role_scope_keys[header] = key
+
+        return key
+
+    def _update_senders(self, websockets: list[Any]) -> list[Any]:
+        """Start senders for new clients and stop those of closed clients."""
+        active = [ws for ws in websockets if not getattr(ws, "terminated", False)]
+        active_ids = {id(ws) for ws in active}
+
+        for ws_id in [i for i in self.senders if i not in active_ids]:
+            self.senders.pop(ws_id).stop()
+
+        for ws in active:
+            if id(ws) not in self.senders:
+                self.senders[id(ws)] = _ClientSender(ws)
+
+        return active
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until all queued messages were handed to the clients."""
+        with self.lock:
+            senders = list(self.senders.values())
+
+        return all(sender.wait_until_idle(timeout) for sender in senders)
 
     def stop(self) -> None:
+        with self.lock:
+            for sender in self.senders.values():
+                sender.stop()
+
+            self.senders.clear()
+
+            if self.config_subscriber is not None:
+                self.config_subscriber.stop()
+
         if self.websocket_server is not None:
             self.websocket_server.manager.close_all()
             self.websocket_server.manager.stop()
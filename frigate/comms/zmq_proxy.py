@@ -2,8 +2,9 @@
 
 import json
 import threading
-from typing import Generic, TypeVar
+from typing import Any, Generic, TypeVar
 
+import msgpack
 import zmq
 
 from frigate.const import FAST_QUEUE_TIMEOUT
@@ -47,13 +48,40 @@ class ZmqProxy:
         self.runner.join()
 
 
+class JsonSerializer:
+    """Encodes payloads as JSON."""
+
+    @staticmethod
+    def dumps(payload: Any) -> bytes:
+        return json.dumps(payload).encode("utf-8")
+
+    @staticmethod
+    def loads(data: bytes) -> Any:
+        return json.loads(data)
+
+
+class MsgpackSerializer:
+    """Encodes payloads as msgpack, for topics that publish every frame."""
+
+    @staticmethod
+    def dumps(payload: Any) -> bytes:
+        return bytes(msgpack.packb(payload, use_bin_type=True))
+
+    @staticmethod
+    def loads(data: bytes) -> Any:
+        return msgpack.unpackb(data, strict_map_key=False)
+
+
+Serializer = type[JsonSerializer] | type[MsgpackSerializer]
+
 T = TypeVar("T")
 
 
 class Publisher(Generic[T]):
-    """Publishes messages."""
+    """Publishes messages as a topic frame followed by a payload frame."""
 
     topic_base: str = ""
+    serializer: Serializer = JsonSerializer
 
     def __init__(self, topic: str = "") -> None:
         self.topic = f"{self.topic_base}{topic}"
@@ -63,7 +91,9 @@ class Publisher(Generic[T]):
 
     def publish(self, payload: T, sub_topic: str = "") -> None:
         """Publish message."""
-        self.socket.send_string(f"{self.topic}{sub_topic} {json.dumps(payload)}")
+        self.socket.send_multipart(
+            [f"{self.topic}{sub_topic}".encode(), self.serializer.dumps(payload)]
+        )
 
     def stop(self) -> None:
         self.socket.close(linger=0)
@@ -71,9 +101,10 @@ class Publisher(Generic[T]):
 
 
 class Subscriber(Generic[T]):
-    """Receives messages."""
+    """Receives messages, the serializer must match the topic's publisher."""
 
     topic_base: str = ""
+    serializer: Serializer = JsonSerializer
 
     def __init__(self, topic: str = "") -> None:
         self.topic = f"{self.topic_base}{topic}"
@@ -88,8 +119,8 @@ class Subscriber(Generic[T]):
             has_update, _, _ = zmq.select([self.socket], [], [], timeout)
 
             if has_update:
-                parts = self.socket.recv_string(flags=zmq.NOBLOCK).split(maxsplit=1)
-                return self._return_object(parts[0], json.loads(parts[1]))
+                topic, data = self.socket.recv_multipart(flags=zmq.NOBLOCK)
+                return self._return_object(topic.decode(), self.serializer.loads(data))
         except zmq.ZMQError:
             pass
 
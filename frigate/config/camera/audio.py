@@ -54,6 +54,6 @@ class AudioConfig(FrigateBaseModel):
     num_threads: int = Field(
         default=2,
         title="Detection threads",
-        description="Number of threads to use for audio detection processing.",
+        description="Number of threads to use for audio detection processing. All cameras share a small pool of audio models, each uses the largest value configured.",
         ge=1,
     )
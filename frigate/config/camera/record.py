@@ -84,6 +84,11 @@ class RecordPreviewConfig(FrigateBaseModel):
         title="Preview quality",
         description="Preview quality level (very_low, low, medium, high, very_high).",
     )
+    streaming: bool = Field(
+        default=False,
+        title="Stream previews",
+        description="Encode preview frames as they are captured instead of caching an image per frame and encoding them every hour. Frames of the current hour can't be scrubbed until its preview is finished.",
+    )
 
 
 class ChaptersEnum(str, Enum):
@@ -5,6 +5,8 @@ INSTALL_DIR = "/opt/frigate"
 CONFIG_DIR = "/config"
 DEFAULT_DB_PATH = f"{CONFIG_DIR}/frigate.db"
 MODEL_CACHE_DIR = f"{CONFIG_DIR}/model_cache"
+REGION_HISTORY_DIR = f"{CONFIG_DIR}/region_history"
+STATS_HISTORY_DIR = f"{CONFIG_DIR}/stats_history"
 BASE_DIR = "/media/frigate"
 CLIPS_DIR = f"{BASE_DIR}/clips"
 EXPORT_DIR = f"{BASE_DIR}/exports"
@@ -20,6 +22,7 @@ PLUS_ENV_VAR = "PLUS_API_KEY"
 PLUS_API_HOST = "https://api.frigate.video"
 
 SHM_FRAMES_VAR = "SHM_MAX_FRAMES"
+OBJECT_PROCESSOR_SHARDS_VAR = "OBJECT_PROCESSOR_SHARDS"
 
 REDACTED_CREDENTIAL_SENTINEL = "__FRIGATE_SAVED_CREDENTIAL__"
 
@@ -113,6 +116,10 @@ DRIVER_AMD = "radeonsi"
 DRIVER_INTEL_i965 = "i965"
 DRIVER_INTEL_iHD = "iHD"
 
+# Detector Values
+
+MAX_DETECTION_BATCH_SIZE = 6
+
 # Preview Values
 
 PREVIEW_FRAME_TYPE = "webp"
@@ -28,6 +28,8 @@ class DataProcessorMetrics:
     object_desc_dps: ValueProxy[float]
     classification_speeds: DictProxy[str, ValueProxy[float]]
     classification_cps: DictProxy[str, ValueProxy[float]]
+    maintainer_topic_speeds: DictProxy[str, float]
+    search_cache_stats: DictProxy[str, dict[str, float]]
 
     def __init__(self, manager: SyncManager, custom_classification_models: list[str]):
         self.image_embeddings_speed = manager.Value("d", 0.0)
@@ -46,6 +48,8 @@ class DataProcessorMetrics:
         self.object_desc_dps = manager.Value("d", 0.0)
         self.classification_speeds = manager.dict()
         self.classification_cps = manager.dict()
+        self.maintainer_topic_speeds = manager.dict()
+        self.search_cache_stats = manager.dict()
 
         if custom_classification_models:
             for key in custom_classification_models:
@@ -23,6 +23,19 @@ class DetectionApi(ABC):
     def detect_raw(self, tensor_input):
         pass
 
+    def detect_raw_batch(self, tensor_input: np.ndarray) -> np.ndarray:
+        """Run detection on a batch of inputs, returning one (20, 6) result per input.
+
+        Detectors that can run the whole batch in a single inference should
+        override this, by default each input is run through detect_raw.
+        """
+        return np.stack(
+            [
+                self.detect_raw(tensor_input[i : i + 1])
+                for i in range(tensor_input.shape[0])
+            ]
+        )
+
     def calculate_grids_strides(self, expanded=True) -> None:
         grids = []
         expanded_strides = []
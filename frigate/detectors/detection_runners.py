@@ -111,6 +111,10 @@ class BaseModelRunner(ABC):
         """Run inference with the model."""
         pass
 
+    def supports_dynamic_batch(self) -> bool:
+        """Check if the model accepts more than one input per inference."""
+        return False
+
 
 class ONNXModelRunner(BaseModelRunner):
     """Run ONNX models using ONNX Runtime."""
@@ -176,6 +180,10 @@ class ONNXModelRunner(BaseModelRunner):
         """Get the input width of the model."""
         return self.ort.get_inputs()[0].shape[3]
 
+    def supports_dynamic_batch(self) -> bool:
+        """Check if the model was exported with a symbolic batch dimension."""
+        return not isinstance(self.ort.get_inputs()[0].shape[0], int)
+
     def run(self, input: dict[str, Any]) -> Any | None:
         if self._inference_lock:
             with self._inference_lock:
@@ -374,6 +382,14 @@ class OpenVINOModelRunner(BaseModelRunner):
             except Exception:
                 return -1
 
+    def supports_dynamic_batch(self) -> bool:
+        """Check if the model was compiled with a dynamic batch dimension."""
+        try:
+            partial_shape = self.compiled_model.inputs[0].get_partial_shape()
+            return len(partial_shape) >= 1 and partial_shape[0].is_dynamic
+        except Exception:
+            return False
+
     def run(self, inputs: dict[str, Any]) -> list[np.ndarray]:
         """Run inference with the model.
 
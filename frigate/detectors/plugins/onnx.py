@@ -61,6 +61,13 @@ class ONNXDetector(DetectionApi):
         if self.onnx_model_type == ModelTypeEnum.yolox:
             self.calculate_grids_strides()
 
+        # dfine takes a second per-image input and yolonas flat outputs mix
+        # every image of the batch together, so those always run one at a time
+        self.batch_supported = (
+            self.onnx_model_type not in [ModelTypeEnum.dfine, ModelTypeEnum.yolonas]
+            and self.runner.supports_dynamic_batch()
+        )
+
         self._warmup(detector_config)
         logger.info(f"ONNX: {path} loaded")
 
@@ -103,7 +110,24 @@ class ONNXDetector(DetectionApi):
 
         model_input_name = self.runner.get_input_names()[0]
         tensor_output = self.runner.run({model_input_name: tensor_input})
+        return self._post_process(tensor_output)
+
+    def detect_raw_batch(self, tensor_input: np.ndarray) -> np.ndarray:
+        if not self.batch_supported or tensor_input.shape[0] == 1:
+            return super().detect_raw_batch(tensor_input)
+
+        model_input_name = self.runner.get_input_names()[0]
+        tensor_output = self.runner.run({model_input_name: tensor_input})
+
+        # post processing expects a batch of one, so split each output per image
+        return np.stack(
+            [
+                self._post_process([output[i : i + 1] for output in tensor_output])
+                for i in range(tensor_input.shape[0])
+            ]
+        )
 
+    def _post_process(self, tensor_output: list[np.ndarray]) -> np.ndarray:
         if self.onnx_model_type == ModelTypeEnum.rfdetr:
             return post_process_rfdetr(tensor_output)
         elif self.onnx_model_type == ModelTypeEnum.yolonas:
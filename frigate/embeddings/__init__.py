@@ -19,7 +19,6 @@ from frigate.const import CONFIG_DIR, FACE_DIR, PROCESS_PRIORITY_HIGH
 from frigate.data_processing.types import DataProcessorMetrics
 from frigate.db.sqlitevecq import SqliteVecQueueDatabase
 from frigate.models import Event
-from frigate.util.builtin import serialize
 from frigate.util.classification import kickoff_model_training
 from frigate.util.process import FrigateProcess
 
@@ -28,6 +27,9 @@ from .util import ZScoreNormalization
 
 logger = logging.getLogger(__name__)
 
+# default number of results for semantic searches
+SEARCH_LIMIT = 100
+
 
 class EmbeddingProcess(FrigateProcess):
     def __init__(
@@ -97,105 +99,92 @@ class EmbeddingsContext:
             json.dump(contents, f)
         self.requestor.stop()
 
-    def search_thumbnail(
-        self, query: Event | str, event_ids: list[str] = None
+    def _search(
+        self,
+        topic: EmbeddingsRequestEnum,
+        request: dict[str, Any],
+        limit: int,
+        cameras: list[str] | None,
+        labels: list[str] | None,
+        zones: list[str] | None,
+        after: float | None,
+        before: float | None,
     ) -> list[tuple[str, float]]:
-        if query.__class__ == Event:
-            cursor = self.db.execute_sql(
-                """
-                SELECT thumbnail_embedding FROM vec_thumbnails WHERE id = ?
-                """,
-                [query.id],
-            )
-
-            row = cursor.fetchone() if cursor else None
-
-            if row:
-                query_embedding = row[0]
-            else:
-                # If no embedding found, generate it and return it
-                data = self.requestor.send_data(
-                    EmbeddingsRequestEnum.embed_thumbnail.value,
-                    {"id": str(query.id), "thumbnail": str(query.thumbnail)},
-                )
-
-                if not data:
-                    return []
-
-                query_embedding = serialize(data)
-        else:
-            data = self.requestor.send_data(
-                EmbeddingsRequestEnum.generate_search.value, query
-            )
-
-            if not data:
-                return []
-
-            query_embedding = serialize(data)
-
-        sql_query = """
-            SELECT
-                id,
-                distance
-            FROM vec_thumbnails
-            WHERE thumbnail_embedding MATCH ?
-                AND k = 100
-        """
-
-        # Add the IN clause if event_ids is provided and not empty
-        # this is the only filter supported by sqlite-vec as of 0.1.3
-        # but it seems to be broken in this version
-        if event_ids:
-            sql_query += " AND id IN ({})".format(",".join("?" * len(event_ids)))
+        filters = {
+            "cameras": cameras,
+            "labels": labels,
+            "zones": zones,
+            "after": after,
+            "before": before,
+        }
+        results = self.requestor.send_data(
+            topic.value,
+            {
+                **request,
+                "limit": limit,
+                "filters": {k: v for k, v in filters.items() if v is not None},
+            },
+        )
 
-        # order by distance DESC is not implemented in this version of sqlite-vec
-        # when it's implemented, we can use cosine similarity
-        sql_query += " ORDER BY distance"
+        if not results:
+            return []
 
-        parameters = [query_embedding] + event_ids if event_ids else [query_embedding]
+        return [(event_id, distance) for event_id, distance in results]
 
-        results = self.db.execute_sql(sql_query, parameters).fetchall()
+    def search_thumbnail(
+        self,
+        query: Event | str,
+        limit: int = SEARCH_LIMIT,
+        cameras: list[str] | None = None,
+        labels: list[str] | None = None,
+        zones: list[str] | None = None,
+        after: float | None = None,
+        before: float | None = None,
+    ) -> list[tuple[str, float]]:
+        """Tracked objects that look most like the query text or tracked object.
 
-        return results
+        Only tracked objects matching the filters are searched, see
+        VectorIndex.search. Returns up to limit (event_id, distance) sorted
+        by distance.
+        """
+        if query.__class__ == Event:
+            request = {"event_id": query.id}
+        else:
+            request = {"query": query}
+
+        return self._search(
+            EmbeddingsRequestEnum.search_thumbnail,
+            request,
+            limit,
+            cameras,
+            labels,
+            zones,
+            after,
+            before,
+        )
 
     def search_description(
-        self, query_text: str, event_ids: list[str] = None
+        self,
+        query_text: str,
+        limit: int = SEARCH_LIMIT,
+        cameras: list[str] | None = None,
+        labels: list[str] | None = None,
+        zones: list[str] | None = None,
+        after: float | None = None,
+        before: float | None = None,
     ) -> list[tuple[str, float]]:
-        data = self.requestor.send_data(
-            EmbeddingsRequestEnum.generate_search.value, query_text
+        """Tracked objects with descriptions closest to the query text."""
+        return self._search(
+            EmbeddingsRequestEnum.search_description,
+            {"query": query_text},
+            limit,
+            cameras,
+            labels,
+            zones,
+            after,
+            before,
         )
 
-        if not data:
-            return []
-
-        query_embedding = serialize(data)
-
-        # Prepare the base SQL query
-        sql_query = """
-            SELECT
-                id,
-                distance
-            FROM vec_descriptions
-            WHERE description_embedding MATCH ?
-                AND k = 100
-        """
-
-        # Add the IN clause if event_ids is provided and not empty
-        # this is the only filter supported by sqlite-vec as of 0.1.3
-        # but it seems to be broken in this version
-        if event_ids:
-            sql_query += " AND id IN ({})".format(",".join("?" * len(event_ids)))
-
-        # order by distance DESC is not implemented in this version of sqlite-vec
-        # when it's implemented, we can use cosine similarity
-        sql_query += " ORDER BY distance"
-
-        parameters = [query_embedding] + event_ids if event_ids else [query_embedding]
-
-        results = self.db.execute_sql(sql_query, parameters).fetchall()
-
-        return results
-
     def register_face(self, face_name: str, image_data: bytes) -> dict[str, Any]:
         return self.requestor.send_data(
             EmbeddingsRequestEnum.register_face.value,
@@ -2,10 +2,12 @@
 
 import datetime
 import io
+import json
 import logging
 import os
 import threading
 import time
+from typing import Any
 
 import numpy as np
 from peewee import DoesNotExist, IntegrityError
@@ -17,6 +19,7 @@ from frigate.config import FrigateConfig
 from frigate.config.classification import SemanticSearchModelEnum
 from frigate.const import (
     CONFIG_DIR,
+    MODEL_CACHE_DIR,
     TRIGGER_DIR,
     UPDATE_EMBEDDINGS_REINDEX_PROGRESS,
     UPDATE_MODEL_STATE,
@@ -31,9 +34,21 @@ from frigate.util.file import get_event_thumbnail_bytes
 from .genai_embedding import GenAIEmbedding
 from .onnx.jina_v1_embedding import JinaV1ImageEmbedding, JinaV1TextEmbedding
 from .onnx.jina_v2_embedding import JinaV2Embedding
+from .search_cache import SearchCache
+from .vector_index import VectorIndex
 
 logger = logging.getLogger(__name__)
 
+SEARCH_INDEX_DIR = os.path.join(MODEL_CACHE_DIR, "search_index")
+# syncing more missing embeddings than this reads the whole table
+SEARCH_INDEX_SCAN_THRESHOLD = 1000
+# sqlite-vec's limit for k
+SQLITE_VEC_MAX_K = 4096
+QUERY_EMBEDDING_CACHE_SIZE = 256
+SEARCH_RESULT_CACHE_SIZE = 128
+# seconds search results are reused for
+SEARCH_RESULT_CACHE_TTL = 60
+
 
 def get_metadata(event: Event) -> dict:
     """Extract valid event metadata."""
@@ -154,10 +169,39 @@ class Embeddings:
                 or ("GPU" if config.semantic_search.model_size == "large" else "CPU"),
             )
 
+        # in-memory search indexes of the vec tables, until they are loaded
+        # searches use sqlite-vec and updates are queued
+        self.search_indexes: dict[str, tuple[str, VectorIndex]] = {
+            "vec_thumbnails": ("thumbnail_embedding", VectorIndex()),
+            "vec_descriptions": ("description_embedding", VectorIndex()),
+        }
+        self.search_index_lock = threading.Lock()
+        self.search_index_ready = threading.Event()
+        self.search_index_loaded = False
+        self.pending_index_updates: list[tuple[str, list[tuple[str, Any]]]] = []
+        # paging and refetching repeat the same searches, results are cached
+        # per version of the table so new embeddings invalidate them
+        self.query_embedding_cache = SearchCache(QUERY_EMBEDDING_CACHE_SIZE)
+        self.search_result_cache = SearchCache(
+            SEARCH_RESULT_CACHE_SIZE, SEARCH_RESULT_CACHE_TTL
+        )
+        self.search_index_versions = {table: 0 for table in self.search_indexes}
+        threading.Thread(
+            target=self._load_search_indexes, name="search_index_loader", daemon=True
+        ).start()
+
     def update_stats(self) -> None:
         self.metrics.image_embeddings_eps.value = self.image_eps.eps()
         self.metrics.text_embeddings_eps.value = self.text_eps.eps()
 
+    def _update_search_cache_stats(self) -> None:
+        self.metrics.search_cache_stats.update(
+            {
+                "query_embeddings": self.query_embedding_cache.stats(),
+                "search_results": self.search_result_cache.stats(),
+            }
+        )
+
     def get_model_definitions(self):
         model_cfg = self.config.semantic_search.model
         if not isinstance(model_cfg, SemanticSearchModelEnum):
@@ -214,6 +258,7 @@ class Embeddings:
                 """,
                 (event_id, serialize(embedding)),
             )
+            self._update_search_index("vec_thumbnails", [(event_id, embedding)])
 
         self.image_inference_speed.update(datetime.datetime.now().timestamp() - start)
         self.image_eps.update()
@@ -264,6 +309,9 @@ class Embeddings:
                 """.format(", ".join(["(?, ?)"] * len(valid_ids))),
                 items,
             )
+            self._update_search_index(
+                "vec_thumbnails", list(zip(valid_ids, embeddings))
+            )
 
         duration = datetime.datetime.now().timestamp() - start
         self.image_inference_speed.update(duration / len(valid_ids))
@@ -284,12 +332,24 @@ class Embeddings:
                 """,
                 (event_id, serialize(embedding)),
             )
+            self._update_search_index("vec_descriptions", [(event_id, embedding)])
 
         self.text_inference_speed.update(datetime.datetime.now().timestamp() - start)
         self.text_eps.update()
 
         return embedding
 
+    def embed_search_query(self, query: str) -> np.ndarray:
+        """Embed the text of a search, reusing the embedding of repeated queries."""
+        embedding = self.query_embedding_cache.get(query)
+
+        if embedding is None:
+            embedding = self.embed_description("", query, upsert=False)
+            embedding.flags.writeable = False
+            self.query_embedding_cache.put(query, embedding)
+
+        return embedding
+
     def batch_embed_description(
         self, event_descriptions: dict[str, str], upsert: bool = True
     ) -> np.ndarray:
@@ -316,6 +376,7 @@ class Embeddings:
                 """.format(", ".join(["(?, ?)"] * len(ids))),
                 items,
             )
+            self._update_search_index("vec_descriptions", list(zip(ids, embeddings)))
 
         self.text_inference_speed.update(datetime.datetime.now().timestamp() - start)
 
@@ -324,11 +385,17 @@ class Embeddings:
     def reindex(self) -> None:
         logger.info("Indexing tracked object embeddings...")
 
+        # the loader must not add embeddings from the dropped tables
+        self.search_index_ready.wait()
         self.db.drop_embeddings_tables()
         logger.debug("Dropped embeddings tables.")
         self.db.create_embeddings_tables()
         logger.debug("Created embeddings tables.")
 
+        for table, (_, index) in self.search_indexes.items():
+            index.clear()
+            self._invalidate_search_results(table)
+
         # Delete the saved stats file
         if os.path.exists(os.path.join(CONFIG_DIR, ".search_stats.json")):
             os.remove(os.path.join(CONFIG_DIR, ".search_stats.json"))
@@ -668,3 +735,262 @@ class Embeddings:
         else:
             logger.warning(f"Unknown trigger type: {trigger.type}")
             return b""
+
+    def _search_index_path(self, table: str) -> str:
+        return os.path.join(SEARCH_INDEX_DIR, f"{table}.npz")
+
+    def _load_search_indexes(self) -> None:
+        """Load the saved search indexes and bring them up to date with the vec tables."""
+        try:
+            for table, (column, index) in self.search_indexes.items():
+                start = time.monotonic()
+                saved = VectorIndex.load(self._search_index_path(table))
+
+                if saved is not None:
+                    index = saved
+                    self.search_indexes[table] = (column, index)
+
+                saved_ids = set(index.rows)
+                table_ids = {
+                    row[0]
+                    for row in self.db.execute_sql(f"SELECT id FROM {table}").fetchall()
+                }
+                index.remove(saved_ids - table_ids)
+                self._index_table_rows(table, column, table_ids - saved_ids)
+                logger.info(
+                    f"Loaded {len(index)} embeddings from {table} for search in {round(time.monotonic() - start, 1)} seconds"
+                )
+
+            self.search_index_loaded = True
+
+            for table in self.search_indexes:
+                self._invalidate_search_results(table)
+        except Exception as e:
+            logger.error(f"Unable to load the search index, using sqlite-vec: {e}")
+
+        while True:
+            with self.search_index_lock:
+                updates = self.pending_index_updates
+                self.pending_index_updates = []
+
+                if not updates:
+                    self.search_index_ready.set()
+                    return
+
+            if self.search_index_loaded:
+                for table, embeddings in updates:
+                    self._add_to_search_index(table, embeddings)
+
+    def _index_table_rows(self, table: str, column: str, event_ids: set[str]) -> None:
+        """Add the embeddings of events from a vec table to its search index."""
+        if not event_ids:
+            return
+
+        if len(event_ids) > SEARCH_INDEX_SCAN_THRESHOLD:
+            rows = (
+                row
+                for row in self.db.execute_sql(f"SELECT id, {column} FROM {table}")
+                if row[0] in event_ids
+            )
+        else:
+            rows = (
+                row
+                for event_id in event_ids
+                for row in self.db.execute_sql(
+                    f"SELECT id, {column} FROM {table} WHERE id = ?", [event_id]
+                ).fetchall()
+            )
+
+        batch: list[tuple[str, Any]] = []
+
+        for event_id, embedding in rows:
+            batch.append((event_id, np.frombuffer(embedding, dtype=np.float32)))
+
+            if len(batch) == 512:
+                self._add_to_search_index(table, batch)
+                batch = []
+
+        self._add_to_search_index(table, batch)
+
+    def _invalidate_search_results(self, table: str) -> None:
+        with self.search_index_lock:
+            self.search_index_versions[table] += 1
+
+    def _update_search_index(self, table: str, embeddings: list[tuple[str, Any]]):
+        self._invalidate_search_results(table)
+
+        with self.search_index_lock:
+            if not self.search_index_ready.is_set():
+                self.pending_index_updates.append((table, embeddings))
+                return
+
+        if self.search_index_loaded:
+            self._add_to_search_index(table, embeddings)
+
+    def _add_to_search_index(
+        self, table: str, embeddings: list[tuple[str, Any]]
+    ) -> None:
+        if not embeddings:
+            return
+
+        _, index = self.search_indexes[table]
+        metadata: dict[str, dict[str, Any]] = {}
+        event_ids = [event_id for event_id, _ in embeddings]
+
+        for i in range(0, len(event_ids), 512):
+            for event_id, camera, label, zones, start_time in (
+                Event.select(
+                    Event.id, Event.camera, Event.label, Event.zones, Event.start_time
+                )
+                .where(Event.id << event_ids[i : i + 512])
+                .tuples()
+            ):
+                metadata[event_id] = {
+                    "camera": camera,
+                    "label": label,
+                    "zones": zones,
+                    "start_time": start_time,
+                }
+
+        # embeddings of events that no longer exist can't match any search
+        index.upsert(
+            [
+                (event_id, embedding, metadata[event_id])
+                for event_id, embedding in embeddings
+                if event_id in metadata
+            ]
+        )
+
+    def save_search_indexes(self) -> None:
+        """Write changed search indexes to disk so they load quickly on startup."""
+        if not self.search_index_ready.is_set() or not self.search_index_loaded:
+            return
+
+        os.makedirs(SEARCH_INDEX_DIR, exist_ok=True)
+
+        for table, (_, index) in self.search_indexes.items():
+            if index.modified:
+                index.save(self._search_index_path(table))
+
+    def prune_search_indexes(self) -> None:
+        """Remove embeddings that were deleted from the vec tables from the indexes."""
+        if not self.search_index_ready.is_set() or not self.search_index_loaded:
+            return
+
+        for table, (_, index) in self.search_indexes.items():
+            indexed = list(index.rows)
+
+            # embeddings are written to the vec table before being indexed and
+            # the writes are queued, wait for them so new ones aren't removed
+            self.db.execute_sql("PRAGMA user_version").fetchall()
+
+            table_ids = {
+                row[0]
+                for row in self.db.execute_sql(f"SELECT id FROM {table}").fetchall()
+            }
+            deleted = [event_id for event_id in indexed if event_id not in table_ids]
+
+            if deleted:
+                index.remove(deleted)
+                self._invalidate_search_results(table)
+                logger.debug(f"Removed {len(deleted)} deleted embeddings from {table}")
+
+    def _existing_search_ids(self, table: str, event_ids: list[str]) -> set[str]:
+        """The events that still have an embedding in a vec table.
+
+        Embeddings are deleted from the vec tables by other processes, the
+        indexes are pruned periodically and deleted events that show up in
+        results before then are dropped.
+        """
+        existing: set[str] = set()
+
+        for i in range(0, len(event_ids), 512):
+            query = Event.select(Event.id).where(Event.id << event_ids[i : i + 512])
+
+            if table == "vec_descriptions":
+                # clearing a description deletes its embedding
+                query = query.where(Event.data["description"] != "")
+
+            existing.update(event_id for (event_id,) in query.tuples())
+
+        return existing
+
+    def search(self, table: str, request: dict[str, Any]) -> list[tuple[str, float]]:
+        """Find the embeddings in a vec table nearest to a search request.
+
+        The request has either a text "query" or, for thumbnails, the
+        "event_id" of a tracked object to find similar ones to. The "limit"
+        nearest results matching the "filters" (cameras, labels, zones,
+        after and before) are returned as (event_id, distance).
+        """
+        key = (
+            table,
+            self.search_index_versions[table],
+            json.dumps(request, sort_keys=True),
+        )
+        results = self.search_result_cache.get(key)
+
+        if results is None:
+            results = self._search(table, request)
+            self.search_result_cache.put(key, results)
+
+        self._update_search_cache_stats()
+        return results
+
+    def _search(self, table: str, request: dict[str, Any]) -> list[tuple[str, float]]:
+        if "event_id" in request:
+            query_embedding = self._get_thumbnail_embedding(request["event_id"])
+        else:
+            query_embedding = self.embed_search_query(request["query"])
+
+        if query_embedding is None:
+            return []
+
+        limit = int(request.get("limit", 100))
+        filters = request.get("filters") or {}
+        column, index = self.search_indexes[table]
+
+        if not self.search_index_ready.is_set() or not self.search_index_loaded:
+            # filters are applied to the results by the caller
+            return self.db.execute_sql(
+                f"""
+                SELECT id, distance
+                FROM {table}
+                WHERE {column} MATCH ?
+                    AND k = ?
+                ORDER BY distance
+                """,
+                [serialize(query_embedding), min(limit, SQLITE_VEC_MAX_K)],
+            ).fetchall()
+
+        # each retry drops the deleted events found in the previous results
+        for _ in range(3):
+            results = index.search(query_embedding, limit, **filters)
+            existing = self._existing_search_ids(table, [r[0] for r in results])
+
+            if len(existing) == len(results):
+                break
+
+            index.remove(r[0] for r in results if r[0] not in existing)
+
+        return [r for r in results if r[0] in existing]
+
+    def _get_thumbnail_embedding(self, event_id: str) -> np.ndarray | None:
+        row = self.db.execute_sql(
+            "SELECT thumbnail_embedding FROM vec_thumbnails WHERE id = ?", [event_id]
+        ).fetchone()
+
+        if row:
+            return np.frombuffer(row[0], dtype=np.float32)
+
+        try:
+            event = Event.get(Event.id == event_id)
+        except DoesNotExist:
+            return None
+
+        thumbnail = get_event_thumbnail_bytes(event)
+
+        if not thumbnail:
+            return None
+
+        return self.embed_thumbnail(event_id, thumbnail)
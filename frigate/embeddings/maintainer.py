@@ -5,6 +5,7 @@ import datetime
 import json
 import logging
 import threading
+import time
 from multiprocessing.synchronize import Event as MpEvent
 from typing import Any
 
@@ -23,6 +24,7 @@ from frigate.comms.event_metadata_updater import (
 )
 from frigate.comms.events_updater import EventEndSubscriber, EventUpdateSubscriber
 from frigate.comms.inter_process import InterProcessRequestor
+from frigate.comms.poller import TopicPoller
 from frigate.comms.recordings_updater import (
     RecordingsDataSubscriber,
     RecordingsDataTypeEnum,
@@ -78,6 +80,13 @@ logger = logging.getLogger(__name__)
 
 MAX_THUMBNAILS = 10
 
+# seconds to wait for messages, bounds how long deferred results wait to be sent
+POLL_TIMEOUT = 0.1
+# seconds between publishing topic handler speeds to the shared metrics
+TOPIC_METRICS_INTERVAL = 1.0
+# seconds between removing deleted embeddings from the search indexes
+SEARCH_INDEX_PRUNE_INTERVAL = 600
+
 
 class EmbeddingMaintainer(threading.Thread):
     """Handle embedding queue and post event updates."""
@@ -283,23 +292,38 @@ class EmbeddingMaintainer(threading.Thread):
 
     def run(self) -> None:
         """Maintain a SQLite-vec database for semantic search."""
+        poller = self._create_poller()
+        last_metrics_update = 0.0
+        last_search_index_prune = time.monotonic()
+
         while not self.stop_event.is_set():
-            self.config_updater.check_for_updates()
-            self._check_enrichment_config_updates()
-            self._process_requests()
-            self._process_updates()
-            self._process_recordings_updates()
-            self._process_review_updates()
-            self._process_frame_updates()
+            poller.poll(POLL_TIMEOUT)
             self._process_deferred_results()
             self._expire_dedicated_lpr()
-            self._process_finalized()
-            self._process_event_metadata()
+
+            now = time.monotonic()
+
+            if (
+                self.metrics is not None
+                and now - last_metrics_update > TOPIC_METRICS_INTERVAL
+            ):
+                self.metrics.maintainer_topic_speeds.update(poller.speeds)
+                last_metrics_update = now
+
+            if (
+                self.embeddings is not None
+                and now - last_search_index_prune > SEARCH_INDEX_PRUNE_INTERVAL
+            ):
+                self.embeddings.prune_search_indexes()
+                last_search_index_prune = now
 
         # Shutdown deferred processors
         for processor in self.realtime_processors:
             processor.shutdown()
 
+        if self.embeddings is not None:
+            self.embeddings.save_search_indexes()
+
         self.config_updater.stop()
         self.enrichment_config_subscriber.stop()
         self.event_subscriber.stop()
@@ -312,6 +336,46 @@ class EmbeddingMaintainer(threading.Thread):
         self.requestor.stop()
         logger.info("Exiting embeddings maintenance...")
 
+    def _create_poller(self) -> TopicPoller:
+        """Dispatch each subscriber's messages as they arrive."""
+        poller = TopicPoller()
+        poller.register(
+            "camera_config",
+            self.config_updater.subscriber.socket,
+            self.config_updater.check_for_updates,
+        )
+        poller.register(
+            "enrichment_config",
+            self.enrichment_config_subscriber.socket,
+            self._check_enrichment_config_updates,
+        )
+        poller.register(
+            "requests", self.embeddings_responder.socket, self._process_requests
+        )
+        poller.register(
+            "event_updates", self.event_subscriber.socket, self._process_updates
+        )
+        poller.register(
+            "recordings",
+            self.recordings_subscriber.socket,
+            self._process_recordings_updates,
+        )
+        poller.register(
+            "reviews", self.review_subscriber.socket, self._process_review_updates
+        )
+        poller.register(
+            "frames", self.detection_subscriber.socket, self._process_frame_updates
+        )
+        poller.register(
+            "event_ends", self.event_end_subscriber.socket, self._process_finalized
+        )
+        poller.register(
+            "event_metadata",
+            self.event_metadata_subscriber.socket,
+            self._process_event_metadata,
+        )
+        return poller
+
     def _check_enrichment_config_updates(self) -> None:
         """Check for enrichment config updates and delegate to processors."""
         topic, payload = self.enrichment_config_subscriber.check_for_update()
@@ -433,12 +497,16 @@ class EmbeddingMaintainer(threading.Thread):
                         )
                     elif topic == EmbeddingsRequestEnum.generate_search.value:
                         return serialize(
-                            self.embeddings.embed_description("", data, upsert=False),
+                            self.embeddings.embed_search_query(data),
                             pack=False,
                         )
                     elif topic == EmbeddingsRequestEnum.reindex.value:
                         response = self.embeddings.start_reindex()
                         return "started" if response else "in_progress"
+                    elif topic == EmbeddingsRequestEnum.search_thumbnail.value:
+                        return self.embeddings.search("vec_thumbnails", data)
+                    elif topic == EmbeddingsRequestEnum.search_description.value:
+                        return self.embeddings.search("vec_descriptions", data)
 
                 processors = [self.realtime_processors, self.post_processors]
                 for processor_list in processors:
@@ -452,7 +520,7 @@ class EmbeddingMaintainer(threading.Thread):
             except Exception as e:
                 logger.exception(f"Unable to handle embeddings request {e}")
 
-        self.embeddings_responder.check_for_request(_handle_request)
+        self.embeddings_responder.check_for_request(_handle_request, timeout=0)
 
     def _process_updates(self) -> None:
         """Process event updates"""
@@ -698,7 +766,7 @@ class EmbeddingMaintainer(threading.Thread):
 
     def _process_frame_updates(self) -> None:
         """Process event updates"""
-        (topic, data) = self.detection_subscriber.check_for_update()
+        (topic, data) = self.detection_subscriber.check_for_update(timeout=0)
 
         if topic is None:
             return
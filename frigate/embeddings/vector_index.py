@@ -0,0 +1,328 @@
+"""In-memory index of embeddings for filtered semantic search."""
+
+import logging
+import os
+import threading
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# rows scored per matrix product, bounds the float32 copy of the vectors
+SCORE_CHUNK_SIZE = 16384
+
+
+def _pack_ids(ids: list[str]) -> np.ndarray:
+    # a fixed width unicode array would take several times the space
+    return np.frombuffer("\n".join(ids).encode(), dtype=np.uint8)
+
+
+def _unpack_ids(data: np.ndarray, count: int) -> list[str]:
+    return data.tobytes().decode().split("\n") if count else []
+
+
+class VectorIndex:
+    """Int8 quantized embeddings with the metadata search results are filtered by.
+
+    Vectors are normalized and stored as int8 with a scale per row, so the
+    cosine distance to a query, matching sqlite-vec's distance_metric=cosine,
+    is 1 - scale * (row . query). Rows are only appended, replacing or
+    removing an embedding marks its old row as deleted and deleted rows are
+    dropped when the arrays need to grow. Camera, label, zone and start time
+    are kept per row so searches only score rows that match their filters,
+    instead of searching everything and filtering the top k afterwards.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self.lock = threading.Lock()
+        self._reset(capacity)
+
+    def _reset(self, capacity: int) -> None:
+        # changed since it was loaded or saved
+        self.modified = False
+        self.count = 0
+        self.dims = 0
+        self.capacity = capacity
+        self.vectors = np.zeros((0, 0), dtype=np.int8)
+        self.scales = np.zeros(capacity, dtype=np.float32)
+        self.cameras = np.zeros(capacity, dtype=np.int32)
+        self.labels = np.zeros(capacity, dtype=np.int32)
+        self.start_times = np.zeros(capacity, dtype=np.float64)
+        self.valid = np.zeros(capacity, dtype=bool)
+        self.ids: list[str] = []
+        self.rows: dict[str, int] = {}
+        self.camera_codes: dict[str, int] = {}
+        self.label_codes: dict[str, int] = {}
+        self.zone_rows: dict[str, list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, event_id: str) -> bool:
+        return event_id in self.rows
+
+    def clear(self) -> None:
+        with self.lock:
+            self._reset(1024)
+            self.modified = True
+
+    def upsert(
+        self,
+        items: Sequence[tuple[str, np.ndarray | Sequence[float], dict[str, Any]]],
+    ) -> None:
+        """Add or replace embeddings.
+
+        Each item is (event_id, embedding, metadata) where metadata has the
+        event's camera, label, zones and start_time.
+        """
+        if not items:
+            return
+
+        vectors = np.asarray([item[1] for item in items], dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.maximum(norms, 1e-12)
+        scales = np.abs(vectors).max(axis=1) / 127
+        quantized = np.rint(vectors / np.maximum(scales, 1e-12)[:, None]).astype(
+            np.int8
+        )
+
+        with self.lock:
+            if not self.dims:
+                self.dims = vectors.shape[1]
+                self.vectors = np.zeros((self.capacity, self.dims), dtype=np.int8)
+
+            if self.count + len(items) > self.capacity:
+                self._make_room(len(items))
+
+            for i, (event_id, _, metadata) in enumerate(items):
+                row = self.count
+                previous = self.rows.get(event_id)
+
+                if previous is not None:
+                    self.valid[previous] = False
+
+                self.vectors[row] = quantized[i]
+                self.scales[row] = scales[i]
+                self.cameras[row] = self._code(self.camera_codes, metadata["camera"])
+                self.labels[row] = self._code(self.label_codes, metadata["label"])
+                self.start_times[row] = metadata["start_time"]
+                self.valid[row] = True
+
+                for zone in metadata.get("zones") or []:
+                    self.zone_rows.setdefault(zone, []).append(row)
+
+                self.ids.append(event_id)
+                self.rows[event_id] = row
+                self.count += 1
+
+            self.modified = True
+
+    def remove(self, event_ids: Iterable[str]) -> None:
+        with self.lock:
+            for event_id in event_ids:
+                row = self.rows.pop(event_id, None)
+
+                if row is not None:
+                    self.valid[row] = False
+                    self.modified = True
+
+    @staticmethod
+    def _code(codes: dict[str, int], value: str) -> int:
+        code = codes.get(value)
+
+        if code is None:
+            code = codes[value] = len(codes)
+
+        return code
+
+    def _make_room(self, required: int) -> None:
+        live = len(self.rows)
+
+        # only grow once at least half of the rows are live
+        while live + required > self.capacity // 2:
+            self.capacity *= 2
+
+        self._compact(self.capacity)
+
+    def _compact(self, capacity: int) -> None:
+        keep = np.flatnonzero(self.valid[: self.count])
+        new_rows = np.full(self.count, -1, dtype=np.int64)
+        new_rows[keep] = np.arange(len(keep))
+
+        def resized(array: np.ndarray) -> np.ndarray:
+            result = np.zeros((capacity, *array.shape[1:]), dtype=array.dtype)
+            result[: len(keep)] = array[keep]
+            return result
+
+        # replaced rather than modified, searches may be scoring the old arrays
+        self.vectors = resized(self.vectors)
+        self.scales = resized(self.scales)
+        self.cameras = resized(self.cameras)
+        self.labels = resized(self.labels)
+        self.start_times = resized(self.start_times)
+        self.valid = resized(self.valid)
+        self.ids = [self.ids[row] for row in keep]
+        self.rows = {event_id: row for row, event_id in enumerate(self.ids)}
+
+        zone_rows: dict[str, list[int]] = {}
+
+        for zone, rows in self.zone_rows.items():
+            remapped = new_rows[rows]
+            remapped = remapped[remapped >= 0]
+
+            if len(remapped):
+                zone_rows[zone] = remapped.tolist()
+
+        self.zone_rows = zone_rows
+        self.count = len(keep)
+
+    def search(
+        self,
+        query: np.ndarray | Sequence[float],
+        k: int,
+        cameras: list[str] | None = None,
+        labels: list[str] | None = None,
+        zones: list[str] | None = None,
+        after: float | None = None,
+        before: float | None = None,
+    ) -> list[tuple[str, float]]:
+        """The k nearest embeddings to query that match all of the filters.
+
+        Returns (event_id, cosine distance) sorted by distance. Events match
+        when their camera and label are in the lists, they were in any of
+        the zones and after <= start_time <= before.
+        """
+        with self.lock:
+            count = self.count
+
+            if not count or k <= 0:
+                return []
+
+            mask = self.valid[:count].copy()
+
+            if cameras is not None:
+                codes = [
+                    self.camera_codes[c] for c in cameras if c in self.camera_codes
+                ]
+                mask &= np.isin(self.cameras[:count], codes)
+
+            if labels is not None:
+                codes = [
+                    self.label_codes[label]
+                    for label in labels
+                    if label in self.label_codes
+                ]
+                mask &= np.isin(self.labels[:count], codes)
+
+            if zones is not None:
+                in_zones = np.zeros(count, dtype=bool)
+
+                for zone in zones:
+                    in_zones[self.zone_rows.get(zone, [])] = True
+
+                mask &= in_zones
+
+            if after is not None:
+                mask &= self.start_times[:count] >= after
+
+            if before is not None:
+                mask &= self.start_times[:count] <= before
+
+            # rows below count are never modified, score them without the lock
+            vectors = self.vectors
+            scales = self.scales
+            ids = self.ids
+
+        rows = np.flatnonzero(mask)
+
+        if not len(rows):
+            return []
+
+        query = np.asarray(query, dtype=np.float32)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+        scores = np.empty(len(rows), dtype=np.float32)
+
+        for start in range(0, len(rows), SCORE_CHUNK_SIZE):
+            chunk = rows[start : start + SCORE_CHUNK_SIZE]
+            scores[start : start + len(chunk)] = (
+                vectors[chunk].astype(np.float32) @ query
+            ) * scales[chunk]
+
+        if k < len(rows):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(rows))
+
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(ids[rows[i]], float(1 - scores[i])) for i in top]
+
+    def save(self, path: str) -> None:
+        """Write the index to disk, deleted rows are dropped first."""
+        with self.lock:
+            self._compact(self.capacity)
+            count = self.count
+            zones = list(self.zone_rows)
+            zone_rows = [self.zone_rows[zone] for zone in zones]
+            temp_path = f"{path}.tmp"
+
+            with open(temp_path, "wb") as f:
+                np.savez(
+                    f,
+                    dims=np.array(self.dims),
+                    vectors=self.vectors[:count],
+                    scales=self.scales[:count],
+                    cameras=self.cameras[:count],
+                    labels=self.labels[:count],
+                    start_times=self.start_times[:count],
+                    ids=_pack_ids(self.ids),
+                    camera_names=np.array(list(self.camera_codes), dtype=np.str_),
+                    label_names=np.array(list(self.label_codes), dtype=np.str_),
+                    zone_names=np.array(zones, dtype=np.str_),
+                    zone_offsets=np.cumsum([len(r) for r in zone_rows], dtype=np.int64),
+                    zone_rows=np.fromiter(
+                        (row for rows in zone_rows for row in rows), dtype=np.int64
+                    ),
+                )
+
+            os.replace(temp_path, path)
+            self.modified = False
+
+    @classmethod
+    def load(cls, path: str) -> "VectorIndex | None":
+        """Read an index written by save, None if it is missing or unreadable."""
+        try:
+            with np.load(path) as data:
+                count = len(data["scales"])
+                index = cls(max(1024, count * 2))
+                index.dims = int(data["dims"])
+                index.vectors = np.zeros((index.capacity, index.dims), dtype=np.int8)
+
+                if count:
+                    index.vectors[:count] = data["vectors"]
+                    index.scales[:count] = data["scales"]
+                    index.cameras[:count] = data["cameras"]
+                    index.labels[:count] = data["labels"]
+                    index.start_times[:count] = data["start_times"]
+                    index.valid[:count] = True
+
+                index.ids = _unpack_ids(data["ids"], count)
+                cameras = data["camera_names"].tolist()
+                labels = data["label_names"].tolist()
+                zones = data["zone_names"].tolist()
+                zone_rows = np.split(data["zone_rows"], data["zone_offsets"][:-1])
+        except FileNotFoundError:
+            return None
+        except (OSError, KeyError, ValueError, UnicodeDecodeError) as e:
+            logger.warning(f"Unable to load search index {path}: {e}")
+            return None
+
+        index.count = count
+        index.rows = {event_id: row for row, event_id in enumerate(index.ids)}
+        index.camera_codes = {name: code for code, name in enumerate(cameras)}
+        index.label_codes = {name: code for code, name in enumerate(labels)}
+        index.zone_rows = {
+            zone: rows.tolist() for zone, rows in zip(zones, zone_rows) if len(rows)
+        }
+        return index
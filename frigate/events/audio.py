@@ -2,15 +2,23 @@
 
 import datetime
 import logging
+import os
+import queue
 import subprocess
 import threading
 import time
+from concurrent.futures import Future
 from multiprocessing.managers import DictProxy
 from multiprocessing.synchronize import Event as MpEvent
 from typing import Any
 
 import numpy as np
 
+from frigate.camera import AudioMetrics
+from frigate.comms.audio_telemetry import (
+    AudioTelemetryPublisher,
+    AudioTelemetryTypeEnum,
+)
 from frigate.comms.detections_updater import DetectionPublisher, DetectionTypeEnum
 from frigate.comms.inter_process import InterProcessRequestor
 from frigate.config import CameraConfig, CameraInput, FrigateConfig
@@ -25,9 +33,7 @@ from frigate.const import (
     AUDIO_MAX_BIT_RANGE,
     AUDIO_MIN_CONFIDENCE,
     AUDIO_SAMPLE_RATE,
-    EXPIRE_AUDIO_ACTIVITY,
     PROCESS_PRIORITY_HIGH,
-    UPDATE_AUDIO_ACTIVITY,
 )
 from frigate.data_processing.common.audio_transcription.model import (
     AudioTranscriptionModelRunner,
@@ -49,6 +55,14 @@ except ModuleNotFoundError:
 
 logger = logging.getLogger(__name__)
 
+# cameras share a pool of interpreters that grows while windows are waiting
+# for one, each interpreter handles about AUDIO_DURATION / inference time
+# cameras so a few are enough for many cameras
+AUDIO_MAX_INTERPRETERS = 4
+AUDIO_CLASSIFY_TIMEOUT = 10
+# seconds between warnings when windows keep waiting with every interpreter busy
+AUDIO_BACKLOG_WARNING_INTERVAL = 60
+
 
 def get_ffmpeg_command(ffmpeg: CameraFfmpegConfig) -> list[str]:
     ffmpeg_input: CameraInput = [i for i in ffmpeg.inputs if "audio" in i.roles][0]
@@ -85,6 +99,7 @@ class AudioProcessor(FrigateProcess):
         self,
         config: FrigateConfig,
         camera_metrics: DictProxy,
+        audio_metrics: AudioMetrics | None,
         stop_event: MpEvent,
     ):
         super().__init__(
@@ -92,7 +107,9 @@ class AudioProcessor(FrigateProcess):
         )
 
         self.camera_metrics = camera_metrics
+        self.audio_metrics = audio_metrics
         self.config = config
+        self.classifier: AudioClassifier | None = None
 
     def __stop_audio_thread(self, camera: str) -> None:
         thread = self.audio_threads.pop(camera, None)
@@ -145,10 +162,19 @@ class AudioProcessor(FrigateProcess):
             # ffmpeg update may not have arrived yet; wait for next poll
             if not any("audio" in i.roles for i in camera.ffmpeg.inputs):
                 return
+            # the model is shared by all cameras, load it with the first one
+            if self.classifier is None:
+                self.classifier = AudioClassifier(
+                    self.stop_event,  # type: ignore[arg-type]
+                    max(c.audio.num_threads for c in self.config.cameras.values()),
+                    self.audio_metrics,
+                )
+                self.classifier.start()
             thread = AudioEventMaintainer(
                 camera,
                 self.config,
                 self.camera_metrics,
+                self.classifier,
                 self.transcription_model_runner,
                 self.stop_event,  # type: ignore[arg-type]
             )
@@ -189,6 +215,9 @@ class AudioProcessor(FrigateProcess):
             if thread.is_alive():
                 self.logger.warning(f"Thread {thread.name} is still alive")
 
+        if self.classifier is not None:
+            self.classifier.join(10)
+
         self.logger.info("Exiting audio processor")
 
 
@@ -198,6 +227,7 @@ class AudioEventMaintainer(threading.Thread):
         camera: CameraConfig,
         config: FrigateConfig,
         camera_metrics: DictProxy,
+        classifier: "AudioClassifier",
         audio_transcription_model_runner: AudioTranscriptionModelRunner | None,
         stop_event: threading.Event,
     ) -> None:
@@ -210,7 +240,7 @@ class AudioEventMaintainer(threading.Thread):
         # per-camera stop signal so a single maintainer can be torn down at
         # runtime (e.g. on camera removal) without stopping the whole process
         self.camera_stop_event = threading.Event()
-        self.detector = AudioTfl(stop_event, self.camera_config.audio.num_threads)
+        self.classifier = classifier
         self.shape = (int(round(AUDIO_DURATION * AUDIO_SAMPLE_RATE)),)
         self.chunk_size = int(round(AUDIO_DURATION * AUDIO_SAMPLE_RATE * 2))
         self.logger = logging.getLogger(f"audio.{self.camera_config.name}")
@@ -233,6 +263,7 @@ class AudioEventMaintainer(threading.Thread):
             ],
         )
         self.detection_publisher = DetectionPublisher(DetectionTypeEnum.audio.value)
+        self.telemetry_publisher = AudioTelemetryPublisher()
 
         if (
             self.camera_config.audio_transcription.enabled
@@ -278,7 +309,7 @@ class AudioEventMaintainer(threading.Thread):
         if rms >= self.camera_config.audio.min_volume:
             # create waveform relative to max range and look for detections
             waveform = (audio / AUDIO_MAX_BIT_RANGE).astype(np.float32)
-            model_detections = self.detector.detect(waveform)
+            model_detections = self.classifier.classify(waveform)
 
             for label, score, _ in model_detections:
                 self.logger.debug(
@@ -303,10 +334,10 @@ class AudioEventMaintainer(threading.Thread):
                 )
             )
 
-        # send audio activity update
-        self.requestor.send_data(
-            UPDATE_AUDIO_ACTIVITY,
-            {self.camera_config.name: {"detections": audio_detections}},
+        # send audio levels and activity, the dispatcher handles these in batches
+        self.telemetry_publisher.publish(
+            (self.camera_config.name, rms, dBFS, audio_detections),
+            AudioTelemetryTypeEnum.levels.value,
         )
 
         # run audio transcription
@@ -334,9 +365,6 @@ class AudioEventMaintainer(threading.Thread):
         else:
             dBFS = 0
 
-        self.requestor.send_data(f"{self.camera_config.name}/audio/dBFS", float(dBFS))
-        self.requestor.send_data(f"{self.camera_config.name}/audio/rms", float(rms))
-
         return float(rms), float(dBFS)
 
     def start_or_restart_ffmpeg(self) -> None:
@@ -408,8 +436,8 @@ class AudioEventMaintainer(threading.Thread):
                     self.logger.debug(
                         f"Disabling audio detections for {self.camera_config.name}, ending events"
                     )
-                    self.requestor.send_data(
-                        EXPIRE_AUDIO_ACTIVITY, self.camera_config.name
+                    self.telemetry_publisher.publish(
+                        self.camera_config.name, AudioTelemetryTypeEnum.expire.value
                     )
 
                     if self.audio_listener:
@@ -429,8 +457,8 @@ class AudioEventMaintainer(threading.Thread):
                     self.logger.debug(
                         f"Disabling audio detections for {self.camera_config.name}, ending events"
                     )
-                    self.requestor.send_data(
-                        EXPIRE_AUDIO_ACTIVITY, self.camera_config.name
+                    self.telemetry_publisher.publish(
+                        self.camera_config.name, AudioTelemetryTypeEnum.expire.value
                     )
                 self.was_audio_enabled = audio_enabled
 
@@ -448,6 +476,148 @@ class AudioEventMaintainer(threading.Thread):
         self.requestor.stop()
         self.config_subscriber.stop()
         self.detection_publisher.stop()
+        self.telemetry_publisher.stop()
+
+
+class AudioClassifier:
+    """Classify audio from all cameras with a shared pool of interpreters.
+
+    Camera readers submit waveform windows and wait for the detections. The
+    pool starts with one interpreter and another is added whenever more
+    windows are waiting than there are interpreters, up to max_interpreters.
+    """
+
+    def __init__(
+        self,
+        stop_event: threading.Event,
+        num_threads: int,
+        metrics: AudioMetrics | None,
+        max_interpreters: int | None = None,
+    ) -> None:
+        self.stop_event = stop_event
+        self.num_threads = num_threads
+        self.metrics = metrics
+        self.max_interpreters = max_interpreters or min(
+            AUDIO_MAX_INTERPRETERS, max(1, (os.cpu_count() or 4) // num_threads)
+        )
+        self.workers: list[threading.Thread] = []
+        self.workers_lock = threading.Lock()
+        self.last_backlog_warning = 0.0
+        self.requests: queue.Queue[
+            tuple[
+                np.ndarray,
+                Future[list[tuple[str, float, tuple[float, float, float, float]]]],
+            ]
+        ] = queue.Queue()
+
+    def start(self) -> None:
+        self._add_interpreter()
+
+    def join(self, timeout: float | None = None) -> None:
+        for worker in list(self.workers):
+            worker.join(timeout)
+
+    def is_alive(self) -> bool:
+        return any(worker.is_alive() for worker in self.workers)
+
+    def _add_interpreter(self) -> None:
+        with self.workers_lock:
+            if len(self.workers) >= self.max_interpreters:
+                return
+
+            worker = threading.Thread(
+                target=self._run,
+                name=f"audio_classifier:{len(self.workers)}",
+                daemon=True,
+            )
+            self.workers.append(worker)
+
+        worker.start()
+
+        if self.metrics is not None:
+            self.metrics.interpreters.value = len(self.workers)
+
+    def classify(
+        self, waveform: np.ndarray
+    ) -> list[tuple[str, float, tuple[float, float, float, float]]]:
+        """Queue a window for the next free interpreter and wait for its detections."""
+        if self.stop_event.is_set():
+            return []
+
+        future: Future[list[tuple[str, float, tuple[float, float, float, float]]]] = (
+            Future()
+        )
+        self.requests.put((waveform, future))
+        self._check_backlog()
+
+        try:
+            return future.result(timeout=AUDIO_CLASSIFY_TIMEOUT)
+        except TimeoutError:
+            logger.warning("Timed out waiting for audio classification")
+            return []
+
+    def _check_backlog(self) -> None:
+        waiting = self.requests.qsize()
+
+        if self.metrics is not None:
+            self.metrics.queue_depth.value = waiting
+
+        if waiting <= len(self.workers):
+            return
+
+        if len(self.workers) < self.max_interpreters:
+            self._add_interpreter()
+            return
+
+        now = time.monotonic()
+
+        if now - self.last_backlog_warning > AUDIO_BACKLOG_WARNING_INTERVAL:
+            self.last_backlog_warning = now
+            logger.warning(
+                f"Audio classification is falling behind, {waiting} windows are "
+                f"waiting for {len(self.workers)} interpreters. Consider "
+                "disabling audio detection on some cameras."
+            )
+
+    def _classify_window(
+        self,
+        detector: "AudioTfl",
+        waveform: np.ndarray,
+        future: Future[list[tuple[str, float, tuple[float, float, float, float]]]],
+    ) -> None:
+        start = time.monotonic()
+
+        try:
+            future.set_result(detector.detect(waveform))
+        except Exception:
+            logger.exception("Error classifying audio")
+            future.set_result([])
+
+        if self.metrics is not None:
+            duration = time.monotonic() - start
+            self.metrics.inference_speed.value = (
+                self.metrics.inference_speed.value * 9 + duration
+            ) / 10
+
+    def _run(self) -> None:
+        detector = AudioTfl(self.stop_event, self.num_threads)
+
+        while not self.stop_event.is_set():
+            try:
+                waveform, future = self.requests.get(timeout=1)
+            except queue.Empty:
+                continue
+
+            self._classify_window(detector, waveform, future)
+
+        # release any readers that are still waiting
+        while True:
+            try:
+                _, future = self.requests.get_nowait()
+            except queue.Empty:
+                break
+
+            future.set_result([])
 
 
 class AudioTfl:
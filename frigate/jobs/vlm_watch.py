@@ -130,7 +130,10 @@ class VLMWatchRunner(threading.Thread):
             )
             return 30
 
-        frame = self.frame_processor.get_current_frame(self.job.camera, {})
+        # Frame downscaled to 480p max height
+        frame = self.frame_processor.get_current_frame(
+            self.job.camera, {}, max_height=480
+        )
         if frame is None:
             logger.debug(
                 "VLM watch job %s: frame unavailable for camera %s",
@@ -140,14 +143,6 @@ class VLMWatchRunner(threading.Thread):
             self.job.last_reasoning = "Camera frame unavailable"
             return 10
 
-        # Downscale frame to 480p max height
-        h, w = frame.shape[:2]
-        if h > 480:
-            scale = 480.0 / h
-            frame = cv2.resize(
-                frame, (int(w * scale), 480), interpolation=cv2.INTER_AREA
-            )
-
         _, enc = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
         b64 = base64.b64encode(enc.tobytes()).decode()
 
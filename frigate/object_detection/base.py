@@ -17,7 +17,7 @@ from frigate.comms.object_detector_signaler import (
     ObjectDetectorSubscriber,
 )
 from frigate.config import FrigateConfig
-from frigate.const import PROCESS_PRIORITY_HIGH
+from frigate.const import MAX_DETECTION_BATCH_SIZE, PROCESS_PRIORITY_HIGH
 from frigate.detectors import create_detector
 from frigate.detectors.detector_config import (
     BaseDetectorConfig,
@@ -33,6 +33,18 @@ from .util import tensor_transform
 logger = logging.getLogger(__name__)
 
 
+def parse_detection_request(request: str | tuple[str, int]) -> tuple[str, int]:
+    """Split a detection queue entry into its connection id and batch size.
+
+    Single region requests are sent as the bare connection id, batched
+    requests as a (connection id, number of filled input slots) tuple.
+    """
+    if isinstance(request, tuple):
+        return request[0], request[1]
+
+    return request, 1
+
+
 class ObjectDetector(ABC):
     @abstractmethod
     def detect(self, tensor_input: np.ndarray, threshold: float = 0.4) -> list:
@@ -100,11 +112,22 @@ class LocalObjectDetector(BaseLocalDetector):
         tensor_input = self._transform_input(tensor_input)
         return self.detect_api.detect_raw(tensor_input=tensor_input)  # type: ignore[no-any-return]
 
+    def detect_raw_batch(self, tensor_input: np.ndarray) -> np.ndarray:
+        tensor_input = self._transform_input(tensor_input)
+        return self.detect_api.detect_raw_batch(tensor_input=tensor_input)  # type: ignore[no-any-return]
+
 
 class AsyncLocalObjectDetector(BaseLocalDetector):
-    def async_send_input(self, tensor_input: np.ndarray, connection_id: str) -> None:
+    def async_send_input(
+        self, tensor_input: np.ndarray, request_id: tuple[str, int]
+    ) -> None:
+        """Send one frame of a batch to the accelerator.
+
+        The request_id is the (connection_id, slot) the frame came from, it is
+        returned with the frame's detections.
+        """
         tensor_input = self._transform_input(tensor_input)
-        self.detect_api.send_input(connection_id, tensor_input)
+        self.detect_api.send_input(request_id, tensor_input)
 
     def async_receive_output(self) -> Any:
         return self.detect_api.receive_output()
@@ -133,7 +156,9 @@ class DetectorRunner(FrigateProcess):
 
     def create_output_shm(self, name: str) -> None:
         out_shm = UntrackedSharedMemory(name=f"out-{name}", create=False)
-        out_np: np.ndarray = np.ndarray((20, 6), dtype=np.float32, buffer=out_shm.buf)
+        out_np: np.ndarray = np.ndarray(
+            (MAX_DETECTION_BATCH_SIZE, 20, 6), dtype=np.float32, buffer=out_shm.buf
+        )
         self.outputs[name] = {"shm": out_shm, "np": out_np}
 
     def run(self) -> None:
@@ -148,38 +173,54 @@ class DetectorRunner(FrigateProcess):
 
         while not self.stop_event.is_set():
             try:
-                connection_id = self.detection_queue.get(timeout=1)
+                connection_id, batch_size = parse_detection_request(
+                    self.detection_queue.get(timeout=1)
+                )
             except queue.Empty:
                 continue
-            input_frame = frame_manager.get(
+            input_frames = frame_manager.get(
                 connection_id,
                 (
-                    1,
+                    MAX_DETECTION_BATCH_SIZE,
                     self.detector_config.model.height,  # type: ignore[union-attr]
                     self.detector_config.model.width,  # type: ignore[union-attr]
                     3,
                 ),
             )
 
-            if input_frame is None:
+            if input_frames is None:
                 logger.warning(f"Failed to get frame {connection_id} from SHM")
                 continue
 
             # detect and send the output
             self.start_time.value = datetime.datetime.now().timestamp()
             mono_start = time.monotonic()
-            detections = object_detector.detect_raw(input_frame)
+
+            if batch_size == 1:
+                detections = object_detector.detect_raw(input_frames[0:1])
+            else:
+                detections = object_detector.detect_raw_batch(
+                    input_frames[0:batch_size]
+                )
+
             duration = time.monotonic() - mono_start
             frame_manager.close(connection_id)
 
             if connection_id not in self.outputs:
                 self.create_output_shm(connection_id)
 
-            self.outputs[connection_id]["np"][:] = detections[:]
+            if batch_size == 1:
+                self.outputs[connection_id]["np"][0][:] = detections[:]
+            else:
+                self.outputs[connection_id]["np"][0:batch_size] = detections[:]
+
             detector_publisher.publish(connection_id)
             self.start_time.value = 0.0
 
-            self.avg_speed.value = (self.avg_speed.value * 9 + duration) / 10
+            # report the time per region so batched requests are comparable
+            self.avg_speed.value = (
+                self.avg_speed.value * 9 + duration / batch_size
+            ) / 10
 
         detector_publisher.stop()
         logger.info("Exited detection process...")
@@ -209,48 +250,61 @@ class AsyncDetectorRunner(FrigateProcess):
         self._publisher: ObjectDetectorPublisher | None = None
         self._detector: AsyncLocalObjectDetector | None = None
         self.send_times: deque[float] = deque()
+        # number of outstanding results for each batched request
+        self.pending_slots: dict[str, int] = {}
 
     def create_output_shm(self, name: str) -> None:
         out_shm = UntrackedSharedMemory(name=f"out-{name}", create=False)
-        out_np: np.ndarray = np.ndarray((20, 6), dtype=np.float32, buffer=out_shm.buf)
+        out_np: np.ndarray = np.ndarray(
+            (MAX_DETECTION_BATCH_SIZE, 20, 6), dtype=np.float32, buffer=out_shm.buf
+        )
         self.outputs[name] = {"shm": out_shm, "np": out_np}
 
     def _detect_worker(self) -> None:
         logger.info("Starting Detect Worker Thread")
         while not self.stop_event.is_set():
             try:
-                connection_id = self.detection_queue.get(timeout=1)
+                connection_id, batch_size = parse_detection_request(
+                    self.detection_queue.get(timeout=1)
+                )
             except queue.Empty:
                 continue
 
             assert self._frame_manager is not None
-            input_frame = self._frame_manager.get(
+            input_frames = self._frame_manager.get(
                 connection_id,
                 (
-                    1,
+                    MAX_DETECTION_BATCH_SIZE,
                     self.detector_config.model.height,  # type: ignore[union-attr]
                     self.detector_config.model.width,  # type: ignore[union-attr]
                     3,
                 ),
             )
 
-            if input_frame is None:
+            if input_frames is None:
                 logger.warning(f"Failed to get frame {connection_id} from SHM")
                 continue
 
-            # mark start time and send to accelerator
-            self.send_times.append(time.perf_counter())
+            self.pending_slots[connection_id] = batch_size
+
+            # each slot is sent to the accelerator as its own input and the
+            # results are collected again in the result worker
             assert self._detector is not None
-            self._detector.async_send_input(input_frame, connection_id)
+            for slot in range(batch_size):
+                # mark start time and send to accelerator
+                self.send_times.append(time.perf_counter())
+                self._detector.async_send_input(
+                    input_frames[slot : slot + 1], (connection_id, slot)
+                )
 
     def _result_worker(self) -> None:
         logger.info("Starting Result Worker Thread")
         while not self.stop_event.is_set():
             assert self._detector is not None
-            connection_id, detections = self._detector.async_receive_output()
+            request_id, detections = self._detector.async_receive_output()
 
             # Handle timeout case (queue.Empty) - just continue
-            if connection_id is None:
+            if request_id is None:
                 continue
 
             if not self.send_times:
@@ -259,16 +313,29 @@ class AsyncDetectorRunner(FrigateProcess):
             ts = self.send_times.popleft()
             duration = time.perf_counter() - ts
 
-            # release input buffer
-            assert self._frame_manager is not None
-            self._frame_manager.close(connection_id)
+            connection_id, slot = request_id
 
             if connection_id not in self.outputs:
                 self.create_output_shm(connection_id)
 
-            # write results and publish
+            # write results for this slot
             if detections is not None:
-                self.outputs[connection_id]["np"][:] = detections[:]
+                self.outputs[connection_id]["np"][slot][:] = detections[:]
+
+            remaining = self.pending_slots.get(connection_id, 1) - 1
+
+            if remaining > 0:
+                self.pending_slots[connection_id] = remaining
+                self.avg_speed.value = (self.avg_speed.value * 9 + duration) / 10
+                continue
+
+            self.pending_slots.pop(connection_id, None)
+
+            # release input buffer once every slot has been processed
+            assert self._frame_manager is not None
+            self._frame_manager.close(connection_id)
+
+            # publish the completed request
             assert self._publisher is not None
             self._publisher.publish(connection_id)
 
@@ -399,22 +466,45 @@ class RemoteObjectDetector:
         self.stop_event = stop_event
         self.shm = UntrackedSharedMemory(name=self.name, create=False)
         self.np_shm: np.ndarray = np.ndarray(
-            (1, model_config.height, model_config.width, 3),
+            (MAX_DETECTION_BATCH_SIZE, model_config.height, model_config.width, 3),
             dtype=np.uint8,
             buffer=self.shm.buf,
         )
         self.out_shm = UntrackedSharedMemory(name=f"out-{self.name}", create=False)
         self.out_np_shm: np.ndarray = np.ndarray(
-            (20, 6), dtype=np.float32, buffer=self.out_shm.buf
+            (MAX_DETECTION_BATCH_SIZE, 20, 6), dtype=np.float32, buffer=self.out_shm.buf
         )
         self.detector_subscriber = ObjectDetectorSubscriber(name)
 
     def detect(self, tensor_input: np.ndarray, threshold: float = 0.4) -> list:
-        detections: list = []
+        return self.detect_batch([tensor_input], threshold)[0]
+
+    def detect_batch(
+        self, tensor_inputs: list[np.ndarray], threshold: float = 0.4
+    ) -> list[list]:
+        """Run detection on multiple regions of the same frame.
+
+        Regions are written to the input slots and sent as a single request,
+        so a frame only waits on one round trip per MAX_DETECTION_BATCH_SIZE
+        regions. Returns the detections for each input in order.
+        """
+        results: list[list] = []
+
+        for start in range(0, len(tensor_inputs), MAX_DETECTION_BATCH_SIZE):
+            batch = tensor_inputs[start : start + MAX_DETECTION_BATCH_SIZE]
 
-        if self.stop_event.is_set():
-            return detections
+            if self.stop_event.is_set() or not self._request(batch):
+                results.extend([[] for _ in batch])
+                continue
+
+            for slot in range(len(batch)):
+                results.append(self._parse_output(slot, threshold))
+                self.fps.update()
+
+        return results
 
+    def _request(self, batch: list[np.ndarray]) -> bool:
+        """Send the batch to the detector and wait for the results."""
         # Drain any stale detection results from the ZMQ buffer before making a new request
         # This prevents reading detection results from a previous request
         # NOTE: This should never happen, but can in some rare cases
@@ -425,21 +515,27 @@ class RemoteObjectDetector:
                 break
 
         # copy input to shared memory
-        self.np_shm[:] = tensor_input[:]
-        self.detection_queue.put(self.name)
-        result = self.detector_subscriber.check_for_update()
+        for slot, tensor_input in enumerate(batch):
+            self.np_shm[slot] = tensor_input[0]
+
+        if len(batch) == 1:
+            self.detection_queue.put(self.name)
+        else:
+            self.detection_queue.put((self.name, len(batch)))
 
-        # if it timed out
-        if result is None:
-            return detections
+        # None means it timed out
+        return self.detector_subscriber.check_for_update() is not None
 
-        for d in self.out_np_shm:
+    def _parse_output(self, slot: int, threshold: float) -> list:
+        detections = []
+
+        for d in self.out_np_shm[slot]:
             if d[1] < threshold:
                 break
             detections.append(
                 (self.labels[int(d[0])], float(d[1]), (d[2], d[3], d[4], d[5]))
             )
-        self.fps.update()
+
         return detections
 
     def cleanup(self) -> None:
@@ -27,6 +27,9 @@ from frigate.util.image import (
 
 logger = logging.getLogger(__name__)
 
+# birdseye is output at up to 10 fps
+OUTPUT_INTERVAL = 1 / 10
+
 
 def get_standard_aspect_ratio(width: int, height: int) -> tuple[int, int]:
     """Ensure that only standard aspect ratios are used."""
@@ -336,6 +339,10 @@ class BirdsEyeFrameManager:
         self.camera_layout: list[Any] = []
         self.active_cameras: set[str] = set()
         self.layout_camera_order: list[str] = []
+        # (x, y, width, height) of each camera in the layout
+        self.layout_positions: dict[str, tuple[int, int, int, int]] = {}
+        # cameras with a tile that hasn't been drawn on the frame yet
+        self.dirty_cameras: set[str] = set()
         self.last_output_time = 0.0
 
     def add_camera(self, cam: str) -> None:
@@ -357,7 +364,13 @@ class BirdsEyeFrameManager:
                 settings.detect.height,
             ],
             "last_active_frame": 0.0,
-            "current_frame": 0.0,
+            # copy of the latest frame, only kept while the camera is active
+            # but not in the layout so it can be drawn when it's added
+            "current_frame": None,
+            "current_frame_copy_time": 0.0,
+            # latest frame scaled to the camera's position in the layout
+            "tile": None,
+            "tile_channel_dims": None,
             "layout_frame": 0.0,
             "channel_dims": {
                 "y": y,
@@ -373,6 +386,8 @@ class BirdsEyeFrameManager:
         if cam in self.cameras:
             del self.cameras[cam]
 
+        self.dirty_cameras.discard(cam)
+
     def sort_cameras(self, cameras: set[str]) -> list[str]:
         """Sort cameras by birdseye order, falling back to name when tied."""
         return sorted(
@@ -383,30 +398,87 @@ class BirdsEyeFrameManager:
     def clear_frame(self) -> None:
         logger.debug("Clearing the birdseye frame")
         self.frame[:] = self.blank_frame
+        # the tiles need to be drawn again
+        self.dirty_cameras = set(self.layout_positions)
 
-    def copy_to_position(
-        self,
-        position: Any,
-        camera: str | None = None,
-        frame: np.ndarray | None = None,
+    def render_tile(
+        self, camera: str, frame: np.ndarray, channel_dims: dict[str, Any]
     ) -> None:
-        if camera is None:
-            frame = None
-            channel_dims = None
-        else:
-            if frame is None:
-                logger.debug(f"Unable to copy frame {camera} to birdseye.")
-                return
+        """Scale a frame to the size of the camera's position in the layout."""
+        _, _, width, height = self.layout_positions[camera]
+        camera_data = self.cameras[camera]
+        tile = camera_data["tile"]
+        # the size of the position's yuv crop, so the tile can be copied as is
+        width = width // 2 * 2
+        height = height // 4 * 4
+
+        if width <= 0 or height <= 0:
+            return
+
+        # a new buffer when rescaling the previous tile, copying clears the destination
+        if tile is None or tile is frame or tile.shape != (height * 3 // 2, width):
+            tile = np.empty((height * 3 // 2, width), np.uint8)
+            camera_data["tile"] = tile
+            camera_data["tile_channel_dims"] = dict(
+                zip(
+                    ["y", "u1", "u2", "v1", "v2"],
+                    get_yuv_crop(tile.shape, (0, 0, width, height)),
+                )
+            )
 
-            channel_dims = self.cameras[camera]["channel_dims"]
+        copy_yuv_to_position(tile, [0, 0], [height, width], frame, channel_dims)
+        self.dirty_cameras.add(camera)
 
-        copy_yuv_to_position(
-            self.frame,
-            [position[1], position[0]],
-            [position[3], position[2]],
-            frame,
-            channel_dims,
-        )
+    def place_tiles(self) -> None:
+        """Scale the cameras to their positions in a new layout."""
+        self.layout_positions = {
+            camera: position for row in self.camera_layout for camera, position in row
+        }
+        self.dirty_cameras = set()
+
+        for camera in self.layout_positions:
+            camera_data = self.cameras[camera]
+            frame = camera_data["current_frame"]
+
+            if frame is not None and frame.size > 0:
+                self.render_tile(camera, frame, camera_data["channel_dims"])
+            elif camera_data["tile"] is not None:
+                # rescale the camera's tile from the previous layout until
+                # its next frame arrives
+                self.render_tile(
+                    camera, camera_data["tile"], camera_data["tile_channel_dims"]
+                )
+
+            camera_data["current_frame"] = None
+
+    def draw_dirty_tiles(self) -> bool:
+        """Copy the tiles that changed onto the frame, returns if any were drawn."""
+        drawn = False
+
+        for camera in self.dirty_cameras:
+            position = self.layout_positions.get(camera)
+            camera_data = self.cameras.get(camera)
+
+            if position is None or camera_data is None or camera_data["tile"] is None:
+                continue
+
+            # the tile is already scaled, its planes are copied to the position
+            tile = camera_data["tile"]
+            x, y = position[0], position[1]
+            destination = get_yuv_crop(
+                self.frame.shape,
+                (x, y, x + tile.shape[1], y + tile.shape[0] // 3 * 2),
+            )
+
+            for (dx1, dy1, dx2, dy2), (sx1, sy1, sx2, sy2) in zip(
+                destination, camera_data["tile_channel_dims"].values()
+            ):
+                self.frame[dy1:dy2, dx1:dx2] = tile[sy1:sy2, sx1:sx2]
+
+            drawn = True
+
+        self.dirty_cameras = set()
+        return drawn
 
     def camera_active(
         self, mode: Any, object_box_count: int, motion_box_count: int
@@ -436,9 +508,9 @@ class BirdsEyeFrameManager:
                 }
         return coordinates
 
-    def update_frame(self, frame: np.ndarray | None = None) -> tuple[bool, bool]:
+    def update_frame(self) -> tuple[bool, bool]:
         """
-        Update birdseye, optionally with a new frame.
+        Update the layout and draw the camera tiles that changed.
         Returns (frame_changed, layout_changed) to indicate if the frame or layout changed.
         """
 
@@ -491,6 +563,7 @@ class BirdsEyeFrameManager:
             self.camera_layout = []
             self.active_cameras = set()
             self.layout_camera_order = []
+            self.layout_positions = {}
             self.clear_frame()
             frame_changed = True
             layout_changed = True
@@ -582,17 +655,11 @@ class BirdsEyeFrameManager:
                         self.canvas.set_coefficient(len(active_cameras), coefficient)
 
                     self.camera_layout = layout_candidate or []
+                self.place_tiles()
                 frame_changed = True
 
-            # Draw the layout
-            for row in self.camera_layout:
-                for position in row:
-                    src_frame = self.cameras[position[0]]["current_frame"]
-                    if src_frame is None or src_frame.size == 0:
-                        logger.debug(f"Skipping invalid frame for {position[0]}")
-                        continue
-                    self.copy_to_position(position[1], position[0], src_frame)
-            if frame is not None:  # Frame presence indicates a potential change
+            # only the cameras with a new frame since the last output are drawn
+            if self.draw_dirty_tiles():
                 frame_changed = True
 
         return frame_changed, layout_changed
@@ -772,24 +839,42 @@ class BirdsEyeFrameManager:
                 return False, False
 
         # update the last active frame for the camera
-        self.cameras[camera]["current_frame"] = frame.copy()
-        self.cameras[camera]["current_frame_time"] = frame_time
+        camera_data = self.cameras[camera]
+        camera_data["current_frame_time"] = frame_time
         if self.camera_active(camera_config.birdseye.mode, object_count, motion_count):
-            self.cameras[camera]["last_active_frame"] = frame_time
+            camera_data["last_active_frame"] = frame_time
+
+        if camera in self.layout_positions:
+            # scale the frame straight into the camera's tile, once per output
+            # since later frames would be replaced before they are sent
+            if camera not in self.dirty_cameras:
+                self.render_tile(camera, frame, camera_data["channel_dims"])
+        elif (
+            camera_data["last_active_frame"] > 0
+            and frame_time - camera_data["last_active_frame"]
+            < self.config.birdseye.inactivity_threshold
+            and frame_time - camera_data["current_frame_copy_time"] >= OUTPUT_INTERVAL
+        ):
+            # the frame is released after this call, keep a copy for when
+            # the camera is added to the layout
+            camera_data["current_frame"] = frame.copy()
+            camera_data["current_frame_copy_time"] = frame_time
 
         now = datetime.datetime.now().timestamp()
 
         # limit output to 10 fps
-        if not force_update and (now - self.last_output_time) < 1 / 10:
+        if not force_update and (now - self.last_output_time) < OUTPUT_INTERVAL:
             return False, False
 
         try:
-            frame_changed, layout_changed = self.update_frame(frame)
+            frame_changed, layout_changed = self.update_frame()
         except Exception:
             frame_changed, layout_changed = False, False
             self.active_cameras = set()
             self.camera_layout = []
             self.layout_camera_order = []
+            self.layout_positions = {}
+            self.dirty_cameras = set()
             print(traceback.format_exc())
 
         # if the frame was updated or the fps is too low, send frame
@@ -6,8 +6,10 @@ import os
 import shutil
 import threading
 from multiprocessing.synchronize import Event as MpEvent
+from typing import Any
 from wsgiref.simple_server import make_server
 
+import numpy as np
 from ws4py.server.wsgirefserver import (
     WebSocketWSGIHandler,
     WebSocketWSGIRequestHandler,
@@ -17,7 +19,6 @@ from ws4py.server.wsgiutils import WebSocketWSGIApplication
 
 from frigate.comms.config_updater import ConfigSubscriber
 from frigate.comms.detections_updater import DetectionSubscriber, DetectionTypeEnum
-from frigate.comms.ws import WebSocket
 from frigate.config import FrigateConfig
 from frigate.config.camera.updater import (
     CameraConfigUpdateEnum,
@@ -32,18 +33,23 @@ from frigate.const import (
 from frigate.output.birdseye import Birdseye
 from frigate.output.camera import JsmpegCamera
 from frigate.output.preview import PreviewRecorder
-from frigate.output.ws_auth import ws_has_camera_access
+from frigate.output.viewers import CameraViewers
+from frigate.output.workers import CameraOutputWorkers
 from frigate.util.image import SharedMemoryFrameManager, get_blank_yuv_frame
 from frigate.util.process import FrigateProcess
 
 logger = logging.getLogger(__name__)
 
+# threads handling the preview and jsmpeg output of the cameras
+OUTPUT_WORKERS = max(1, min(4, os.cpu_count() or 1))
+
 
 def check_disabled_camera_update(
     config: FrigateConfig,
     birdseye: Birdseye | None,
     previews: dict[str, PreviewRecorder],
     write_times: dict[str, float],
+    workers: CameraOutputWorkers,
 ) -> None:
     """Check if camera is disabled / offline and needs an update."""
     now = datetime.datetime.now().timestamp()
@@ -56,9 +62,12 @@ def check_disabled_camera_update(
             has_enabled_camera = True
         else:
             # flag camera as offline when it is disabled
-            previews[camera].flag_offline(now)
+            workers.submit(camera, previews[camera].flag_offline, now)
 
         if offline_time > 1:
+            # the most recent preview frame is shown while the camera is offline
+            workers.submit(camera, previews[camera].save_last_frame)
+
             # last camera update was more than 1 second ago
             # need to send empty data to birdseye because current
             # frame is now out of date
@@ -82,6 +91,26 @@ def check_disabled_camera_update(
         birdseye.all_cameras_disabled()
 
 
+def write_camera_output(
+    frame_manager: SharedMemoryFrameManager,
+    frame_name: str,
+    preview: PreviewRecorder,
+    jsmpeg: JsmpegCamera | None,
+    current_tracked_objects: list[dict[str, Any]],
+    motion_boxes: list[list[int]],
+    frame_time: float,
+    frame: np.ndarray,
+) -> None:
+    """Write a frame to a camera's preview and jsmpeg stream."""
+    # send frames for low fps recording
+    preview.write_data(current_tracked_objects, motion_boxes, frame_time, frame)
+
+    if jsmpeg is not None:
+        jsmpeg.write_frame(frame.tobytes())
+
+    frame_manager.close(frame_name)
+
+
 class OutputProcess(FrigateProcess):
     def __init__(self, config: FrigateConfig, stop_event: MpEvent) -> None:
         super().__init__(
@@ -121,13 +150,14 @@ class OutputProcess(FrigateProcess):
         frame_manager = SharedMemoryFrameManager()
 
         # start a websocket server on 8082
+        viewers = CameraViewers(self.config)
         WebSocketWSGIHandler.http_version = "1.1"
         websocket_server = make_server(
             "127.0.0.1",
             8082,
             server_class=WSGIServer,
             handler_class=WebSocketWSGIRequestHandler,
-            app=WebSocketWSGIApplication(handler_cls=WebSocket),
+            app=WebSocketWSGIApplication(handler_cls=viewers.handler()),
         )
         websocket_server.initialize_websockets_manager()
         websocket_thread = threading.Thread(target=websocket_server.serve_forever)
@@ -150,6 +180,7 @@ class OutputProcess(FrigateProcess):
         preview_recorders: dict[str, PreviewRecorder] = {}
         preview_write_times: dict[str, float] = {}
         failed_frame_requests: dict[str, int] = {}
+        workers = CameraOutputWorkers(self.stop_event, OUTPUT_WORKERS)
         last_disabled_cam_check = datetime.datetime.now().timestamp()
 
         move_preview_frames("cache")
@@ -212,7 +243,11 @@ class OutputProcess(FrigateProcess):
                 # check disabled cameras every 5 seconds
                 last_disabled_cam_check = now
                 check_disabled_camera_update(
-                    self.config, birdseye, preview_recorders, preview_write_times
+                    self.config,
+                    birdseye,
+                    preview_recorders,
+                    preview_write_times,
+                    workers,
                 )
 
             if not topic or data is None:
@@ -254,33 +289,13 @@ class OutputProcess(FrigateProcess):
             else:
                 failed_frame_requests[camera] = 0
 
-            # send frames for low fps recording
-            preview_recorders[camera].write_data(
-                current_tracked_objects, motion_boxes, frame_time, frame
-            )
             preview_write_times[camera] = frame_time
 
-            # send camera frame to ffmpeg process if websockets are connected
-            if any(
-                ws.environ["PATH_INFO"].endswith(camera)
-                and ws_has_camera_access(ws, camera, self.config)
-                for ws in websocket_server.manager
-            ):
-                # write to the converter for the camera if clients are listening to the specific camera
-                jsmpeg_cameras[camera].write_frame(frame.tobytes())
-
             # send output data to birdseye if websocket is connected or restreaming
             if (
                 self.config.birdseye.enabled
                 and birdseye is not None
-                and (
-                    self.config.birdseye.restream
-                    or any(
-                        ws.environ["PATH_INFO"].endswith("birdseye")
-                        and ws_has_camera_access(ws, "birdseye", self.config)
-                        for ws in websocket_server.manager
-                    )
-                )
+                and (self.config.birdseye.restream or "birdseye" in viewers)
             ):
                 birdseye.write_data(
                     camera,
@@ -290,7 +305,27 @@ class OutputProcess(FrigateProcess):
                     frame,
                 )
 
-            frame_manager.close(frame_name)
+            # the preview and the camera's ffmpeg process, if clients are
+            # listening to the specific camera, are written on a worker
+            workers.submit(
+                camera,
+                write_camera_output,
+                frame_manager,
+                frame_name,
+                preview_recorders[camera],
+                jsmpeg_cameras[camera] if camera in viewers else None,
+                current_tracked_objects,
+                motion_boxes,
+                frame_time,
+                frame,
+            )
+
+        # finish the queued writes and the partial previews before the
+        # preview cache is moved
+        workers.stop()
+
+        for preview in preview_recorders.values():
+            preview.stop()
 
         move_preview_frames("clips")
 
@@ -322,9 +357,6 @@ class OutputProcess(FrigateProcess):
         for jsmpeg in jsmpeg_cameras.values():
             jsmpeg.stop()
 
-        for preview in preview_recorders.values():
-            preview.stop()
-
         if birdseye is not None:
             birdseye.stop()
 
@@ -28,6 +28,8 @@ logger = logging.getLogger(__name__)
 
 FOLDER_PREVIEW_FRAMES = "preview_frames"
 PREVIEW_CACHE_DIR = os.path.join(CACHE_DIR, FOLDER_PREVIEW_FRAMES)
+# previews being streamed to ffmpeg, moved to clips when they are finished
+PREVIEW_SEGMENT_CACHE_DIR = os.path.join(CACHE_DIR, "preview_segments")
 PREVIEW_SEGMENT_DURATION = 3600  # one hour
 # important to have lower keyframe to maintain scrubbing performance
 PREVIEW_KEYFRAME_INTERVAL = 40
@@ -205,6 +207,121 @@ class FFMpegConverter(threading.Thread):
             Path(get_cache_image_name(self.config.name, t)).unlink(missing_ok=True)  # type: ignore[arg-type]
 
 
+class PreviewEncoder:
+    """Encode preview frames into a vfr mp4 as they are output.
+
+    Downscaled yuv frames are written to a long running ffmpeg process which
+    timestamps them as they arrive, so the frames of a segment don't need to
+    be cached as images and decoded again when the segment ends.
+    """
+
+    def __init__(
+        self,
+        config: CameraConfig,
+        width: int,
+        height: int,
+        start_time: float,
+        requestor: InterProcessRequestor,
+    ):
+        self.config = config
+        self.requestor = requestor
+        self.start_time = start_time
+        self.end_time = start_time
+        self.frame_count = 0
+        self.failed = False
+
+        cache_dir = os.path.join(PREVIEW_SEGMENT_CACHE_DIR, config.name or "")
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        self.cache_path = os.path.join(cache_dir, f"{start_time}.mp4")
+
+        quality = config.record.preview.quality
+        ffmpeg_cmd = parse_preset_hardware_acceleration_encode(
+            config.ffmpeg.ffmpeg_path,
+            "default",
+            input=f"-f rawvideo -pix_fmt yuv420p -video_size {width}x{height} -use_wallclock_as_timestamps 1 -threads 1 -i pipe:",
+            output=f"-threads 1 -g {PREVIEW_KEYFRAME_INTERVAL} -bf 0 -b:v {PREVIEW_QUALITY_BIT_RATES[quality]}{PREVIEW_QMAX_PARAM[quality]} {FPS_VFR_PARAM} -movflags +faststart -pix_fmt yuv420p -y {self.cache_path}",
+            type=EncodeTypeEnum.preview,
+        )
+        self.process = sp.Popen(
+            ffmpeg_cmd.split(" "),
+            stdin=sp.PIPE,
+            stdout=sp.DEVNULL,
+            stderr=sp.DEVNULL,
+            start_new_session=True,
+        )
+
+    def write(self, frame_time: float, frame: np.ndarray) -> None:
+        if self.failed:
+            return
+
+        assert self.process.stdin is not None
+
+        try:
+            self.process.stdin.write(frame.tobytes())
+            # ffmpeg timestamps the frame once it has all of it
+            self.process.stdin.flush()
+        except (BrokenPipeError, ValueError):
+            logger.error(f"Preview encoder for {self.config.name} exited unexpectedly")
+            self.failed = True
+            return
+
+        self.frame_count += 1
+        self.end_time = frame_time
+
+    def finish(self, wait: bool = False) -> None:
+        """Finish the segment and save the preview in the background."""
+        thread = threading.Thread(
+            target=self._save,
+            name=f"{self.config.name}_preview_encoder",
+            daemon=True,
+        )
+        thread.start()
+
+        if wait:
+            thread.join()
+
+    def _save(self) -> None:
+        try:
+            self.process.stdin.close()  # type: ignore[union-attr]
+        except BrokenPipeError:
+            pass
+
+        try:
+            returncode = self.process.wait(timeout=60)
+        except sp.TimeoutExpired:
+            self.process.kill()
+            returncode = self.process.wait()
+
+        # a single frame isn't worth a preview, it's also the last frame of
+        # the previous segment when a segment is cut short by a restart
+        if self.failed or returncode != 0 or self.frame_count < 2:
+            if returncode != 0:
+                logger.error(
+                    f"Error saving preview for {self.config.name}, ffmpeg exited with {returncode}"
+                )
+
+            Path(self.cache_path).unlink(missing_ok=True)
+            return
+
+        path = os.path.join(
+            CLIPS_DIR,
+            f"previews/{self.config.name}/{self.start_time}-{self.end_time}.mp4",
+        )
+        shutil.move(self.cache_path, path)
+        logger.debug("successfully saved preview")
+        self.requestor.send_data(
+            INSERT_PREVIEW,
+            {
+                Previews.id.name: f"{self.config.name}_{self.end_time}",
+                Previews.camera.name: self.config.name,
+                Previews.path.name: path,
+                Previews.start_time.name: self.start_time,
+                Previews.end_time.name: self.end_time,
+                Previews.duration.name: self.end_time - self.start_time,
+            },
+        )
+
+
 class PreviewRecorder:
     def __init__(self, config: CameraConfig) -> None:
         self.config = config
@@ -213,6 +330,14 @@ class PreviewRecorder:
         self.last_output_time: float = 0
         self.offline = False
         self.output_frames: list[float] = []
+        # stream frames to an encoder instead of caching an image per frame
+        self.streaming = config.record.preview.streaming
+        self.encoder: PreviewEncoder | None = None
+        # the latest frame, only written to the cache when it's needed as
+        # the most recent preview frame of an offline camera
+        self.last_frame: np.ndarray | None = None
+        self.last_frame_time: float = 0
+        self.last_frame_path: str | None = None
 
         if config.detect.width is None or config.detect.height is None:
             raise ValueError("Detect width and height must be set for previews.")
@@ -273,14 +398,29 @@ class PreviewRecorder:
         file_start = f"preview_{config.name}-"
         start_file = f"{file_start}{start_ts}.webp"
 
-        for file in sorted(os.listdir(os.path.join(CACHE_DIR, FOLDER_PREVIEW_FRAMES))):
-            if not file.startswith(file_start):
-                continue
+        if self.streaming:
+            # segments interrupted by a restart can't be finished
+            shutil.rmtree(
+                os.path.join(PREVIEW_SEGMENT_CACHE_DIR, config.name or ""),
+                ignore_errors=True,
+            )
 
-            if file < start_file:
+        cached_files = sorted(
+            file
+            for file in os.listdir(os.path.join(CACHE_DIR, FOLDER_PREVIEW_FRAMES))
+            if file.startswith(file_start)
+        )
+
+        for i, file in enumerate(cached_files):
+            if file < start_file or (self.streaming and i < len(cached_files) - 1):
                 os.unlink(os.path.join(PREVIEW_CACHE_DIR, file))
                 continue
 
+            if self.streaming:
+                # keep the most recent frame until a new one is saved
+                self.last_frame_path = os.path.join(PREVIEW_CACHE_DIR, file)
+                continue
+
             try:
                 file_time = file.split("-")[-1][: -(len(PREVIEW_FRAME_TYPE) + 1)]
 
@@ -346,8 +486,7 @@ class PreviewRecorder:
 
         return False
 
-    def write_frame_to_cache(self, frame_time: float, frame: np.ndarray) -> None:
-        # resize yuv frame
+    def resize_frame(self, frame: np.ndarray) -> np.ndarray:
         small_frame: np.ndarray = np.zeros(
             (self.out_height * 3 // 2, self.out_width), np.uint8
         )
@@ -359,11 +498,69 @@ class PreviewRecorder:
             self.channel_dims,
             cv2.INTER_AREA,
         )
+        return small_frame
+
+    def write_frame(self, frame_time: float, frame: np.ndarray) -> None:
+        if not self.streaming:
+            self.write_frame_to_cache(frame_time, frame)
+            return
+
+        self.stream_frame(frame_time, self.resize_frame(frame))
+
+    def stream_frame(self, frame_time: float, small_frame: np.ndarray) -> None:
+        if self.encoder is None:
+            self.encoder = PreviewEncoder(
+                self.config,
+                self.out_width,
+                self.out_height,
+                frame_time,
+                self.requestor,
+            )
+
+        self.encoder.write(frame_time, small_frame)
+        self.last_frame = small_frame
+        self.last_frame_time = frame_time
+
+    def finish_segment(self) -> None:
+        if not self.streaming:
+            # write the preview if any frames exist for this hour
+            FFMpegConverter(
+                self.config,
+                self.output_frames,
+                self.requestor,
+            ).start()
+        elif self.encoder is not None:
+            self.encoder.finish()
+            self.encoder = None
+
+    def save_last_frame(self) -> None:
+        """Write the latest streamed frame to the cache as the most recent preview frame."""
+        if self.last_frame is None:
+            return
+
+        cache_path = get_cache_image_name(self.camera_name, self.last_frame_time)
+
+        if cache_path == self.last_frame_path:
+            return
+
+        self.write_image(cache_path, self.last_frame)
+
+        if self.last_frame_path is not None:
+            Path(self.last_frame_path).unlink(missing_ok=True)
+
+        self.last_frame_path = cache_path
+
+    def write_frame_to_cache(self, frame_time: float, frame: np.ndarray) -> None:
+        self.write_image(
+            get_cache_image_name(self.camera_name, frame_time),
+            self.resize_frame(frame),
+        )
+
+    def write_image(self, cache_path: str, small_frame: np.ndarray) -> None:
         small_frame = cv2.cvtColor(
             small_frame,
             cv2.COLOR_YUV2BGR_I420,
         )
-        cache_path = get_cache_image_name(self.camera_name, frame_time)
 
         if not cv2.imwrite(
             cache_path,
@@ -388,7 +585,7 @@ class PreviewRecorder:
         if self.start_time == 0:
             self.start_time = frame_time
             self.output_frames.append(frame_time)
-            self.write_frame_to_cache(frame_time, frame)
+            self.write_frame(frame_time, frame)
             return
 
         # check if PREVIEW clip should be generated and cached frames reset
@@ -397,14 +594,9 @@ class PreviewRecorder:
                 # save last frame to ensure consistent duration
                 if self.config.record:
                     self.output_frames.append(frame_time)
-                    self.write_frame_to_cache(frame_time, frame)
-
-                # write the preview if any frames exist for this hour
-                FFMpegConverter(
-                    self.config,
-                    self.output_frames,
-                    self.requestor,
-                ).start()
+                    self.write_frame(frame_time, frame)
+
+                self.finish_segment()
             else:
                 logger.debug(
                     f"Not saving preview for {self.camera_name} because there are no saved frames."
@@ -415,20 +607,21 @@ class PreviewRecorder:
             # include first frame to ensure consistent duration
             if self.config.record.enabled:
                 self.output_frames.append(frame_time)
-                self.write_frame_to_cache(frame_time, frame)
+                self.write_frame(frame_time, frame)
 
             return
         elif self.should_write_frame(current_tracked_objects, motion_boxes, frame_time):
             self.output_frames.append(frame_time)
-            self.write_frame_to_cache(frame_time, frame)
+            self.write_frame(frame_time, frame)
             return
 
     def flag_offline(self, frame_time: float) -> None:
         if not self.offline:
-            self.write_frame_to_cache(
+            self.write_frame(
                 frame_time,
                 get_blank_yuv_frame(self.detect_width, self.detect_height),
             )
+            self.save_last_frame()
             self.offline = True
 
         # check if PREVIEW clip should be generated and cached frames reset
@@ -439,23 +632,27 @@ class PreviewRecorder:
                 self.reset_frame_cache(frame_time)
                 return
 
-            old_frame_path = get_cache_image_name(
-                self.camera_name, self.output_frames[-1]
-            )
-            new_frame_path = get_cache_image_name(self.camera_name, frame_time)
-            shutil.copy(old_frame_path, new_frame_path)
-
             # save last frame to ensure consistent duration
-            self.output_frames.append(frame_time)
-            FFMpegConverter(
-                self.config,
-                self.output_frames,
-                self.requestor,
-            ).start()
+            if self.streaming and self.last_frame is not None:
+                self.stream_frame(frame_time, self.last_frame)
+            elif not self.streaming:
+                old_frame_path = get_cache_image_name(
+                    self.camera_name, self.output_frames[-1]
+                )
+                new_frame_path = get_cache_image_name(self.camera_name, frame_time)
+                shutil.copy(old_frame_path, new_frame_path)
 
+            self.output_frames.append(frame_time)
+            self.finish_segment()
             self.reset_frame_cache(frame_time)
 
     def stop(self) -> None:
+        if self.encoder is not None:
+            # save the preview of the partial segment
+            self.encoder.finish(wait=True)
+            self.encoder = None
+
+        self.save_last_frame()
         self.requestor.stop()
 
 
@@ -0,0 +1,65 @@
+"""Track which cameras JSMPEG websocket clients are watching."""
+
+import threading
+from typing import Any
+
+from frigate.comms.ws import WebSocket
+from frigate.config import FrigateConfig
+from frigate.output.ws_auth import ws_has_camera_access
+
+
+class CameraViewers:
+    """The cameras with at least one authorized websocket client.
+
+    Clients are added and removed as they connect and disconnect, so the
+    output loop can check if a camera is being watched for each frame
+    without scanning every websocket connection.
+    """
+
+    def __init__(self, config: FrigateConfig) -> None:
+        self.config = config
+        self.lock = threading.Lock()
+        self.counts: dict[str, int] = {}
+        self.cameras: frozenset[str] = frozenset()
+
+    def __contains__(self, camera: str) -> bool:
+        return camera in self.cameras
+
+    def add(self, ws: Any) -> None:
+        camera = ws.environ.get("PATH_INFO", "")[1:]
+
+        if not camera or not ws_has_camera_access(ws, camera, self.config):
+            return
+
+        with self.lock:
+            ws.viewing_camera = camera
+            self.counts[camera] = self.counts.get(camera, 0) + 1
+            self.cameras = frozenset(self.counts)
+
+    def remove(self, ws: Any) -> None:
+        with self.lock:
+            camera = getattr(ws, "viewing_camera", None)
+
+            if camera is None:
+                return
+
+            ws.viewing_camera = None
+            self.counts[camera] -= 1
+
+            if self.counts[camera] == 0:
+                del self.counts[camera]
+
+            self.cameras = frozenset(self.counts)
+
+    def handler(self) -> type[WebSocket]:
+        """A websocket handler class that keeps these viewers up to date."""
+        viewers = self
+
+        class ViewerWebSocket(WebSocket):
+            def opened(self) -> None:
+                viewers.add(self)
+
+            def closed(self, code: int, reason: str | None = None) -> None:
+                viewers.remove(self)
+
+        return ViewerWebSocket
@@ -0,0 +1,78 @@
+"""Run per camera output work on a pool of threads."""
+
+import logging
+import queue
+import threading
+import zlib
+from collections.abc import Callable
+from multiprocessing.synchronize import Event as MpEvent
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class CameraOutputWorkers:
+    """Run work for each camera in order on one of a fixed set of threads.
+
+    A camera is always handled by the same worker so its work never runs
+    concurrently. Each worker has a bounded queue, when a worker falls
+    behind submit blocks so the output loop can't get further ahead of it
+    than the frames that are still available in shared memory.
+    """
+
+    def __init__(
+        self, stop_event: MpEvent, worker_count: int, queue_size: int = 8
+    ) -> None:
+        self.stop_event = stop_event
+        self.queues: list[queue.Queue[tuple[Callable[..., Any], tuple] | None]] = [
+            queue.Queue(maxsize=queue_size) for _ in range(worker_count)
+        ]
+        self.threads = [
+            threading.Thread(
+                target=self._run,
+                args=(work_queue,),
+                name=f"output_worker:{i}",
+                daemon=True,
+            )
+            for i, work_queue in enumerate(self.queues)
+        ]
+
+        for thread in self.threads:
+            thread.start()
+
+    def _queue(self, camera: str) -> queue.Queue:
+        # a stable hash, so a camera keeps its worker
+        return self.queues[zlib.crc32(camera.encode()) % len(self.queues)]
+
+    def submit(self, camera: str, work: Callable[..., Any], *args: Any) -> None:
+        """Queue work for a camera, waiting while its worker is busy."""
+        work_queue = self._queue(camera)
+
+        while not self.stop_event.is_set():
+            try:
+                work_queue.put((work, args), timeout=1)
+                return
+            except queue.Full:
+                logger.debug(f"Output worker for {camera} is falling behind")
+
+    def _run(self, work_queue: queue.Queue) -> None:
+        while True:
+            item = work_queue.get()
+
+            if item is None:
+                return
+
+            work, args = item
+
+            try:
+                work(*args)
+            except Exception:
+                logger.exception("Error handling output")
+
+    def stop(self) -> None:
+        """Finish the queued work and stop the workers."""
+        for work_queue in self.queues:
+            work_queue.put(None)
+
+        for thread in self.threads:
+            thread.join()
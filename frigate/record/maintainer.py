@@ -14,7 +14,6 @@ from pathlib import Path
 from typing import Any
 
 import numpy as np
-import psutil
 
 from frigate.comms.detections_updater import DetectionSubscriber, DetectionTypeEnum
 from frigate.comms.inter_process import InterProcessRequestor
@@ -28,8 +27,6 @@ from frigate.config.camera.updater import (
     CameraConfigUpdateSubscriber,
 )
 from frigate.const import (
-    CACHE_DIR,
-    CACHE_SEGMENT_FORMAT,
     FAST_QUEUE_TIMEOUT,
     INSERT_MANY_RECORDINGS,
     MAX_SEGMENT_DURATION,
@@ -37,7 +34,10 @@ from frigate.const import (
     RECORD_DIR,
 )
 from frigate.models import Recordings, ReviewSegment
+from frigate.record.recording_info import AudioRecordingInfo, ObjectRecordingInfo
+from frigate.record.segment_tracker import SegmentTracker
 from frigate.review.types import SeverityEnum
+from frigate.util.media import get_keyframe_offsets
 from frigate.util.services import get_video_properties
 
 logger = logging.getLogger(__name__)
@@ -98,51 +98,26 @@ class RecordingMaintainer(threading.Thread):
         self.recordings_publisher = RecordingsDataPublisher()
 
         self.stop_event = stop_event
-        self.object_recordings_info: dict[str, list] = defaultdict(list)
-        self.audio_recordings_info: dict[str, list] = defaultdict(list)
+        self.object_recordings_info: defaultdict[str, ObjectRecordingInfo] = (
+            defaultdict(ObjectRecordingInfo)
+        )
+        self.audio_recordings_info: defaultdict[str, AudioRecordingInfo] = defaultdict(
+            AudioRecordingInfo
+        )
         self.end_time_cache: dict[str, tuple[datetime.datetime, float]] = {}
-        self.unexpected_cache_files_logged: bool = False
+        self.segment_tracker = SegmentTracker()
 
     async def move_files(self) -> None:
-        cache_files = [
-            d
-            for d in os.listdir(CACHE_DIR)
-            if os.path.isfile(os.path.join(CACHE_DIR, d))
-            and d.endswith(".mp4")
-            and not d.startswith("preview_")
-        ]
+        self.segment_tracker.update()
 
         # publish newest cached segment per camera (including in use files)
-        newest_cache_segments: dict[str, dict[str, Any]] = {}
-        for cache in cache_files:
-            cache_path = os.path.join(CACHE_DIR, cache)
-            basename = os.path.splitext(cache)[0]
-            try:
-                camera, date = basename.rsplit("@", maxsplit=1)
-            except ValueError:
-                if not self.unexpected_cache_files_logged:
-                    logger.warning("Skipping unexpected files in cache")
-                    self.unexpected_cache_files_logged = True
-                continue
-
-            start_time = datetime.datetime.strptime(
-                date, CACHE_SEGMENT_FORMAT
-            ).astimezone(datetime.UTC)
-            if (
-                camera not in newest_cache_segments
-                or start_time > newest_cache_segments[camera]["start_time"]
-            ):
-                newest_cache_segments[camera] = {
-                    "start_time": start_time,
-                    "cache_path": cache_path,
-                }
-
+        newest_cache_segments = self.segment_tracker.newest_segments()
         for camera, newest in newest_cache_segments.items():
             self.recordings_publisher.publish(
                 (
                     camera,
-                    newest["start_time"].timestamp(),
-                    newest["cache_path"],
+                    newest.start_time.timestamp(),
+                    newest.cache_path,
                 ),
                 RecordingsDataTypeEnum.latest.value,
             )
@@ -154,60 +129,23 @@ class RecordingMaintainer(threading.Thread):
                     RecordingsDataTypeEnum.latest.value,
                 )
 
-        files_in_use = []
-        for process in psutil.process_iter():
-            try:
-                if process.name() != "ffmpeg":
-                    continue
-                file_list = process.open_files()
-                if file_list:
-                    for nt in file_list:
-                        if nt.path.startswith(CACHE_DIR):
-                            files_in_use.append(nt.path.split("/")[-1])
-            except psutil.Error:
-                continue
-
         # group recordings by camera (skip in-use for validation/moving)
         grouped_recordings: defaultdict[str, list[dict[str, Any]]] = defaultdict(list)
-        for cache in cache_files:
-            # Skip files currently in use
-            if cache in files_in_use:
-                continue
-
-            cache_path = os.path.join(CACHE_DIR, cache)
-            basename = os.path.splitext(cache)[0]
-            try:
-                camera, date = basename.rsplit("@", maxsplit=1)
-            except ValueError:
-                if not self.unexpected_cache_files_logged:
-                    logger.warning("Skipping unexpected files in cache")
-                    self.unexpected_cache_files_logged = True
-                continue
-
-            # important that start_time is utc because recordings are stored and compared in utc
-            start_time = datetime.datetime.strptime(
-                date, CACHE_SEGMENT_FORMAT
-            ).astimezone(datetime.UTC)
-
-            grouped_recordings[camera].append(
+        for camera, segments in self.segment_tracker.closed_segments().items():
+            grouped_recordings[camera] = [
                 {
-                    "cache_path": cache_path,
-                    "start_time": start_time,
+                    "cache_path": segment.cache_path,
+                    "start_time": segment.start_time,
                 }
-            )
+                for segment in segments
+            ]
 
         # delete all cached files past the most recent MAX_SEGMENTS_IN_CACHE
         keep_count = MAX_SEGMENTS_IN_CACHE
         for camera in grouped_recordings.keys():
-            # sort based on start time
-            grouped_recordings[camera] = sorted(
-                grouped_recordings[camera], key=lambda s: s["start_time"]
-            )
-
-            camera_info = self.object_recordings_info[camera]
-            most_recently_processed_frame_time = (
-                camera_info[-1][0] if len(camera_info) > 0 else 0
-            )
+            most_recently_processed_frame_time = self.object_recordings_info[
+                camera
+            ].latest_frame_time()
 
             processed_segment_count = len(
                 list(
@@ -228,9 +166,7 @@ class RecordingMaintainer(threading.Thread):
                 )
                 to_remove = grouped_recordings[camera][:-keep_count]
                 for rec in to_remove:
-                    cache_path = rec["cache_path"]
-                    Path(cache_path).unlink(missing_ok=True)
-                    self.end_time_cache.pop(cache_path, None)
+                    self.drop_segment(rec["cache_path"])
                 grouped_recordings[camera] = grouped_recordings[camera][-keep_count:]
 
             # see if detection has failed and unprocessed segments need to be deleted
@@ -243,28 +179,15 @@ class RecordingMaintainer(threading.Thread):
                 )
                 to_remove = grouped_recordings[camera][:-keep_count]
                 for rec in to_remove:
-                    cache_path = rec["cache_path"]
-                    Path(cache_path).unlink(missing_ok=True)
-                    self.end_time_cache.pop(cache_path, None)
+                    self.drop_segment(rec["cache_path"])
                 grouped_recordings[camera] = grouped_recordings[camera][-keep_count:]
 
         tasks = []
         for camera, recordings in grouped_recordings.items():
-            # clear out all the object recording info for old frames
-            while (
-                len(self.object_recordings_info[camera]) > 0
-                and self.object_recordings_info[camera][0][0]
-                < recordings[0]["start_time"].timestamp()
-            ):
-                self.object_recordings_info[camera].pop(0)
-
-            # clear out all the audio recording info for old frames
-            while (
-                len(self.audio_recordings_info[camera]) > 0
-                and self.audio_recordings_info[camera][0][0]
-                < recordings[0]["start_time"].timestamp()
-            ):
-                self.audio_recordings_info[camera].pop(0)
+            # clear out all the object and audio recording info for old frames
+            oldest_start_time = recordings[0]["start_time"].timestamp()
+            self.object_recordings_info[camera].drop_before(oldest_start_time)
+            self.audio_recordings_info[camera].drop_before(oldest_start_time)
 
             # get all reviews with the end time after the start of the oldest cache file
             # or with end_time None
@@ -324,12 +247,11 @@ class RecordingMaintainer(threading.Thread):
             for camera in list(recordings_info.keys()):
                 if camera in grouped_recordings:
                     continue
-                info = recordings_info[camera]
-                while info and info[0][0] < expire_before:
-                    info.pop(0)
+                recordings_info[camera].drop_before(expire_before)
 
     def drop_segment(self, cache_path: str) -> None:
         Path(cache_path).unlink(missing_ok=True)
+        self.segment_tracker.remove(cache_path)
         self.end_time_cache.pop(cache_path, None)
 
     async def validate_and_move_segment(
@@ -402,10 +324,9 @@ class RecordingMaintainer(threading.Thread):
         # and avoid any DB calls
         if highest is not None:
             # assume that empty means the relevant recording info has not been received yet
-            camera_info = self.object_recordings_info[camera]
-            most_recently_processed_frame_time = (
-                camera_info[-1][0] if len(camera_info) > 0 else 0
-            )
+            most_recently_processed_frame_time = self.object_recordings_info[
+                camera
+            ].latest_frame_time()
 
             # ensure delayed segment info does not lead to lost segments
             if (
@@ -487,10 +408,9 @@ class RecordingMaintainer(threading.Thread):
         # continuous/motion retention (either disabled or segment_stats said
         # discard), so waiting longer just fills the cache.
         else:
-            camera_info = self.object_recordings_info[camera]
-            most_recently_processed_frame_time = (
-                camera_info[-1][0] if len(camera_info) > 0 else 0
-            )
+            most_recently_processed_frame_time = self.object_recordings_info[
+                camera
+            ].latest_frame_time()
             retain_cutoff = datetime.datetime.fromtimestamp(
                 most_recently_processed_frame_time - record_config.event_pre_capture
             ).astimezone(datetime.UTC)
@@ -501,7 +421,7 @@ class RecordingMaintainer(threading.Thread):
         return None
 
     def _compute_motion_heatmap(
-        self, camera: str, motion_boxes: list[tuple[int, int, int, int]]
+        self, camera: str, motion_boxes: np.ndarray
     ) -> dict[str, int] | None:
         """Compute a 16x16 motion intensity heatmap from motion boxes.
 
@@ -510,12 +430,12 @@ class RecordingMaintainer(threading.Thread):
 
         Args:
             camera: Camera name to get detect dimensions from.
-            motion_boxes: List of (x1, y1, x2, y2) pixel coordinates.
+            motion_boxes: (N, 4) array of (x1, y1, x2, y2) pixel coordinates.
 
         Returns:
             Sparse dict like {"45": 3, "46": 5}, or None if no boxes.
         """
-        if not motion_boxes:
+        if len(motion_boxes) == 0:
             return None
 
         camera_config = self.config.cameras.get(camera)
@@ -529,79 +449,58 @@ class RecordingMaintainer(threading.Thread):
             return None
 
         GRID_SIZE = 16
-        counts: dict[int, int] = {}
-
-        for box in motion_boxes:
-            if len(box) < 4:
-                continue
-            x1, y1, x2, y2 = box
-
-            # Convert pixel coordinates to grid cells
-            grid_x1 = max(0, int((x1 / frame_width) * GRID_SIZE))
-            grid_y1 = max(0, int((y1 / frame_height) * GRID_SIZE))
-            grid_x2 = min(GRID_SIZE - 1, int((x2 / frame_width) * GRID_SIZE))
-            grid_y2 = min(GRID_SIZE - 1, int((y2 / frame_height) * GRID_SIZE))
-
-            for y in range(grid_y1, grid_y2 + 1):
-                for x in range(grid_x1, grid_x2 + 1):
-                    idx = y * GRID_SIZE + x
-                    counts[idx] = min(255, counts.get(idx, 0) + 1)
-
-        if not counts:
+        boxes = np.asarray(motion_boxes, dtype=np.float64)
+
+        # Convert pixel coordinates to grid cells
+        scale = np.array([frame_width, frame_height, frame_width, frame_height])
+        cells = np.trunc(boxes / scale * GRID_SIZE).astype(np.int64)
+        x1 = np.maximum(cells[:, 0], 0)
+        y1 = np.maximum(cells[:, 1], 0)
+        x2 = np.minimum(cells[:, 2], GRID_SIZE - 1)
+        y2 = np.minimum(cells[:, 3], GRID_SIZE - 1)
+        covers = (x1 <= x2) & (y1 <= y2)
+        x1, y1, x2, y2 = x1[covers], y1[covers], x2[covers], y2[covers]
+
+        # mark each box's corners in a difference grid, the 2d prefix sum is
+        # then the number of boxes covering each cell
+        diff = np.zeros((GRID_SIZE + 1, GRID_SIZE + 1), dtype=np.int64)
+        np.add.at(diff, (y1, x1), 1)
+        np.add.at(diff, (y1, x2 + 1), -1)
+        np.add.at(diff, (y2 + 1, x1), -1)
+        np.add.at(diff, (y2 + 1, x2 + 1), 1)
+        counts = np.minimum(
+            diff.cumsum(axis=0).cumsum(axis=1)[:GRID_SIZE, :GRID_SIZE], 255
+        ).ravel()
+
+        cells_with_motion = np.flatnonzero(counts)
+
+        if len(cells_with_motion) == 0:
             return None
 
         # Convert to string keys for JSON storage
-        return {str(k): v for k, v in counts.items()}
+        return {str(k): int(counts[k]) for k in cells_with_motion}
 
     def segment_stats(
         self, camera: str, start_time: datetime.datetime, end_time: datetime.datetime
     ) -> SegmentInfo:
-        video_frame_count = 0
-        active_count = 0
-        region_count = 0
-        motion_count = 0
-        all_motion_boxes: list[tuple[int, int, int, int]] = []
-
-        for frame in self.object_recordings_info[camera]:
-            # frame is after end time of segment
-            if frame[0] > end_time.timestamp():
-                break
-            # frame is before start time of segment
-            if frame[0] < start_time.timestamp():
-                continue
-
-            video_frame_count += 1
-            active_count += len(
-                [
-                    o
-                    for o in frame[1]
-                    if not o["false_positive"] and o["motionless_count"] == 0
-                ]
-            )
-            motion_count += len(frame[2])
-            region_count += len(frame[3])
-            # Collect motion boxes for heatmap computation
-            all_motion_boxes.extend(frame[2])
-
-        audio_values = []
-        for frame in self.audio_recordings_info[camera]:
-            # frame is after end time of segment
-            if frame[0] > end_time.timestamp():
-                break
-
-            # frame is before start time of segment
-            if frame[0] < start_time.timestamp():
-                continue
+        object_info = self.object_recordings_info[camera]
+        frames = object_info.window(start_time.timestamp(), end_time.timestamp())
+        active_count = int(object_info.data["active_count"][frames].sum())
+        motion_count = int(object_info.data["motion_count"][frames].sum())
+        region_count = int(object_info.data["region_count"][frames].sum())
 
-            # add active audio label count to count of active objects
-            active_count += len(frame[2])
+        audio_info = self.audio_recordings_info[camera]
+        audio_frames = audio_info.window(start_time.timestamp(), end_time.timestamp())
 
-            # add sound level to audio values
-            audio_values.append(frame[1])
+        # add active audio label count to count of active objects
+        active_count += int(audio_info.data["detection_count"][audio_frames].sum())
+        audio_values = audio_info.data["dBFS"][audio_frames]
 
-        average_dBFS = 0 if not audio_values else np.average(audio_values)
+        average_dBFS = 0 if len(audio_values) == 0 else np.average(audio_values)
 
-        motion_heatmap = self._compute_motion_heatmap(camera, all_motion_boxes)
+        motion_heatmap = self._compute_motion_heatmap(
+            camera, object_info.motion_boxes(frames)
+        )
 
         return SegmentInfo(
             motion_count,
@@ -675,7 +574,13 @@ class RecordingMaintainer(threading.Thread):
                 except OSError:
                     segment_size = 0
 
+                # index keyframes once so VOD requests don't need to probe the file
+                keyframes = await get_keyframe_offsets(
+                    cache_path, self.config.ffmpeg.ffprobe_path
+                )
+
                 os.remove(cache_path)
+                self.segment_tracker.remove(cache_path)
 
                 rand_id = "".join(
                     random.choices(string.ascii_lowercase + string.digits, k=6)
@@ -695,13 +600,21 @@ class RecordingMaintainer(threading.Thread):
                     Recordings.dBFS.name: segment_info.average_dBFS,
                     Recordings.segment_size.name: segment_size,
                     Recordings.motion_heatmap.name: segment_info.motion_heatmap,
+                    Recordings.keyframes.name: keyframes,
                 }
+            else:
+                # the segment was already stored, the tracker only learns
+                # about cache files when they are written so it's removed
+                # here rather than being left in the cache
+                logger.debug(f"{file_path} already exists, discarding {cache_path}")
+                Path(cache_path).unlink(missing_ok=True)
         except Exception as e:
             logger.error(f"Unable to store recording segment {cache_path}")
             Path(cache_path).unlink(missing_ok=True)
             logger.error(e)
 
         # clear end_time cache
+        self.segment_tracker.remove(cache_path)
         self.end_time_cache.pop(cache_path, None)
         return None
 
@@ -747,12 +660,10 @@ class RecordingMaintainer(threading.Thread):
 
                     if self.config.cameras[camera].record.enabled:
                         self.object_recordings_info[camera].append(
-                            (
-                                frame_time,
-                                current_tracked_objects,
-                                motion_boxes,
-                                regions,
-                            )
+                            frame_time,
+                            current_tracked_objects,
+                            motion_boxes,
+                            regions,
                         )
                 elif topic == DetectionTypeEnum.audio.value:
                     (
@@ -764,11 +675,9 @@ class RecordingMaintainer(threading.Thread):
 
                     if self.config.cameras[camera].record.enabled:
                         self.audio_recordings_info[camera].append(
-                            (
-                                frame_time,
-                                dBFS,
-                                audio_detections,
-                            )
+                            frame_time,
+                            dBFS,
+                            audio_detections,
                         )
                 elif (
                     topic == DetectionTypeEnum.api.value
@@ -796,4 +705,5 @@ class RecordingMaintainer(threading.Thread):
         self.config_subscriber.stop()
         self.detection_subscriber.stop()
         self.recordings_publisher.stop()
+        self.segment_tracker.stop()
         logger.info("Exiting recording maintenance...")
@@ -0,0 +1,173 @@
+"""Columnar per-frame info used to compute recording segment stats."""
+
+from typing import Any
+
+import numpy as np
+
+
+class RecordingInfoBuffer:
+    """Time sorted columns of per-frame info for a single camera.
+
+    Columns are preallocated numpy arrays that double in size when full.
+    Dropping old frames only advances the start index, the arrays are
+    compacted when they need to grow, so trimming and appending stay
+    amortized O(1) and a segment's frames are found with searchsorted.
+    """
+
+    columns: dict[str, type] = {}
+
+    def __init__(self, capacity: int = 64) -> None:
+        self.start = 0
+        self.end = 0
+        self.data: dict[str, np.ndarray] = {
+            name: np.empty(capacity, dtype=dtype)
+            for name, dtype in {"frame_time": np.float64, **self.columns}.items()
+        }
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def column(self, name: str) -> np.ndarray:
+        return self.data[name][self.start : self.end]
+
+    def latest_frame_time(self) -> float:
+        """Time of the most recently received frame, 0 if there are none."""
+        return float(self.data["frame_time"][self.end - 1]) if len(self) else 0
+
+    def window(self, start_time: float, end_time: float) -> slice:
+        """Absolute index range of frames with start_time <= frame_time <= end_time."""
+        times = self.column("frame_time")
+        return slice(
+            self.start + int(np.searchsorted(times, start_time, side="left")),
+            self.start + int(np.searchsorted(times, end_time, side="right")),
+        )
+
+    def drop_before(self, frame_time: float) -> None:
+        """Forget all frames older than frame_time."""
+        self.start += int(
+            np.searchsorted(self.column("frame_time"), frame_time, side="left")
+        )
+
+    def _append_row(self, **values: Any) -> None:
+        if self.end == len(self.data["frame_time"]):
+            self._make_room()
+
+        for name, value in values.items():
+            self.data[name][self.end] = value
+
+        self.end += 1
+
+    def _make_room(self) -> None:
+        count = len(self)
+        capacity = len(self.data["frame_time"])
+
+        if count > capacity // 2:
+            capacity *= 2
+
+        for name, array in self.data.items():
+            resized = np.empty(capacity, dtype=array.dtype)
+            resized[:count] = array[self.start : self.end]
+            self.data[name] = resized
+
+        self.start = 0
+        self.end = count
+
+
+class ObjectRecordingInfo(RecordingInfoBuffer):
+    """Per-frame tracked object, motion and region info.
+
+    Motion boxes for all frames are stored in a single (N, 4) array, each
+    frame keeps the end offset of its boxes in that array.
+    """
+
+    columns = {
+        "active_count": np.int32,
+        "motion_count": np.int32,
+        "region_count": np.int32,
+        "box_end": np.int64,
+    }
+
+    def __init__(self, capacity: int = 64) -> None:
+        super().__init__(capacity)
+        self.boxes = np.empty((capacity * 4, 4), dtype=np.int32)
+        self.box_start = 0
+        self.box_end = 0
+
+    def append(
+        self,
+        frame_time: float,
+        tracked_objects: list[dict[str, Any]],
+        motion_boxes: list[tuple[int, int, int, int]],
+        regions: list[tuple[int, int, int, int]],
+    ) -> None:
+        boxes = [box[:4] for box in motion_boxes if len(box) >= 4]
+
+        if self.box_end + len(boxes) > len(self.boxes):
+            self._make_room_for_boxes(len(boxes))
+
+        if boxes:
+            self.boxes[self.box_end : self.box_end + len(boxes)] = boxes
+            self.box_end += len(boxes)
+
+        self._append_row(
+            frame_time=frame_time,
+            active_count=len(
+                [
+                    o
+                    for o in tracked_objects
+                    if not o["false_positive"] and o["motionless_count"] == 0
+                ]
+            ),
+            motion_count=len(motion_boxes),
+            region_count=len(regions),
+            box_end=self.box_end,
+        )
+
+    def drop_before(self, frame_time: float) -> None:
+        previous_start = self.start
+        super().drop_before(frame_time)
+
+        if self.start > previous_start:
+            self.box_start = int(self.data["box_end"][self.start - 1])
+
+    def motion_boxes(self, frames: slice) -> np.ndarray:
+        """Motion boxes of the frames in an absolute index range."""
+        if frames.stop <= frames.start:
+            return self.boxes[:0]
+
+        first = (
+            int(self.data["box_end"][frames.start - 1])
+            if frames.start > self.start
+            else self.box_start
+        )
+        return self.boxes[first : int(self.data["box_end"][frames.stop - 1])]
+
+    def _make_room_for_boxes(self, required: int) -> None:
+        count = self.box_end - self.box_start
+        capacity = len(self.boxes)
+
+        while count + required > capacity // 2:
+            capacity *= 2
+
+        resized = np.empty((capacity, 4), dtype=np.int32)
+        resized[:count] = self.boxes[self.box_start : self.box_end]
+        self.boxes = resized
+        self.data["box_end"][self.start : self.end] -= self.box_start
+        self.box_start = 0
+        self.box_end = count
+
+
+class AudioRecordingInfo(RecordingInfoBuffer):
+    """Per-frame audio level and detected audio label counts."""
+
+    columns = {
+        "dBFS": np.float64,
+        "detection_count": np.int32,
+    }
+
+    def append(self, frame_time: float, dBFS: float, audio_detections: list) -> None:
+        self._append_row(
+            frame_time=frame_time,
+            dBFS=dBFS,
+            detection_count=len(audio_detections),
+        )
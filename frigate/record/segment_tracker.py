@@ -0,0 +1,230 @@
+"""Track recording segments in the cache directory."""
+
+import bisect
+import ctypes
+import ctypes.util
+import datetime
+import logging
+import os
+import struct
+import time
+from collections import defaultdict
+
+from frigate.const import CACHE_DIR, CACHE_SEGMENT_FORMAT, MAX_SEGMENT_DURATION
+
+logger = logging.getLogger(__name__)
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class CacheSegment:
+    def __init__(self, cache_path: str, camera: str, start_time: datetime.datetime):
+        self.cache_path = cache_path
+        self.camera = camera
+        # important that start_time is utc because recordings are stored and compared in utc
+        self.start_time = start_time
+        self.closed = False
+
+
+class SegmentTracker:
+    """Keeps a sorted per camera index of the recording segments in the cache.
+
+    Changes are read from inotify when the platform supports it, a segment
+    is known to be complete once ffmpeg closes it. Otherwise the directory
+    is rescanned on each update and only new file names are parsed.
+    Either way ffmpeg writes a single segment per camera at a time, so
+    every segment older than a camera's newest one is complete.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR) -> None:
+        self.cache_dir = cache_dir
+        self.segments: dict[str, CacheSegment] = {}
+        self.camera_segments: defaultdict[str, list[tuple[float, str]]] = defaultdict(
+            list
+        )
+        self.ignored: set[str] = set()
+        self.unexpected_files_logged = False
+        self.inotify_fd = self._start_inotify()
+        self.rescan()
+
+    def _start_inotify(self) -> int | None:
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = int(libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC))
+        except (AttributeError, OSError):
+            logger.debug("inotify is not available, polling the recording cache")
+            return None
+
+        if fd < 0:
+            logger.debug("Unable to initialize inotify, polling the recording cache")
+            return None
+
+        if libc.inotify_add_watch(fd, self.cache_dir.encode(), WATCH_MASK) < 0:
+            logger.debug(
+                f"Unable to watch {self.cache_dir}: {os.strerror(ctypes.get_errno())}"
+            )
+            os.close(fd)
+            return None
+
+        return fd
+
+    def stop(self) -> None:
+        if self.inotify_fd is not None:
+            os.close(self.inotify_fd)
+            self.inotify_fd = None
+
+    def update(self) -> None:
+        """Bring the index up to date with the cache directory."""
+        if self.inotify_fd is None:
+            self.rescan()
+            return
+
+        while True:
+            try:
+                data = os.read(self.inotify_fd, 65536)
+            except BlockingIOError:
+                return
+
+            if self._handle_events(data):
+                return
+
+    def _handle_events(self, data: bytes) -> bool:
+        """Apply inotify events, returns True if the index had to be rebuilt."""
+        offset = 0
+
+        while offset < len(data):
+            _, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size
+            name = data[offset : offset + length].rstrip(b"\0").decode()
+            offset += length
+
+            if mask & IN_IGNORED:
+                # the watch was removed along with the directory
+                logger.debug(f"Lost watch on {self.cache_dir}, polling instead")
+                self.stop()
+                self.rescan()
+                return True
+
+            if mask & IN_Q_OVERFLOW:
+                self.rescan()
+                return True
+
+            if mask & (IN_DELETE | IN_MOVED_FROM):
+                self._remove(name)
+            elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                segment = self.segments.get(name) or self._add(name)
+
+                if segment is not None:
+                    segment.closed = True
+            elif mask & IN_CREATE:
+                self._add(name)
+
+        return False
+
+    def rescan(self) -> None:
+        """Sync the index with a full listing of the cache directory."""
+        try:
+            names = {
+                entry.name
+                for entry in os.scandir(self.cache_dir)
+                if self._is_segment_name(entry.name) and entry.is_file()
+            }
+        except FileNotFoundError:
+            names = set()
+
+        for name in [n for n in self.segments if n not in names]:
+            self._remove(name)
+
+        self.ignored &= names
+
+        for name in names:
+            if name not in self.segments and name not in self.ignored:
+                self._add(name)
+
+    def remove(self, cache_path: str) -> None:
+        """Drop a segment that was moved or deleted from the cache."""
+        self._remove(os.path.basename(cache_path))
+
+    def _is_segment_name(self, name: str) -> bool:
+        return name.endswith(".mp4") and not name.startswith("preview_")
+
+    def _add(self, name: str) -> CacheSegment | None:
+        if not self._is_segment_name(name):
+            return None
+
+        try:
+            camera, date = os.path.splitext(name)[0].rsplit("@", maxsplit=1)
+            start_time = datetime.datetime.strptime(
+                date, CACHE_SEGMENT_FORMAT
+            ).astimezone(datetime.UTC)
+        except ValueError:
+            self.ignored.add(name)
+
+            if not self.unexpected_files_logged:
+                logger.warning("Skipping unexpected files in cache")
+                self.unexpected_files_logged = True
+            return None
+
+        segment = CacheSegment(os.path.join(self.cache_dir, name), camera, start_time)
+        self.segments[name] = segment
+        bisect.insort(self.camera_segments[camera], (start_time.timestamp(), name))
+        return segment
+
+    def _remove(self, name: str) -> None:
+        segment = self.segments.pop(name, None)
+
+        if segment is None:
+            return
+
+        index = self.camera_segments[segment.camera]
+        position = bisect.bisect_left(index, (segment.start_time.timestamp(), name))
+
+        if position < len(index) and index[position][1] == name:
+            index.pop(position)
+
+        if not index:
+            del self.camera_segments[segment.camera]
+
+    def newest_segments(self) -> dict[str, CacheSegment]:
+        """The newest segment for each camera, including ones still being written."""
+        return {
+            camera: self.segments[index[-1][1]]
+            for camera, index in self.camera_segments.items()
+        }
+
+    def closed_segments(self) -> dict[str, list[CacheSegment]]:
+        """Segments ffmpeg has finished writing, sorted by start time per camera."""
+        closed: dict[str, list[CacheSegment]] = {}
+
+        for camera, index in self.camera_segments.items():
+            segments = [self.segments[name] for _, name in index]
+
+            if not self._is_complete(segments[-1]):
+                segments = segments[:-1]
+
+            if segments:
+                closed[camera] = segments
+
+        return closed
+
+    def _is_complete(self, segment: CacheSegment) -> bool:
+        if segment.closed:
+            return True
+
+        # ffmpeg is no longer writing a segment that hasn't changed in longer
+        # than any segment can last, e.g. one left over from before a restart
+        try:
+            modified = os.path.getmtime(segment.cache_path)
+        except FileNotFoundError:
+            return False
+
+        return time.time() - modified > MAX_SEGMENT_DURATION
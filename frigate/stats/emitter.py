@@ -10,7 +10,8 @@ from typing import Any
 
 from frigate.comms.inter_process import InterProcessRequestor
 from frigate.config import FrigateConfig
-from frigate.const import FREQUENCY_STATS_POINTS
+from frigate.const import FREQUENCY_STATS_POINTS, STATS_HISTORY_DIR
+from frigate.stats.history import StatsHistoryStore
 from frigate.stats.prometheus import update_metrics
 from frigate.stats.util import stats_snapshot
 from frigate.types import StatsTrackingTypes
@@ -34,6 +35,7 @@ class StatsEmitter(threading.Thread):
         self.stop_event = stop_event
         self.hwaccel_errors: dict[str, float] = {}
         self.stats_history: list[dict[str, Any]] = []
+        self.stats_store = StatsHistoryStore(STATS_HISTORY_DIR)
 
         # create communication for stats
         self.requestor = InterProcessRequestor()
@@ -114,6 +116,12 @@ class StatsEmitter(threading.Thread):
 
         return selected_stats
 
+    def get_stats_series(
+        self, metrics: list[str], after: float, before: float
+    ) -> dict[str, Any]:
+        """Get downsampled values of the matching stats over a time range."""
+        return self.stats_store.query(metrics, after, before)
+
     def stats_init(config, camera_metrics, detectors, processes):
         stats = {
             "cameras": camera_metrics,
@@ -138,10 +146,12 @@ class StatsEmitter(threading.Thread):
             )
             self.stats_history.append(stats)
             self.stats_history = self.stats_history[-MAX_STATS_POINTS:]
+            self.stats_store.add(stats)
 
             if counter == 0:
                 self.requestor.send_data("stats", json.dumps(stats))
 
             logger.debug("Finished stats collection")
 
+        self.stats_store.flush()
         logger.info("Exiting stats emitter...")
@@ -0,0 +1,369 @@
+"""Store downsampled stats on disk so they can be queried over long ranges."""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from fnmatch import fnmatchcase
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# the stats that are kept, as dotted paths where * matches any part of the
+# path. the schema is fixed so per topic and per stage stats, and cumulative
+# counters that can't be averaged, don't each get a column
+HISTORY_METRICS = [
+    "camera_fps",
+    "process_fps",
+    "skipped_fps",
+    "detection_fps",
+    "cameras.*.camera_fps",
+    "cameras.*.process_fps",
+    "cameras.*.skipped_fps",
+    "cameras.*.detection_fps",
+    "cameras.*.audio_dBFS",
+    "cameras.*.ffmpeg_cpu",
+    "cameras.*.capture_cpu",
+    "cameras.*.detect_cpu",
+    "detectors.*.inference_speed",
+    "detectors.*.cpu",
+    "detectors.*.mem",
+    "cpu_usages.frigate.full_system.cpu",
+    "cpu_usages.frigate.full_system.mem",
+    "gpu_usages.*.gpu",
+    "gpu_usages.*.mem",
+    "gpu_usages.*.enc",
+    "gpu_usages.*.dec",
+    "npu_usages.*.npu",
+    "embeddings.*_speed",
+    "audio.inference_speed",
+    "audio.queue_depth",
+]
+
+# resolution and retention in seconds of each rollup, from finest to coarsest
+STATS_TIERS = [
+    ("15s", 15, 86400),
+    ("1m", 60, 86400 * 7),
+    ("15m", 900, 86400 * 28),
+]
+
+# rows are added for new metrics in blocks so the files are rarely resized
+METRIC_BLOCK_SIZE = 64
+FLUSH_INTERVAL = 300
+
+
+def flatten_stats(stats: dict[str, Any], prefix: str = "") -> dict[str, float]:
+    """Get the numeric values of a stats snapshot keyed by their dotted path."""
+    values: dict[str, float] = {}
+
+    for key, value in stats.items():
+        path = f"{prefix}{key}"
+
+        if isinstance(value, dict):
+            values.update(flatten_stats(value, f"{path}."))
+        elif isinstance(value, bool):
+            continue
+        elif isinstance(value, (int, float)):
+            values[path] = float(value)
+        elif isinstance(value, str):
+            # cpu and gpu usages are reported as strings, some with a percent
+            try:
+                values[path] = float(value.removesuffix("%"))
+            except ValueError:
+                pass
+
+    return values
+
+
+def is_history_metric(path: str) -> bool:
+    return any(fnmatchcase(path, pattern) for pattern in HISTORY_METRICS)
+
+
+class StatsTier:
+    """A ring of values for every metric at a single resolution.
+
+    Each bucket is a row so a sample only writes to one contiguous part of
+    the file, the current bucket holds the mean of the samples seen so far
+    in it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        resolution: int,
+        retention: int,
+        directory: str | None,
+        capacity: int,
+    ) -> None:
+        self.name = name
+        self.resolution = resolution
+        self.retention = retention
+        self.slots = retention // resolution
+        self.directory = directory
+        self.bucket = -1
+        self.sums = np.zeros(capacity)
+        self.counts = np.zeros(capacity)
+        self.times = self._open("times", (self.slots,), np.float64, 0)
+        self.data = self._open("data", (self.slots, capacity), np.float32, np.nan)
+
+    def _path(self, kind: str) -> str:
+        return os.path.join(str(self.directory), f"{self.name}_{kind}.npy")
+
+    def _open(
+        self, kind: str, shape: tuple[int, ...], dtype: type, fill: float
+    ) -> np.ndarray:
+        if self.directory is None:
+            return np.full(shape, fill, dtype=dtype)
+
+        path = self._path(kind)
+
+        if os.path.exists(path):
+            try:
+                existing = np.load(path, mmap_mode="r+")
+
+                if existing.shape == shape and existing.dtype == dtype:
+                    return existing
+            except (OSError, ValueError):
+                logger.warning(f"Unable to load stats history from {path}")
+
+        array = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+        array[:] = fill
+        return array
+
+    def resize(self, capacity: int, columns: list[int] | None = None) -> None:
+        """Change the number of columns, keeping only the given columns if set."""
+        keep = np.arange(self.data.shape[1]) if columns is None else np.array(columns)
+        kept = len(keep)
+
+        if self.directory is None:
+            data = np.full((self.slots, capacity), np.nan, dtype=np.float32)
+            data[:, :kept] = self.data[:, keep]
+            self.data = data
+        else:
+            path = self._path("data")
+            data = np.lib.format.open_memmap(
+                f"{path}.tmp", mode="w+", dtype=np.float32, shape=(self.slots, capacity)
+            )
+            data[:] = np.nan
+            data[:, :kept] = self.data[:, keep]
+            data.flush()
+            del data
+            os.replace(f"{path}.tmp", path)
+            self.data = np.load(path, mmap_mode="r+")
+
+        sums = np.zeros(capacity)
+        sums[:kept] = self.sums[keep]
+        self.sums = sums
+        counts = np.zeros(capacity)
+        counts[:kept] = self.counts[keep]
+        self.counts = counts
+
+    def add(self, timestamp: float, values: np.ndarray) -> None:
+        bucket = int(timestamp // self.resolution)
+
+        if bucket != self.bucket:
+            self.bucket = bucket
+            self.sums[:] = 0
+            self.counts[:] = 0
+
+        known = ~np.isnan(values)
+        self.sums[known] += values[known]
+        self.counts[known] += 1
+
+        slot = bucket % self.slots
+        self.times[slot] = bucket * self.resolution
+        self.data[slot] = np.where(
+            self.counts > 0, self.sums / np.maximum(self.counts, 1), np.nan
+        )
+
+    def flush(self) -> None:
+        if isinstance(self.data, np.memmap):
+            self.data.flush()
+
+        if isinstance(self.times, np.memmap):
+            self.times.flush()
+
+
+class StatsHistoryStore:
+    """Keeps stats snapshots as 15 second, 1 minute and 15 minute rollups.
+
+    When a directory is given the rollups are memory mapped files in it, so
+    they survive restarts without being held in memory.
+    """
+
+    def __init__(self, directory: str | None) -> None:
+        self.directory = directory
+        self.lock = threading.Lock()
+        self.metrics: list[str] = []
+        self.cameras: set[str] = set()
+        # whether each path seen in the stats is kept
+        self.kept: dict[str, bool] = {}
+
+        if directory is not None:
+            try:
+                os.makedirs(directory, exist_ok=True)
+                self.metrics = self._load_metrics()
+            except OSError as e:
+                logger.warning(f"Unable to save stats history in {directory}: {e}")
+                self.directory = None
+
+        self.index = {path: i for i, path in enumerate(self.metrics)}
+        capacity = self._capacity(len(self.metrics))
+        self.tiers = [
+            StatsTier(name, resolution, retention, self.directory, capacity)
+            for name, resolution, retention in STATS_TIERS
+        ]
+        self.last_flush = time.monotonic()
+
+        # metrics saved before they were dropped from the schema
+        removed = [path for path in self.metrics if not is_history_metric(path)]
+
+        if removed:
+            self._remove_metrics(removed)
+
+    def _metrics_path(self) -> str:
+        return os.path.join(str(self.directory), "metrics.json")
+
+    def _load_metrics(self) -> list[str]:
+        try:
+            with open(self._metrics_path()) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return []
+
+    @staticmethod
+    def _capacity(count: int) -> int:
+        return max(1, math.ceil(count / METRIC_BLOCK_SIZE)) * METRIC_BLOCK_SIZE
+
+    def _add_metrics(self, paths: list[str]) -> None:
+        for path in paths:
+            self.index[path] = len(self.metrics)
+            self.metrics.append(path)
+
+        capacity = self._capacity(len(self.metrics))
+
+        for tier in self.tiers:
+            if tier.data.shape[1] < capacity:
+                tier.resize(capacity)
+
+        self._save_metrics()
+
+    def _remove_metrics(self, paths: list[str]) -> None:
+        removed = set(paths)
+        columns = [i for i, path in enumerate(self.metrics) if path not in removed]
+        self.metrics = [self.metrics[i] for i in columns]
+        self.index = {path: i for i, path in enumerate(self.metrics)}
+        capacity = self._capacity(len(self.metrics))
+
+        for tier in self.tiers:
+            tier.resize(capacity, columns)
+
+        self._save_metrics()
+
+    def _save_metrics(self) -> None:
+        if self.directory is not None:
+            with open(self._metrics_path(), "w") as f:
+                json.dump(self.metrics, f)
+
+    def _is_kept(self, path: str) -> bool:
+        kept = self.kept.get(path)
+
+        if kept is None:
+            kept = self.kept[path] = is_history_metric(path)
+
+        return kept
+
+    def _update_cameras(self, cameras: set[str]) -> None:
+        """Drop the metrics of cameras that were removed."""
+        self.cameras = cameras
+        removed = [
+            path
+            for path in self.metrics
+            if path.startswith("cameras.") and path.split(".")[1] not in cameras
+        ]
+
+        if removed:
+            self._remove_metrics(removed)
+            self.kept = {}
+
+    def add(self, stats: dict[str, Any], timestamp: float | None = None) -> None:
+        """Add a stats snapshot to every rollup."""
+        values = flatten_stats(stats)
+        timestamp = timestamp if timestamp is not None else time.time()
+
+        with self.lock:
+            values = {path: v for path, v in values.items() if self._is_kept(path)}
+
+            if "cameras" in stats and set(stats["cameras"]) != self.cameras:
+                self._update_cameras(set(stats["cameras"]))
+
+            new_paths = [path for path in values if path not in self.index]
+
+            if new_paths:
+                self._add_metrics(new_paths)
+
+            row = np.full(self.tiers[0].data.shape[1], np.nan)
+
+            for path, value in values.items():
+                row[self.index[path]] = value
+
+            for tier in self.tiers:
+                tier.add(timestamp, row)
+
+            if time.monotonic() - self.last_flush > FLUSH_INTERVAL:
+                self._flush()
+
+    def _flush(self) -> None:
+        self.last_flush = time.monotonic()
+
+        for tier in self.tiers:
+            tier.flush()
+
+    def flush(self) -> None:
+        with self.lock:
+            self._flush()
+
+    def query(
+        self,
+        patterns: list[str],
+        after: float,
+        before: float,
+    ) -> dict[str, Any]:
+        """Get the values of the metrics matching the patterns in a time range.
+
+        Patterns are dotted stats paths where * matches any part of the path,
+        ex: cameras.*.camera_fps. The finest rollup that still covers the
+        start of the range is used.
+        """
+        now = time.time()
+
+        with self.lock:
+            tier = next(
+                (t for t in self.tiers if after >= now - t.retention), self.tiers[-1]
+            )
+            paths = [
+                path
+                for path in self.metrics
+                if any(fnmatchcase(path, pattern) for pattern in patterns)
+            ]
+            slots = np.flatnonzero(
+                (tier.times > 0) & (tier.times >= after) & (tier.times <= before)
+            )
+            slots = slots[np.argsort(tier.times[slots])]
+            values = tier.data[slots][:, [self.index[path] for path in paths]].T
+
+            return {
+                "resolution": tier.resolution,
+                "times": tier.times[slots].tolist(),
+                "metrics": {
+                    path: [
+                        None if math.isnan(value) else round(value, 2)
+                        for value in values[i].tolist()
+                    ]
+                    for i, path in enumerate(paths)
+                },
+            }
@@ -7,9 +7,12 @@ from prometheus_client.core import (
     REGISTRY,
     CounterMetricFamily,
     GaugeMetricFamily,
+    HistogramMetricFamily,
     InfoMetricFamily,
 )
 
+from frigate.track.latency import LATENCY_EXPORT_BOUNDS
+
 
 class CustomCollector:
     def __init__(self, _url):
@@ -196,6 +199,31 @@ class CustomCollector:
         yield process_fps
         yield skipped_fps
 
+        pipeline_latency = HistogramMetricFamily(
+            "frigate_pipeline_latency_seconds",
+            "Time frames spend in each stage from being read to being published",
+            labels=["camera_name", "stage"],
+        )
+
+        for camera_name, camera_stats in cameras.items():
+            try:
+                for stage, stage_stats in camera_stats["pipeline_latency"].items():
+                    pipeline_latency.add_metric(
+                        [camera_name, stage],
+                        [
+                            (str(bound / 1000), count)
+                            for bound, count in zip(
+                                LATENCY_EXPORT_BOUNDS, stage_stats["buckets"]
+                            )
+                        ]
+                        + [("+Inf", stage_stats["count"])],
+                        stage_stats["sum"] / 1000,
+                    )
+            except (KeyError, TypeError):
+                pass
+
+        yield pipeline_latency
+
         # bandwidth stats
         bandwidth_usages = GaugeMetricFamily(
             "frigate_bandwidth_usages_kBps",
@@ -431,6 +459,150 @@ class CustomCollector:
 
         yield temperatures
 
+        media_subprocesses = GaugeMetricFamily(
+            "frigate_media_subprocesses",
+            "API ffmpeg/ffprobe subprocess pool",
+            labels=["state"],
+        )
+        try:
+            for state in stats["service"]["media_subprocesses"]:
+                self.add_metric(
+                    media_subprocesses,
+                    [state],
+                    stats["service"]["media_subprocesses"],
+                    state,
+                )
+        except KeyError:
+            pass
+
+        yield media_subprocesses
+
+        media_downloads = GaugeMetricFamily(
+            "frigate_media_downloads",
+            "API clip download subprocess pool",
+            labels=["state"],
+        )
+        try:
+            for state in stats["service"]["media_downloads"]:
+                self.add_metric(
+                    media_downloads,
+                    [state],
+                    stats["service"]["media_downloads"],
+                    state,
+                )
+        except KeyError:
+            pass
+
+        yield media_downloads
+
+        embeddings_topic_speed = GaugeMetricFamily(
+            "frigate_embeddings_topic_handler_seconds",
+            "Time the embeddings maintainer spends handling a topic per poll",
+            labels=["topic"],
+        )
+        try:
+            for topic in stats["embeddings_maintainer"]:
+                self.add_metric(
+                    embeddings_topic_speed,
+                    [topic],
+                    stats["embeddings_maintainer"],
+                    topic,
+                    1e-3,
+                )
+        except KeyError:
+            pass
+
+        yield embeddings_topic_speed
+
+        search_cache_hits = CounterMetricFamily(
+            "frigate_search_cache_hits",
+            "Semantic search cache hits",
+            labels=["cache"],
+        )
+        search_cache_misses = CounterMetricFamily(
+            "frigate_search_cache_misses",
+            "Semantic search cache misses",
+            labels=["cache"],
+        )
+        try:
+            for cache, cache_stats in stats["search_cache"].items():
+                self.add_metric(search_cache_hits, [cache], cache_stats, "hits")
+                self.add_metric(search_cache_misses, [cache], cache_stats, "misses")
+        except KeyError:
+            pass
+
+        yield search_cache_hits
+        yield search_cache_misses
+
+        audio_inference_speed = GaugeMetricFamily(
+            "frigate_audio_inference_speed_seconds",
+            "Time the shared audio classifier takes per window",
+        )
+        audio_interpreters = GaugeMetricFamily(
+            "frigate_audio_interpreters",
+            "Audio interpreters shared by the cameras",
+        )
+        audio_queue_depth = GaugeMetricFamily(
+            "frigate_audio_queue_depth",
+            "Audio windows waiting to be classified",
+        )
+        try:
+            audio_stats = stats["audio"]
+            self.add_metric(
+                audio_inference_speed, [], audio_stats, "inference_speed", 1e-3
+            )
+            self.add_metric(audio_interpreters, [], audio_stats, "interpreters")
+            self.add_metric(audio_queue_depth, [], audio_stats, "queue_depth")
+        except KeyError:
+            pass
+
+        yield audio_inference_speed
+        yield audio_interpreters
+        yield audio_queue_depth
+
+        ipc_requests = CounterMetricFamily(
+            "frigate_ipc_requests",
+            "Requests handled from other processes",
+            labels=["topic"],
+        )
+        ipc_request_wait = GaugeMetricFamily(
+            "frigate_ipc_request_wait_seconds",
+            "Average time requests wait before they are handled",
+            labels=["topic"],
+        )
+        ipc_request_duration = GaugeMetricFamily(
+            "frigate_ipc_request_duration_seconds",
+            "Average time taken to handle requests",
+            labels=["topic"],
+        )
+        ipc_queued = GaugeMetricFamily(
+            "frigate_ipc_queued_requests",
+            "Requests waiting to be handled",
+            labels=["class"],
+        )
+        try:
+            for topic, topic_stats in stats["inter_process"]["topics"].items():
+                self.add_metric(ipc_requests, [topic], topic_stats, "requests")
+                self.add_metric(ipc_request_wait, [topic], topic_stats, "wait", 1e-3)
+                self.add_metric(
+                    ipc_request_duration, [topic], topic_stats, "duration", 1e-3
+                )
+
+            for request_class in stats["inter_process"]["queued"]:
+                self.add_metric(
+                    ipc_queued,
+                    [request_class],
+                    stats["inter_process"]["queued"],
+                    request_class,
+                )
+        except KeyError:
+            pass
+
+        yield ipc_requests
+        yield ipc_request_wait
+        yield ipc_request_duration
+        yield ipc_queued
+
         storage_free = GaugeMetricFamily(
             "frigate_storage_free_bytes", "Storage free bytes", labels=["storage"]
         )
@@ -12,10 +12,13 @@ from typing import Any
 import requests
 from requests.exceptions import RequestException
 
+from frigate.camera import AudioMetrics
+from frigate.comms.inter_process import RequestMetrics
 from frigate.config import FrigateConfig
 from frigate.const import CACHE_DIR, CLIPS_DIR, RECORD_DIR
 from frigate.data_processing.types import DataProcessorMetrics
 from frigate.object_detection.base import ObjectDetectProcess
+from frigate.track.latency import PipelineMetrics
 from frigate.types import StatsTrackingTypes
 from frigate.util.services import (
     calculate_shm_requirements,
@@ -33,6 +36,7 @@ from frigate.util.services import (
     get_rockchip_npu_stats,
     is_vaapi_amd_driver,
 )
+from frigate.util.subprocess_pool import media_downloads, media_subprocesses
 from frigate.version import VERSION
 
 logger = logging.getLogger(__name__)
@@ -63,12 +67,18 @@ def stats_init(
     config: FrigateConfig,
     camera_metrics: DictProxy,
     embeddings_metrics: DataProcessorMetrics | None,
+    audio_metrics: AudioMetrics | None,
+    request_metrics: RequestMetrics | None,
+    pipeline_metrics: PipelineMetrics | None,
     detectors: dict[str, ObjectDetectProcess],
     processes: dict[str, int],
 ) -> StatsTrackingTypes:
     stats_tracking: StatsTrackingTypes = {
         "camera_metrics": camera_metrics,
         "embeddings_metrics": embeddings_metrics,
+        "audio_metrics": audio_metrics,
+        "request_metrics": request_metrics,
+        "pipeline_metrics": pipeline_metrics,
         "detectors": detectors,
         "started": int(time.time()),
         "latest_frigate_version": get_latest_version(config),
@@ -351,6 +361,9 @@ def stats_snapshot(
 
     total_camera_fps = total_process_fps = total_skipped_fps = total_detection_fps = 0
 
+    pipeline_metrics = stats_tracking.get("pipeline_metrics")
+    pipeline_latency = pipeline_metrics.stats() if pipeline_metrics else {}
+
     stats["cameras"] = {}
     for name, camera_stats in camera_metrics.items():
         if name not in config.cameras:
@@ -404,6 +417,7 @@ def stats_snapshot(
             "ffmpeg_pid": ffmpeg_pid,
             "audio_rms": round(camera_stats.audio_rms.value, 4),
             "audio_dBFS": round(camera_stats.audio_dBFS.value, 4),
+            "pipeline_latency": pipeline_latency.get(name, {}),
             **connection_quality,
         }
 
@@ -486,6 +500,29 @@ def stats_snapshot(
                 embeddings_metrics.classification_cps[key].value, 2
             )
 
+        # time the embeddings maintainer spends handling each topic per poll
+        stats["embeddings_maintainer"] = {
+            topic: round(speed * 1000, 2)
+            for topic, speed in embeddings_metrics.maintainer_topic_speeds.copy().items()
+        }
+
+        if embeddings_metrics.search_cache_stats:
+            stats["search_cache"] = embeddings_metrics.search_cache_stats.copy()
+
+    audio_metrics = stats_tracking.get("audio_metrics")
+
+    if audio_metrics and any(c.audio.enabled for c in config.cameras.values()):
+        stats["audio"] = {
+            "inference_speed": round(audio_metrics.inference_speed.value * 1000, 2),
+            "interpreters": audio_metrics.interpreters.value,
+            "queue_depth": audio_metrics.queue_depth.value,
+        }
+
+    request_metrics = stats_tracking.get("request_metrics")
+
+    if request_metrics:
+        stats["inter_process"] = request_metrics.stats()
+
     get_processing_stats(config, stats, hwaccel_errors)
 
     stats["service"] = {
@@ -494,6 +531,8 @@ def stats_snapshot(
         "latest_version": stats_tracking["latest_frigate_version"],
         "storage": {},
         "last_updated": int(time.time()),
+        "media_subprocesses": media_subprocesses.stats(),
+        "media_downloads": media_downloads.stats(),
     }
 
     for path in [RECORD_DIR, CLIPS_DIR, CACHE_DIR]:
@@ -27,6 +27,36 @@ class TestHttpApp(BaseTestHttp):
             response_json = response.json()
             assert response_json == self.test_stats
 
+    def test_stats_series_endpoint(self):
+        stats = Mock(spec=StatsEmitter)
+        stats.get_stats_series.return_value = {
+            "resolution": 15,
+            "times": [],
+            "metrics": {},
+        }
+        app = super().create_app(stats)
+
+        with AuthTestClient(app) as client:
+            response = client.get(
+                "/stats/series",
+                params={
+                    "metrics": "cameras.*.camera_fps,detectors.*.inference_speed",
+                    "after": 1000,
+                    "before": 2000,
+                },
+            )
+            assert response.status_code == 200
+            stats.get_stats_series.assert_called_once_with(
+                ["cameras.*.camera_fps", "detectors.*.inference_speed"], 1000, 2000
+            )
+
+            response = client.get(
+                "/stats/series",
+                params={"metrics": "cpu"},
+                headers={"remote-user": "viewer", "remote-role": "viewer"},
+            )
+            assert response.status_code == 403
+
     def test_recordings_storage_requires_admin(self):
         stats = Mock(spec=StatsEmitter)
         stats.get_latest_stats.return_value = self.test_stats
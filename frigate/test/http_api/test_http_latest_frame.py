@@ -93,6 +93,7 @@ class TestHttpLatestFrame(BaseTestHttp):
         camera = "front_door"
         # 1. Mock frame processor to return None
         self.app.detected_frames_processor.get_current_frame.return_value = None
+        self.app.detected_frames_processor.get_current_frame_time.return_value = 0.0
 
         # 2. No preview file created
 
@@ -105,3 +106,28 @@ class TestHttpLatestFrame(BaseTestHttp):
             # Since we didn't provide camera-error.jpg, it might 500 if glob fails or return 500 if frame is None.
             assert response.status_code in [200, 500]
             assert "X-Frigate-Offline" not in response.headers
+
+    def test_latest_frame_reuses_encoded_frame(self):
+        camera = "front_door"
+        dummy_frame = np.zeros((180, 320, 3), np.uint8)
+        processor = self.app.detected_frames_processor
+        processor.get_current_frame.return_value = dummy_frame
+        processor.get_current_frame_time.return_value = 2000000000.0
+
+        with AuthTestClient(self.app) as client:
+            first = client.get(f"/{camera}/latest.jpg?height=90")
+            second = client.get(f"/{camera}/latest.jpg?height=90")
+            resized = client.get(f"/{camera}/latest.jpg?height=45")
+
+            assert first.status_code == 200
+            assert first.content == second.content
+            assert cv2.imdecode(
+                np.frombuffer(resized.content, np.uint8), cv2.IMREAD_COLOR
+            ).shape == (45, 80, 3)
+            # the frame is converted once and shared between sizes
+            assert processor.get_current_frame.call_count == 1
+
+            # a new frame invalidates the cached image
+            processor.get_current_frame_time.return_value = 2000000001.0
+            client.get(f"/{camera}/latest.jpg?height=90")
+            assert processor.get_current_frame.call_count == 2
@@ -1,13 +1,16 @@
 """Unit tests for recordings/media API endpoints."""
 
 from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import numpy as np
 import pytz
 from fastapi import Request
 
 from frigate.api.auth import get_allowed_cameras_for_filter, get_current_user
-from frigate.models import Recordings
+from frigate.models import Recordings, Regions
 from frigate.test.http_api.base_http_test import AuthTestClient, BaseTestHttp
+from frigate.util.object import GRID_SIZE
 
 
 class TestHttpMedia(BaseTestHttp):
@@ -527,3 +530,80 @@ class TestHttpMedia(BaseTestHttp):
 
             assert response.status_code == 200
             assert response.json() == [{"start_time": 1010, "end_time": 1030}]
+
+    def test_vod_snaps_clip_from_using_stored_keyframes(self):
+        """Stored keyframe offsets are used instead of probing the recording."""
+        with AuthTestClient(self.app) as client:
+            Recordings.insert(
+                id="front_indexed",
+                path="/media/recordings/front_indexed.mp4",
+                camera="front_door",
+                start_time=1000,
+                end_time=1010,
+                duration=10,
+                motion=0,
+                keyframes=[0, 2000, 4000, 6000, 8000],
+            ).execute()
+
+            with patch(
+                "frigate.api.media.get_keyframe_before", new_callable=AsyncMock
+            ) as mock_probe:
+                response = client.get("/vod/front_door/start/1005.5/end/1010")
+
+            mock_probe.assert_not_called()
+            assert response.status_code == 200
+            clip = response.json()["sequences"][0]["clips"][0]
+            assert clip["clipFrom"] == 4000
+            assert clip["keyFrameDurations"] == [6000]
+
+    def test_vod_probes_recordings_without_keyframe_index(self):
+        """Recordings stored before the keyframe index fall back to ffprobe."""
+        with AuthTestClient(self.app) as client:
+            Recordings.insert(
+                id="front_legacy",
+                path="/media/recordings/front_legacy.mp4",
+                camera="front_door",
+                start_time=1000,
+                end_time=1010,
+                duration=10,
+                motion=0,
+            ).execute()
+
+            with patch(
+                "frigate.api.media.get_keyframe_before",
+                new_callable=AsyncMock,
+                return_value=5000,
+            ) as mock_probe:
+                response = client.get("/vod/front_door/start/1005.5/end/1010")
+
+            mock_probe.assert_called_once_with(
+                "/media/recordings/front_legacy.mp4", 5500
+            )
+            assert response.status_code == 200
+            clip = response.json()["sequences"][0]["clips"][0]
+            assert clip["clipFrom"] == 5000
+
+
+class TestHttpGridSnapshot(BaseTestHttp):
+    def setUp(self):
+        super().setUp([Regions])
+        self.app = super().create_app()
+        self.app.detected_frames_processor = MagicMock()
+        self.app.detected_frames_processor.get_current_frame.return_value = np.zeros(
+            (1080, 1920, 3), np.uint8
+        )
+        self.app.detected_frames_processor.get_current_frame_time.return_value = (
+            datetime.now().timestamp()
+        )
+
+    def test_grid_snapshot_with_cell_data(self):
+        grid = [[{"count": 0} for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+        grid[2][3] = {"x": 2, "y": 3, "count": 12, "std_dev": 0.05, "mean": 0.2}
+        Regions.insert(
+            camera="front_door", grid=grid, last_update=datetime.now()
+        ).execute()
+
+        with AuthTestClient(self.app) as client:
+            response = client.get("/front_door/grid.jpg")
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "image/jpeg"
@@ -0,0 +1,130 @@
+"""Tests for the shared audio classifier."""
+
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+
+from frigate.events.audio import AudioClassifier
+
+
+class FakeAudioTfl:
+    """Labels each window with its first sample, waiting until released."""
+
+    release = threading.Event()
+
+    def __init__(self, stop_event, num_threads):
+        self.thread = threading.current_thread().name
+
+    def detect(self, tensor_input):
+        FakeAudioTfl.release.wait(5)
+        return [(f"sound_{int(tensor_input[0])}", 0.9, (-1, -1, -1, -1))]
+
+
+class TestAudioClassifier(unittest.TestCase):
+    def setUp(self):
+        p = patch("frigate.events.audio.AudioTfl", FakeAudioTfl)
+        p.start()
+        self.addCleanup(p.stop)
+        FakeAudioTfl.release.set()
+
+        self.stop_event = threading.Event()
+        self.metrics = SimpleNamespace(
+            inference_speed=SimpleNamespace(value=0.0),
+            interpreters=SimpleNamespace(value=0),
+            queue_depth=SimpleNamespace(value=0),
+        )
+        self.classifier = AudioClassifier(
+            self.stop_event, 2, self.metrics, max_interpreters=2
+        )
+
+    def tearDown(self):
+        self.stop_event.set()
+        FakeAudioTfl.release.set()
+        self.classifier.join(5)
+
+    def submit(self, count: int) -> tuple[dict[int, list], list[threading.Thread]]:
+        results: dict[int, list] = {}
+
+        def classify(i: int) -> None:
+            results[i] = self.classifier.classify(np.full(10, i, np.float32))
+
+        threads = [threading.Thread(target=classify, args=(i,)) for i in range(count)]
+
+        for thread in threads:
+            thread.start()
+
+        return results, threads
+
+    def wait_for(self, condition) -> None:
+        deadline = time.monotonic() + 5
+
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_each_camera_gets_its_detections(self):
+        self.classifier.start()
+        results, threads = self.submit(4)
+
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(
+            {i: detections[0][0] for i, detections in results.items()},
+            {i: f"sound_{i}" for i in range(4)},
+        )
+
+    def test_interpreters_are_added_while_windows_wait(self):
+        FakeAudioTfl.release.clear()
+        self.classifier.start()
+        results, threads = self.submit(4)
+
+        self.wait_for(lambda: len(self.classifier.workers) == 2)
+        FakeAudioTfl.release.set()
+
+        for thread in threads:
+            thread.join(5)
+
+        # the pool doesn't grow past its limit
+        self.assertEqual(len(self.classifier.workers), 2)
+        self.assertEqual(self.metrics.interpreters.value, 2)
+        self.assertEqual(len(results), 4)
+
+    def test_backlog_is_logged_when_every_interpreter_is_busy(self):
+        self.classifier.max_interpreters = 1
+        FakeAudioTfl.release.clear()
+        self.classifier.start()
+
+        with patch("frigate.events.audio.logger") as logger:
+            _, threads = self.submit(4)
+            self.wait_for(lambda: logger.warning.called)
+            FakeAudioTfl.release.set()
+
+            for thread in threads:
+                thread.join(5)
+
+        self.assertEqual(len(self.classifier.workers), 1)
+        self.assertIn("falling behind", logger.warning.call_args[0][0])
+
+    def test_waiting_readers_are_released_on_stop(self):
+        future_result: list = []
+        reader = threading.Thread(
+            target=lambda: future_result.append(
+                self.classifier.classify(np.zeros(10, np.float32))
+            )
+        )
+        reader.start()
+
+        self.stop_event.set()
+        self.classifier.start()
+        self.classifier.join(5)
+        reader.join(5)
+
+        self.assertEqual(future_result, [[]])
+
+
+if __name__ == "__main__":
+    unittest.main()
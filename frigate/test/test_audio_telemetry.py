@@ -0,0 +1,93 @@
+"""Tests for batching audio levels and activity in the audio activity manager."""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from frigate.camera.activity_manager import AudioActivityManager
+from frigate.comms.audio_telemetry import AudioTelemetryTypeEnum
+from frigate.config import FrigateConfig
+
+LEVELS = AudioTelemetryTypeEnum.levels.value
+EXPIRE = AudioTelemetryTypeEnum.expire.value
+
+
+class TestAudioTelemetry(unittest.TestCase):
+    def setUp(self):
+        patches = [
+            patch("frigate.camera.activity_manager.AudioTelemetrySubscriber"),
+            patch("frigate.camera.activity_manager.EventMetadataPublisher"),
+        ]
+        subscriber = patches[0].start()
+        patches[1].start()
+
+        for p in patches:
+            self.addCleanup(p.stop)
+
+        # updates are handled by the tests rather than the telemetry thread
+        subscriber.return_value.check_for_updates.return_value = []
+
+        camera = {
+            "ffmpeg": {
+                "inputs": [
+                    {"path": "rtsp://10.0.0.1:554/video", "roles": ["detect", "audio"]}
+                ]
+            },
+            "detect": {"width": 640, "height": 360},
+            "audio": {"enabled": True},
+        }
+        config = FrigateConfig(
+            **{"mqtt": {"enabled": False}, "cameras": {"front": camera, "back": camera}}
+        )
+        self.publish = MagicMock()
+        self.manager = AudioActivityManager(config, self.publish)
+        self.addCleanup(self.manager.stop)
+
+    def published(self) -> dict:
+        return {call.args[0]: call.args[1] for call in self.publish.call_args_list}
+
+    def test_levels_are_coalesced(self):
+        self.manager.handle_telemetry(
+            [
+                (LEVELS, ["front", 100.0, -50.0, []]),
+                (LEVELS, ["back", 300.0, -40.0, []]),
+                (LEVELS, ["front", 200.0, -45.0, []]),
+            ]
+        )
+
+        published = self.published()
+        self.assertEqual(published["front/audio/rms"], 200.0)
+        self.assertEqual(published["front/audio/dBFS"], -45.0)
+        self.assertEqual(published["back/audio/rms"], 300.0)
+        self.assertEqual(self.publish.call_count, 4)
+
+    def test_detections_in_a_batch_are_merged(self):
+        self.manager.handle_telemetry(
+            [
+                (LEVELS, ["front", 100.0, -50.0, [["bark", 0.85]]]),
+                (LEVELS, ["front", 100.0, -50.0, [["bark", 0.9], ["yell", 0.8]]]),
+                (LEVELS, ["front", 100.0, -50.0, []]),
+            ]
+        )
+
+        detections = self.manager.current_audio_detections["front"]
+        self.assertEqual(set(detections), {"bark", "yell"})
+        self.assertEqual(detections["bark"]["score"], 0.9)
+        self.assertEqual(self.published()["front/audio/all"], "ON")
+
+    def test_expire_ends_activity(self):
+        self.manager.handle_telemetry(
+            [(LEVELS, ["front", 100.0, -50.0, [["bark", 0.9]]])]
+        )
+        self.manager.handle_telemetry(
+            [
+                (LEVELS, ["front", 100.0, -50.0, [["bark", 0.9]]]),
+                (EXPIRE, "front"),
+            ]
+        )
+
+        self.assertEqual(self.manager.current_audio_detections["front"], {})
+        self.assertEqual(self.published()["front/audio/bark"], "OFF")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,9 +2,13 @@
 
 import multiprocessing as mp
 import unittest
+from unittest.mock import patch
+
+import numpy as np
 
 from frigate.config import FrigateConfig
 from frigate.output.birdseye import BirdsEyeFrameManager, get_canvas_shape
+from frigate.util.image import copy_yuv_to_position
 
 
 class TestBirdseye(unittest.TestCase):
@@ -114,3 +118,109 @@ class TestBirdseyeCameraOrder(unittest.TestCase):
 
         assert not layout_changed
         assert self.layout_order() == ["back", "front", "side"]
+
+
+class TestBirdseyeTiles(unittest.TestCase):
+    """Test that cameras are scaled into tiles only when they have new frames."""
+
+    def setUp(self):
+        config = {
+            "mqtt": {"enabled": False},
+            "birdseye": {"enabled": True, "mode": "continuous"},
+            "cameras": {
+                camera: {
+                    "ffmpeg": {
+                        "inputs": [
+                            {"path": "rtsp://10.0.0.1:554/video", "roles": ["detect"]}
+                        ]
+                    },
+                    "detect": {"height": 360, "width": 640, "fps": 5},
+                }
+                for camera in ("back", "front")
+            },
+        }
+        self.config = FrigateConfig(**config)
+        self.manager = BirdsEyeFrameManager(self.config, mp.Event())
+
+    def frame(self, camera: str, value: int) -> np.ndarray:
+        return np.full(self.config.cameras[camera].frame_shape_yuv, value, np.uint8)
+
+    def update(self, camera: str, frame_time: float, value: int) -> tuple[bool, bool]:
+        # allow an output on every update
+        self.manager.last_output_time = 0
+        return self.manager.update(camera, 0, 0, frame_time, self.frame(camera, value))
+
+    def pixel(self, camera: str) -> int:
+        x, y, width, height = self.manager.layout_positions[camera]
+        return int(self.manager.frame[y + height // 2, x + width // 2])
+
+    def test_new_frames_are_drawn(self):
+        assert self.update("back", 1.0, 200) == (True, True)
+        assert self.pixel("back") == 200
+        assert self.manager.cameras["back"]["current_frame"] is None
+
+        with patch(
+            "frigate.output.birdseye.copy_yuv_to_position",
+            wraps=copy_yuv_to_position,
+        ) as copy:
+            assert self.update("back", 1.2, 50) == (True, False)
+
+        # scaled into the tile once, drawing it on the frame is a plain copy
+        assert copy.call_count == 1
+        assert self.pixel("back") == 50
+
+    def test_rate_limited_frames_are_not_scaled(self):
+        self.update("back", 1.0, 200)
+
+        with patch(
+            "frigate.output.birdseye.copy_yuv_to_position",
+            wraps=copy_yuv_to_position,
+        ) as copy:
+            self.manager.last_output_time = 1e12
+            assert self.manager.update("back", 0, 0, 1.2, self.frame("back", 50)) == (
+                False,
+                False,
+            )
+            assert self.manager.update("back", 0, 0, 1.4, self.frame("back", 60)) == (
+                False,
+                False,
+            )
+
+        assert copy.call_count == 1
+        assert self.manager.dirty_cameras == {"back"}
+
+    def test_unchanged_tiles_are_not_redrawn(self):
+        self.update("back", 1.0, 200)
+        self.update("front", 1.0, 100)
+
+        with patch(
+            "frigate.output.birdseye.copy_yuv_to_position",
+            wraps=copy_yuv_to_position,
+        ) as copy:
+            assert self.update("front", 1.2, 90) == (True, False)
+
+        assert copy.call_count == 1
+        assert self.pixel("back") == 200
+        assert self.pixel("front") == 90
+
+    def test_layout_change_rescales_previous_tiles(self):
+        self.update("back", 1.0, 200)
+        full_screen = self.manager.layout_positions["back"]
+
+        assert self.update("front", 1.2, 100) == (True, True)
+        assert self.manager.layout_positions["back"] != full_screen
+        assert self.pixel("back") == 200
+        assert self.pixel("front") == 100
+
+    def test_tiles_are_drawn_at_their_position(self):
+        self.update("back", 1.0, 200)
+        self.update("front", 1.0, 100)
+
+        for camera, value in (("back", 200), ("front", 100)):
+            x, y, width, height = self.manager.layout_positions[camera]
+            tile = self.manager.cameras[camera]["tile"]
+            assert tile.shape == (height // 4 * 4 * 3 // 2, width // 2 * 2)
+
+            # the tile fills the position, so the whole y plane is drawn
+            y_crop = self.manager.frame[y : y + height // 4 * 4, x : x + width // 2 * 2]
+            assert (y_crop == value).all()
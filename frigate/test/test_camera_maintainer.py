@@ -1,11 +1,10 @@
 """Tests for CameraMaintainer SHM cleanup on camera remove.
 
 Regression coverage for the case where a camera is removed and then a
-new camera is added with the same name. Without unlinking the per-frame
-YUV SHM slots, the maintainer's frame_manager.create call hits
-FileExistsError and falls back to reopening the existing segment at the
-*old* size, which the new ffmpeg process then writes mismatched-size
-frames into.
+new camera is added with the same name. Without unlinking the camera's
+YUV frame ring, long-lived readers would keep serving frames from the
+old segment at the *old* size after the new ffmpeg process starts
+writing into its replacement.
 """
 
 import unittest
@@ -24,55 +23,27 @@ class TestMaintainerUnlinkFrameSlotsOnRemove(unittest.TestCase):
         maintainer.frame_manager = MagicMock()
         return maintainer
 
-    def test_unlinks_only_segments_with_matching_prefix(self) -> None:
+    def test_unlinks_camera_frame_ring(self) -> None:
         maintainer = self._make_maintainer()
-        maintainer.frame_manager.shm_store = {
-            "front_frame0": object(),
-            "front_frame1": object(),
-            "front_frame2": object(),
-            # Different camera; must not be touched.
-            "side_frame0": object(),
-            # Detector input/output buffers are sized by the model and
-            # cached by the long-lived DetectorRunner — must not be
-            # touched even when their owning camera is removed.
-            "front": object(),
-            "out-front": object(),
-        }
 
         # __name-mangled access from outside the class.
         maintainer._CameraMaintainer__unlink_camera_frame_slots("front")
 
-        deleted = [c.args[0] for c in maintainer.frame_manager.delete.call_args_list]
-        self.assertEqual(
-            sorted(deleted),
-            ["front_frame0", "front_frame1", "front_frame2"],
-        )
-
-    def test_handles_camera_with_no_slots(self) -> None:
-        """Cameras that were removed before any frame slot was ever
-        created (e.g. cancelled during preparing_clip) should be a no-op."""
-        maintainer = self._make_maintainer()
-        maintainer.frame_manager.shm_store = {"other_frame0": object()}
-
-        maintainer._CameraMaintainer__unlink_camera_frame_slots("front")
-
+        # Only the camera's ring is removed; detector input/output buffers
+        # ("front", "out-front") are sized by the model and cached by the
+        # long-lived DetectorRunner, so they must not be touched.
+        maintainer.frame_manager.delete_frame_ring.assert_called_once_with("front")
         maintainer.frame_manager.delete.assert_not_called()
 
     def test_swallows_delete_errors(self) -> None:
-        """Unlink failures shouldn't abort the remove loop — best-effort."""
+        """Unlink failures shouldn't abort the remove — best-effort."""
         maintainer = self._make_maintainer()
-        maintainer.frame_manager.shm_store = {
-            "front_frame0": object(),
-            "front_frame1": object(),
-        }
-        maintainer.frame_manager.delete.side_effect = OSError("simulated")
+        maintainer.frame_manager.delete_frame_ring.side_effect = OSError("simulated")
 
-        # Both slots are attempted; the OSError on the first doesn't
-        # prevent the second from being tried.
         with patch("frigate.camera.maintainer.logger"):
             maintainer._CameraMaintainer__unlink_camera_frame_slots("front")
 
-        self.assertEqual(maintainer.frame_manager.delete.call_count, 2)
+        maintainer.frame_manager.delete_frame_ring.assert_called_once_with("front")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,104 @@
+"""Tests for the shared bgr frame cache of the camera state."""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+import cv2
+import numpy as np
+
+from frigate.camera.state import CameraState
+from frigate.config import FrigateConfig
+
+CAMERA = "front"
+
+
+def _camera_state() -> CameraState:
+    config = FrigateConfig(
+        **{
+            "mqtt": {"enabled": False},
+            "cameras": {
+                CAMERA: {
+                    "ffmpeg": {
+                        "inputs": [
+                            {"path": "rtsp://10.0.0.1:554/video", "roles": ["detect"]}
+                        ]
+                    },
+                    "detect": {"width": 320, "height": 240},
+                }
+            },
+        }
+    )
+    return CameraState(CAMERA, config, MagicMock(), MagicMock())
+
+
+def _set_frame(state: CameraState, frame_time: float, value: int) -> None:
+    with state.current_frame_lock:
+        state.current_frame_time = frame_time
+        state._current_frame = np.full(
+            state.camera_config.frame_shape_yuv, value, np.uint8
+        )
+
+
+class TestCameraStateFrameCache(unittest.TestCase):
+    def setUp(self):
+        self.state = _camera_state()
+        _set_frame(self.state, 1.0, 100)
+
+    def test_frame_is_converted_once(self):
+        with patch(
+            "frigate.camera.state.cv2.cvtColor", wraps=cv2.cvtColor
+        ) as cvt_color:
+            first = self.state.get_current_frame()
+            second = self.state.get_current_frame({})
+
+        self.assertIs(first, second)
+        self.assertEqual(cvt_color.call_count, 1)
+        self.assertEqual(first.shape, (240, 320, 3))
+        self.assertFalse(first.flags.writeable)
+
+    def test_new_frame_is_converted(self):
+        first = self.state.get_current_frame()
+        _set_frame(self.state, 2.0, 200)
+        second = self.state.get_current_frame()
+
+        self.assertIsNot(first, second)
+        self.assertGreater(int(second.mean()), int(first.mean()))
+
+    def test_overlays_are_drawn_on_a_copy(self):
+        shared = self.state.get_current_frame()
+        shared_before = shared.copy()
+
+        with patch(
+            "frigate.camera.state.cv2.cvtColor", wraps=cv2.cvtColor
+        ) as cvt_color:
+            drawn = self.state.get_current_frame({"timestamp": True})
+
+        self.assertEqual(cvt_color.call_count, 0)
+        self.assertTrue(drawn.flags.writeable)
+        self.assertFalse(np.array_equal(drawn, shared))
+        np.testing.assert_array_equal(shared, shared_before)
+
+    def test_downscaled_frame_is_cached(self):
+        with patch("frigate.camera.state.cv2.resize", wraps=cv2.resize) as resize:
+            first = self.state.get_current_frame(max_height=120)
+            second = self.state.get_current_frame(max_height=120)
+
+        self.assertIs(first, second)
+        self.assertEqual(resize.call_count, 1)
+        self.assertEqual(first.shape, (120, 160, 3))
+        # taller than the frame returns the full size frame
+        self.assertIs(
+            self.state.get_current_frame(max_height=480),
+            self.state.get_current_frame(),
+        )
+
+    def test_replaced_frame_is_not_cached(self):
+        newest = self.state.get_current_frame()
+        stale = np.full(self.state.camera_config.frame_shape_yuv, 50, np.uint8)
+        self.state._get_bgr_frame(stale, 0.5)
+
+        self.assertIs(self.state.get_current_frame(), newest)
+
+
+if __name__ == "__main__":
+    unittest.main()
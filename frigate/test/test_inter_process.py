@@ -0,0 +1,79 @@
+"""Tests for handling requests from other processes."""
+
+import os
+import threading
+import unittest
+
+from frigate.comms.inter_process import (
+    InterProcessCommunicator,
+    InterProcessRequestor,
+)
+from frigate.const import CACHE_DIR, REQUEST_REGION_GRID
+
+
+class TestInterProcessCommunicator(unittest.TestCase):
+    def setUp(self):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+        def receive(topic, payload):
+            if topic == REQUEST_REGION_GRID:
+                self.release.wait(5)
+                return [[{"count": 0}]]
+
+            if topic == "echo":
+                return payload
+
+            return None
+
+        self.communicator = InterProcessCommunicator()
+        self.communicator.subscribe(receive)
+        self.addCleanup(self.communicator.stop)
+        self.requestors: list[InterProcessRequestor] = []
+
+    def tearDown(self):
+        for requestor in self.requestors:
+            requestor.stop()
+
+    def requestor(self, timeout: float | None = 5) -> InterProcessRequestor:
+        requestor = InterProcessRequestor(timeout)
+        self.requestors.append(requestor)
+        return requestor
+
+    def test_slow_request_does_not_block_control_requests(self):
+        grid: list = []
+        thread = threading.Thread(
+            target=lambda: grid.append(
+                self.requestor().send_data(REQUEST_REGION_GRID, "front")
+            )
+        )
+        thread.start()
+
+        # replies to control requests while the grid is still being built
+        requestor = self.requestor()
+        self.assertEqual(requestor.send_data("echo", {"a": 1}), {"a": 1})
+        self.assertEqual(requestor.send_data("front/status/audio", "online"), [])
+        self.assertFalse(grid)
+
+        self.release.set()
+        thread.join(5)
+        self.assertEqual(grid, [[[{"count": 0}]]])
+
+        stats = self.communicator.metrics.stats()
+        self.assertEqual(stats["queued"], {"control": 0, "database": 0})
+        self.assertEqual(stats["topics"]["echo"]["requests"], 1)
+        self.assertEqual(stats["topics"]["*/status/audio"]["requests"], 1)
+        self.assertEqual(stats["topics"][REQUEST_REGION_GRID]["requests"], 1)
+
+    def test_request_times_out(self):
+        requestor = self.requestor(timeout=0.2)
+        self.assertEqual(requestor.send_data(REQUEST_REGION_GRID, "front"), "")
+
+        # the late reply is dropped and the next request gets its own reply
+        self.release.set()
+        self.assertEqual(requestor.send_data("echo", "next"), "next")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,10 @@
 """Tests for keyframe-spacing analysis used to detect smart/+ codecs."""
 
+import subprocess as sp
 import unittest
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from frigate.util.media import get_keyframe_before, get_keyframe_offsets
 from frigate.util.services import (
     analyze_record_keyframes,
     classify_keyframe_gaps,
@@ -106,5 +108,33 @@ class TestAnalyzeRecordKeyframes(unittest.IsolatedAsyncioTestCase):
         proc.kill.assert_called_once()
 
 
+class TestKeyframeOffsets(unittest.IsolatedAsyncioTestCase):
+    def _probe(self, returncode: int, stdout: bytes) -> AsyncMock:
+        return AsyncMock(
+            return_value=sp.CompletedProcess([], returncode, stdout=stdout, stderr=b"")
+        )
+
+    async def test_offsets_and_keyframe_before_share_probe(self):
+        probe = self._probe(0, b"2.0,K__\n2.5,___\n0.0,K__\n4.0,K__\n")
+
+        with patch("frigate.util.media.media_subprocesses.run", probe):
+            self.assertEqual(await get_keyframe_offsets("seg.mp4"), [0, 2000, 4000])
+            self.assertEqual(await get_keyframe_before("seg.mp4", 3000), 2000)
+            self.assertEqual(await get_keyframe_before("seg.mp4", 4000), 4000)
+
+        self.assertEqual(probe.await_count, 3)
+
+    async def test_failed_probe_returns_none(self):
+        with patch("frigate.util.media.media_subprocesses.run", self._probe(1, b"")):
+            self.assertIsNone(await get_keyframe_offsets("seg.mp4"))
+            self.assertIsNone(await get_keyframe_before("seg.mp4", 3000))
+
+        with patch(
+            "frigate.util.media.media_subprocesses.run",
+            AsyncMock(side_effect=sp.TimeoutExpired([], 5)),
+        ):
+            self.assertIsNone(await get_keyframe_before("seg.mp4", 3000))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,8 +1,12 @@
 import datetime
 import sys
+import tempfile
 import unittest
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import numpy as np
+
 # Mock complex imports before importing maintainer, saving originals so we can
 # restore them after import and avoid polluting sys.modules for other tests.
 _MOCKED_MODULES = [
@@ -18,6 +22,7 @@ for name in _MOCKED_MODULES:
 # Now import the class under test
 from frigate.config import FrigateConfig  # noqa: E402
 from frigate.record.maintainer import RecordingMaintainer  # noqa: E402
+from frigate.record.segment_tracker import SegmentTracker  # noqa: E402
 
 # Restore original modules (or remove mock if there was no original)
 for name, orig in _originals.items():
@@ -38,42 +43,43 @@ class TestMaintainer(unittest.IsolatedAsyncioTestCase):
         # We need to mock end_time_cache to avoid key errors if logic proceeds
         maintainer.end_time_cache = {}
 
-        # Mock filesystem
         # One bad file, one good file
-        files = ["bad_filename.mp4", "camera@20210101000000+0000.mp4"]
-
-        with patch("os.listdir", return_value=files):
-            with patch("os.path.isfile", return_value=True):
-                with patch(
-                    "frigate.record.maintainer.psutil.process_iter", return_value=[]
-                ):
-                    with patch("frigate.record.maintainer.logger.warning") as warn:
-                        # Mock validate_and_move_segment to avoid further logic
-                        maintainer.validate_and_move_segment = MagicMock()
-
-                        try:
-                            await maintainer.move_files()
-                        except ValueError as e:
-                            if "not enough values to unpack" in str(e):
-                                self.fail("move_files() crashed on bad filename!")
-                            raise e
-                        except Exception:
-                            # Ignore other errors (like DB connection) as we only care about the unpack crash
-                            pass
-
-                        # The bad filename is encountered in multiple loops, but should only warn once.
-                        matching = [
-                            c
-                            for c in warn.call_args_list
-                            if c.args
-                            and isinstance(c.args[0], str)
-                            and "Skipping unexpected files in cache" in c.args[0]
-                        ]
-                        self.assertEqual(
-                            1,
-                            len(matching),
-                            f"Expected a single warning for unexpected files, got {len(matching)}",
-                        )
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for name in ["bad_filename.mp4", "camera@20210101000000+0000.mp4"]:
+                Path(cache_dir, name).touch()
+
+            with patch("frigate.record.segment_tracker.logger.warning") as warn:
+                maintainer.segment_tracker.stop()
+                maintainer.segment_tracker = SegmentTracker(cache_dir)
+                # Mock validate_and_move_segment to avoid further logic
+                maintainer.validate_and_move_segment = MagicMock()
+
+                try:
+                    await maintainer.move_files()
+                    await maintainer.move_files()
+                except ValueError as e:
+                    if "not enough values to unpack" in str(e):
+                        self.fail("move_files() crashed on bad filename!")
+                    raise e
+                except Exception:
+                    # Ignore other errors (like DB connection) as we only care about the unpack crash
+                    pass
+
+                maintainer.segment_tracker.stop()
+
+                # The bad filename is seen on every pass, but should only warn once.
+                matching = [
+                    c
+                    for c in warn.call_args_list
+                    if c.args
+                    and isinstance(c.args[0], str)
+                    and "Skipping unexpected files in cache" in c.args[0]
+                ]
+                self.assertEqual(
+                    1,
+                    len(matching),
+                    f"Expected a single warning for unexpected files, got {len(matching)}",
+                )
 
     async def test_drops_quiet_segment_when_only_motion_retention(self):
         # Regression: when motion retention is enabled but a segment has no
@@ -100,8 +106,9 @@ class TestMaintainer(unittest.IsolatedAsyncioTestCase):
 
         maintainer.end_time_cache = {cache_path: (end_time, 10.0)}
         # Single processed frame well past end_time with no motion/objects.
-        maintainer.object_recordings_info["test_cam"] = [(now.timestamp(), [], [], [])]
-        maintainer.audio_recordings_info["test_cam"] = []
+        maintainer.object_recordings_info["test_cam"].append(
+            now.timestamp(), [], [], []
+        )
 
         maintainer.drop_segment = MagicMock()
         maintainer.recordings_publisher = MagicMock()
@@ -125,36 +132,109 @@ class TestMaintainer(unittest.IsolatedAsyncioTestCase):
         ancient = now - 86400
         recent = now - 1
 
-        maintainer.object_recordings_info["present_cam"] = [(ancient, [], [], [])]
-        maintainer.audio_recordings_info["present_cam"] = [(ancient, 0, [])]
+        maintainer.object_recordings_info["present_cam"].append(ancient, [], [], [])
+        maintainer.audio_recordings_info["present_cam"].append(ancient, 0, [])
 
-        maintainer.object_recordings_info["absent_cam"] = [
-            (ancient, [], [], []),
-            (recent, [], [], []),
-        ]
-        maintainer.audio_recordings_info["absent_cam"] = [
-            (ancient, 0, []),
-            (recent, 0, []),
-        ]
+        for frame_time in (ancient, recent):
+            maintainer.object_recordings_info["absent_cam"].append(
+                frame_time, [], [], []
+            )
+            maintainer.audio_recordings_info["absent_cam"].append(frame_time, 0, [])
 
         grouped_recordings = {"present_cam": [{"start_time": ancient}]}
 
         maintainer._expire_stale_recordings_info(grouped_recordings)
 
-        self.assertEqual(
-            maintainer.object_recordings_info["present_cam"], [(ancient, [], [], [])]
-        )
-        self.assertEqual(
-            maintainer.audio_recordings_info["present_cam"], [(ancient, 0, [])]
-        )
+        for recordings_info in (
+            maintainer.object_recordings_info,
+            maintainer.audio_recordings_info,
+        ):
+            self.assertEqual(
+                list(recordings_info["present_cam"].column("frame_time")), [ancient]
+            )
+            self.assertEqual(
+                list(recordings_info["absent_cam"].column("frame_time")), [recent]
+            )
+
+    def _reference_heatmap(
+        self, boxes: list[tuple[int, int, int, int]], width: int, height: int
+    ) -> dict[str, int] | None:
+        """Per-box, per-cell loop the vectorized heatmap must match."""
+        counts: dict[int, int] = {}
+
+        for x1, y1, x2, y2 in boxes:
+            grid_x1 = max(0, int((x1 / width) * 16))
+            grid_y1 = max(0, int((y1 / height) * 16))
+            grid_x2 = min(15, int((x2 / width) * 16))
+            grid_y2 = min(15, int((y2 / height) * 16))
+
+            for y in range(grid_y1, grid_y2 + 1):
+                for x in range(grid_x1, grid_x2 + 1):
+                    counts[y * 16 + x] = min(255, counts.get(y * 16 + x, 0) + 1)
+
+        return {str(k): v for k, v in sorted(counts.items())} or None
+
+    def _stats_maintainer(self) -> RecordingMaintainer:
+        config = MagicMock(spec=FrigateConfig)
+        camera_config = MagicMock()
+        camera_config.detect.width = 1280
+        camera_config.detect.height = 720
+        config.cameras = {"test_cam": camera_config}
+        return RecordingMaintainer(config, MagicMock())
 
-        self.assertEqual(
-            maintainer.object_recordings_info["absent_cam"], [(recent, [], [], [])]
-        )
-        self.assertEqual(
-            maintainer.audio_recordings_info["absent_cam"], [(recent, 0, [])]
+    async def test_motion_heatmap_matches_reference(self):
+        maintainer = self._stats_maintainer()
+        rng = np.random.default_rng(0)
+
+        for _ in range(20):
+            boxes = []
+
+            for _ in range(rng.integers(1, 400)):
+                x1, x2 = sorted(rng.integers(-20, 1300, size=2))
+                y1, y2 = sorted(rng.integers(-20, 740, size=2))
+                boxes.append((int(x1), int(y1), int(x2), int(y2)))
+
+            self.assertEqual(
+                maintainer._compute_motion_heatmap("test_cam", np.array(boxes)),
+                self._reference_heatmap(boxes, 1280, 720),
+            )
+
+        self.assertIsNone(
+            maintainer._compute_motion_heatmap("test_cam", np.empty((0, 4)))
         )
 
+    async def test_segment_stats_counts_frames_in_window(self):
+        maintainer = self._stats_maintainer()
+        active = {"false_positive": False, "motionless_count": 0}
+        stationary = {"false_positive": False, "motionless_count": 10}
+        object_info = maintainer.object_recordings_info["test_cam"]
+        audio_info = maintainer.audio_recordings_info["test_cam"]
+
+        # enough frames to force the buffers to grow and compact
+        for i in range(300):
+            object_info.append(
+                float(i),
+                [active, stationary],
+                [(0, 0, 79, 44)] * (i % 3),
+                [(0, 0, 320, 320)],
+            )
+            audio_info.append(float(i), -40.0 if i % 2 else -20.0, ["speech"])
+
+            if i % 50 == 0:
+                object_info.drop_before(i - 100)
+                audio_info.drop_before(i - 100)
+
+        start = datetime.datetime.fromtimestamp(250, datetime.UTC)
+        end = datetime.datetime.fromtimestamp(259, datetime.UTC)
+        stats = maintainer.segment_stats("test_cam", start, end)
+
+        # frames 250 through 259 inclusive
+        self.assertEqual(stats.region_count, 10)
+        self.assertEqual(stats.motion_count, sum(i % 3 for i in range(250, 260)))
+        self.assertEqual(stats.active_object_count, 10 + 10)
+        self.assertEqual(stats.average_dBFS, -30)
+        self.assertEqual(stats.motion_heatmap, {"0": stats.motion_count})
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -8,7 +8,7 @@ from norfair.camera_motion import (
 )
 
 from frigate.ptz.autotrack import transform_is_finite
-from frigate.track.norfair_tracker import distance
+from frigate.track.norfair_tracker import distance, distances
 
 
 class TestNorfairDistance(unittest.TestCase):
@@ -63,6 +63,60 @@ class TestNorfairDistance(unittest.TestCase):
         self.assertEqual(d, float("inf"))
 
 
+class TestVectorizedNorfairDistance(unittest.TestCase):
+    """distances() must match distance() for every detection/estimate pair."""
+
+    def _assert_matches_scalar(
+        self, detections: np.ndarray, estimates: np.ndarray
+    ) -> None:
+        matrix = distances(detections.reshape(-1, 4), estimates.reshape(-1, 4))
+
+        self.assertEqual(matrix.shape, (len(detections), len(estimates)))
+        self.assertFalse(np.isnan(matrix).any())
+
+        for i, detection in enumerate(detections):
+            for j, estimate in enumerate(estimates):
+                expected = distance(detection, estimate)
+
+                if math.isinf(expected):
+                    self.assertEqual(matrix[i, j], expected)
+                else:
+                    self.assertAlmostEqual(matrix[i, j], expected, places=9)
+
+    def test_random_boxes_match_scalar_distance(self) -> None:
+        rng = np.random.default_rng(0)
+        top_left = rng.uniform(0, 1000, size=(40, 1, 2))
+        detections = np.concatenate(
+            [top_left, top_left + rng.uniform(1, 200, size=(40, 1, 2))], axis=1
+        )
+        estimates = detections[:25] + rng.normal(0, 10, size=(25, 2, 2))
+
+        self._assert_matches_scalar(detections, estimates)
+
+    def test_degenerate_boxes_match_scalar_distance(self) -> None:
+        detections = np.array(
+            [
+                [[805.0, 402.0], [864.0, 521.0]],
+                [[805.0, 402.0], [805.0, 521.0]],
+                [[np.inf, 402.0], [864.0, 521.0]],
+            ]
+        )
+        estimates = np.array(
+            [
+                [[800.0, 400.0], [860.0, 520.0]],
+                [[np.nan, 400.0], [860.0, 520.0]],
+                [[900.0, 500.0], [900.0, 500.0]],
+                [[860.0, 520.0], [800.0, 400.0]],
+            ]
+        )
+
+        self._assert_matches_scalar(detections, estimates)
+
+    def test_empty_inputs(self) -> None:
+        matrix = distances(np.empty((0, 4)), np.ones((3, 4)))
+        self.assertEqual(matrix.shape, (0, 3))
+
+
 class TestTransformIsFinite(unittest.TestCase):
     def test_finite_homography_is_finite(self) -> None:
         matrix = np.array([[1.0, 0.0, 5.0], [0.0, 1.0, 3.0], [0.0, 0.0, 1.0]])
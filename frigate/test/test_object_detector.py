@@ -8,6 +8,7 @@ import frigate.detectors as detectors
 import frigate.object_detection.base
 from frigate.config import DetectorConfig, ModelConfig
 from frigate.detectors import DetectorTypeEnum
+from frigate.detectors.detection_api import DetectionApi
 from frigate.detectors.detector_config import InputTensorEnum
 
 
@@ -87,6 +88,34 @@ class TestLocalObjectDetector(unittest.TestCase):
 
         assert test_result is mock_det_api.detect_raw.return_value
 
+    @patch.dict(
+        "frigate.detectors.api_types",
+        {det_type: Mock() for det_type in DetectorTypeEnum},
+    )
+    def test_detect_raw_batch_should_call_api_detect_raw_batch_with_transposed_tensor(
+        self,
+    ):
+        mock_cputfl = detectors.api_types[DetectorTypeEnum.cpu]
+
+        TEST_DATA = np.zeros((3, 32, 32, 3), np.uint8)
+
+        test_cfg = parse_obj_as(DetectorConfig, {"type": "cpu", "model": {}})
+        test_cfg.model.input_tensor = InputTensorEnum.nchw
+
+        test_obj_detect = frigate.object_detection.base.LocalObjectDetector(
+            detector_config=test_cfg
+        )
+
+        mock_det_api = mock_cputfl.return_value
+        test_result = test_obj_detect.detect_raw_batch(TEST_DATA)
+
+        mock_det_api.detect_raw_batch.assert_called_once()
+        assert (
+            mock_det_api.detect_raw_batch.call_args.kwargs["tensor_input"].shape
+            == np.zeros((3, 3, 32, 32)).shape
+        )
+        assert test_result is mock_det_api.detect_raw_batch.return_value
+
     @patch.dict(
         "frigate.detectors.api_types",
         {det_type: Mock() for det_type in DetectorTypeEnum},
@@ -136,3 +165,31 @@ class TestLocalObjectDetector(unittest.TestCase):
             == np.zeros((1, 32, 32, 3)).shape
         )
         assert test_result == TEST_DETECT_RESULT
+
+
+class TestDetectionBatching(unittest.TestCase):
+    def test_detect_raw_batch_falls_back_to_detect_raw_per_input(self):
+        class SingleInputApi(DetectionApi):
+            def __init__(self):
+                self.calls = []
+
+            def detect_raw(self, tensor_input):
+                self.calls.append(tensor_input.shape)
+                return np.full((20, 6), tensor_input[0, 0, 0, 0], np.float32)
+
+        api = SingleInputApi()
+        tensor_input = np.stack(
+            [np.full((32, 32, 3), i, np.uint8) for i in range(3)], axis=0
+        )
+
+        result = api.detect_raw_batch(tensor_input)
+
+        assert api.calls == [(1, 32, 32, 3)] * 3
+        assert result.shape == (3, 20, 6)
+        for i in range(3):
+            assert np.all(result[i] == i)
+
+    def test_parse_detection_request(self):
+        parse = frigate.object_detection.base.parse_detection_request
+        assert parse("front") == ("front", 1)
+        assert parse(("front", 4)) == ("front", 4)
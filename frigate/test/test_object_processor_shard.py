@@ -0,0 +1,177 @@
+"""Tests for running tracked object work on per-camera shard threads."""
+
+import os
+import queue
+import threading
+import unittest
+from multiprocessing import Event
+from unittest.mock import MagicMock, patch
+
+from frigate.comms.event_metadata_updater import EventMetadataTypeEnum
+from frigate.const import OBJECT_PROCESSOR_SHARDS_VAR
+from frigate.track.object_processing import (
+    SHARD_MAX_PENDING_TASKS,
+    ObjectProcessorShard,
+    TrackedObjectProcessor,
+)
+
+
+class TestObjectProcessorShard(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stop_event = Event()
+        self.shard = ObjectProcessorShard(0, self.stop_event)
+
+    def tearDown(self) -> None:
+        self.stop_event.set()
+
+        if self.shard.is_alive():
+            self.shard.join(timeout=5)
+
+    def test_tasks_run_in_order_on_shard_thread(self) -> None:
+        done = threading.Event()
+        results: list[tuple[int, str]] = []
+
+        def task(value: int) -> None:
+            results.append((value, threading.current_thread().name))
+
+            if value == 2:
+                done.set()
+
+        self.shard.start()
+
+        for value in range(3):
+            self.shard.submit(task, value)
+
+        self.assertTrue(done.wait(timeout=5))
+        self.assertEqual([r[0] for r in results], [0, 1, 2])
+        self.assertTrue(all(r[1] == self.shard.name for r in results))
+
+    def test_failed_task_does_not_stop_shard(self) -> None:
+        done = threading.Event()
+
+        def failing_task() -> None:
+            raise ValueError("simulated")
+
+        self.shard.start()
+        self.shard.submit(failing_task)
+        self.shard.submit(done.set)
+
+        self.assertTrue(done.wait(timeout=5))
+
+    def test_on_exit_runs_when_stopped(self) -> None:
+        exited = threading.Event()
+        self.shard.on_exit = exited.set
+        self.shard.start()
+
+        self.stop_event.set()
+        self.shard.join(timeout=5)
+
+        self.assertTrue(exited.is_set())
+
+    def test_submit_waits_when_full(self) -> None:
+        for _ in range(SHARD_MAX_PENDING_TASKS):
+            self.shard.submit(lambda: None)
+
+        submitted = threading.Event()
+        submitter = threading.Thread(
+            target=lambda: (self.shard.submit(lambda: None), submitted.set())
+        )
+        submitter.start()
+
+        self.assertFalse(submitted.wait(timeout=0.2))
+
+        self.shard.start()
+
+        self.assertTrue(submitted.wait(timeout=5))
+        submitter.join(timeout=5)
+
+
+@patch("frigate.track.object_processing.CameraState")
+@patch("frigate.track.object_processing.EventMetadataSubscriber")
+@patch("frigate.track.object_processing.EventEndSubscriber")
+@patch("frigate.track.object_processing.CameraConfigUpdateSubscriber")
+class TestTrackedObjectProcessorShards(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stop_event = Event()
+        self.config = MagicMock()
+        self.config.cameras = {
+            camera: MagicMock(enabled_in_config=True, enabled=True)
+            for camera in ["front", "back"]
+        }
+
+    def tearDown(self) -> None:
+        self.stop_event.set()
+
+    def _create_processor(self) -> TrackedObjectProcessor:
+        with patch.dict(os.environ, {OBJECT_PROCESSOR_SHARDS_VAR: "2"}):
+            processor = TrackedObjectProcessor(
+                self.config, MagicMock(), queue.Queue(), MagicMock(), self.stop_event
+            )
+
+        processor.camera_config_subscriber.check_for_updates.return_value = {}
+        processor.event_end_subscriber.check_for_update.return_value = None
+        processor.sub_label_subscriber.check_for_update.return_value = None
+        return processor
+
+    def test_current_frame_read_on_camera_shard(
+        self, _config_subscriber, _end, _metadata, camera_state
+    ) -> None:
+        camera_state.side_effect = lambda *_: MagicMock()
+        processor = self._create_processor()
+        threads: dict[str, str] = {}
+
+        for camera, state in processor.camera_states.items():
+            state.get_current_frame.side_effect = lambda *_, camera=camera: (
+                threads.setdefault(camera, threading.current_thread().name)
+            )
+
+        for shard in processor.shards:
+            shard.start()
+
+        for camera in processor.camera_states:
+            self.assertIsNotNone(processor.get_current_frame(camera))
+
+        self.assertEqual(
+            threads,
+            {
+                camera: processor.camera_shards[camera].name
+                for camera in processor.camera_states
+            },
+        )
+        self.assertNotEqual(threads["front"], threads["back"])
+
+    def test_manual_event_routed_to_camera_shard(self, *_) -> None:
+        processor = self._create_processor()
+        ended = threading.Event()
+        threads: list[str] = []
+
+        def record(payload: tuple) -> None:
+            threads.append(threading.current_thread().name)
+
+        def end(payload: tuple) -> None:
+            record(payload)
+            processor.ongoing_manual_events.pop(payload[0])
+            ended.set()
+
+        processor.create_manual_event = record
+        processor.end_manual_event = end
+        processor.sub_label_subscriber.check_for_update.side_effect = [
+            (
+                EventMetadataTypeEnum.manual_event_create.value,
+                (1.0, "back", "person", "event_1", True, 1, None, 0, "api", True, 0),
+            ),
+            (EventMetadataTypeEnum.manual_event_end.value, ("event_1", 2.0)),
+        ] + [None] * 1000
+
+        processor.start()
+
+        self.assertTrue(ended.wait(timeout=5))
+        self.stop_event.set()
+        processor.join(timeout=5)
+
+        self.assertEqual(threads, [processor.camera_shards["back"].name] * 2)
+        self.assertEqual(processor.ongoing_manual_events, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+"""Tests for running per camera output work on a pool of threads."""
+
+import multiprocessing as mp
+import threading
+import time
+import unittest
+
+from frigate.output.workers import CameraOutputWorkers
+
+
+class TestCameraOutputWorkers(unittest.TestCase):
+    def setUp(self):
+        self.stop_event = mp.Event()
+
+    def test_camera_work_runs_in_order(self):
+        workers = CameraOutputWorkers(self.stop_event, 3)
+        handled: dict[str, list[int]] = {}
+        threads: dict[str, set[str]] = {}
+
+        def work(camera: str, frame: int) -> None:
+            handled.setdefault(camera, []).append(frame)
+            threads.setdefault(camera, set()).add(threading.current_thread().name)
+
+        for frame in range(50):
+            for camera in ("front", "back", "side", "garage"):
+                workers.submit(camera, work, camera, frame)
+
+        workers.stop()
+
+        for camera in ("front", "back", "side", "garage"):
+            self.assertEqual(handled[camera], list(range(50)))
+            self.assertEqual(len(threads[camera]), 1)
+
+    def test_submit_waits_for_a_busy_worker(self):
+        workers = CameraOutputWorkers(self.stop_event, 1, queue_size=1)
+        release = threading.Event()
+        workers.submit("front", release.wait)
+        # wait for the worker to start the blocking work
+        time.sleep(0.05)
+        workers.submit("front", lambda: None)
+
+        submitted = threading.Event()
+
+        def submit() -> None:
+            workers.submit("front", lambda: None)
+            submitted.set()
+
+        threading.Thread(target=submit, daemon=True).start()
+        self.assertFalse(submitted.wait(0.2))
+
+        release.set()
+        self.assertTrue(submitted.wait(2))
+        workers.stop()
+
+    def test_errors_do_not_stop_the_worker(self):
+        workers = CameraOutputWorkers(self.stop_event, 1)
+        handled = []
+
+        def fail() -> None:
+            raise ValueError("bad frame")
+
+        workers.submit("front", fail)
+        workers.submit("front", handled.append, 1)
+        workers.stop()
+
+        self.assertEqual(handled, [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
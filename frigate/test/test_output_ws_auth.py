@@ -4,6 +4,7 @@ import unittest
 from types import SimpleNamespace
 
 from frigate.config import FrigateConfig
+from frigate.output.viewers import CameraViewers
 from frigate.output.ws_auth import ws_has_camera_access
 
 
@@ -55,3 +56,38 @@ class TestWsHasCameraAccess(unittest.TestCase):
         self.assertFalse(
             ws_has_camera_access(self._make_ws("limited_user"), "birdseye", self.config)
         )
+
+    def _make_viewer(self, role: str, camera: str):
+        return SimpleNamespace(
+            environ={"HTTP_REMOTE_ROLE": role, "PATH_INFO": f"/{camera}"}
+        )
+
+    def test_viewers_are_tracked_per_camera(self):
+        viewers = CameraViewers(self.config)
+        first = self._make_viewer("viewer", "front_door")
+        second = self._make_viewer("admin", "front_door")
+        birdseye = self._make_viewer("viewer", "birdseye")
+
+        for ws in (first, second, birdseye):
+            viewers.add(ws)
+
+        self.assertIn("front_door", viewers)
+        self.assertIn("birdseye", viewers)
+        self.assertNotIn("back_door", viewers)
+
+        viewers.remove(first)
+        # removing a client twice doesn't drop the other viewer
+        viewers.remove(first)
+        self.assertIn("front_door", viewers)
+
+        viewers.remove(second)
+        self.assertNotIn("front_door", viewers)
+
+    def test_unauthorized_clients_are_not_viewers(self):
+        viewers = CameraViewers(self.config)
+        ws = self._make_viewer("limited_user", "back_door")
+        viewers.add(ws)
+        viewers.remove(ws)
+
+        self.assertNotIn("back_door", viewers)
+        self.assertEqual(viewers.counts, {})
@@ -0,0 +1,89 @@
+"""Tests for the per frame pipeline latency histograms."""
+
+import unittest
+
+from frigate.stats.prometheus import get_metrics, update_metrics
+from frigate.track.latency import PIPELINE_STAGES, PipelineMetrics
+
+
+def publish(metrics: PipelineMetrics, camera: str, detect: float) -> None:
+    """Publish a frame that spent 2ms in each stage except detect."""
+    times = [100.0]
+
+    for stage in PIPELINE_STAGES[:-1]:
+        times.append(times[-1] + (detect if stage == "detect" else 0.002))
+
+    metrics.frame_published(camera, times[0], tuple(times[1:-1]), times[-1])
+
+
+class TestPipelineMetrics(unittest.TestCase):
+    def test_stage_latencies(self):
+        metrics = PipelineMetrics()
+
+        for _ in range(98):
+            publish(metrics, "front", 0.01)
+
+        publish(metrics, "front", 0.1)
+        publish(metrics, "front", 1.0)
+        stats = metrics.stats()["front"]
+
+        self.assertEqual(set(stats), set(PIPELINE_STAGES))
+        self.assertEqual(stats["queue"]["count"], 100)
+        self.assertAlmostEqual(stats["queue"]["sum"], 200, places=1)
+
+        # percentiles are the upper bound of their bucket
+        self.assertGreaterEqual(stats["queue"]["p99"], 2)
+        self.assertLess(stats["queue"]["p99"], 2 * 1.2)
+        self.assertGreaterEqual(stats["detect"]["p50"], 10)
+        self.assertLess(stats["detect"]["p50"], 10 * 1.2)
+        self.assertGreaterEqual(stats["detect"]["p99"], 100)
+        self.assertLess(stats["detect"]["p99"], 100 * 1.2)
+        self.assertGreaterEqual(stats["detect"]["max"], 1000)
+        self.assertLess(stats["detect"]["max"], 1000 * 1.2)
+        self.assertGreaterEqual(stats["total"]["p50"], 20)
+
+        # cumulative counts under 1ms, 2ms, ... 16s
+        self.assertEqual(stats["detect"]["buckets"][:4], [0, 0, 0, 0])
+        self.assertEqual(stats["detect"]["buckets"][4], 98)
+        self.assertEqual(stats["detect"]["buckets"][-1], 100)
+
+    def test_percentiles_are_for_frames_since_last_stats(self):
+        metrics = PipelineMetrics()
+        publish(metrics, "front", 1.0)
+        metrics.stats()
+
+        stats = metrics.stats()["front"]["detect"]
+        self.assertIsNone(stats["p50"])
+        self.assertEqual(stats["count"], 1)
+
+        publish(metrics, "front", 0.01)
+        self.assertLess(metrics.stats()["front"]["detect"]["max"], 12)
+
+        metrics.remove_camera("front")
+        self.assertEqual(metrics.stats(), {})
+
+    def test_prometheus_histogram(self):
+        metrics = PipelineMetrics()
+        publish(metrics, "front", 0.01)
+        update_metrics(
+            {"cameras": {"front": {"pipeline_latency": metrics.stats()["front"]}}},
+            [],
+        )
+
+        content = get_metrics()[0].decode()
+        self.assertIn(
+            'frigate_pipeline_latency_seconds_bucket{camera_name="front",le="0.016",stage="detect"} 1.0',
+            content,
+        )
+        self.assertIn(
+            'frigate_pipeline_latency_seconds_bucket{camera_name="front",le="0.008",stage="detect"} 0.0',
+            content,
+        )
+        self.assertIn(
+            'frigate_pipeline_latency_seconds_count{camera_name="front",stage="total"} 1.0',
+            content,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+"""Tests for streaming preview frames to a long running encoder."""
+
+import io
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from frigate.config import FrigateConfig
+from frigate.const import INSERT_PREVIEW
+from frigate.output.preview import (
+    PREVIEW_CACHE_DIR,
+    PreviewRecorder,
+    get_most_recent_preview_frame,
+)
+
+CAMERA = "front"
+
+
+class FakeEncoderProcess:
+    """Stands in for ffmpeg, writing the output file when stdin is closed."""
+
+    def __init__(self, cmd: list[str], **kwargs):
+        self.output_path = cmd[-1]
+        self.stdin = io.BytesIO()
+        self.stdin.close = self.close  # type: ignore[method-assign]
+        self.data = b""
+
+    def close(self) -> None:
+        self.data = self.stdin.getvalue()
+        Path(self.output_path).write_bytes(b"mp4")
+
+    def wait(self, timeout: float | None = None) -> int:
+        return 0
+
+
+class TestPreviewStreaming(unittest.TestCase):
+    def setUp(self):
+        if os.path.exists(PREVIEW_CACHE_DIR):
+            shutil.rmtree(PREVIEW_CACHE_DIR)
+        os.makedirs(PREVIEW_CACHE_DIR)
+
+        self.clips_dir = tempfile.mkdtemp()
+        self.processes: list[FakeEncoderProcess] = []
+
+        def popen(cmd, **kwargs):
+            process = FakeEncoderProcess(cmd, **kwargs)
+            self.processes.append(process)
+            return process
+
+        patches = [
+            patch("frigate.output.preview.CLIPS_DIR", self.clips_dir),
+            patch("frigate.output.preview.sp.Popen", side_effect=popen),
+            patch("frigate.output.preview.InterProcessRequestor"),
+        ]
+
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+        config = FrigateConfig(
+            **{
+                "mqtt": {"enabled": False},
+                "cameras": {
+                    CAMERA: {
+                        "ffmpeg": {
+                            "inputs": [
+                                {
+                                    "path": "rtsp://10.0.0.1:554/video",
+                                    "roles": ["detect"],
+                                }
+                            ]
+                        },
+                        "detect": {"width": 640, "height": 360},
+                        "record": {"enabled": True, "preview": {"streaming": True}},
+                    }
+                },
+            }
+        )
+        self.recorder = PreviewRecorder(config.cameras[CAMERA])
+        self.requestor: MagicMock = self.recorder.requestor  # type: ignore[assignment]
+        self.frame = np.full(config.cameras[CAMERA].frame_shape_yuv, 100, np.uint8)
+        self.frame_size = self.recorder.out_width * self.recorder.out_height * 3 // 2
+
+    def tearDown(self):
+        shutil.rmtree(PREVIEW_CACHE_DIR, ignore_errors=True)
+        shutil.rmtree(self.clips_dir, ignore_errors=True)
+
+    def write(self, frame_time: float) -> None:
+        self.recorder.write_data([], [[0, 0, 10, 10]], frame_time, self.frame)
+
+    def saved_previews(self, count: int) -> list[dict]:
+        # previews are saved in the background
+        deadline = time.monotonic() + 5
+
+        while True:
+            previews = [
+                call.args[1]
+                for call in self.requestor.send_data.call_args_list
+                if call.args[0] == INSERT_PREVIEW
+            ]
+
+            if len(previews) >= count or time.monotonic() > deadline:
+                return sorted(previews, key=lambda p: p["start_time"])
+
+            time.sleep(0.01)
+
+    def test_frames_are_not_cached_as_images(self):
+        self.recorder.segment_end = 2000
+
+        for frame_time in range(1000, 1010):
+            self.write(frame_time)
+
+        self.assertEqual(os.listdir(PREVIEW_CACHE_DIR), [])
+        self.assertEqual(len(self.processes), 1)
+        self.assertEqual(len(self.processes[0].stdin.getvalue()), 10 * self.frame_size)
+
+    def test_segment_is_saved_when_it_ends(self):
+        self.recorder.segment_end = 1005
+
+        for frame_time in range(1000, 1006):
+            self.write(frame_time)
+
+        # the first frame of the next segment also ends the previous one
+        previews = self.saved_previews(1)
+        self.assertEqual(len(self.processes), 2)
+        self.assertEqual(len(self.processes[0].data), 6 * self.frame_size)
+        self.assertEqual(
+            [(p["start_time"], p["end_time"]) for p in previews], [(1000, 1005)]
+        )
+        self.assertTrue(os.path.exists(previews[0]["path"]))
+
+        # stopping saves the partial segment
+        self.write(1006)
+        self.recorder.stop()
+        self.assertEqual(len(self.processes[1].data), 2 * self.frame_size)
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.clips_dir, "previews", CAMERA))),
+            ["1000-1005.mp4", "1005-1006.mp4"],
+        )
+
+    def test_last_frame_is_saved_when_offline(self):
+        self.recorder.segment_end = 2000
+        self.write(1000)
+        self.write(1001)
+        self.assertIsNone(get_most_recent_preview_frame(CAMERA))
+
+        self.recorder.save_last_frame()
+        self.assertEqual(
+            get_most_recent_preview_frame(CAMERA),
+            os.path.join(PREVIEW_CACHE_DIR, f"preview_{CAMERA}-1001.webp"),
+        )
+
+        # only the most recent frame is kept
+        self.recorder.flag_offline(1010)
+        self.assertEqual(os.listdir(PREVIEW_CACHE_DIR), [f"preview_{CAMERA}-1010.webp"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+"""Compare region clustering and detection reduction with the original loops."""
+
+import random
+import unittest
+from collections import defaultdict
+from unittest.mock import patch
+
+from frigate.const import LABEL_CONSOLIDATION_DEFAULT, LABEL_CONSOLIDATION_MAP
+from frigate.util.image import area, intersection
+from frigate.util.object import (
+    box_inside,
+    consolidate_detections,
+    get_cluster_boundary,
+    get_cluster_candidates,
+    get_cluster_region,
+    reduce_detections,
+)
+
+
+def reference_cluster_candidates(frame_shape, min_region, boxes):
+    """The original pure python get_cluster_candidates."""
+    cluster_candidates = []
+    used_boxes = set()
+    for current_index, b in enumerate(boxes):
+        if current_index in used_boxes:
+            continue
+        cluster = [current_index]
+        used_boxes.add(current_index)
+        cluster_boundary = get_cluster_boundary(b, min_region)
+        for compare_index, compare_box in enumerate(boxes):
+            if compare_index in used_boxes:
+                continue
+
+            if not box_inside(cluster_boundary, compare_box):
+                continue
+
+            potential_cluster = cluster + [compare_index]
+            cluster_region = get_cluster_region(
+                frame_shape, min_region, potential_cluster, boxes
+            )
+            should_cluster = True
+            if (cluster_region[2] - cluster_region[0]) > min_region:
+                for b in potential_cluster:
+                    box = boxes[b]
+                    if area(box) / area(cluster_region) < 0.05:
+                        should_cluster = False
+                        break
+
+            if should_cluster:
+                cluster.append(compare_index)
+                used_boxes.add(compare_index)
+        cluster_candidates.append(cluster)
+
+    unique = {tuple(sorted(c)) for c in cluster_candidates}
+    return [list(tup) for tup in unique]
+
+
+def reference_consolidated_detections(detections):
+    """The original pure python consolidation pass of reduce_detections."""
+    detected_object_groups = defaultdict(lambda: [])
+    for detection in detections:
+        detected_object_groups[detection[0]].append(detection)
+
+    consolidated_detections = []
+    for group in detected_object_groups.values():
+        if len(group) == 1:
+            consolidated_detections.append(group[0])
+            continue
+
+        sorted_by_area = sorted(group, key=lambda g: g[3])
+
+        for current_detection_idx in range(0, len(sorted_by_area)):
+            current_detection = sorted_by_area[current_detection_idx]
+            current_label = current_detection[0]
+            current_box = current_detection[2]
+            current_area = area(current_box)
+            overlap = 0
+            for to_check_idx in range(
+                min(current_detection_idx + 1, len(sorted_by_area)),
+                len(sorted_by_area),
+            ):
+                to_check = sorted_by_area[to_check_idx][2]
+
+                if current_area / area(to_check) < 0.05:
+                    continue
+
+                intersect_box = intersection(current_box, to_check)
+                if intersect_box is not None and area(
+                    intersect_box
+                ) / current_area > LABEL_CONSOLIDATION_MAP.get(
+                    current_label, LABEL_CONSOLIDATION_DEFAULT
+                ):
+                    overlap = 1
+                    break
+            if overlap == 0:
+                consolidated_detections.append(sorted_by_area[current_detection_idx])
+
+    return consolidated_detections
+
+
+def random_boxes(rng, count, frame_shape, max_size=200):
+    boxes = []
+    for _ in range(count):
+        width = rng.randint(2, max_size)
+        height = rng.randint(2, max_size)
+        x = rng.randint(0, frame_shape[1] - width - 1)
+        y = rng.randint(0, frame_shape[0] - height - 1)
+        boxes.append((x, y, x + width, y + height))
+    return boxes
+
+
+def random_detections(rng, count, frame_shape):
+    detections = []
+    for box in random_boxes(rng, count, frame_shape, max_size=400):
+        label = rng.choice(["person", "car", "dog"])
+        detections.append(
+            (label, round(rng.uniform(0.5, 1.0), 2), box, area(box), 1.0, box)
+        )
+    return detections
+
+
+class TestRegionClusteringMatchesLoops(unittest.TestCase):
+    def setUp(self):
+        self.frame_shape = (1080, 1920)
+        self.min_region = 320
+
+    def test_cluster_candidates_match(self):
+        rng = random.Random(0)
+
+        for count in [0, 1, 2, 5, 20, 60, 150]:
+            for _ in range(10):
+                boxes = random_boxes(rng, count, self.frame_shape)
+                self.assertEqual(
+                    get_cluster_candidates(self.frame_shape, self.min_region, boxes),
+                    reference_cluster_candidates(
+                        self.frame_shape, self.min_region, boxes
+                    ),
+                )
+
+    def test_dense_small_boxes_match(self):
+        rng = random.Random(1)
+        boxes = random_boxes(rng, 100, (300, 300), max_size=40)
+        self.assertEqual(
+            get_cluster_candidates((300, 300), 160, boxes),
+            reference_cluster_candidates((300, 300), 160, boxes),
+        )
+
+    def test_consolidated_detections_match(self):
+        rng = random.Random(2)
+
+        for count in [2, 5, 20, 60]:
+            for _ in range(10):
+                detections = random_detections(rng, count, self.frame_shape)
+                self.assertEqual(
+                    consolidate_detections(detections),
+                    reference_consolidated_detections(detections),
+                )
+
+    def test_vectorized_paths_match_for_small_inputs(self):
+        rng = random.Random(3)
+
+        with (
+            patch("frigate.util.object.VECTORIZED_CLUSTER_MIN_BOXES", 0),
+            patch("frigate.util.object.VECTORIZED_CONSOLIDATION_MIN_DETECTIONS", 0),
+        ):
+            for count in [1, 2, 5, 10]:
+                boxes = random_boxes(rng, count, self.frame_shape)
+                self.assertEqual(
+                    get_cluster_candidates(self.frame_shape, self.min_region, boxes),
+                    reference_cluster_candidates(
+                        self.frame_shape, self.min_region, boxes
+                    ),
+                )
+                detections = random_detections(rng, count, self.frame_shape)
+                self.assertEqual(
+                    consolidate_detections(detections),
+                    reference_consolidated_detections(detections),
+                )
+
+    def test_reduce_detections_consolidates_after_nms(self):
+        detections = [
+            ("car", 0.9, (100, 100, 300, 200), 20301, 2.0, (0, 0, 320, 320)),
+            ("car", 0.8, (110, 110, 290, 190), 14661, 2.25, (0, 0, 320, 320)),
+            ("car", 0.7, (600, 100, 700, 200), 10201, 1.0, (500, 0, 820, 320)),
+        ]
+        self.assertEqual(
+            reduce_detections(self.frame_shape, detections),
+            [detections[2], detections[0]],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""Tests for the region history and the region grid built from it."""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from frigate.config import DetectConfig
+from frigate.util.image import calculate_region
+from frigate.util.object import GRID_SIZE, build_regions_grid
+from frigate.util.region_history import (
+    RegionHistoryWriter,
+    clear_region_history,
+    has_region_history,
+    read_region_history,
+)
+
+
+def per_box_grid(boxes, width, height, min_region_size):
+    """The original grid calculation, one box at a time."""
+    grid = [[[] for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+
+    for box in boxes:
+        x_pos = int((box[0] + box[2] / 2) * GRID_SIZE)
+        y_pos = int((box[1] + box[3] / 2) * GRID_SIZE)
+        region = calculate_region(
+            (height, width),
+            box[0] * width,
+            box[1] * height,
+            (box[0] + box[2]) * width,
+            (box[1] + box[3]) * height,
+            min_region_size,
+            1.35,
+        )
+        grid[x_pos][y_pos].append((region[2] - region[0]) / width)
+
+    return grid
+
+
+class TestBuildRegionsGrid(unittest.TestCase):
+    def test_matches_per_box_calculation(self):
+        rng = np.random.default_rng(0)
+        sizes = rng.uniform(0.01, 0.6, (2000, 2))
+        positions = rng.uniform(0, 1, (2000, 2)) * (1 - sizes)
+        boxes = np.concatenate([positions, sizes], axis=1).astype(np.float32)
+        # leave the bottom right of the frame without detections
+        boxes = boxes[(boxes[:, 0] < 0.5) | (boxes[:, 1] < 0.5)]
+        detect = DetectConfig(width=1280, height=720)
+
+        grid = build_regions_grid(boxes, detect, 320)
+        expected = per_box_grid(boxes.tolist(), 1280, 720, 320)
+
+        for x in range(GRID_SIZE):
+            for y in range(GRID_SIZE):
+                cell = grid[x][y]
+                self.assertEqual(cell["count"], len(expected[x][y]))
+
+                if not expected[x][y]:
+                    continue
+
+                self.assertEqual((cell["x"], cell["y"]), (x, y))
+                self.assertAlmostEqual(cell["mean"], np.mean(expected[x][y]))
+                self.assertAlmostEqual(cell["std_dev"], np.std(expected[x][y]))
+
+    def test_empty_history(self):
+        grid = build_regions_grid(
+            np.empty((0, 4)), DetectConfig(width=1280, height=720), 320
+        )
+        self.assertEqual(len(grid), GRID_SIZE)
+        self.assertTrue(all(cell == {"count": 0} for row in grid for cell in row))
+
+
+class TestRegionHistory(unittest.TestCase):
+    def setUp(self):
+        self.history_dir = tempfile.mkdtemp()
+        p = patch("frigate.util.region_history.REGION_HISTORY_DIR", self.history_dir)
+        p.start()
+        self.addCleanup(p.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.history_dir, ignore_errors=True)
+
+    def test_boxes_are_saved_per_day(self):
+        now = time.time()
+        writer = RegionHistoryWriter()
+        writer.add("front", now - 86400, [0.1, 0.2, 0.3, 0.4])
+        writer.add("front", now, [0.5, 0.5, 0.1, 0.1])
+        writer.add("back", now, [0.0, 0.0, 1.0, 1.0])
+        # days past the retention are expired
+        writer.add("back", now - 60 * 86400, [0.0, 0.0, 1.0, 1.0])
+
+        # boxes are buffered until enough have built up
+        writer.flush()
+        self.assertFalse(has_region_history("front"))
+
+        writer.flush(force=True)
+        self.assertEqual(len(os.listdir(os.path.join(self.history_dir, "front"))), 2)
+        np.testing.assert_allclose(
+            read_region_history("front"),
+            [[0.1, 0.2, 0.3, 0.4], [0.5, 0.5, 0.1, 0.1]],
+            rtol=1e-6,
+        )
+        self.assertEqual(read_region_history("back").shape, (1, 4))
+
+    def test_clear_keeps_camera(self):
+        writer = RegionHistoryWriter()
+        writer.add("front", time.time(), [0.1, 0.2, 0.3, 0.4])
+        writer.flush(force=True)
+
+        clear_region_history("front")
+        self.assertTrue(has_region_history("front"))
+        self.assertEqual(read_region_history("front").shape, (0, 4))
+
+        clear_region_history("front", remove=True)
+        self.assertFalse(has_region_history("front"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+"""Tests for the semantic search caches."""
+
+import unittest
+from unittest.mock import patch
+
+from frigate.embeddings.search_cache import SearchCache
+
+
+class TestSearchCache(unittest.TestCase):
+    def test_least_recently_used_is_evicted(self):
+        cache = SearchCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_entries_expire(self):
+        cache = SearchCache(4, ttl=60)
+
+        with patch("frigate.embeddings.search_cache.time.monotonic") as monotonic:
+            monotonic.return_value = 100
+            cache.put("query", [("event", 0.1)])
+            monotonic.return_value = 159
+            self.assertEqual(cache.get("query"), [("event", 0.1)])
+            monotonic.return_value = 160
+            self.assertIsNone(cache.get("query"))
+
+        self.assertEqual(len(cache), 0)
+
+    def test_hit_rate(self):
+        cache = SearchCache(4)
+        self.assertEqual(cache.stats(), {"hits": 0, "misses": 0, "hit_rate": 0.0})
+
+        cache.get("query")
+        cache.put("query", 1)
+        cache.get("query")
+        cache.get("query")
+        cache.clear()
+        cache.get("query")
+
+        self.assertEqual(cache.stats(), {"hits": 2, "misses": 2, "hit_rate": 0.5})
+
+
+if __name__ == "__main__":
+    unittest.main()
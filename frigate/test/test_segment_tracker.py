@@ -0,0 +1,109 @@
+"""Tests for the recording cache segment tracker."""
+
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from frigate.const import MAX_SEGMENT_DURATION
+from frigate.record.segment_tracker import SegmentTracker
+
+FIRST = "front@20250101000000+0000.mp4"
+SECOND = "front@20250101000010+0000.mp4"
+THIRD = "front@20250101000020+0000.mp4"
+
+
+class TestSegmentTracker(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = self.temp_dir.name
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def _tracker(self, polling: bool) -> SegmentTracker:
+        if polling:
+            with patch.object(SegmentTracker, "_start_inotify", return_value=None):
+                tracker = SegmentTracker(self.cache_dir)
+        else:
+            tracker = SegmentTracker(self.cache_dir)
+
+        self.addCleanup(tracker.stop)
+        return tracker
+
+    def _closed_names(self, tracker: SegmentTracker) -> dict[str, list[str]]:
+        return {
+            camera: [os.path.basename(s.cache_path) for s in segments]
+            for camera, segments in tracker.closed_segments().items()
+        }
+
+    def test_newest_segment_is_in_use_until_closed(self) -> None:
+        for polling in (False, True):
+            with self.subTest(polling=polling):
+                tracker = self._tracker(polling)
+
+                # ffmpeg has the first segment open
+                first = open(os.path.join(self.cache_dir, FIRST), "wb")
+                tracker.update()
+                self.assertEqual(self._closed_names(tracker), {})
+
+                # a newer segment means ffmpeg is done with the first one
+                first.close()
+                second = open(os.path.join(self.cache_dir, SECOND), "wb")
+                tracker.update()
+                self.assertEqual(self._closed_names(tracker), {"front": [FIRST]})
+                self.assertEqual(
+                    tracker.newest_segments()["front"].cache_path,
+                    os.path.join(self.cache_dir, SECOND),
+                )
+
+                second.close()
+                os.remove(os.path.join(self.cache_dir, FIRST))
+                os.remove(os.path.join(self.cache_dir, SECOND))
+
+    def test_close_event_completes_newest_segment(self) -> None:
+        tracker = self._tracker(polling=False)
+        self.assertIsNotNone(tracker.inotify_fd)
+
+        with open(os.path.join(self.cache_dir, FIRST), "wb") as segment:
+            segment.write(b"data")
+            tracker.update()
+            self.assertEqual(self._closed_names(tracker), {})
+
+        tracker.update()
+        self.assertEqual(self._closed_names(tracker), {"front": [FIRST]})
+
+    def test_stale_newest_segment_is_complete(self) -> None:
+        path = os.path.join(self.cache_dir, FIRST)
+        Path(path).touch()
+        stale = time.time() - MAX_SEGMENT_DURATION - 1
+        os.utime(path, (stale, stale))
+
+        tracker = self._tracker(polling=True)
+        self.assertEqual(self._closed_names(tracker), {"front": [FIRST]})
+
+    def test_segments_sorted_and_removed(self) -> None:
+        for name in (THIRD, FIRST, SECOND, "side@20250101000000+0000.mp4"):
+            Path(self.cache_dir, name).touch()
+
+        # the newest segment per camera is still considered in use
+        tracker = self._tracker(polling=False)
+        self.assertEqual(self._closed_names(tracker), {"front": [FIRST, SECOND]})
+
+        tracker.remove(os.path.join(self.cache_dir, FIRST))
+        os.remove(os.path.join(self.cache_dir, FIRST))
+        tracker.update()
+        self.assertEqual(self._closed_names(tracker), {"front": [SECOND]})
+
+    def test_ignores_previews_and_other_files(self) -> None:
+        for name in ("preview_front-1.mp4", "notes.txt", FIRST):
+            Path(self.cache_dir, name).touch()
+
+        tracker = self._tracker(polling=True)
+        self.assertEqual(list(tracker.segments), [FIRST])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,16 +3,22 @@
 Covers the case where a SHM segment is unlinked and recreated at a
 different size across a camera add/remove cycle while a long-lived
 in-process cache (e.g. TrackedObjectProcessor) still holds a ref to
-the old, smaller segment.
+the old, smaller segment, and the per-camera frame ring that keeps
+frame slots mapped across frames.
 """
 
 import unittest
+import uuid
 from types import SimpleNamespace
 from unittest.mock import patch
 
 import numpy as np
 
-from frigate.util.image import SharedMemoryFrameManager
+from frigate.util.image import (
+    SharedMemoryFrameManager,
+    get_frame_name,
+    parse_frame_name,
+)
 
 
 def _fake_shm(size: int) -> SimpleNamespace:
@@ -152,5 +158,88 @@ class TestSharedMemoryFrameManagerGetRecreatesLargerSegment(unittest.TestCase):
         self.assertEqual(arr_large.shape, (1620, 1920))
 
 
+class TestSharedMemoryFrameManagerRing(unittest.TestCase):
+    """Exercises a real SHM frame ring shared by a writer and a reader."""
+
+    def setUp(self) -> None:
+        self.camera = f"test_{uuid.uuid4().hex[:8]}"
+        self.writer = SharedMemoryFrameManager()
+        self.reader = SharedMemoryFrameManager()
+        self.writer.create_frame_ring(self.camera, 3, 2_500)
+
+    def tearDown(self) -> None:
+        self.reader.frame_rings.clear()
+        self.writer.delete_frame_ring(self.camera)
+
+    def _write(self, slot: int, value: int) -> str:
+        buffer = self.writer.write_frame(self.camera, slot)
+        buffer[:] = bytes([value]) * len(buffer)
+        return self.writer.commit_frame(self.camera, slot)
+
+    def test_frame_name_round_trip(self) -> None:
+        name = get_frame_name("front_door", 4, 12)
+        self.assertEqual(parse_frame_name(name), ("front_door", 4, 12))
+        self.assertIsNone(parse_frame_name("front_door"))
+        self.assertIsNone(parse_frame_name("front_door_frame4"))
+
+    def test_reader_gets_committed_frame(self) -> None:
+        name = self._write(1, 7)
+        frame = self.reader.get(name, (50, 50))
+
+        self.assertIsNotNone(frame)
+        self.assertEqual(frame.shape, (50, 50))
+        self.assertTrue((frame == 7).all())
+
+    def test_ring_stays_mapped_across_frames(self) -> None:
+        first = self._write(0, 1)
+        self.assertIsNotNone(self.reader.get(first, (50, 50)))
+        self.reader.close(first)
+        ring = self.reader.frame_rings[self.camera]
+
+        second = self._write(1, 2)
+
+        with patch("frigate.util.image.UntrackedSharedMemory") as untracked_shm_cls:
+            frame = self.reader.get(second, (50, 50))
+            untracked_shm_cls.assert_not_called()
+
+        self.assertTrue((frame == 2).all())
+        self.assertIs(self.reader.frame_rings[self.camera], ring)
+
+    def test_reused_slot_is_stale(self) -> None:
+        old = self._write(0, 1)
+        self._write(0, 2)
+
+        self.assertIsNone(self.reader.get(old, (50, 50)))
+
+    def test_slot_being_written_is_stale(self) -> None:
+        name = self._write(2, 1)
+        self.writer.write_frame(self.camera, 2)
+
+        self.assertIsNone(self.reader.get(name, (50, 50)))
+
+    def test_wrong_frame_size_returns_none(self) -> None:
+        name = self._write(0, 1)
+
+        self.assertIsNone(self.reader.get(name, (60, 60)))
+
+    def test_recreated_ring_is_remapped(self) -> None:
+        old = self._write(0, 1)
+        self.assertIsNotNone(self.reader.get(old, (50, 50)))
+
+        self.writer.create_frame_ring(self.camera, 3, 2_500)
+        name = self._write(0, 9)
+        frame = self.reader.get(name, (50, 50))
+
+        self.assertIsNotNone(frame)
+        self.assertTrue((frame == 9).all())
+        self.assertIsNone(self.reader.get(old, (50, 50)))
+
+    def test_delete_of_ring_frame_keeps_ring(self) -> None:
+        name = self._write(0, 1)
+        self.reader.delete(name)
+
+        self.assertIsNotNone(self.reader.get(name, (50, 50)))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,186 @@
+"""Tests for the downsampled stats history."""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from frigate.stats.history import StatsHistoryStore, flatten_stats
+
+
+def snapshot(fps: float, inference: float) -> dict:
+    return {
+        "cameras": {
+            "front": {
+                "camera_fps": fps,
+                "pid": 10,
+                "ffmpeg_pid": 11,
+                "ffmpeg_cpu": "5.0",
+                "pipeline_latency": {"total": {"count": 10, "p50": 2.0}},
+            }
+        },
+        "detectors": {"cpu": {"inference_speed": inference, "pid": 12}},
+        "gpu_usages": {"intel": {"gpu": "12.5%", "mem": "-%"}},
+        "cpu_usages": {"10": {"cpu": "5.0"}},
+        "service": {"uptime": 100, "version": "0.17.0"},
+    }
+
+
+class TestFlattenStats(unittest.TestCase):
+    def test_numeric_values_are_kept(self):
+        self.assertEqual(
+            flatten_stats(snapshot(5.0, 10.0)),
+            {
+                "cameras.front.camera_fps": 5.0,
+                "cameras.front.pid": 10.0,
+                "cameras.front.ffmpeg_pid": 11.0,
+                "cameras.front.ffmpeg_cpu": 5.0,
+                "cameras.front.pipeline_latency.total.count": 10.0,
+                "cameras.front.pipeline_latency.total.p50": 2.0,
+                "detectors.cpu.inference_speed": 10.0,
+                "detectors.cpu.pid": 12.0,
+                "gpu_usages.intel.gpu": 12.5,
+                "cpu_usages.10.cpu": 5.0,
+                "service.uptime": 100.0,
+            },
+        )
+
+
+class TestStatsHistoryStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.now = (time.time() // 900) * 900
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_samples_are_averaged_per_bucket(self):
+        store = StatsHistoryStore(None)
+
+        for i in range(8):
+            store.add(snapshot(i, 10.0), self.now + i * 15)
+
+        # the last 15 minutes are at 15 second resolution
+        result = store.query(["cameras.*.camera_fps"], self.now - 600, self.now + 900)
+        self.assertEqual(result["resolution"], 15)
+        self.assertEqual(len(result["times"]), 8)
+        self.assertEqual(
+            result["metrics"], {"cameras.front.camera_fps": list(range(8))}
+        )
+
+        # two days ago only the 1 minute rollup is still kept
+        result = store.query(
+            ["cameras.*.camera_fps", "detectors.cpu.*"],
+            self.now - 2 * 86400,
+            self.now + 900,
+        )
+        self.assertEqual(result["resolution"], 60)
+        self.assertEqual(result["times"], [self.now, self.now + 60])
+        self.assertEqual(
+            result["metrics"],
+            {
+                "cameras.front.camera_fps": [1.5, 5.5],
+                "detectors.cpu.inference_speed": [10.0, 10.0],
+            },
+        )
+
+    def test_only_history_metrics_are_kept(self):
+        store = StatsHistoryStore(None)
+        store.add(snapshot(5.0, 10.0), self.now)
+
+        self.assertEqual(
+            store.metrics,
+            [
+                "cameras.front.camera_fps",
+                "cameras.front.ffmpeg_cpu",
+                "detectors.cpu.inference_speed",
+                "gpu_usages.intel.gpu",
+            ],
+        )
+
+    def test_new_metrics_are_added(self):
+        store = StatsHistoryStore(self.directory)
+        store.add(snapshot(5.0, 10.0), self.now)
+
+        cameras = {f"camera_{i}": {"camera_fps": float(i)} for i in range(100)}
+        cameras["front"] = {}
+        store.add({"cameras": cameras}, self.now + 15)
+
+        result = store.query(["cameras.*"], self.now - 60, self.now + 60)
+        self.assertEqual(len(result["metrics"]), 102)
+        self.assertEqual(result["metrics"]["cameras.front.camera_fps"], [5.0, None])
+        self.assertEqual(result["metrics"]["cameras.camera_99.camera_fps"], [None, 99])
+
+    def test_removed_camera_metrics_are_dropped(self):
+        store = StatsHistoryStore(self.directory)
+        cameras = {f"camera_{i}": {"camera_fps": float(i)} for i in range(100)}
+        store.add({"cameras": cameras}, self.now)
+        self.assertEqual(store.tiers[0].data.shape[1], 128)
+
+        store.add({"cameras": {"camera_99": {"camera_fps": 9.0}}}, self.now + 15)
+
+        self.assertEqual(store.metrics, ["cameras.camera_99.camera_fps"])
+        self.assertEqual(store.tiers[0].data.shape[1], 64)
+        result = store.query(["cameras.*"], self.now - 60, self.now + 60)
+        self.assertEqual(
+            result["metrics"], {"cameras.camera_99.camera_fps": [99.0, 9.0]}
+        )
+
+        with open(os.path.join(self.directory, "metrics.json")) as f:
+            self.assertEqual(json.load(f), ["cameras.camera_99.camera_fps"])
+
+    def test_saved_metrics_outside_history_are_dropped(self):
+        store = StatsHistoryStore(self.directory)
+        store.add(snapshot(5.0, 10.0), self.now)
+        store.flush()
+        del store
+
+        # a metric saved by a version that kept every stat
+        with open(os.path.join(self.directory, "metrics.json")) as f:
+            metrics = json.load(f)
+
+        with open(os.path.join(self.directory, "metrics.json"), "w") as f:
+            json.dump(["service.uptime", *metrics], f)
+
+        store = StatsHistoryStore(self.directory)
+        self.assertNotIn("service.uptime", store.metrics)
+        result = store.query(["cameras.front.camera_fps"], self.now - 60, self.now)
+        self.assertEqual(result["metrics"], {"cameras.front.camera_fps": [5.0]})
+
+    def test_sample_writes_one_row(self):
+        store = StatsHistoryStore(self.directory)
+        store.add(snapshot(5.0, 10.0), self.now)
+
+        for tier in store.tiers:
+            # buckets are rows so a sample is contiguous in the file
+            self.assertEqual(tier.data.shape, (tier.slots, 64))
+            written = np.flatnonzero(~np.isnan(tier.data).all(axis=1))
+            self.assertEqual(
+                written.tolist(), [(self.now // tier.resolution) % tier.slots]
+            )
+
+    def test_history_is_kept_across_restarts(self):
+        store = StatsHistoryStore(self.directory)
+        store.add(snapshot(5.0, 10.0), self.now)
+        store.add(snapshot(7.0, 10.0), self.now + 15)
+        store.flush()
+        del store
+
+        with patch("frigate.stats.history.logger") as logger:
+            store = StatsHistoryStore(self.directory)
+            logger.warning.assert_not_called()
+
+        store.add(snapshot(9.0, 10.0), self.now + 30)
+        result = store.query(["cameras.front.camera_fps"], self.now - 60, self.now + 60)
+        self.assertEqual(
+            result["metrics"], {"cameras.front.camera_fps": [5.0, 7.0, 9.0]}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
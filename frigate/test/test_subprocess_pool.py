@@ -0,0 +1,101 @@
+"""Tests for the bounded async subprocess pool."""
+
+import asyncio
+import subprocess as sp
+import time
+import unittest
+
+from frigate.util.subprocess_pool import AsyncSubprocessPool
+
+
+class DisconnectedRequest:
+    async def is_disconnected(self) -> bool:
+        return True
+
+
+class TestAsyncSubprocessPool(unittest.IsolatedAsyncioTestCase):
+    async def test_run_captures_output(self):
+        pool = AsyncSubprocessPool(2)
+        process = await pool.run(["cat"], input=b"frame")
+
+        self.assertEqual(process.returncode, 0)
+        self.assertEqual(process.stdout, b"frame")
+        self.assertEqual(pool.stats()["completed"], 1)
+        self.assertEqual(pool.stats()["running"], 0)
+
+    async def test_run_kills_process_on_timeout(self):
+        pool = AsyncSubprocessPool(2)
+        start = time.monotonic()
+
+        with self.assertRaises(sp.TimeoutExpired):
+            await pool.run(["sleep", "10"], timeout=0.1)
+
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual(pool.stats()["timed_out"], 1)
+        self.assertEqual(pool.stats()["running"], 0)
+
+    async def test_run_kills_process_when_client_disconnects(self):
+        pool = AsyncSubprocessPool(2)
+        process = await pool.run(["sleep", "10"], request=DisconnectedRequest())
+
+        self.assertNotEqual(process.returncode, 0)
+        self.assertEqual(pool.stats()["cancelled"], 1)
+
+    async def test_concurrency_is_bounded(self):
+        pool = AsyncSubprocessPool(1)
+        tasks = [
+            asyncio.create_task(pool.run(["sleep", "0.2"])),
+            asyncio.create_task(pool.run(["sleep", "0.2"])),
+        ]
+        await asyncio.sleep(0.1)
+
+        self.assertEqual(pool.stats()["running"], 1)
+        self.assertEqual(pool.stats()["waiting"], 1)
+
+        await asyncio.gather(*tasks)
+        self.assertEqual(pool.stats()["completed"], 2)
+        self.assertEqual(pool.stats()["waiting"], 0)
+
+    async def test_timeout_includes_waiting_for_a_slot(self):
+        pool = AsyncSubprocessPool(1)
+        task = asyncio.create_task(pool.run(["sleep", "0.5"]))
+        await asyncio.sleep(0.1)
+        start = time.monotonic()
+
+        with self.assertRaises(sp.TimeoutExpired):
+            await pool.run(["true"], timeout=0.1)
+
+        self.assertLess(time.monotonic() - start, 0.4)
+        self.assertEqual(pool.stats()["timed_out"], 1)
+        self.assertEqual(pool.stats()["waiting"], 0)
+
+        await task
+        self.assertEqual((await pool.run(["true"], timeout=1)).returncode, 0)
+
+    async def test_stream_yields_output(self):
+        pool = AsyncSubprocessPool(2)
+        chunks = [c async for c in pool.stream(["echo", "clip"], chunk_size=2)]
+
+        self.assertEqual(b"".join(chunks), b"clip\n")
+        self.assertEqual(pool.stats()["completed"], 1)
+
+    async def test_stream_raises_when_command_fails(self):
+        pool = AsyncSubprocessPool(2)
+
+        with self.assertRaises(sp.CalledProcessError):
+            async for _ in pool.stream(["sh", "-c", "echo oops >&2; exit 1"]):
+                pass
+
+    async def test_closing_stream_kills_process(self):
+        pool = AsyncSubprocessPool(2)
+        stream = pool.stream(["yes"])
+
+        self.assertTrue(await anext(stream))
+        await stream.aclose()
+
+        self.assertEqual(pool.stats()["cancelled"], 1)
+        self.assertEqual(pool.stats()["running"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""Tests for dispatching messages from many sockets with one poller."""
+
+import time
+import unittest
+
+import zmq
+
+from frigate.comms.poller import TopicPoller
+
+
+class TestTopicPoller(unittest.TestCase):
+    def setUp(self):
+        self.context = zmq.Context()
+        self.received: list[tuple[str, bytes]] = []
+        self.senders: dict[str, zmq.Socket] = {}
+        self.poller = TopicPoller(max_batch=4)
+
+        for name in ["config", "frames"]:
+            receiver = self.context.socket(zmq.PAIR)
+            receiver.bind(f"inproc://{name}")
+            sender = self.context.socket(zmq.PAIR)
+            sender.connect(f"inproc://{name}")
+            self.senders[name] = sender
+            self.poller.register(name, receiver, self._handler(name, receiver))
+
+    def tearDown(self):
+        self.context.destroy(linger=0)
+
+    def _handler(self, name: str, socket: zmq.Socket):
+        def handle() -> None:
+            self.received.append((name, socket.recv(flags=zmq.NOBLOCK)))
+
+        return handle
+
+    def test_idle_poll_waits_for_timeout(self):
+        start = time.monotonic()
+
+        self.assertEqual(self.poller.poll(0.05), 0)
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+        self.assertEqual(self.received, [])
+
+    def test_only_ready_topics_are_handled(self):
+        self.senders["frames"].send(b"frame")
+
+        self.assertEqual(self.poller.poll(1), 1)
+        self.assertEqual(self.received, [("frames", b"frame")])
+        self.assertIn("frames", self.poller.speeds)
+        self.assertNotIn("config", self.poller.speeds)
+
+    def test_topics_are_handled_in_registration_order(self):
+        self.senders["frames"].send(b"frame")
+        self.senders["config"].send(b"config")
+        # wait for both messages to be queued
+        time.sleep(0.05)
+
+        self.assertEqual(self.poller.poll(1), 2)
+        self.assertEqual(self.received, [("config", b"config"), ("frames", b"frame")])
+
+    def test_busy_topic_is_drained_in_batches(self):
+        for i in range(6):
+            self.senders["frames"].send(str(i).encode())
+
+        time.sleep(0.05)
+        self.poller.poll(1)
+        self.assertEqual(len(self.received), 4)
+
+        self.poller.poll(1)
+        self.assertEqual(
+            [m for _, m in self.received], [b"0", b"1", b"2", b"3", b"4", b"5"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+"""Tests for the in-memory semantic search index."""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from frigate.embeddings.vector_index import VectorIndex
+
+CAMERAS = ["front", "back", "side"]
+LABELS = ["person", "car"]
+ZONES = ["yard", "street", "porch"]
+
+
+def random_items(count: int, seed: int = 0) -> list[tuple[str, np.ndarray, dict]]:
+    rng = np.random.default_rng(seed)
+    return [
+        (
+            f"{1700000000 + i}.{seed}-{i}",
+            rng.normal(size=64).astype(np.float32),
+            {
+                "camera": CAMERAS[i % len(CAMERAS)],
+                "label": LABELS[i % len(LABELS)],
+                "zones": [z for j, z in enumerate(ZONES) if (i >> j) & 1],
+                "start_time": 1700000000 + i,
+            },
+        )
+        for i in range(count)
+    ]
+
+
+def brute_force(
+    items: list[tuple[str, np.ndarray, dict]], query: np.ndarray, k: int, **filters
+) -> list[tuple[str, float]]:
+    results = []
+
+    for event_id, vector, metadata in items:
+        if "cameras" in filters and metadata["camera"] not in filters["cameras"]:
+            continue
+        if "labels" in filters and metadata["label"] not in filters["labels"]:
+            continue
+        if "zones" in filters and not set(metadata["zones"]) & set(filters["zones"]):
+            continue
+        if "after" in filters and metadata["start_time"] < filters["after"]:
+            continue
+        if "before" in filters and metadata["start_time"] > filters["before"]:
+            continue
+
+        similarity = vector @ query / np.linalg.norm(vector) / np.linalg.norm(query)
+        results.append((event_id, 1 - float(similarity)))
+
+    return sorted(results, key=lambda r: r[1])[:k]
+
+
+class TestVectorIndex(unittest.TestCase):
+    def setUp(self):
+        self.items = random_items(500)
+        self.index = VectorIndex(capacity=64)
+        self.index.upsert(self.items)
+        self.query = np.random.default_rng(1).normal(size=64).astype(np.float32)
+
+    def assert_matches(self, results, expected):
+        self.assertEqual(len(results), len(expected))
+
+        # quantization can swap neighbours with nearly equal distances
+        self.assertGreaterEqual(
+            len({r[0] for r in results} & {e[0] for e in expected}),
+            len(expected) - 2,
+        )
+
+        for (_, distance), (_, expected_distance) in zip(results, expected):
+            self.assertAlmostEqual(distance, expected_distance, delta=0.02)
+
+        distances = [r[1] for r in results]
+        self.assertEqual(distances, sorted(distances))
+
+    def test_search_matches_brute_force(self):
+        self.assert_matches(
+            self.index.search(self.query, 20), brute_force(self.items, self.query, 20)
+        )
+
+    def test_filters_are_applied_before_ranking(self):
+        filters = {
+            "cameras": ["front", "side"],
+            "labels": ["person"],
+            "zones": ["porch"],
+            "after": 1700000100,
+            "before": 1700000400,
+        }
+        results = self.index.search(self.query, 10, **filters)
+
+        self.assert_matches(results, brute_force(self.items, self.query, 10, **filters))
+
+    def test_k_larger_than_matches_returns_all_matches(self):
+        results = self.index.search(self.query, 1000, cameras=["back"])
+
+        self.assertEqual(
+            len(results), len([i for i in self.items if i[2]["camera"] == "back"])
+        )
+        self.assertEqual(self.index.search(self.query, 10, cameras=["garage"]), [])
+
+    def test_replace_and_remove(self):
+        event_id, vector, metadata = self.items[0]
+        self.index.upsert([(event_id, self.query * 2, {**metadata, "zones": []})])
+        self.index.remove([self.items[1][0]])
+
+        results = self.index.search(self.query, 600)
+        self.assertEqual(results[0][0], event_id)
+        self.assertAlmostEqual(results[0][1], 0, delta=0.01)
+        self.assertEqual(len(results), 499)
+        self.assertNotIn(self.items[1][0], [r[0] for r in results])
+        # the replaced row no longer matches its old zones
+        self.assertNotIn(
+            event_id, [r[0] for r in self.index.search(self.query, 600, zones=ZONES)]
+        )
+
+    def test_deleted_rows_are_dropped_when_growing(self):
+        self.index.remove(item[0] for item in self.items[:400])
+        added = random_items(self.index.capacity - self.index.count + 1, seed=2)
+        self.index.upsert(added)
+
+        self.assertEqual(self.index.count, 100 + len(added))
+        self.assert_matches(
+            self.index.search(self.query, 10, zones=["yard"]),
+            brute_force(self.items[400:] + added, self.query, 10, zones=["yard"]),
+        )
+
+    def test_save_and_load(self):
+        self.index.remove([self.items[0][0]])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "index.npz")
+            self.index.save(path)
+            self.assertFalse(self.index.modified)
+            loaded = VectorIndex.load(path)
+
+        self.assertEqual(len(loaded), 499)
+        self.assertNotIn(self.items[0][0], loaded)
+        filters = {"labels": ["car"], "zones": ["street", "yard"]}
+        self.assertEqual(
+            loaded.search(self.query, 15, **filters),
+            self.index.search(self.query, 15, **filters),
+        )
+
+    def test_load_missing_index(self):
+        self.assertIsNone(VectorIndex.load("/nonexistent/index.npz"))
+
+
+if __name__ == "__main__":
+    unittest.main()
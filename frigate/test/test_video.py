@@ -351,7 +351,7 @@ class TestRegionGrid(unittest.TestCase):
             [],
             [],
             [],
-            [{}, {}, {}, {}, {}, {"sizes": [0.25], "mean": 0.26, "std_dev": 0.01}],
+            [{}, {}, {}, {}, {}, {"count": 1, "mean": 0.26, "std_dev": 0.01}],
         ]
 
         region = get_region_from_grid(frame_shape, box, 320, region_grid)
@@ -365,7 +365,7 @@ class TestRegionGrid(unittest.TestCase):
             [],
             [],
             [],
-            [{}, {}, {}, {}, {}, {"sizes": [0.5], "mean": 0.5, "std_dev": 0.1}],
+            [{}, {}, {}, {}, {}, {"count": 1, "mean": 0.5, "std_dev": 0.1}],
         ]
 
         region = get_region_from_grid(frame_shape, box, 320, region_grid)
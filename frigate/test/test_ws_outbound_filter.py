@@ -5,8 +5,10 @@ import threading
 import unittest
 from types import SimpleNamespace
 from typing import Any
+from unittest.mock import MagicMock, patch
 
 from frigate.comms.ws import (
+    _WS_MAX_PENDING_MESSAGES,
     WebSocketClient,
     _classify_outbound,
     _collect_zone_names,
@@ -668,35 +670,44 @@ class TestPublishEndToEnd(unittest.TestCase):
         self.client.websocket_server = _FakeServer(
             _FakeManager([self.admin, self.restricted, self.anon])
         )
+        self.addCleanup(self._stop_senders)
+
+    def _stop_senders(self) -> None:
+        for sender in self.client.senders.values():
+            sender.stop()
+
+    def _publish(self, topic: str, payload: Any) -> None:
+        self.client.publish(topic, payload)
+        self.assertTrue(self.client.flush(timeout=5))
 
     def _payloads(self, ws: _CapturingWs) -> list[Any]:
         return [json.loads(m)["payload"] for m in ws.sent]
 
     def test_global_topic_reaches_everyone(self):
-        self.client.publish("model_state", "{}")
+        self._publish("model_state", "{}")
         self.assertEqual(len(self.admin.sent), 1)
         self.assertEqual(len(self.restricted.sent), 1)
         self.assertEqual(len(self.anon.sent), 1)
 
     def test_camera_topic_filters_restricted_recipient(self):
-        self.client.publish("garage/detect/state", "ON")
+        self._publish("garage/detect/state", "ON")
         self.assertEqual(len(self.admin.sent), 1)
         self.assertEqual(len(self.restricted.sent), 0)
         self.assertEqual(len(self.anon.sent), 0)
 
     def test_camera_topic_allows_restricted_recipient_for_allowed_camera(self):
-        self.client.publish("front_door/detect/state", "ON")
+        self._publish("front_door/detect/state", "ON")
         self.assertEqual(len(self.admin.sent), 1)
         self.assertEqual(len(self.restricted.sent), 1)
         self.assertEqual(len(self.anon.sent), 0)
 
     def test_events_payload_filtered(self):
-        self.client.publish("events", json.dumps({"after": {"camera": "garage"}}))
+        self._publish("events", json.dumps({"after": {"camera": "garage"}}))
         self.assertEqual(len(self.admin.sent), 1)
         self.assertEqual(len(self.restricted.sent), 0)
 
     def test_camera_activity_reshaped_per_recipient(self):
-        self.client.publish(
+        self._publish(
             "camera_activity",
             json.dumps(
                 {
@@ -717,7 +728,7 @@ class TestPublishEndToEnd(unittest.TestCase):
         self.assertEqual(len(self.anon.sent), 0)
 
     def test_birdseye_layout_blocked_for_restricted_and_anon(self):
-        self.client.publish(
+        self._publish(
             "birdseye_layout",
             json.dumps({"front_door": {"x": 0, "y": 0, "width": 1, "height": 1}}),
         )
@@ -726,12 +737,12 @@ class TestPublishEndToEnd(unittest.TestCase):
         self.assertEqual(len(self.anon.sent), 0)
 
     def test_zone_aggregate_blocked_for_restricted(self):
-        self.client.publish("driveway/person", 2)
+        self._publish("driveway/person", 2)
         self.assertEqual(len(self.admin.sent), 1)
         self.assertEqual(len(self.restricted.sent), 0)
 
     def test_stats_reshaped_per_recipient(self):
-        self.client.publish(
+        self._publish(
             "stats",
             json.dumps(
                 {
@@ -758,7 +769,7 @@ class TestPublishEndToEnd(unittest.TestCase):
         self.assertEqual(len(self.anon.sent), 0)
 
     def test_export_job_state_filters_results_jobs_per_recipient(self):
-        self.client.publish(
+        self._publish(
             "job_state",
             json.dumps(
                 {
@@ -790,17 +801,115 @@ class TestPublishEndToEnd(unittest.TestCase):
         )
 
     def test_unknown_topic_dropped_for_everyone(self):
-        self.client.publish("some_rogue_topic", "data")
+        self._publish("some_rogue_topic", "data")
         self.assertEqual(self.admin.sent, [])
         self.assertEqual(self.restricted.sent, [])
         self.assertEqual(self.anon.sent, [])
 
     def test_terminated_client_is_skipped(self):
         self.restricted.terminated = True
-        self.client.publish("front_door/detect/state", "ON")
+        self._publish("front_door/detect/state", "ON")
         self.assertEqual(len(self.admin.sent), 1)
         self.assertEqual(len(self.restricted.sent), 0)
 
+    def test_payload_materialized_once_per_permission_scope(self):
+        restricted_alias = _CapturingWs("house_only")
+        self.client.websocket_server.manager.websockets[id(restricted_alias)] = (
+            restricted_alias
+        )
+
+        with patch(
+            "frigate.comms.ws._materialize_for_ws", wraps=_materialize_for_ws
+        ) as materialize:
+            self._publish(
+                "camera_activity", json.dumps({"front_door": {}, "garage": {}})
+            )
+
+        # admin, house_only (shared by two clients) and anonymous
+        self.assertEqual(materialize.call_count, 3)
+        self.assertEqual(restricted_alias.sent, self.restricted.sent)
+
+    def test_topic_classification_follows_config_updates(self):
+        self.client.config_subscriber = MagicMock()
+        self.client.config_subscriber.check_for_updates.return_value = {}
+        self._publish("patio/person", 1)
+        self.assertEqual(self.admin.sent, [])
+
+        self.config.cameras["front_door"].zones = {
+            **self.config.cameras["front_door"].zones,
+            "patio": self.config.cameras["front_door"].zones["driveway"],
+        }
+        self.client.config_subscriber.check_for_updates.return_value = {
+            "zones": ["front_door"]
+        }
+        self._publish("patio/person", 1)
+        self.assertEqual(len(self.admin.sent), 1)
+        self.assertEqual(self.restricted.sent, [])
+
+    def test_topic_classification_follows_replaced_config(self):
+        self._publish("patio/person", 1)
+        self.assertEqual(self.admin.sent, [])
+
+        self.client.config = _build_config(
+            extra_zones={"front_door": {"patio": {"coordinates": "0,0,1,0,1,1,0,1"}}}
+        )
+        self._publish("patio/person", 1)
+        self.assertEqual(len(self.admin.sent), 1)
+
+    def _block_sends(self, ws: _CapturingWs) -> tuple[threading.Event, threading.Event]:
+        release = threading.Event()
+        blocked = threading.Event()
+        original_send = ws.send
+
+        def slow_send(message: str) -> None:
+            blocked.set()
+            release.wait(5)
+            original_send(message)
+
+        ws.send = slow_send
+        self.addCleanup(release.set)
+        return release, blocked
+
+    def test_burst_is_kept_for_client_that_is_not_stalled(self):
+        release, blocked = self._block_sends(self.admin)
+        self.client.publish("front_door/detect/state", "ON")
+        self.assertTrue(blocked.wait(5))
+
+        # the sender is behind the burst but its send hasn't stalled
+        for i in range(_WS_MAX_PENDING_MESSAGES + 10):
+            self.client.publish("front_door/motion", str(i))
+
+        release.set()
+        self.assertTrue(self.client.flush(timeout=5))
+        self.assertEqual(self.client.senders[id(self.admin)].dropped, 0)
+        self.assertEqual(len(self.admin.sent), _WS_MAX_PENDING_MESSAGES + 11)
+
+    def test_slow_client_does_not_block_others(self):
+        release, blocked = self._block_sends(self.restricted)
+        self.client.publish("front_door/detect/state", "ON")
+        self.assertTrue(blocked.wait(5))
+
+        # the send in progress has been blocked for longer than allowed
+        self.client.senders[id(self.restricted)].stall_timeout = 0
+
+        for i in range(_WS_MAX_PENDING_MESSAGES + 10):
+            self.client.publish("front_door/motion", str(i))
+
+        self.assertTrue(self.client.senders[id(self.admin)].wait_until_idle(5))
+        self.assertEqual(len(self.admin.sent), _WS_MAX_PENDING_MESSAGES + 11)
+        self.assertEqual(self.client.senders[id(self.admin)].dropped, 0)
+
+        release.set()
+        self.assertTrue(self.client.flush(timeout=5))
+
+        # the oldest queued messages were dropped for the slow client
+        self.assertEqual(self.client.senders[id(self.restricted)].dropped, 10)
+        self.assertEqual(len(self.restricted.sent), _WS_MAX_PENDING_MESSAGES + 1)
+        self.assertEqual(
+            self._payloads(self.restricted)[-1], str(_WS_MAX_PENDING_MESSAGES + 9)
+        )
+        self.assertEqual(self._payloads(self.restricted)[1], "10")
+
 
 if __name__ == "__main__":
     unittest.main()
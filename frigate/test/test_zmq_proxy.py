@@ -0,0 +1,83 @@
+"""Tests for ZMQ proxy payload serialization."""
+
+import os
+import time
+import unittest
+
+from frigate.comms.detections_updater import (
+    DetectionPublisher,
+    DetectionSubscriber,
+    DetectionTypeEnum,
+)
+from frigate.comms.zmq_proxy import JsonSerializer, MsgpackSerializer, ZmqProxy
+
+
+class TestSerializers(unittest.TestCase):
+    payload = (
+        "front",
+        "front_frame3@42",
+        1700000000.5,
+        [{"id": "1700000000.5-abc", "box": (1, 2, 3, 4), "attributes": {}}],
+        [(0, 0, 10, 10)],
+        [],
+    )
+
+    def test_serializers_decode_tuples_as_lists(self) -> None:
+        """Both serializers must hand subscribers the same structure."""
+        expected = [
+            "front",
+            "front_frame3@42",
+            1700000000.5,
+            [{"id": "1700000000.5-abc", "box": [1, 2, 3, 4], "attributes": {}}],
+            [[0, 0, 10, 10]],
+            [],
+        ]
+
+        for serializer in (JsonSerializer, MsgpackSerializer):
+            with self.subTest(serializer=serializer.__name__):
+                self.assertEqual(
+                    serializer.loads(serializer.dumps(self.payload)), expected
+                )
+
+    def test_str_enum_values_are_plain_strings(self) -> None:
+        data = MsgpackSerializer.loads(
+            MsgpackSerializer.dumps({"type": DetectionTypeEnum.video})
+        )
+        self.assertEqual(data, {"type": "video"})
+
+
+class TestDetectionPubSub(unittest.TestCase):
+    def setUp(self) -> None:
+        os.makedirs("/tmp/cache", exist_ok=True)
+        self.proxy = ZmqProxy()
+        self.publisher = DetectionPublisher(DetectionTypeEnum.video.value)
+        self.video = DetectionSubscriber(DetectionTypeEnum.video.value)
+        self.audio = DetectionSubscriber(DetectionTypeEnum.audio.value)
+
+    def tearDown(self) -> None:
+        self.publisher.stop()
+        self.video.stop()
+        self.audio.stop()
+        self.proxy.stop()
+
+    def test_topic_frame_filters_subscribers(self) -> None:
+        payload = ("front", "front_frame0@1", 1.0, [], [], [])
+        received = None
+        deadline = time.monotonic() + 5
+
+        # subscriptions propagate through the proxy asynchronously
+        while received is None and time.monotonic() < deadline:
+            self.publisher.publish(payload)
+            topic, data = self.video.check_for_update(timeout=0.1)
+
+            if topic is not None:
+                received = (topic, data)
+
+        self.assertEqual(
+            received, ("video", ["front", "front_frame0@1", 1.0, [], [], []])
+        )
+        self.assertEqual(self.audio.check_for_update(timeout=0.1), (None, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
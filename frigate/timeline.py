@@ -11,6 +11,7 @@ from frigate.config import FrigateConfig
 from frigate.events.types import EventStateEnum, EventTypeEnum
 from frigate.models import Timeline
 from frigate.util.builtin import to_relative_box
+from frigate.util.region_history import RegionHistoryWriter
 
 logger = logging.getLogger(__name__)
 
@@ -29,9 +30,12 @@ class TimelineProcessor(threading.Thread):
         self.queue = queue
         self.stop_event = stop_event
         self.pre_event_cache: dict[str, list[dict[Any, Any]]] = {}
+        self.region_history = RegionHistoryWriter()
 
     def run(self) -> None:
         while not self.stop_event.is_set():
+            self.region_history.flush()
+
             try:
                 (
                     camera,
@@ -54,6 +58,19 @@ class TimelineProcessor(threading.Thread):
             elif input_type == EventTypeEnum.api:
                 self.handle_api_entry(camera, event_type, event_data)
 
+        self.region_history.flush(force=True)
+
+    def save_entry(self, entry: dict[Any, Any]) -> None:
+        """Insert an entry into the db and keep its box for the region grid."""
+        Timeline.insert(entry).execute()
+
+        if entry[Timeline.source] == "tracked_object":
+            self.region_history.add(
+                entry[Timeline.camera],
+                entry[Timeline.timestamp],
+                entry[Timeline.data]["box"],
+            )
+
     def insert_or_save(
         self,
         entry: dict[Any, Any],
@@ -72,11 +89,11 @@ class TimelineProcessor(threading.Thread):
             # the event is saved, insert to db and insert cached into db
             if id in self.pre_event_cache.keys():
                 for e in self.pre_event_cache[id]:
-                    Timeline.insert(e).execute()
+                    self.save_entry(e)
 
                 self.pre_event_cache.pop(id)
 
-            Timeline.insert(entry).execute()
+            self.save_entry(entry)
 
     def handle_object_detection(
         self,
@@ -0,0 +1,140 @@
+"""Latency of each stage a frame goes through from capture to being published."""
+
+import math
+import threading
+from typing import Any
+
+import numpy as np
+
+# the time between each of the timestamps carried with a frame, the total is
+# from the frame being read to it being published
+PIPELINE_STAGES = [
+    "read",
+    "queue",
+    "motion",
+    "detect",
+    "track",
+    "process",
+    "publish",
+    "total",
+]
+
+# latencies are counted in buckets that grow by 2^(1/4) from 2^-3 to 2^16 ms,
+# with one bucket below and one above that range
+LATENCY_MIN_EXP = -3
+LATENCY_MAX_EXP = 16
+LATENCY_SUB_BUCKETS = 4
+LATENCY_BUCKETS = (LATENCY_MAX_EXP - LATENCY_MIN_EXP) * LATENCY_SUB_BUCKETS + 2
+
+# upper bound in ms of each bucket except the last one
+LATENCY_BUCKET_BOUNDS = 2.0 ** (
+    LATENCY_MIN_EXP + np.arange(LATENCY_BUCKETS - 1) / LATENCY_SUB_BUCKETS
+)
+
+# bounds in ms that cumulative counts are reported for, 1ms to ~16s
+LATENCY_EXPORT_BOUNDS = [2**i for i in range(15)]
+LATENCY_EXPORT_BUCKETS = [
+    (int(math.log2(bound)) - LATENCY_MIN_EXP) * LATENCY_SUB_BUCKETS
+    for bound in LATENCY_EXPORT_BOUNDS
+]
+
+
+def _bucket_bound(bucket: int) -> float:
+    # latencies past the last bound are reported as the last bound
+    return round(float(LATENCY_BUCKET_BOUNDS[min(bucket, LATENCY_BUCKETS - 2)]), 2)
+
+
+class LatencyHistogram:
+    """Counts the latency of each pipeline stage in log scaled buckets.
+
+    Percentiles are within 20% of the actual latency and are calculated from
+    the frames since the previous call to stats.
+    """
+
+    def __init__(self) -> None:
+        self.counts = np.zeros((len(PIPELINE_STAGES), LATENCY_BUCKETS), np.int64)
+        self.sums = np.zeros(len(PIPELINE_STAGES))
+        self.last_counts = self.counts.copy()
+        self.rows = np.arange(len(PIPELINE_STAGES))
+
+    def record(self, latencies: np.ndarray) -> None:
+        """Add the latency in seconds of each stage for a frame."""
+        latencies = np.maximum(latencies * 1000, 0)
+        exponents = np.log2(np.maximum(latencies, 2.0 ** (LATENCY_MIN_EXP - 1)))
+        buckets = np.floor(
+            (exponents - LATENCY_MIN_EXP) * LATENCY_SUB_BUCKETS + 1
+        ).astype(int)
+        self.counts[self.rows, np.clip(buckets, 0, LATENCY_BUCKETS - 1)] += 1
+        self.sums += latencies
+
+    @staticmethod
+    def _percentiles(counts: np.ndarray) -> dict[str, float | None]:
+        total = int(counts.sum())
+
+        if total == 0:
+            return {"p50": None, "p90": None, "p99": None, "max": None}
+
+        cumulative = np.cumsum(counts)
+        percentiles: dict[str, float | None] = {
+            name: _bucket_bound(int(np.searchsorted(cumulative, math.ceil(q * total))))
+            for name, q in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99))
+        }
+        percentiles["max"] = _bucket_bound(int(np.flatnonzero(counts)[-1]))
+        return percentiles
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        window = self.counts - self.last_counts
+        self.last_counts = self.counts.copy()
+        cumulative = np.cumsum(self.counts, axis=1)
+
+        return {
+            stage: {
+                "count": int(cumulative[i, -1]),
+                "sum": round(float(self.sums[i]), 2),
+                **self._percentiles(window[i]),
+                "buckets": cumulative[i, LATENCY_EXPORT_BUCKETS].tolist(),
+            }
+            for i, stage in enumerate(PIPELINE_STAGES)
+        }
+
+
+class PipelineMetrics:
+    """Latency histograms of the frames published for each camera."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.cameras: dict[str, LatencyHistogram] = {}
+
+    def frame_published(
+        self,
+        camera: str,
+        frame_time: float,
+        stage_times: tuple[float, ...],
+        published: float,
+    ) -> None:
+        """Record a frame from its stage timestamps.
+
+        The stage timestamps are when the frame was read, dequeued for
+        processing, motion was detected, objects were detected, objects were
+        tracked and processing finished.
+        """
+        times = np.array((frame_time, *stage_times, published))
+        latencies = np.append(np.diff(times), published - stage_times[0])
+
+        with self.lock:
+            histogram = self.cameras.get(camera)
+
+            if histogram is None:
+                histogram = self.cameras[camera] = LatencyHistogram()
+
+            histogram.record(latencies)
+
+    def remove_camera(self, camera: str) -> None:
+        with self.lock:
+            self.cameras.pop(camera, None)
+
+    def stats(self) -> dict[str, dict[str, dict[str, Any]]]:
+        with self.lock:
+            return {
+                camera: histogram.stats() for camera, histogram in self.cameras.items()
+            }
@@ -6,6 +6,7 @@ from typing import Any, cast
 
 import cv2
 import numpy as np
+from norfair.distances import Distance, VectorizedDistance
 from norfair.drawing.draw_boxes import draw_boxes
 from norfair.drawing.drawer import Drawable, Drawer
 from norfair.filter import OptimizedKalmanFilterFactory
@@ -83,8 +84,68 @@ def distance(detection: np.ndarray, estimate: np.ndarray) -> float:
     return float(np.linalg.norm(change))
 
 
-def frigate_distance(detection: Detection, tracked_object: TrackedObject) -> float:
-    return distance(detection.points, tracked_object.estimate)
+def distances(detections: np.ndarray, estimates: np.ndarray) -> np.ndarray:
+    """Vectorized distance() between every detection and estimate.
+
+    Boxes are stacked as flattened [x1, y1, x2, y2] rows, the result is the
+    (detections, estimates) cost matrix.
+    """
+    detections = np.asarray(detections, dtype=float).reshape(-1, 1, 4)
+    estimates = np.asarray(estimates, dtype=float).reshape(1, -1, 4)
+
+    detection_w = detections[..., 2] - detections[..., 0]
+    detection_h = detections[..., 3] - detections[..., 1]
+    estimate_w = estimates[..., 2] - estimates[..., 0]
+    estimate_h = estimates[..., 3] - estimates[..., 1]
+
+    # Guard against degenerate or non-finite boxes
+    valid = (
+        np.isfinite(detection_w)
+        & np.isfinite(detection_h)
+        & (detection_w > 0)
+        & (detection_h > 0)
+    ) & (
+        np.isfinite(estimate_w)
+        & np.isfinite(estimate_h)
+        & (estimate_w > 0)
+        & (estimate_h > 0)
+    )
+
+    with np.errstate(all="ignore"):
+        # change in bottom center position relative to w and h
+        dx = (
+            (detections[..., 0] + detections[..., 2]) / 2
+            - (estimates[..., 0] + estimates[..., 2]) / 2
+        ) / estimate_w
+        dy = (detections[..., 3] - estimates[..., 3]) / estimate_h
+
+        # ratio of widths and heights, normalized to 1
+        width_ratio = (
+            np.maximum(detection_w, estimate_w) / np.minimum(detection_w, estimate_w)
+            - 1.0
+        )
+        height_ratio = (
+            np.maximum(detection_h, estimate_h) / np.minimum(detection_h, estimate_h)
+            - 1.0
+        )
+
+        change = np.sqrt(dx**2 + dy**2 + width_ratio**2 + height_ratio**2)
+
+    return np.where(valid, change, np.inf)
+
+
+# norfair computes the whole detections x tracked objects matrix per label
+frigate_distance = VectorizedDistance(distances)
+
+
+def create_tracker(distance_function: Distance, **kwargs: Any) -> Tracker:
+    """Create a norfair tracker that matches with a vectorized distance."""
+    # norfair only accepts distance names or scalar functions when the
+    # tracker is created (and the attribute is typed to match), matching
+    # only calls get_distances so the distance is swapped in afterwards
+    tracker = Tracker(distance_function="euclidean", **kwargs)
+    tracker.distance_function = distance_function  # type: ignore[assignment]
+    return tracker
 
 
 def histogram_distance(
@@ -203,23 +264,21 @@ class NorfairTracker(ObjectTracker):
 
         # Initialize default trackers
         self.default_tracker = {
-            "static": Tracker(
+            "static": create_tracker(
                 distance_function=frigate_distance,
-                distance_threshold=self.default_tracker_config[  # type: ignore[arg-type]
-                    "distance_threshold"
-                ],
+                distance_threshold=self.default_tracker_config["distance_threshold"],
                 initialization_delay=self.detect_config.min_initialized,
-                hit_counter_max=self.detect_config.max_disappeared,  # type: ignore[arg-type]
-                filter_factory=self.default_tracker_config["filter_factory"],  # type: ignore[arg-type]
+                hit_counter_max=self.detect_config.max_disappeared,
+                filter_factory=self.default_tracker_config["filter_factory"],
             ),
-            "ptz": Tracker(
+            "ptz": create_tracker(
                 distance_function=frigate_distance,
                 distance_threshold=self.default_ptz_tracker_config[
                     "distance_threshold"
-                ],  # type: ignore[arg-type]
+                ],
                 initialization_delay=self.detect_config.min_initialized,
-                hit_counter_max=self.detect_config.max_disappeared,  # type: ignore[arg-type]
-                filter_factory=self.default_ptz_tracker_config["filter_factory"],  # type: ignore[arg-type]
+                hit_counter_max=self.detect_config.max_disappeared,
+                filter_factory=self.default_ptz_tracker_config["filter_factory"],
             ),
         }
 
@@ -255,7 +314,7 @@ class NorfairTracker(ObjectTracker):
                 {key: tracker_config[key] for key in reid_keys if key in tracker_config}
             )
 
-        return Tracker(**tracker_params)
+        return create_tracker(**tracker_params)
 
     def get_tracker(self, object_type: str) -> Tracker:
         """Get the appropriate tracker based on object type and camera mode."""
@@ -2,9 +2,13 @@ import base64
 import datetime
 import json
 import logging
+import os
 import queue
 import threading
+import time
 from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import Future
 from enum import Enum
 from multiprocessing import Queue as MpQueue
 from multiprocessing.synchronize import Event as MpEvent
@@ -35,17 +39,26 @@ from frigate.config.camera.updater import (
 )
 from frigate.const import (
     FAST_QUEUE_TIMEOUT,
+    OBJECT_PROCESSOR_SHARDS_VAR,
     UPDATE_CAMERA_ACTIVITY,
     UPSERT_REVIEW_SEGMENT,
 )
 from frigate.events.types import EventStateEnum, EventTypeEnum
 from frigate.models import Event, ReviewSegment, Timeline
 from frigate.ptz.autotrack import PtzAutoTrackerThread
+from frigate.track.latency import PipelineMetrics
 from frigate.track.tracked_object import TrackedObject
 from frigate.util.image import SharedMemoryFrameManager
 
 logger = logging.getLogger(__name__)
 
+# tasks queued per shard before submitting blocks, so a shard that falls
+# behind backs up the detected frames queue instead of growing without limit
+SHARD_MAX_PENDING_TASKS = 32
+
+# seconds to wait for a shard to return a result to another thread
+SHARD_CALL_TIMEOUT = 5
+
 
 class ManualEventState(str, Enum):
     complete = "complete"
@@ -53,6 +66,48 @@ class ManualEventState(str, Enum):
     end = "end"
 
 
+class ObjectProcessorShard(threading.Thread):
+    """Runs tracked object work for a subset of cameras.
+
+    Every task for a camera is executed on the shard that owns it, so camera
+    state is still only ever updated from a single thread.
+    """
+
+    def __init__(self, index: int, stop_event: MpEvent) -> None:
+        super().__init__(name=f"detected_frames_processor:{index}", daemon=True)
+        self.stop_event = stop_event
+        self.cameras: set[str] = set()
+        self.frame_manager = SharedMemoryFrameManager()
+        self.tasks: queue.Queue[tuple[Callable[..., None], tuple]] = queue.Queue(
+            maxsize=SHARD_MAX_PENDING_TASKS
+        )
+        self.on_exit: Callable[[], None] | None = None
+
+    def submit(self, task: Callable[..., None], *args: Any) -> None:
+        """Queues the task, waiting while the shard is full."""
+        while not self.stop_event.is_set():
+            try:
+                self.tasks.put((task, args), timeout=1)
+                return
+            except queue.Full:
+                continue
+
+    def run(self) -> None:
+        while not self.stop_event.is_set():
+            try:
+                task, args = self.tasks.get(True, 1)
+            except queue.Empty:
+                continue
+
+            try:
+                task(*args)
+            except Exception:
+                logger.exception(f"Error processing objects in {self.name}")
+
+        if self.on_exit:
+            self.on_exit()
+
+
 class TrackedObjectProcessor(threading.Thread):
     def __init__(
         self,
@@ -71,6 +126,7 @@ class TrackedObjectProcessor(threading.Thread):
         self.frame_manager = SharedMemoryFrameManager()
         self.last_motion_detected: dict[str, float] = {}
         self.ptz_autotracker_thread = ptz_autotracker_thread
+        self.pipeline_metrics = PipelineMetrics()
 
         self.camera_config_subscriber = CameraConfigUpdateSubscriber(
             self.config,
@@ -86,13 +142,26 @@ class TrackedObjectProcessor(threading.Thread):
             ],
         )
 
-        self.requestor = InterProcessRequestor()
-        self.detection_publisher = DetectionPublisher(DetectionTypeEnum.all.value)
-        self.event_sender = EventUpdatePublisher()
+        # zmq sockets are not thread safe, each shard thread creates its own
+        self.thread_sockets = threading.local()
         self.event_end_subscriber = EventEndSubscriber()
         self.sub_label_subscriber = EventMetadataSubscriber(EventMetadataTypeEnum.all)
 
+        # when sharded, cameras are split across worker threads and the main
+        # thread only routes updates to the shard that owns the camera
+        self.shards: list[ObjectProcessorShard] = []
+        self.camera_shards: dict[str, ObjectProcessorShard] = {}
+
+        shard_count = int(os.environ.get(OBJECT_PROCESSOR_SHARDS_VAR, "1"))
+
+        if shard_count > 1:
+            for i in range(shard_count):
+                shard = ObjectProcessorShard(i, self.stop_event)
+                shard.on_exit = self.stop_thread_sockets
+                self.shards.append(shard)
+
         self.camera_activity: dict[str, dict[str, Any]] = {}
+        self.camera_activity_lock = threading.Lock()
         self.ongoing_manual_events: dict[str, str] = {}
 
         # {
@@ -113,6 +182,89 @@ class TrackedObjectProcessor(threading.Thread):
         for camera in self.config.cameras.keys():
             self.create_camera_state(camera)
 
+    @property
+    def requestor(self) -> InterProcessRequestor:
+        if not hasattr(self.thread_sockets, "requestor"):
+            self.thread_sockets.requestor = InterProcessRequestor()
+
+        return self.thread_sockets.requestor  # type: ignore[no-any-return]
+
+    @property
+    def detection_publisher(self) -> DetectionPublisher:
+        if not hasattr(self.thread_sockets, "detection_publisher"):
+            self.thread_sockets.detection_publisher = DetectionPublisher(
+                DetectionTypeEnum.all.value
+            )
+
+        return self.thread_sockets.detection_publisher  # type: ignore[no-any-return]
+
+    @property
+    def event_sender(self) -> EventUpdatePublisher:
+        if not hasattr(self.thread_sockets, "event_sender"):
+            self.thread_sockets.event_sender = EventUpdatePublisher()
+
+        return self.thread_sockets.event_sender  # type: ignore[no-any-return]
+
+    def stop_thread_sockets(self) -> None:
+        """Stops the sockets created by the calling thread."""
+        for name in ["requestor", "detection_publisher", "event_sender"]:
+            socket = getattr(self.thread_sockets, name, None)
+
+            if socket is not None:
+                socket.stop()
+                delattr(self.thread_sockets, name)
+
+    def run_for_camera(
+        self, camera: str | None, task: Callable[..., None], *args: Any
+    ) -> None:
+        """Runs the task on the shard that owns the camera.
+
+        Tasks for cameras without a shard (or when not sharded) run inline.
+        """
+        shard = self.camera_shards.get(camera) if camera else None
+
+        if shard is None or threading.current_thread() is shard:
+            task(*args)
+        else:
+            shard.submit(task, *args)
+
+    def call_for_camera(
+        self, camera: str, task: Callable[..., Any], *args: Any, default: Any = None
+    ) -> Any:
+        """Runs the task on the shard that owns the camera and returns its result.
+
+        The default is returned if the shard doesn't run the task in time.
+        """
+        shard = self.camera_shards.get(camera)
+
+        # nothing else mutates the camera's state once its shard has exited
+        if shard is None or not shard.is_alive() or threading.current_thread() is shard:
+            return task(*args)
+
+        future: Future = Future()
+
+        def run() -> None:
+            try:
+                future.set_result(task(*args))
+            except Exception as e:
+                future.set_exception(e)
+
+        shard.submit(run)
+
+        try:
+            return future.result(timeout=SHARD_CALL_TIMEOUT)
+        except TimeoutError:
+            logger.debug(f"Timed out waiting for {camera} on {shard.name}")
+            return default
+
+    def get_event_camera(self, event_id: str) -> str | None:
+        """Returns the camera currently tracking the event id."""
+        for camera, state in list(self.camera_states.items()):
+            if event_id in state.tracked_objects:
+                return camera
+
+        return None
+
     def create_camera_state(self, camera: str) -> None:
         """Creates a new camera state."""
 
@@ -221,14 +373,28 @@ class TrackedObjectProcessor(threading.Thread):
             return False
 
         def camera_activity(camera: str, activity: dict[str, Any]) -> None:
-            last_activity = self.camera_activity.get(camera)
+            with self.camera_activity_lock:
+                last_activity = self.camera_activity.get(camera)
+
+                if last_activity and activity == last_activity:
+                    return
 
-            if not last_activity or activity != last_activity:
                 self.camera_activity[camera] = activity
-                self.requestor.send_data(UPDATE_CAMERA_ACTIVITY, self.camera_activity)
+                all_activity = dict(self.camera_activity)
+
+            self.requestor.send_data(UPDATE_CAMERA_ACTIVITY, all_activity)
+
+        frame_manager = self.frame_manager
+
+        if self.shards:
+            # assign new cameras to the least loaded shard
+            shard = min(self.shards, key=lambda s: len(s.cameras))
+            shard.cameras.add(camera)
+            self.camera_shards[camera] = shard
+            frame_manager = shard.frame_manager
 
         camera_state = CameraState(
-            camera, self.config, self.frame_manager, self.ptz_autotracker_thread
+            camera, self.config, frame_manager, self.ptz_autotracker_thread
         )
         camera_state.on("start", start)
         camera_state.on("autotrack", autotrack)
@@ -325,7 +491,12 @@ class TrackedObjectProcessor(threading.Thread):
                 self.last_motion_detected[camera] = 0
 
     def get_best(self, camera: str, label: str) -> dict[str, Any]:
-        # TODO: need a lock here
+        result: dict[str, Any] = self.call_for_camera(
+            camera, self._get_best, camera, label, default={}
+        )
+        return result
+
+    def _get_best(self, camera: str, label: str) -> dict[str, Any]:
         camera_state = self.camera_states[camera]
         if label in camera_state.best_objects:
             best_obj = camera_state.best_objects[label]
@@ -342,7 +513,10 @@ class TrackedObjectProcessor(threading.Thread):
             return {}
 
     def get_current_frame(
-        self, camera: str, draw_options: dict[str, Any] = {}
+        self,
+        camera: str,
+        draw_options: dict[str, Any] = {},
+        max_height: int | None = None,
     ) -> np.ndarray | None:
         if camera == "birdseye":
             return self.frame_manager.get(
@@ -350,10 +524,15 @@ class TrackedObjectProcessor(threading.Thread):
                 (self.config.birdseye.height * 3 // 2, self.config.birdseye.width),
             )
 
-        if camera not in self.camera_states:
+        camera_state = self.camera_states.get(camera)
+
+        if camera_state is None:
             return None
 
-        return self.camera_states[camera].get_current_frame(draw_options)
+        frame: np.ndarray | None = self.call_for_camera(
+            camera, camera_state.get_current_frame, draw_options, max_height
+        )
+        return frame
 
     def get_current_frame_time(self, camera: str) -> float:
         """Returns the latest frame time for a given camera."""
@@ -560,7 +739,6 @@ class TrackedObjectProcessor(threading.Thread):
         )
 
         if source_type == "api":
-            self.ongoing_manual_events[event_id] = camera_name
             self.detection_publisher.publish(
                 (
                     camera_name,
@@ -618,7 +796,6 @@ class TrackedObjectProcessor(threading.Thread):
             )
         )
 
-        self.ongoing_manual_events[event_id] = camera_name
         self.detection_publisher.publish(
             (
                 camera_name,
@@ -679,7 +856,48 @@ class TrackedObjectProcessor(threading.Thread):
                         {"enabled": False, "motion": 0, "objects": []},
                     )
 
+    def process_frame(
+        self,
+        camera: str,
+        frame_name: str,
+        frame_time: float,
+        current_tracked_objects: dict[str, dict[str, Any]],
+        motion_boxes: list[tuple[int, int, int, int]],
+        regions: list[tuple[int, int, int, int]],
+        stage_times: tuple[float, ...],
+    ) -> None:
+        camera_state = self.camera_states.get(camera)
+        if camera_state is None:
+            return
+
+        camera_state.update(
+            frame_name, frame_time, current_tracked_objects, motion_boxes, regions
+        )
+
+        self.update_mqtt_motion(camera, frame_time, motion_boxes)
+
+        tracked_objects = [o.to_dict() for o in camera_state.tracked_objects.values()]
+
+        # publish info on this frame
+        self.detection_publisher.publish(
+            (
+                camera,
+                frame_name,
+                frame_time,
+                tracked_objects,
+                motion_boxes,
+                regions,
+            ),
+            DetectionTypeEnum.video.value,
+        )
+        self.pipeline_metrics.frame_published(
+            camera, frame_time, stage_times, time.time()
+        )
+
     def run(self) -> None:
+        for shard in self.shards:
+            shard.start()
+
         while not self.stop_event.is_set():
             # check for config updates
             updated_topics = self.camera_config_subscriber.check_for_updates()
@@ -698,12 +916,22 @@ class TrackedObjectProcessor(threading.Thread):
                     if camera_state is None:
                         continue
 
-                    camera_state.shutdown()
+                    self.run_for_camera(camera, camera_state.shutdown)
                     self.camera_states.pop(camera)
-                    self.camera_activity.pop(camera, None)
                     self.last_motion_detected.pop(camera, None)
+                    self.pipeline_metrics.remove_camera(camera)
+
+                    camera_shard = self.camera_shards.pop(camera, None)
+                    if camera_shard is not None:
+                        camera_shard.cameras.discard(camera)
+
+                    with self.camera_activity_lock:
+                        self.camera_activity.pop(camera, None)
 
-                self.requestor.send_data(UPDATE_CAMERA_ACTIVITY, self.camera_activity)
+                with self.camera_activity_lock:
+                    all_activity = dict(self.camera_activity)
+
+                self.requestor.send_data(UPDATE_CAMERA_ACTIVITY, all_activity)
 
             # manage camera disabled state
             for camera, config in self.config.cameras.items():
@@ -719,7 +947,9 @@ class TrackedObjectProcessor(threading.Thread):
 
                 if camera_state.prev_enabled and not current_enabled:
                     logger.debug(f"Not processing objects for disabled camera {camera}")
-                    self.force_end_all_events(camera, camera_state)
+                    self.run_for_camera(
+                        camera, self.force_end_all_events, camera, camera_state
+                    )
 
                 camera_state.prev_enabled = current_enabled
 
@@ -742,18 +972,47 @@ class TrackedObjectProcessor(threading.Thread):
 
                 if topic.endswith(EventMetadataTypeEnum.sub_label.value):
                     (event_id, sub_label, score) = payload
-                    self.set_sub_label(event_id, sub_label, score)
+                    self.run_for_camera(
+                        self.get_event_camera(event_id),
+                        self.set_sub_label,
+                        event_id,
+                        sub_label,
+                        score,
+                    )
                 if topic.endswith(EventMetadataTypeEnum.attribute.value):
                     (event_id, field_name, field_value, score) = payload
-                    self.set_object_attribute(event_id, field_name, field_value, score)
+                    self.run_for_camera(
+                        self.get_event_camera(event_id),
+                        self.set_object_attribute,
+                        event_id,
+                        field_name,
+                        field_value,
+                        score,
+                    )
                 elif topic.endswith(EventMetadataTypeEnum.lpr_event_create.value):
-                    self.create_lpr_event(payload)
+                    camera_name, event_id = payload[1], payload[3]
+                    # tracked here so the end is routed to the same shard
+                    self.ongoing_manual_events[event_id] = camera_name
+                    self.run_for_camera(camera_name, self.create_lpr_event, payload)
                 elif topic.endswith(EventMetadataTypeEnum.save_lpr_snapshot.value):
-                    self.save_lpr_snapshot(payload)
+                    self.run_for_camera(payload[2], self.save_lpr_snapshot, payload)
                 elif topic.endswith(EventMetadataTypeEnum.manual_event_create.value):
-                    self.create_manual_event(payload)
+                    camera_name, event_id, source_type = (
+                        payload[1],
+                        payload[3],
+                        payload[8],
+                    )
+
+                    if source_type == "api":
+                        self.ongoing_manual_events[event_id] = camera_name
+
+                    self.run_for_camera(camera_name, self.create_manual_event, payload)
                 elif topic.endswith(EventMetadataTypeEnum.manual_event_end.value):
-                    self.end_manual_event(payload)
+                    self.run_for_camera(
+                        self.ongoing_manual_events.get(payload[0]),
+                        self.end_manual_event,
+                        payload,
+                    )
 
             try:
                 (
@@ -763,6 +1022,7 @@ class TrackedObjectProcessor(threading.Thread):
                     current_tracked_objects,
                     motion_boxes,
                     regions,
+                    stage_times,
                 ) = self.tracked_objects_queue.get(True, 1)
             except queue.Empty:
                 continue
@@ -775,31 +1035,16 @@ class TrackedObjectProcessor(threading.Thread):
                 logger.debug(f"Camera {camera} disabled, skipping update")
                 continue
 
-            camera_state = self.camera_states.get(camera)
-            if camera_state is None:
-                continue
-
-            camera_state.update(
-                frame_name, frame_time, current_tracked_objects, motion_boxes, regions
-            )
-
-            self.update_mqtt_motion(camera, frame_time, motion_boxes)
-
-            tracked_objects = [
-                o.to_dict() for o in camera_state.tracked_objects.values()
-            ]
-
-            # publish info on this frame
-            self.detection_publisher.publish(
-                (
-                    camera,
-                    frame_name,
-                    frame_time,
-                    tracked_objects,
-                    motion_boxes,
-                    regions,
-                ),
-                DetectionTypeEnum.video.value,
+            self.run_for_camera(
+                camera,
+                self.process_frame,
+                camera,
+                frame_name,
+                frame_time,
+                current_tracked_objects,
+                motion_boxes,
+                regions,
+                stage_times,
             )
 
             # cleanup event finished queue
@@ -812,15 +1057,18 @@ class TrackedObjectProcessor(threading.Thread):
                     break
 
                 event_id, camera, _ = update
-                self.camera_states[camera].finished(event_id)
+                self.run_for_camera(
+                    camera, self.camera_states[camera].finished, event_id
+                )
+
+        for shard in self.shards:
+            shard.join()
 
         # shut down camera states
         for state in self.camera_states.values():
             state.shutdown()
 
-        self.requestor.stop()
-        self.detection_publisher.stop()
-        self.event_sender.stop()
+        self.stop_thread_sockets()
         self.event_end_subscriber.stop()
         self.sub_label_subscriber.stop()
         self.camera_config_subscriber.stop()
@@ -1,14 +1,19 @@
 from enum import Enum
 from typing import TypedDict
 
-from frigate.camera import CameraMetrics
+from frigate.camera import AudioMetrics, CameraMetrics
+from frigate.comms.inter_process import RequestMetrics
 from frigate.data_processing.types import DataProcessorMetrics
 from frigate.object_detection.base import ObjectDetectProcess
+from frigate.track.latency import PipelineMetrics
 
 
 class StatsTrackingTypes(TypedDict):
     camera_metrics: dict[str, CameraMetrics]
     embeddings_metrics: DataProcessorMetrics | None
+    audio_metrics: AudioMetrics | None
+    request_metrics: RequestMetrics | None
+    pipeline_metrics: PipelineMetrics | None
     detectors: dict[str, ObjectDetectProcess]
     started: int
     latest_frigate_version: str
@@ -16,6 +16,7 @@ from frigate.models import (
     Timeline,
     Trigger,
 )
+from frigate.util.region_history import clear_region_history
 
 logger = logging.getLogger(__name__)
 
@@ -77,6 +78,8 @@ def cleanup_camera_db(
     except Exception as e:
         logger.error("Failed to delete regions for camera %s: %s", camera_name, e)
 
+    clear_region_history(camera_name, remove=True)
+
     try:
         counts["triggers"] = (
             Trigger.delete().where(Trigger.camera == camera_name).execute()
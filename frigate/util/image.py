@@ -2,8 +2,10 @@
 
 import datetime
 import logging
+import re
 import subprocess as sp
 import threading
+import time
 from abc import ABC, abstractmethod
 from multiprocessing import resource_tracker as _mprt
 from multiprocessing import shared_memory as _mpshm
@@ -1013,6 +1015,22 @@ class FrameManager(ABC):
     def cleanup(self):
         pass
 
+    @abstractmethod
+    def create_frame_ring(self, camera: str, slot_count: int, frame_size: int):
+        pass
+
+    @abstractmethod
+    def write_frame(self, camera: str, slot: int) -> memoryview | None:
+        pass
+
+    @abstractmethod
+    def commit_frame(self, camera: str, slot: int) -> str:
+        pass
+
+    @abstractmethod
+    def delete_frame_ring(self, camera: str):
+        pass
+
 
 class UntrackedSharedMemory(_mpshm.SharedMemory):
     # https://github.com/python/cpython/issues/82300#issuecomment-2169035092
@@ -1058,9 +1076,243 @@ class UntrackedSharedMemory(_mpshm.SharedMemory):
                 _mprt.unregister(self._name, "shared_memory")
 
 
+FRAME_NAME_PATTERN = re.compile(
+    r"^(?P<camera>.+)_frame(?P<slot>\d+)@(?P<sequence>\d+)$"
+)
+
+
+def get_frame_ring_name(camera: str) -> str:
+    """Name of the SHM segment that holds a camera's frame ring."""
+    return f"{camera}_frames"
+
+
+def get_frame_name(camera: str, slot: int, sequence: int) -> str:
+    """Build the name passed between processes for a frame in a camera's ring."""
+    return f"{camera}_frame{slot}@{sequence}"
+
+
+def parse_frame_name(name: str) -> tuple[str, int, int] | None:
+    """Split a frame name into (camera, slot, sequence), None for other SHM names."""
+    match = FRAME_NAME_PATTERN.match(name)
+
+    if match is None:
+        return None
+
+    return match["camera"], int(match["slot"]), int(match["sequence"])
+
+
+class FrameRingBuffer:
+    """A camera's frame slots stored in a single SHM segment.
+
+    The segment starts with an int64 header of
+    [slot_count, frame_size, next_sequence, slot sequences...] followed by
+    the frame slots. The writer invalidates a slot before filling it and
+    stamps it with a new sequence once the frame is complete, so readers
+    can detect that a slot was reused after the frame name was sent.
+    Sequences are seeded from the wall clock when the ring is created so a
+    recreated ring never reuses names from the previous one.
+    """
+
+    HEADER_FIELDS = 3
+    HEADER_ALIGNMENT = 64
+
+    def __init__(self, shm: UntrackedSharedMemory) -> None:
+        self.shm = shm
+        header = np.ndarray((self.HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        self.slot_count = int(header[0])
+        self.frame_size = int(header[1])
+        self.data_offset = self.header_size(self.slot_count)
+        self._header = header
+        self._sequences = np.ndarray(
+            (self.slot_count,),
+            dtype=np.int64,
+            buffer=shm.buf,
+            offset=self.HEADER_FIELDS * 8,
+        )
+
+    @classmethod
+    def header_size(cls, slot_count: int) -> int:
+        size = (cls.HEADER_FIELDS + slot_count) * 8
+        return -(-size // cls.HEADER_ALIGNMENT) * cls.HEADER_ALIGNMENT
+
+    @classmethod
+    def create(cls, camera: str, slot_count: int, frame_size: int) -> "FrameRingBuffer":
+        name = get_frame_ring_name(camera)
+        size = cls.header_size(slot_count) + slot_count * frame_size
+
+        try:
+            shm = UntrackedSharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # left over from a previous run, replace it so the layout matches
+            stale = UntrackedSharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            shm = UntrackedSharedMemory(name=name, create=True, size=size)
+
+        header = np.ndarray(
+            (cls.HEADER_FIELDS + slot_count,), dtype=np.int64, buffer=shm.buf
+        )
+        header[:] = 0
+        header[0] = slot_count
+        header[1] = frame_size
+        header[2] = time.time_ns()
+        del header
+        return cls(shm)
+
+    @classmethod
+    def open(cls, camera: str) -> "FrameRingBuffer | None":
+        try:
+            shm = UntrackedSharedMemory(name=get_frame_ring_name(camera))
+        except FileNotFoundError:
+            return None
+
+        if shm.size < cls.header_size(0):
+            # segment is still being created
+            shm.close()
+            return None
+
+        return cls(shm)
+
+    @property
+    def next_sequence(self) -> int:
+        return int(self._header[2])
+
+    def sequence(self, slot: int) -> int:
+        return int(self._sequences[slot])
+
+    def slot(self, slot: int) -> memoryview:
+        start = self.data_offset + slot * self.frame_size
+        return self.shm.buf[start : start + self.frame_size]
+
+    def begin_write(self, slot: int) -> memoryview:
+        """Invalidate a slot and return its buffer for the next frame."""
+        self._sequences[slot] = 0
+        return self.slot(slot)
+
+    def commit(self, slot: int) -> int:
+        """Publish the frame written to a slot and return its sequence."""
+        sequence = int(self._header[2])
+        self._header[2] = sequence + 1
+        self._sequences[slot] = sequence
+        return sequence
+
+    def get(self, slot: int, sequence: int, shape) -> np.ndarray | None:
+        if slot >= self.slot_count or self._sequences[slot] != sequence:
+            return None
+
+        return np.ndarray(
+            shape,
+            dtype=np.uint8,
+            buffer=self.shm.buf,
+            offset=self.data_offset + slot * self.frame_size,
+        )
+
+    def close(self) -> None:
+        del self._header
+        del self._sequences
+
+        try:
+            self.shm.close()
+        except BufferError:
+            # frames handed out from this mapping are still referenced,
+            # the mapping is released once they are garbage collected
+            pass
+
+    def unlink(self) -> None:
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
 class SharedMemoryFrameManager(FrameManager):
     def __init__(self):
         self.shm_store: dict[str, UntrackedSharedMemory] = {}
+        self.frame_rings: dict[str, FrameRingBuffer] = {}
+
+    def create_frame_ring(
+        self, camera: str, slot_count: int, frame_size: int
+    ) -> FrameRingBuffer:
+        self.delete_frame_ring(camera)
+        ring = FrameRingBuffer.create(camera, slot_count, frame_size)
+        self.frame_rings[camera] = ring
+        return ring
+
+    def _get_frame_ring(self, camera: str, frame_size: int) -> FrameRingBuffer | None:
+        ring = self.frame_rings.get(camera)
+
+        if ring is not None and ring.frame_size != frame_size:
+            # the ring was recreated for a new resolution, drop our mapping
+            self._drop_frame_ring(camera)
+            ring = None
+
+        if ring is None:
+            ring = FrameRingBuffer.open(camera)
+
+            if ring is None:
+                return None
+
+            if ring.frame_size != frame_size:
+                # mid-recreate: ring doesn't match the expected frame size yet
+                ring.close()
+                return None
+
+            self.frame_rings[camera] = ring
+
+        return ring
+
+    def _drop_frame_ring(self, camera: str) -> None:
+        ring = self.frame_rings.pop(camera, None)
+
+        if ring is not None:
+            ring.close()
+
+    def write_frame(self, camera: str, slot: int) -> memoryview | None:
+        ring = self.frame_rings.get(camera)
+
+        if ring is None:
+            ring = FrameRingBuffer.open(camera)
+
+            if ring is None:
+                logger.info(f"the frame ring for {camera} not found")
+                return None
+
+            self.frame_rings[camera] = ring
+
+        return ring.begin_write(slot)
+
+    def commit_frame(self, camera: str, slot: int) -> str:
+        sequence = self.frame_rings[camera].commit(slot)
+        return get_frame_name(camera, slot, sequence)
+
+    def delete_frame_ring(self, camera: str) -> None:
+        ring = self.frame_rings.pop(camera, None)
+
+        if ring is None:
+            ring = FrameRingBuffer.open(camera)
+
+            if ring is None:
+                return
+
+        ring.close()
+        ring.unlink()
+
+    def _get_ring_frame(self, name: str, shape) -> np.ndarray | None:
+        camera, slot, sequence = parse_frame_name(name)
+        ring = self._get_frame_ring(camera, int(np.prod(shape)))
+
+        if ring is None:
+            return None
+
+        if sequence >= ring.next_sequence:
+            # the frame was written after our mapping's ring was replaced
+            self._drop_frame_ring(camera)
+            ring = self._get_frame_ring(camera, int(np.prod(shape)))
+
+            if ring is None:
+                return None
+
+        return ring.get(slot, sequence, shape)
 
     def create(self, name: str, size) -> AnyStr:
         try:
@@ -1088,6 +1340,9 @@ class SharedMemoryFrameManager(FrameManager):
             return None
 
     def get(self, name: str, shape) -> np.ndarray | None:
+        if parse_frame_name(name) is not None:
+            return self._get_ring_frame(name, shape)
+
         try:
             required = int(np.prod(shape))
             shm = self.shm_store.get(name)
@@ -1114,11 +1369,16 @@ class SharedMemoryFrameManager(FrameManager):
             return None
 
     def close(self, name: str):
+        # ring frames stay mapped for the life of the process
         if name in self.shm_store:
             self.shm_store[name].close()
             del self.shm_store[name]
 
     def delete(self, name: str):
+        if parse_frame_name(name) is not None:
+            # ring slots are reused, the ring itself is removed with delete_frame_ring
+            return
+
         if name in self.shm_store:
             self.shm_store[name].close()
 
@@ -1145,6 +1405,12 @@ class SharedMemoryFrameManager(FrameManager):
             except FileNotFoundError:
                 pass
 
+        for ring in self.frame_rings.values():
+            ring.close()
+            ring.unlink()
+
+        self.frame_rings.clear()
+
 
 def create_mask(frame_shape, mask):
     mask_img = np.zeros(frame_shape, np.uint8)
@@ -1181,15 +1447,14 @@ def add_mask(mask: str, mask_img: np.ndarray):
     cv2.fillPoly(mask_img, pts=[contour], color=(0))
 
 
-def run_ffmpeg_snapshot(
+def get_ffmpeg_snapshot_cmd(
     ffmpeg,
     input_path: str,
     codec: str,
     seek_time: float | None = None,
     height: int | None = None,
-    timeout: int | None = None,
-) -> tuple[bytes | None, str]:
-    """Run ffmpeg to extract a snapshot/image from a video source."""
+) -> list[str]:
+    """Build the ffmpeg command that extracts a snapshot/image from a video source."""
     ffmpeg_cmd = [
         ffmpeg.ffmpeg_path,
         "-hide_banner",
@@ -1218,6 +1483,20 @@ def run_ffmpeg_snapshot(
         ffmpeg_cmd.insert(-3, "-vf")
         ffmpeg_cmd.insert(-3, f"scale=-1:{height}")
 
+    return ffmpeg_cmd
+
+
+def run_ffmpeg_snapshot(
+    ffmpeg,
+    input_path: str,
+    codec: str,
+    seek_time: float | None = None,
+    height: int | None = None,
+    timeout: int | None = None,
+) -> tuple[bytes | None, str]:
+    """Run ffmpeg to extract a snapshot/image from a video source."""
+    ffmpeg_cmd = get_ffmpeg_snapshot_cmd(ffmpeg, input_path, codec, seek_time, height)
+
     try:
         process = sp.run(
             ffmpeg_cmd,
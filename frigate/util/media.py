@@ -5,6 +5,7 @@ import errno
 import logging
 import os
 import subprocess as sp
+from bisect import bisect_right
 from collections.abc import Iterable
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -26,6 +27,8 @@ from frigate.models import (
     RecordingsToDelete,
     ReviewSegment,
 )
+from frigate.util.services import parse_keyframe_packets
+from frigate.util.subprocess_pool import media_subprocesses
 
 logger = logging.getLogger(__name__)
 
@@ -879,16 +882,33 @@ def sync_all_media(
     return results
 
 
-def get_keyframe_before(path: str, offset_ms: int) -> int | None:
+async def get_keyframe_before(path: str, offset_ms: int) -> int | None:
     """Get the timestamp (ms) of the last keyframe at or before offset_ms.
 
     Uses ffprobe packet index to read keyframe positions from the mp4 file.
     Returns None if ffprobe fails or no keyframe is found before the offset.
     """
+    keyframes = await get_keyframe_offsets(path)
+
+    if keyframes is None:
+        return None
+
+    return find_keyframe_before(keyframes, offset_ms)
+
+
+async def get_keyframe_offsets(
+    path: str, ffprobe_path: str = FFPROBE_PATH
+) -> list[int] | None:
+    """Get the timestamps (ms) of every keyframe in a recording segment.
+
+    Used to build the keyframe index stored with each recording so VOD
+    playlists don't need to probe the file on every request.
+    Returns None if ffprobe fails.
+    """
     try:
-        result = sp.run(
+        result = await media_subprocesses.run(
             [
-                FFPROBE_PATH,
+                ffprobe_path,
                 "-select_streams",
                 "v:0",
                 "-show_entries",
@@ -899,31 +919,23 @@ def get_keyframe_before(path: str, offset_ms: int) -> int | None:
                 "error",
                 path,
             ],
-            capture_output=True,
             timeout=5,
         )
-    except (sp.TimeoutExpired, FileNotFoundError):
+    except (sp.TimeoutExpired, OSError):
         return None
 
     if result.returncode != 0:
         return None
 
-    offset_s = offset_ms / 1000.0
-    best_ms = None
-    for line in result.stdout.decode().strip().splitlines():
-        parts = line.strip().split(",")
-        if len(parts) != 2:
-            continue
-        ts_str, flags = parts
-        if "K" not in flags:
-            continue
-        try:
-            ts = float(ts_str)
-        except ValueError:
-            continue
-        if ts <= offset_s:
-            best_ms = int(ts * 1000)
-        else:
-            break
+    keyframe_pts, _ = parse_keyframe_packets(result.stdout.decode("utf-8", "replace"))
+    return sorted(int(pts * 1000) for pts in keyframe_pts)
+
+
+def find_keyframe_before(keyframes: list[int], offset_ms: int) -> int | None:
+    """Get the last keyframe (ms) at or before offset_ms from a sorted index."""
+    idx = bisect_right(keyframes, offset_ms)
+
+    if idx == 0:
+        return None
 
-    return best_ms
+    return keyframes[idx - 1]
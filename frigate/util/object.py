@@ -29,107 +29,140 @@ from frigate.util.image import (
     yuv_region_2_rgb,
     yuv_region_2_yuv,
 )
+from frigate.util.region_history import (
+    RegionHistoryWriter,
+    clear_region_history,
+    has_region_history,
+    read_region_history,
+    region_history_last_update,
+)
 
 logger = logging.getLogger(__name__)
 
 GRID_SIZE = 8
 
+# below these sizes plain python is faster than building numpy arrays
+VECTORIZED_CLUSTER_MIN_BOXES = 64
+VECTORIZED_CONSOLIDATION_MIN_DETECTIONS = 16
 
-def get_camera_regions_grid(
-    name: str,
+
+def build_regions_grid(
+    boxes: np.ndarray,
     detect: DetectConfig,
     min_region_size: int,
 ) -> list[list[dict[str, Any]]]:
-    """Build a grid of expected region sizes for a camera."""
-    # get grid from db if available
-    try:
-        regions: Regions = Regions.select().where(Regions.camera == name).get()
-        grid = regions.grid
-        last_update = regions.last_update
-    except DoesNotExist:
-        grid = []
-        for x in range(GRID_SIZE):
-            row = []
-            for y in range(GRID_SIZE):
-                row.append({"sizes": []})
-            grid.append(row)
-        last_update = 0
-
-    # get events for timeline entries
+    """Build a grid of expected region sizes from relative boxes.
+
+    Each box is assigned to the cell containing its centroid, the region
+    size for the box is calculated the same way as calculate_region and
+    the sizes are summed per cell to get the mean and standard deviation.
+    """
+    width = detect.width
+    height = detect.height
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+
+    # calculate centroid position
+    x_pos = np.clip(
+        ((boxes[:, 0] + boxes[:, 2] / 2) * GRID_SIZE).astype(np.int64),
+        0,
+        GRID_SIZE - 1,
+    )
+    y_pos = np.clip(
+        ((boxes[:, 1] + boxes[:, 3] / 2) * GRID_SIZE).astype(np.int64),
+        0,
+        GRID_SIZE - 1,
+    )
+
+    # region is the longest edge divisible by 4, no smaller than the model
+    box_width = (boxes[:, 0] + boxes[:, 2]) * width - boxes[:, 0] * width
+    box_height = (boxes[:, 1] + boxes[:, 3]) * height - boxes[:, 1] * height
+    sizes = np.floor_divide(np.maximum(box_width, box_height) * 1.35, 4) * 4
+    # save width of region to grid as relative
+    sizes = np.maximum(sizes, min_region_size) / width
+
+    cells = x_pos * GRID_SIZE + y_pos
+    counts = np.bincount(cells, minlength=GRID_SIZE * GRID_SIZE)
+    totals = np.bincount(cells, weights=sizes, minlength=GRID_SIZE * GRID_SIZE)
+    squares = np.bincount(cells, weights=sizes * sizes, minlength=GRID_SIZE * GRID_SIZE)
+
+    grid = []
+    for x in range(GRID_SIZE):
+        row = []
+        for y in range(GRID_SIZE):
+            cell = x * GRID_SIZE + y
+            count = int(counts[cell])
+
+            if count == 0:
+                row.append({"count": 0})
+                continue
+
+            mean = totals[cell] / count
+            std_dev = math.sqrt(max(0.0, squares[cell] / count - mean * mean))
+            row.append(
+                {
+                    "x": x,
+                    "y": y,
+                    "count": count,
+                    "std_dev": std_dev,
+                    "mean": mean,
+                }
+            )
+        grid.append(row)
+
+    return grid
+
+
+def _seed_region_history(name: str) -> None:
+    """Fill the region history of a camera from the existing timeline."""
     events = (
         Event.select(Event.id)
         .where(Event.camera == name)
         .where((Event.false_positive == None) | (Event.false_positive == False))
-        .where(Event.start_time > last_update)
     )
-
-    event_count = events.count()
-    logger.debug(f"Found {event_count} new events for {name}")
-
-    # no new events, return as is
-    if event_count == 0:
-        return grid
-
-    new_update = datetime.datetime.now().timestamp()
     timeline = (
-        Timeline.select(
-            *[
-                Timeline.camera,
-                Timeline.source,
-                Timeline.data,
-            ]
-        )
+        Timeline.select(Timeline.timestamp, Timeline.data)
+        .where(Timeline.source == "tracked_object")
         .where(Timeline.source_id << events)
-        .limit(10000)
-        .dicts()
+        .tuples()
+        .iterator()
     )
 
-    logger.debug(f"Found {len(timeline)} new entries for {name}")
-
-    width = detect.width
-    height = detect.height
+    writer = RegionHistoryWriter()
 
-    for t in timeline:
-        if t.get("source") != "tracked_object":
-            continue
+    for timestamp, data in timeline:
+        writer.add(name, timestamp, data["box"])
 
-        box = t["data"]["box"]
+    logger.debug(f"Seeding region history for {name} with {writer.buffered} boxes")
+    writer.flush(force=True)
 
-        # calculate centroid position
-        x = box[0] + (box[2] / 2)
-        y = box[1] + (box[3] / 2)
+    if not has_region_history(name):
+        clear_region_history(name)
 
-        x_pos = int(x * GRID_SIZE)
-        y_pos = int(y * GRID_SIZE)
 
-        calculated_region = calculate_region(
-            (height, width),
-            box[0] * width,
-            box[1] * height,
-            (box[0] + box[2]) * width,
-            (box[1] + box[3]) * height,
-            min_region_size,
-            1.35,
-        )
-        # save width of region to grid as relative
-        grid[x_pos][y_pos]["sizes"].append(
-            (calculated_region[2] - calculated_region[0]) / width
-        )
+def get_camera_regions_grid(
+    name: str,
+    detect: DetectConfig,
+    min_region_size: int,
+) -> list[list[dict[str, Any]]]:
+    """Build a grid of expected region sizes for a camera."""
+    if not has_region_history(name):
+        _seed_region_history(name)
 
-    for x in range(GRID_SIZE):
-        for y in range(GRID_SIZE):
-            cell = grid[x][y]
+    # use grid from db if the history hasn't changed
+    try:
+        regions: Regions = Regions.select().where(Regions.camera == name).get()
 
-            if len(cell["sizes"]) == 0:
-                continue
+        if regions.last_update >= region_history_last_update(name) and all(
+            "count" in cell for row in regions.grid for cell in row
+        ):
+            return regions.grid
+    except DoesNotExist:
+        pass
 
-            std_dev = np.std(cell["sizes"])
-            mean = np.mean(cell["sizes"])
-            logger.debug(f"std dev: {std_dev} mean: {mean}")
-            cell["x"] = x
-            cell["y"] = y
-            cell["std_dev"] = std_dev
-            cell["mean"] = mean
+    new_update = datetime.datetime.now().timestamp()
+    boxes = read_region_history(name)
+    logger.debug(f"Building region grid for {name} from {len(boxes)} boxes")
+    grid = build_regions_grid(boxes, detect, min_region_size)
 
     # update db with new grid
     region = {
@@ -184,7 +217,7 @@ def get_region_from_grid(
     cell = region_grid[grid_x][grid_y]
 
     # if there is no known data, use original region calculation
-    if not cell or not cell["sizes"]:
+    if not cell or not cell.get("count"):
         return box
 
     # convert the calculated region size to relative
@@ -389,49 +422,103 @@ def get_cluster_boundary(box, min_region):
     ]
 
 
+def get_cluster_boundary_matrix(min_region, boxes) -> np.ndarray:
+    """Returns a matrix where [i, j] is True when box j is inside the cluster boundary of box i."""
+    # same math as get_cluster_boundary for all boxes at once
+    box_array = np.asarray(boxes)[:, :4]
+    box_width = box_array[:, 2] - box_array[:, 0]
+    box_height = box_array[:, 3] - box_array[:, 1]
+    max_region_size = np.maximum(
+        min_region, np.trunc(np.sqrt(np.abs(box_width * box_height) / 0.1))
+    )
+    centroid_x = box_width / 2 + box_array[:, 0]
+    centroid_y = box_height / 2 + box_array[:, 1]
+    max_x_dist = np.trunc(max_region_size - box_width / 2 * 1.1)
+    max_y_dist = np.trunc(max_region_size - box_height / 2 * 1.1)
+
+    return (
+        (box_array[:, 0] >= np.trunc(centroid_x - max_x_dist)[:, np.newaxis])
+        & (box_array[:, 1] >= np.trunc(centroid_y - max_y_dist)[:, np.newaxis])
+        & (box_array[:, 2] <= np.trunc(centroid_x + max_x_dist)[:, np.newaxis])
+        & (box_array[:, 3] <= np.trunc(centroid_y + max_y_dist)[:, np.newaxis])
+    )
+
+
 def get_cluster_candidates(frame_shape, min_region, boxes):
     # and create a cluster of other boxes using it's max region size
     # only include boxes where the region is an appropriate(except the region could possibly be smaller?)
     # size in the cluster. in order to be in the cluster, the furthest corner needs to be within x,y offset
     # determined by the max_region size minus half the box + 20%
-    # TODO: see if we can do this with numpy
+    inside = (
+        get_cluster_boundary_matrix(min_region, boxes)
+        if len(boxes) >= VECTORIZED_CLUSTER_MIN_BOXES
+        else None
+    )
+    areas = [area(b) for b in boxes]
+
     cluster_candidates = []
-    used_boxes = set()
+    used = [False] * len(boxes)
     # loop over each box
     for current_index, b in enumerate(boxes):
-        if current_index in used_boxes:
+        if used[current_index]:
             continue
         cluster = [current_index]
-        used_boxes.add(current_index)
-        cluster_boundary = get_cluster_boundary(b, min_region)
+        used[current_index] = True
+        # track the bounds and smallest box of the cluster as it grows
+        # so the region of each potential cluster is computed in O(1)
+        min_x = min(b[0], frame_shape[1])
+        min_y = min(b[1], frame_shape[0])
+        max_x = max(b[2], 0)
+        max_y = max(b[3], 0)
+        min_area = areas[current_index]
+
+        # all earlier boxes are already in a cluster
+        if inside is None:
+            cluster_boundary = get_cluster_boundary(b, min_region)
+            compare_indices = range(current_index + 1, len(boxes))
+        else:
+            compare_indices = (
+                np.flatnonzero(inside[current_index, current_index + 1 :])
+                + current_index
+                + 1
+            ).tolist()
+
         # find all other boxes that fit inside the boundary
-        for compare_index, compare_box in enumerate(boxes):
-            if compare_index in used_boxes:
+        for compare_index in compare_indices:
+            if used[compare_index]:
                 continue
 
+            compare_box = boxes[compare_index]
+
             # if the box is not inside the potential cluster area, cluster them
-            if not box_inside(cluster_boundary, compare_box):
+            if inside is None and not box_inside(cluster_boundary, compare_box):
                 continue
 
             # get the region if you were to add this box to the cluster
-            potential_cluster = cluster + [compare_index]
-            cluster_region = get_cluster_region(
-                frame_shape, min_region, potential_cluster, boxes
+            cluster_region = calculate_region(
+                frame_shape,
+                min(compare_box[0], min_x),
+                min(compare_box[1], min_y),
+                max(compare_box[2], max_x),
+                max(compare_box[3], max_y),
+                min_region,
+                multiplier=1.35,
             )
             # if region could be smaller and either box would be too small
             # for the resulting region, dont cluster
-            should_cluster = True
-            if (cluster_region[2] - cluster_region[0]) > min_region:
-                for b in potential_cluster:
-                    box = boxes[b]
-                    # boxes should be more than 5% of the area of the region
-                    if area(box) / area(cluster_region) < 0.05:
-                        should_cluster = False
-                        break
-
-            if should_cluster:
-                cluster.append(compare_index)
-                used_boxes.add(compare_index)
+            # boxes should be more than 5% of the area of the region
+            if (cluster_region[2] - cluster_region[0]) > min_region and min(
+                min_area, areas[compare_index]
+            ) / area(cluster_region) < 0.05:
+                continue
+
+            cluster.append(compare_index)
+            used[compare_index] = True
+            min_x = min(compare_box[0], min_x)
+            min_y = min(compare_box[1], min_y)
+            max_x = max(compare_box[2], max_x)
+            max_y = max(compare_box[3], max_y)
+            min_area = min(min_area, areas[compare_index])
         cluster_candidates.append(cluster)
 
     # return the unique clusters only
@@ -462,12 +549,14 @@ def get_startup_regions(
     """Get a list of regions to run on startup."""
     # return 8 most popular regions for the camera
     all_cells = np.concatenate(region_grid).flat
-    startup_cells = sorted(all_cells, key=lambda c: len(c["sizes"]), reverse=True)[0:8]
+    startup_cells = sorted(all_cells, key=lambda c: c.get("count", 0), reverse=True)[
+        0:8
+    ]
     regions = []
 
     for cell in startup_cells:
         # rest of the cells are empty
-        if not cell["sizes"]:
+        if not cell.get("count"):
             break
 
         x = frame_shape[1] / GRID_SIZE * (0.5 + cell["x"])
@@ -488,6 +577,100 @@ def get_startup_regions(
     return regions
 
 
+def get_overlapping_detections(
+    sorted_by_area: list[tuple[Any]], label: str
+) -> list[bool]:
+    """Whether each detection, sorted smallest to largest, overlaps a larger one too much."""
+    threshold = LABEL_CONSOLIDATION_MAP.get(label, LABEL_CONSOLIDATION_DEFAULT)
+
+    if len(sorted_by_area) < VECTORIZED_CONSOLIDATION_MIN_DETECTIONS:
+        overlapping = []
+
+        for current_detection_idx, current_detection in enumerate(sorted_by_area):
+            current_box = current_detection[2]
+            current_area = area(current_box)
+            overlap = False
+            for to_check_detection in sorted_by_area[current_detection_idx + 1 :]:
+                to_check = to_check_detection[2]
+
+                # if area of current detection / area of check < 5% they should not be compared
+                # this covers cases where a large car parked in a driveway doesn't block detections
+                # of cars in the street behind it
+                if current_area / area(to_check) < 0.05:
+                    continue
+
+                intersect_box = intersection(current_box, to_check)
+                # if % of smaller detection is inside of another detection, consolidate
+                if (
+                    intersect_box is not None
+                    and area(intersect_box) / current_area > threshold
+                ):
+                    overlap = True
+                    break
+            overlapping.append(overlap)
+
+        return overlapping
+
+    # the same checks for all pairs at once, current detections are rows
+    # and the detections they are checked against are columns
+    boxes = np.array([d[2] for d in sorted_by_area], dtype=float)
+    areas = (boxes[:, 2] - boxes[:, 0] + 1) * (boxes[:, 3] - boxes[:, 1] + 1)
+    current = boxes[:, np.newaxis, :]
+    to_check = boxes[np.newaxis, :, :]
+    intersects = ~(
+        (current[..., 2] < to_check[..., 0])
+        | (current[..., 0] > to_check[..., 2])
+        | (current[..., 1] > to_check[..., 3])
+        | (current[..., 3] < to_check[..., 1])
+    )
+    intersect_areas = (
+        np.minimum(current[..., 2], to_check[..., 2])
+        - np.maximum(current[..., 0], to_check[..., 0])
+        + 1
+    ) * (
+        np.minimum(current[..., 3], to_check[..., 3])
+        - np.maximum(current[..., 1], to_check[..., 1])
+        + 1
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        overlaps = (
+            # only check against larger detections
+            np.triu(np.ones((len(boxes), len(boxes)), dtype=bool), k=1)
+            & ~(areas[:, np.newaxis] / areas[np.newaxis, :] < 0.05)
+            & intersects
+            & (intersect_areas / areas[:, np.newaxis] > threshold)
+        )
+
+    return overlaps.any(axis=1).tolist()
+
+
+def consolidate_detections(detections: list[tuple[Any]]) -> list[tuple[Any]]:
+    """Drop detections that overlap too much."""
+    detected_object_groups = defaultdict(lambda: [])
+    for detection in detections:
+        detected_object_groups[detection[0]].append(detection)
+
+    consolidated_detections = []
+    for label, group in detected_object_groups.items():
+        # if the group only has 1 item, skip
+        if len(group) == 1:
+            consolidated_detections.append(group[0])
+            continue
+
+        # sort smallest to largest by area
+        sorted_by_area = sorted(group, key=lambda g: g[3])
+        consolidated_detections.extend(
+            detection
+            for detection, overlap in zip(
+                sorted_by_area, get_overlapping_detections(sorted_by_area, label)
+            )
+            if not overlap
+        )
+
+    return consolidated_detections
+
+
 def reduce_detections(
     frame_shape: tuple[int, int],
     all_detections: list[tuple[Any]],
@@ -533,56 +716,4 @@ def reduce_detections(
         # set the detections list to only include top objects
         return selected_objects
 
-    def get_consolidated_object_detections(detections: list[tuple[Any]]):
-        """Drop detections that overlap too much."""
-        detected_object_groups = defaultdict(lambda: [])
-        for detection in detections:
-            detected_object_groups[detection[0]].append(detection)
-
-        consolidated_detections = []
-        for group in detected_object_groups.values():
-            # if the group only has 1 item, skip
-            if len(group) == 1:
-                consolidated_detections.append(group[0])
-                continue
-
-            # sort smallest to largest by area
-            sorted_by_area = sorted(group, key=lambda g: g[3])
-
-            for current_detection_idx in range(0, len(sorted_by_area)):
-                current_detection = sorted_by_area[current_detection_idx]
-                current_label = current_detection[0]
-                current_box = current_detection[2]
-                current_area = area(current_box)
-                overlap = 0
-                for to_check_idx in range(
-                    min(current_detection_idx + 1, len(sorted_by_area)),
-                    len(sorted_by_area),
-                ):
-                    to_check = sorted_by_area[to_check_idx][2]
-
-                    # if area of current detection / area of check < 5% they should not be compared
-                    # this covers cases where a large car parked in a driveway doesn't block detections
-                    # of cars in the street behind it
-                    if current_area / area(to_check) < 0.05:
-                        continue
-
-                    intersect_box = intersection(current_box, to_check)
-                    # if % of smaller detection is inside of another detection, consolidate
-                    if intersect_box is not None and area(
-                        intersect_box
-                    ) / current_area > LABEL_CONSOLIDATION_MAP.get(
-                        current_label, LABEL_CONSOLIDATION_DEFAULT
-                    ):
-                        overlap = 1
-                        break
-                if overlap == 0:
-                    consolidated_detections.append(
-                        sorted_by_area[current_detection_idx]
-                    )
-
-        return consolidated_detections
-
-    return get_consolidated_object_detections(
-        reduce_overlapping_detections(all_detections)
-    )
+    return consolidate_detections(reduce_overlapping_detections(all_detections))
@@ -0,0 +1,152 @@
+"""Compact history of tracked object boxes used to build region grids.
+
+Boxes are stored per camera and per day as packed float32 rows of the
+relative x, y, width and height of the box, so the region grid can be
+rebuilt from the full history without reading the timeline.
+"""
+
+import datetime
+import logging
+import os
+import shutil
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from frigate.const import REGION_HISTORY_DIR
+
+logger = logging.getLogger(__name__)
+
+BOX_FIELDS = 4
+REGION_HISTORY_DAYS = 30
+REGION_HISTORY_FLUSH_INTERVAL = 60
+REGION_HISTORY_FLUSH_SIZE = 1024
+
+
+def _camera_dir(camera: str) -> str:
+    return os.path.join(REGION_HISTORY_DIR, camera)
+
+
+def _day(timestamp: float) -> str:
+    return datetime.datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d")
+
+
+def _day_files(camera: str) -> list[str]:
+    camera_dir = _camera_dir(camera)
+
+    if not os.path.isdir(camera_dir):
+        return []
+
+    return sorted(
+        os.path.join(camera_dir, f)
+        for f in os.listdir(camera_dir)
+        if f.endswith(".bin")
+    )
+
+
+def has_region_history(camera: str) -> bool:
+    """If history has ever been recorded for a camera."""
+    return os.path.isdir(_camera_dir(camera))
+
+
+def append_region_history(camera: str, day: str, boxes: np.ndarray) -> None:
+    """Append relative boxes to the history of a camera for a day."""
+    camera_dir = _camera_dir(camera)
+    os.makedirs(camera_dir, exist_ok=True)
+
+    with open(os.path.join(camera_dir, f"{day}.bin"), "ab") as f:
+        np.ascontiguousarray(boxes, dtype=np.float32).tofile(f)
+
+
+def read_region_history(camera: str) -> np.ndarray:
+    """Read all stored boxes for a camera as an (N, 4) array."""
+    days = [np.fromfile(path, dtype=np.float32) for path in _day_files(camera)]
+
+    if not days:
+        return np.empty((0, BOX_FIELDS), dtype=np.float32)
+
+    data = np.concatenate(days)
+    # drop a partially written row
+    data = data[: len(data) // BOX_FIELDS * BOX_FIELDS]
+    return data.reshape(-1, BOX_FIELDS)
+
+
+def region_history_last_update(camera: str) -> float:
+    """Time the history of a camera last changed."""
+    camera_dir = _camera_dir(camera)
+
+    if not os.path.isdir(camera_dir):
+        return 0
+
+    return max(
+        [os.path.getmtime(camera_dir)]
+        + [os.path.getmtime(path) for path in _day_files(camera)]
+    )
+
+
+def clear_region_history(camera: str, remove: bool = False) -> None:
+    """Remove the stored boxes for a camera.
+
+    The camera directory is kept unless remove is set so the history isn't
+    seeded from the timeline again.
+    """
+    camera_dir = _camera_dir(camera)
+    shutil.rmtree(camera_dir, ignore_errors=True)
+
+    if not remove:
+        os.makedirs(camera_dir, exist_ok=True)
+
+
+def expire_region_history(camera: str, keep_days: int = REGION_HISTORY_DAYS) -> None:
+    """Remove days of history older than keep_days."""
+    oldest = _day(time.time() - keep_days * 86400)
+
+    for path in _day_files(camera):
+        if os.path.basename(path)[:-4] < oldest:
+            os.remove(path)
+
+
+class RegionHistoryWriter:
+    """Buffer tracked object boxes and append them to the region history."""
+
+    def __init__(self) -> None:
+        self.buffer: dict[tuple[str, str], list[list[float]]] = defaultdict(list)
+        self.buffered = 0
+        self.last_flush = time.monotonic()
+        self.last_expire = ""
+
+    def add(self, camera: str, timestamp: float, box: list[float]) -> None:
+        self.buffer[(camera, _day(timestamp))].append(box)
+        self.buffered += 1
+
+    def flush(self, force: bool = False) -> None:
+        """Write the buffered boxes once enough have built up."""
+        if not force and (
+            self.buffered < REGION_HISTORY_FLUSH_SIZE
+            and time.monotonic() - self.last_flush < REGION_HISTORY_FLUSH_INTERVAL
+        ):
+            return
+
+        buffer = self.buffer
+        self.buffer = defaultdict(list)
+        self.buffered = 0
+        self.last_flush = time.monotonic()
+
+        for (camera, day), boxes in buffer.items():
+            try:
+                append_region_history(camera, day, np.array(boxes))
+            except OSError as e:
+                logger.warning(f"Unable to save region history for {camera}: {e}")
+
+        today = _day(time.time())
+
+        if today != self.last_expire:
+            self.last_expire = today
+            cameras = {camera for camera, _ in buffer}
+
+            if os.path.isdir(REGION_HISTORY_DIR):
+                cameras.update(os.listdir(REGION_HISTORY_DIR))
+
+            for camera in cameras:
+                expire_region_history(camera)
@@ -0,0 +1,209 @@
+"""Bounded asyncio execution of ffmpeg / ffprobe for API requests."""
+
+import asyncio
+import logging
+import os
+import subprocess as sp
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+
+from starlette.requests import Request
+
+logger = logging.getLogger(__name__)
+
+DISCONNECT_POLL_INTERVAL = 0.5
+
+# clip downloads are copied rather than encoded and last as long as the
+# transfer, they get their own pool so they can't starve other media work
+MAX_CONCURRENT_DOWNLOADS = 8
+
+
+class AsyncSubprocessPool:
+    """Runs subprocesses without blocking the event loop.
+
+    At most max_concurrent processes run at once, further requests wait
+    for a slot. When the request that started a process disconnects, or
+    the process exceeds its timeout, it is killed so abandoned work
+    doesn't hold a slot.
+    """
+
+    def __init__(self, max_concurrent: int) -> None:
+        self.max_concurrent = max_concurrent
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.timed_out = 0
+        self.cancelled = 0
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "waiting": self.waiting,
+            "running": self.running,
+            "completed": self.completed,
+            "timed_out": self.timed_out,
+            "cancelled": self.cancelled,
+        }
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._loop = loop
+
+        return self._semaphore
+
+    @asynccontextmanager
+    async def _slot(
+        self, cmd: list[str], timeout: float | None = None
+    ) -> AsyncIterator[None]:
+        semaphore = self._get_semaphore()
+        self.waiting += 1
+
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout)
+        except TimeoutError:
+            self.timed_out += 1
+            raise sp.TimeoutExpired(cmd, timeout or 0) from None
+        finally:
+            self.waiting -= 1
+
+        self.running += 1
+
+        try:
+            yield
+        finally:
+            self.running -= 1
+            semaphore.release()
+
+    @staticmethod
+    async def _wait_for_disconnect(request: Request) -> None:
+        try:
+            while not await request.is_disconnected():
+                await asyncio.sleep(DISCONNECT_POLL_INTERVAL)
+        except OSError:
+            # the connection is gone
+            pass
+
+    @staticmethod
+    async def _kill(process: asyncio.subprocess.Process) -> None:
+        with suppress(ProcessLookupError):
+            process.kill()
+
+        await process.wait()
+
+    async def run(
+        self,
+        cmd: list[str],
+        input: bytes | None = None,
+        timeout: float | None = None,
+        request: Request | None = None,
+    ) -> sp.CompletedProcess:
+        """Run a command to completion, like subprocess.run with capture_output.
+
+        Raises subprocess.TimeoutExpired when the timeout, which includes
+        waiting for a slot, is reached. When the request disconnects the
+        process is killed and its result is returned with the kill signal as
+        the return code.
+        """
+        start = time.monotonic()
+
+        async with self._slot(cmd, timeout):
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.PIPE
+                if input is not None
+                else asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            communicate = asyncio.ensure_future(process.communicate(input))
+            disconnect = asyncio.ensure_future(
+                self._wait_for_disconnect(request)
+                if request is not None
+                else asyncio.Event().wait()
+            )
+
+            try:
+                done, _ = await asyncio.wait(
+                    {communicate, disconnect},
+                    timeout=None
+                    if timeout is None
+                    else max(0, timeout - (time.monotonic() - start)),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                raise
+            finally:
+                disconnect.cancel()
+
+                if not communicate.done():
+                    await self._kill(process)
+                    communicate.cancel()
+
+            if communicate in done:
+                stdout, stderr = communicate.result()
+                self.completed += 1
+                return sp.CompletedProcess(cmd, process.returncode, stdout, stderr)
+
+            if disconnect in done:
+                self.cancelled += 1
+                logger.debug(f"Client disconnected, stopped {cmd[0]}")
+                return sp.CompletedProcess(cmd, process.returncode, b"", b"")
+
+            self.timed_out += 1
+            raise sp.TimeoutExpired(cmd, timeout or 0)
+
+    async def stream(
+        self, cmd: list[str], chunk_size: int = 8192
+    ) -> AsyncIterator[bytes]:
+        """Yield the stdout of a command as it is produced.
+
+        Closing the generator, e.g. when a streaming response's client
+        disconnects, kills the process. Raises subprocess.CalledProcessError
+        after the output if the command failed.
+        """
+        async with self._slot(cmd):
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            # drain stderr so a chatty process can't block on a full pipe
+            stderr = asyncio.ensure_future(process.stderr.read())
+
+            try:
+                while data := await process.stdout.read(chunk_size):
+                    yield data
+
+                await process.wait()
+            finally:
+                if process.returncode is None:
+                    self.cancelled += 1
+
+                    with suppress(ProcessLookupError):
+                        process.kill()
+
+                    # the process isn't reaped until its pipes are closed,
+                    # discard what is left of the unread output
+                    await process.stdout.read()
+                    await process.wait()
+                    stderr.cancel()
+                else:
+                    self.completed += 1
+
+            if process.returncode != 0:
+                raise sp.CalledProcessError(
+                    process.returncode, cmd, stderr=await stderr
+                )
+
+
+# shared by all API handlers, leave half the cpus to the rest of frigate
+media_subprocesses = AsyncSubprocessPool(max(2, (os.cpu_count() or 4) // 2))
+media_downloads = AsyncSubprocessPool(MAX_CONCURRENT_DOWNLOADS)
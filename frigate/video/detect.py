@@ -130,7 +130,7 @@ class CameraTracker(FrigateProcess):
         # empty the frame queue
         logger.info(f"{self.config.name}: emptying frame queue")
         while not frame_queue.empty():
-            (frame_name, _) = frame_queue.get(False)
+            (frame_name, _, _) = frame_queue.get(False)
             frame_manager.delete(frame_name)
 
         logger.info(f"{self.config.name}: exiting subprocess")
@@ -138,38 +138,44 @@ class CameraTracker(FrigateProcess):
 
 def detect(
     detect_config: DetectConfig,
-    object_detector,
+    object_detector: RemoteObjectDetector,
     frame,
     model_config: ModelConfig,
-    region,
+    regions,
     objects_to_track,
     object_filters,
 ):
-    tensor_input = create_tensor_input(frame, model_config, region)
+    tensor_inputs = [
+        create_tensor_input(frame, model_config, region) for region in regions
+    ]
 
     detections = []
-    region_detections = object_detector.detect(tensor_input)
-    for d in region_detections:
-        box = d[2]
+    # all regions of the frame are sent to the detector as a single batch
+    batch_detections = object_detector.detect_batch(tensor_inputs)
+    for region, region_detections in zip(regions, batch_detections):
         size = region[2] - region[0]
-        x_min = int(max(0, (box[1] * size) + region[0]))
-        y_min = int(max(0, (box[0] * size) + region[1]))
-        x_max = int(min(detect_config.width - 1, (box[3] * size) + region[0]))
-        y_max = int(min(detect_config.height - 1, (box[2] * size) + region[1]))
-
-        # ignore objects that were detected outside the frame
-        if (x_min >= detect_config.width - 1) or (y_min >= detect_config.height - 1):
-            continue
-
-        width = x_max - x_min
-        height = y_max - y_min
-        area = width * height
-        ratio = width / max(1, height)
-        det = (d[0], d[1], (x_min, y_min, x_max, y_max), area, ratio, region)
-        # apply object filters
-        if is_object_filtered(det, objects_to_track, object_filters):
-            continue
-        detections.append(det)
+        for d in region_detections:
+            box = d[2]
+            x_min = int(max(0, (box[1] * size) + region[0]))
+            y_min = int(max(0, (box[0] * size) + region[1]))
+            x_max = int(min(detect_config.width - 1, (box[3] * size) + region[0]))
+            y_max = int(min(detect_config.height - 1, (box[2] * size) + region[1]))
+
+            # ignore objects that were detected outside the frame
+            if (x_min >= detect_config.width - 1) or (
+                y_min >= detect_config.height - 1
+            ):
+                continue
+
+            width = x_max - x_min
+            height = y_max - y_min
+            area = width * height
+            ratio = width / max(1, height)
+            det = (d[0], d[1], (x_min, y_min, x_max, y_max), area, ratio, region)
+            # apply object filters
+            if is_object_filtered(det, objects_to_track, object_filters):
+                continue
+            detections.append(det)
     return detections
 
 
@@ -274,20 +280,28 @@ def process_frames(
             continue
 
         if datetime.now().astimezone(UTC) > next_region_update:
-            region_grid = requestor.send_data(REQUEST_REGION_GRID, camera_config.name)
+            new_region_grid = requestor.send_data(
+                REQUEST_REGION_GRID, camera_config.name
+            )
+
+            # keep the current grid if the request failed
+            if new_region_grid:
+                region_grid = new_region_grid
+
             next_region_update = get_tomorrow_at_time(2)
 
         try:
             if exit_on_empty:
-                frame_name, frame_time = frame_queue.get(False)
+                frame_name, frame_time, read_time = frame_queue.get(False)
             else:
-                frame_name, frame_time = frame_queue.get(True, 1)
+                frame_name, frame_time, read_time = frame_queue.get(True, 1)
         except queue.Empty:
             if exit_on_empty:
                 logger.info("Exiting track_objects...")
                 break
             continue
 
+        dequeued_time = time.time()
         camera_metrics.detection_frame.value = frame_time
         ptz_metrics.frame_time.value = frame_time
 
@@ -301,6 +315,7 @@ def process_frames(
 
         # look for motion if enabled
         motion_boxes = motion_detector.detect(frame)
+        motion_time = detect_time = time.time()
 
         regions = []
         consolidated_detections = []
@@ -308,6 +323,7 @@ def process_frames(
         # if detection is disabled
         if not camera_config.detect.enabled:
             object_tracker.match_and_update(frame_name, frame_time, [])
+            track_time = time.time()
         else:
             # get stationary object ids
             # check every Nth frame for stationary objects
@@ -410,20 +426,21 @@ def process_frames(
                 if obj["id"] in stationary_object_ids
             ]
 
-            for region in regions:
+            if regions:
                 detections.extend(
                     detect(
                         camera_config.detect,
                         object_detector,
                         frame,
                         model_config,
-                        region,
+                        regions,
                         camera_config.objects.track,
                         camera_config.objects.filters,
                     )
                 )
 
             consolidated_detections = reduce_detections(frame_shape, detections)
+            detect_time = time.time()
 
             # if detection was run on this frame, consolidate
             if len(regions) > 0:
@@ -438,6 +455,8 @@ def process_frames(
             else:
                 object_tracker.update_frame_times(frame_name, frame_time)
 
+            track_time = time.time()
+
         # build detections
         detections = {}
         for obj in object_tracker.tracked_objects.values():
@@ -551,6 +570,14 @@ def process_frames(
                     detections,
                     motion_boxes,
                     regions,
+                    (
+                        read_time,
+                        dequeued_time,
+                        motion_time,
+                        detect_time,
+                        track_time,
+                        time.time(),
+                    ),
                 )
             )
             camera_metrics.detection_fps.value = object_detector.fps.eps()
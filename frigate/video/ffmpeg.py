@@ -72,8 +72,7 @@ def capture_frames(
             fps.value = frame_rate.eps()
             skipped_fps.value = skipped_eps.eps()
             current_frame.value = datetime.now().timestamp()
-            frame_name = f"{config.name}_frame{frame_index}"
-            frame_buffer = frame_manager.write(frame_name)
+            frame_buffer = frame_manager.write_frame(config.name, frame_index)
             try:
                 frame_buffer[:] = ffmpeg_process.stdout.read(frame_size)
             except Exception:
@@ -94,12 +93,12 @@ def capture_frames(
                 continue
 
             frame_rate.update()
+            frame_name = frame_manager.commit_frame(config.name, frame_index)
 
             # don't lock the queue to check, just try since it should rarely be full
             try:
-                # add to the queue
-                frame_queue.put((frame_name, current_frame.value), False)
-                frame_manager.close(frame_name)
+                # add to the queue with when the frame finished being read
+                frame_queue.put((frame_name, current_frame.value, time.time()), False)
             except queue.Full:
                 # if the queue is full, skip this frame
                 skipped_eps.update()
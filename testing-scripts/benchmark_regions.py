@@ -0,0 +1,68 @@
+"""Compare region clustering and detection consolidation with the original loops.
+
+Run from the repository root: python testing-scripts/benchmark_regions.py
+"""
+
+import random
+import timeit
+from unittest.mock import patch
+
+from frigate.test.test_region_clustering import (
+    random_boxes,
+    random_detections,
+    reference_cluster_candidates,
+    reference_consolidated_detections,
+)
+from frigate.util.object import consolidate_detections, get_cluster_candidates
+
+frame_shape = (1080, 1920)
+min_region = 320
+number = 50
+rng = random.Random(0)
+
+
+def measure(func) -> float:
+    return min(timeit.repeat(func, number=number, repeat=7)) / number * 1000
+
+
+def report(name, count, reference, current):
+    # time both the python and numpy paths regardless of the size cutoffs
+    with (
+        patch("frigate.util.object.VECTORIZED_CLUSTER_MIN_BOXES", 10**9),
+        patch("frigate.util.object.VECTORIZED_CONSOLIDATION_MIN_DETECTIONS", 10**9),
+    ):
+        python_time = measure(current)
+
+    with (
+        patch("frigate.util.object.VECTORIZED_CLUSTER_MIN_BOXES", 0),
+        patch("frigate.util.object.VECTORIZED_CONSOLIDATION_MIN_DETECTIONS", 0),
+    ):
+        assert current() == reference()
+        numpy_time = measure(current)
+
+    reference_time = measure(reference)
+    print(
+        f"{name:<24} {count:>4}: "
+        f"original {reference_time:7.3f}ms  "
+        f"python {python_time:7.3f}ms  "
+        f"numpy {numpy_time:7.3f}ms"
+    )
+
+
+for count in [5, 20, 50, 100, 200, 400]:
+    boxes = random_boxes(rng, count, frame_shape, max_size=120)
+    report(
+        "get_cluster_candidates",
+        count,
+        lambda: reference_cluster_candidates(frame_shape, min_region, boxes),
+        lambda: get_cluster_candidates(frame_shape, min_region, boxes),
+    )
+
+for count in [2, 5, 10, 20, 50, 100]:
+    detections = [("car", *d[1:]) for d in random_detections(rng, count, frame_shape)]
+    report(
+        "consolidate_detections",
+        count,
+        lambda: reference_consolidated_detections(detections),
+        lambda: consolidate_detections(detections),
+    )